@@ -1,9 +1,17 @@
 from openai import OpenAI
+import base64
 import json
+import re
+from contextlib import aclosing
 
 from datetime import datetime
 import logging
 
+from utils import openai_pool
+from utils.ai_cache import analysis_cache, make_key
+from utils.singleflight import stream_flights
+from utils.sse import coalesce_text
+
 logger = logging.getLogger(__name__)
 
 # System Prompt for the AI Saju Analyst
@@ -168,6 +176,379 @@ TOJEONG_SYSTEM_PROMPT = """
 5. **구체성**: 추상적 표현보다는 구체적인 상황과 예시를 포함하세요.
 """
 
+
+MODEL = "gpt-4o-mini"
+
+_STRING_STOP = re.compile(r'["\\]')
+_CONTAINER_STOP = re.compile(r'["\[\]{}]')
+_SCALAR_STOP = re.compile(r'[,}]')
+_WHITESPACE = " \t\r\n"
+
+
+class _SectionParser:
+    """
+    Incremental parser for the model's top-level JSON object.
+
+    feed(text) returns the (key, value) members that became complete with
+    this text, so each top-level section can be sent as soon as it closes.
+    Every member is parsed once; finish() returns the assembled object
+    without re-parsing the whole output. If the output is not a single
+    JSON object, the parser gives up (failed=True) and the caller falls
+    back to json.loads on the full text.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"  # start, key, colon, value, after_value, done
+        self._first_member = True
+        self._token_start = None
+        self._in_string = False
+        self._depth = 0
+        self._key = None
+        self.failed = False
+        self.result = {}
+
+    def feed(self, text):
+        if self.failed:
+            return []
+        self._buf += text
+        completed = []
+        try:
+            while self._step(completed):
+                pass
+        except ValueError:
+            # json.JSONDecodeError 포함
+            self.failed = True
+        return completed
+
+    def finish(self):
+        """완성된 객체 (형식이 올바르지 않거나 끝나지 않았으면 None)"""
+        if self.failed or self._state != "done":
+            return None
+        return self.result
+
+    def _skip_whitespace(self):
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _scan_string(self):
+        """열린 문자열의 끝을 찾으면 True (_pos는 닫는 따옴표 다음)"""
+        buf = self._buf
+        while True:
+            match = _STRING_STOP.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            index = match.start()
+            if buf[index] == '"':
+                self._pos = index + 1
+                self._in_string = False
+                return True
+            if index + 1 >= len(buf):
+                # 이스케이프 문자 뒤가 아직 오지 않음
+                self._pos = index
+                return False
+            self._pos = index + 2
+
+    def _complete_member(self, completed, end):
+        value = json.loads(self._buf[self._token_start:end])
+        self.result[self._key] = value
+        completed.append((self._key, value))
+        # 처리한 멤버는 버퍼에서 제거해 버퍼가 섹션 하나 크기를 넘지 않게 함
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        self._state = "after_value"
+
+    def _step(self, completed):
+        """상태 하나를 진행합니다. 더 읽을 입력이 필요하면 False"""
+        state = self._state
+        if state == "key" and self._in_string:
+            if not self._scan_string():
+                return False
+            self._key = json.loads(self._buf[self._token_start:self._pos])
+            self._state = "colon"
+            return True
+        if state == "value" and self._token_start is not None:
+            return self._scan_value(completed)
+        if not self._skip_whitespace():
+            return False
+        char = self._buf[self._pos]
+        if state == "start":
+            if char != "{":
+                raise ValueError("JSON 객체가 아닙니다.")
+            self._pos += 1
+            self._state = "key"
+        elif state == "key":
+            if char == "}" and self._first_member:
+                self._pos += 1
+                self._state = "done"
+            elif char == '"':
+                self._token_start = self._pos
+                self._pos += 1
+                self._in_string = True
+            else:
+                raise ValueError("키가 필요합니다.")
+        elif state == "colon":
+            if char != ":":
+                raise ValueError("':'가 필요합니다.")
+            self._pos += 1
+            self._state = "value"
+            self._token_start = None
+        elif state == "value":
+            self._token_start = self._pos
+            self._depth = 0
+            if char == '"':
+                self._in_string = True
+                self._pos += 1
+            elif char in "{[":
+                self._depth = 1
+                self._pos += 1
+        elif state == "after_value":
+            self._pos += 1
+            if char == ",":
+                self._state = "key"
+                self._first_member = False
+            elif char == "}":
+                self._state = "done"
+            else:
+                raise ValueError("',' 또는 '}'가 필요합니다.")
+        else:
+            raise ValueError("객체 뒤에 다른 내용이 있습니다.")
+        return True
+
+    def _scan_value(self, completed):
+        buf = self._buf
+        if self._in_string and self._depth == 0:
+            # 문자열 값
+            if not self._scan_string():
+                return False
+            self._complete_member(completed, self._pos)
+            return True
+        if self._depth == 0:
+            # 숫자, true/false/null: 다음 ',' 또는 '}' 앞까지
+            match = _SCALAR_STOP.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            self._pos = match.start()
+            self._complete_member(completed, self._pos)
+            return True
+        # 객체/배열 값: 괄호 깊이가 0이 될 때까지
+        while True:
+            if self._in_string:
+                if not self._scan_string():
+                    return False
+                continue
+            match = _CONTAINER_STOP.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            char = match.group()
+            self._pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_member(completed, self._pos)
+                    return True
+
+
+def _sse_event(payload):
+    """SSE data 이벤트 문자열을 만듭니다."""
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _parse_result(accumulated_text):
+    """누적된 모델 출력을 JSON으로 파싱합니다. 실패하면 None"""
+    try:
+        return json.loads(accumulated_text)
+    except json.JSONDecodeError:
+        return None
+
+
+def _final_event(result_json):
+    """최종 complete 이벤트 (파싱 실패 시 error 이벤트)"""
+    if result_json is None:
+        return _sse_event({'type': 'error', 'error': 'JSON 파싱 실패'})
+    return _sse_event({'type': 'complete', 'data': result_json})
+
+
+def _section_events(completed):
+    """완성된 최상위 항목마다 section 이벤트"""
+    return [_sse_event({'type': 'section', 'key': key, 'data': value}) for key, value in completed]
+
+
+def _replay_events(result_json):
+    """캐시된 결과를 스트리밍과 같은 chunk → section... → complete 순서의 이벤트로 재생"""
+    events = [_sse_event({'type': 'chunk', 'content': json.dumps(result_json, ensure_ascii=False)})]
+    if isinstance(result_json, dict):
+        events.extend(_section_events(result_json.items()))
+    events.append(_sse_event({'type': 'complete', 'data': result_json}))
+    return events
+
+
+def _finish_result(parser, parts):
+    """스트림 종료 후 최종 결과: 증분 파서 결과를 쓰고, 파서가 실패했을 때만 전체 텍스트를 파싱"""
+    result_json = parser.finish()
+    if result_json is None:
+        result_json = _parse_result("".join(parts))
+    return result_json
+
+
+def _cache_key(kind, system_prompt, input_data):
+    """분석 결과 캐시 키 (분석 종류 + 모델 + 프롬프트 버전 + 정규화된 입력)"""
+    return make_key(kind, MODEL, system_prompt, input_data)
+
+
+def _stream_chat(api_key, system_prompt, user_message, cache_key=None):
+    """
+    Stream a JSON chat completion as SSE events (chunk / section..., complete | error).
+    A section event is sent as soon as each top-level key of the result is complete.
+    Synchronous version: blocks the calling thread while reading tokens.
+    With cache_key, a cached result is replayed without calling the API,
+    and a successfully parsed result is stored for next time.
+    """
+    if cache_key is not None:
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            yield from _replay_events(cached)
+            return
+    
+    client = OpenAI(api_key=api_key)
+    
+    try:
+        stream = client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            stream=True,  # 스트리밍 활성화
+            timeout=60.0  # 스트리밍은 타임아웃이 길어도 문제없음 (청크 단위로 전송)
+        )
+        
+        parser = _SectionParser()
+        parts = []
+        for chunk in stream:
+            if chunk.choices and len(chunk.choices) > 0:
+                delta = chunk.choices[0].delta
+                if delta and delta.content:
+                    parts.append(delta.content)
+                    # 각 청크를 JSON 형식으로 전송
+                    yield _sse_event({'type': 'chunk', 'content': delta.content})
+                    yield from _section_events(parser.feed(delta.content))
+        
+        # 최종 완료 메시지
+        result_json = _finish_result(parser, parts)
+        if result_json is not None and cache_key is not None:
+            analysis_cache.set(cache_key, result_json)
+        yield _final_event(result_json)
+        
+    except Exception as e:
+        yield _sse_event({'type': 'error', 'error': str(e)})
+
+
+async def _content_deltas(stream):
+    """모델 스트림에서 텍스트 delta만 꺼냅니다."""
+    async for chunk in stream:
+        if chunk.choices and len(chunk.choices) > 0:
+            delta = chunk.choices[0].delta
+            if delta and delta.content:
+                yield delta.content
+
+
+async def _stream_chat_async(api_key, system_prompt, user_message, cache_key=None, name="chat"):
+    """
+    Async version of _stream_chat on a pooled AsyncOpenAI client.
+    Tokens are awaited on the event loop, so many streams can run on one worker
+    and requests with the same API key reuse keep-alive connections.
+    Deltas are merged into larger chunk events by utils.sse.coalesce_text
+    using the flush policy for `name`.
+    If the generator is closed or cancelled early (client gone), the upstream
+    HTTP response is closed immediately instead of being drained.
+    """
+    if cache_key is not None:
+        cached = await analysis_cache.aget(cache_key)
+        if cached is not None:
+            for event in _replay_events(cached):
+                yield event
+            return
+    
+    client = openai_pool.get_async_client(api_key)
+    stream = None
+    
+    try:
+        stream = await client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            stream=True,
+            timeout=60.0
+        )
+        
+        parser = _SectionParser()
+        parts = []
+        async with aclosing(coalesce_text(_content_deltas(stream), name)) as texts:
+            async for text in texts:
+                parts.append(text)
+                yield _sse_event({'type': 'chunk', 'content': text})
+                for event in _section_events(parser.feed(text)):
+                    yield event
+        
+        result_json = _finish_result(parser, parts)
+        if result_json is not None and cache_key is not None:
+            await analysis_cache.aset(cache_key, result_json)
+        yield _final_event(result_json)
+        
+    except Exception as e:
+        yield _sse_event({'type': 'error', 'error': str(e)})
+    finally:
+        if stream is not None:
+            # 끝까지 읽었으면 이미 닫혀 있음, 중간에 멈췄으면 남은 응답을 받지 않고 연결을 닫음
+            try:
+                await stream.close()
+            except Exception as e:
+                logger.warning(f"OpenAI 스트림 종료 중 오류: {e}")
+
+
+async def _coalesced_stream(name, api_key, system_prompt, user_message, cache_key, admit=None):
+    """
+    _stream_chat_async behind single-flight: identical concurrent requests
+    (same input and same API key) share one upstream stream.
+    `admit` (async, returns a Permit) is awaited only when a new upstream
+    stream is started; requests that join an in-flight stream skip it.
+    """
+    flight_key = (cache_key, openai_pool.key_hash(api_key))
+    return await stream_flights.open(
+        flight_key,
+        lambda: _stream_chat_async(api_key, system_prompt, user_message, cache_key, name),
+        admit
+    )
+
+
+def _build_saju_message(input_data):
+    """사주 분석 요청 메시지"""
+    user_message = f"""
+다음 사주 데이터를 분석해주세요:
+
+{json.dumps(input_data, ensure_ascii=False, indent=2)}
+"""
+    return user_message
+
+
 def generate_saju_analysis(api_key, input_data):
     """
     Generate comprehensive Saju analysis using OpenAI API.
@@ -181,15 +562,11 @@ def generate_saju_analysis(api_key, input_data):
     """
     client = OpenAI(api_key=api_key)
     
-    user_message = f"""
-다음 사주 데이터를 분석해주세요:
-
-{json.dumps(input_data, ensure_ascii=False, indent=2)}
-"""
+    user_message = _build_saju_message(input_data)
     
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
@@ -219,62 +596,24 @@ def generate_saju_analysis_stream(api_key, input_data):
     Yields:
         str: JSON chunks of the analysis result
     """
-    client = OpenAI(api_key=api_key)
-    
-    user_message = f"""
-다음 사주 데이터를 분석해주세요:
-
-{json.dumps(input_data, ensure_ascii=False, indent=2)}
-"""
-    
-    try:
-        stream = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            stream=True,  # 스트리밍 활성화
-            timeout=60.0  # 스트리밍은 타임아웃이 길어도 문제없음 (청크 단위로 전송)
-        )
-        
-        accumulated_text = ""
-        for chunk in stream:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    accumulated_text += delta.content
-                    # 각 청크를 JSON 형식으로 전송
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': delta.content}, ensure_ascii=False)}\n\n"
-        
-        # 최종 완료 메시지
-        try:
-            result_json = json.loads(accumulated_text)
-            yield f"data: {json.dumps({'type': 'complete', 'data': result_json}, ensure_ascii=False)}\n\n"
-        except json.JSONDecodeError:
-            yield f"data: {json.dumps({'type': 'error', 'error': 'JSON 파싱 실패'}, ensure_ascii=False)}\n\n"
-        
-    except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    return _stream_chat(api_key, SYSTEM_PROMPT, _build_saju_message(input_data),
+                        _cache_key("saju", SYSTEM_PROMPT, input_data))
 
 
-def generate_tojeong_analysis(api_key, tojeong_data, pillars_data=None, pillars_info=None):
+async def generate_saju_analysis_stream_async(api_key, input_data, admit=None):
     """
-    Generate detailed Tojeong Bigyeol (토정비결) analysis using OpenAI API.
-    
-    Args:
-        api_key: OpenAI API key
-        tojeong_data: Dictionary containing Tojeong calculation results
-        pillars_data: List of pillar dictionaries (사주 기둥 데이터)
-        pillars_info: Dictionary with pillar information (사주 정보)
+    Async version of generate_saju_analysis_stream (AsyncOpenAI, pooled client).
+    Awaiting it opens or joins the stream; admission errors from `admit` are raised here.
     
     Returns:
-        Dictionary containing detailed Tojeong analysis
+        async iterator of str: SSE events, same sequence as the synchronous version
     """
-    client = OpenAI(api_key=api_key)
-    
+    return await _coalesced_stream("saju", api_key, SYSTEM_PROMPT, _build_saju_message(input_data),
+                                   _cache_key("saju", SYSTEM_PROMPT, input_data), admit)
+
+
+def _build_tojeong_message(tojeong_data, pillars_data=None, pillars_info=None):
+    """토정비결 분석 요청 메시지"""
     # 사주 정보 구성
     saju_info = ""
     if pillars_data and pillars_info:
@@ -300,10 +639,29 @@ def generate_tojeong_analysis(api_key, tojeong_data, pillars_data=None, pillars_
 {saju_info}
 위 정보를 바탕으로 토정비결의 전통적 해석과 현대적 의미를 결합하여, 사주팔자 정보를 활용한 매우 상세하고 풍부한 올해 운세를 제공해주세요. 사주팔자의 오행, 십성, 신살 등을 고려하여 더욱 구체적이고 개인화된 분석을 해주세요.
 """
+    return user_message
+
+
+def generate_tojeong_analysis(api_key, tojeong_data, pillars_data=None, pillars_info=None):
+    """
+    Generate detailed Tojeong Bigyeol (토정비결) analysis using OpenAI API.
+    
+    Args:
+        api_key: OpenAI API key
+        tojeong_data: Dictionary containing Tojeong calculation results
+        pillars_data: List of pillar dictionaries (사주 기둥 데이터)
+        pillars_info: Dictionary with pillar information (사주 정보)
+    
+    Returns:
+        Dictionary containing detailed Tojeong analysis
+    """
+    client = OpenAI(api_key=api_key)
+    
+    user_message = _build_tojeong_message(tojeong_data, pillars_data, pillars_info)
     
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": TOJEONG_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
@@ -335,65 +693,23 @@ def generate_tojeong_analysis_stream(api_key, tojeong_data, pillars_data=None, p
     Yields:
         str: JSON chunks of the analysis result
     """
-    client = OpenAI(api_key=api_key)
-    
-    # 사주 정보 구성
-    saju_info = ""
-    if pillars_data and pillars_info:
-        saju_info = f"""
-## 사주팔자 정보
-사주팔자: {pillars_data[0].get('Heavenly Stem (천간)', '')}{pillars_data[0].get('Earthly Branch (지지)', '')}년 
-         {pillars_data[1].get('Heavenly Stem (천간)', '')}{pillars_data[1].get('Earthly Branch (지지)', '')}월 
-         {pillars_data[2].get('Heavenly Stem (천간)', '')}{pillars_data[2].get('Earthly Branch (지지)', '')}일 
-         {pillars_data[3].get('Heavenly Stem (천간)', '')}{pillars_data[3].get('Earthly Branch (지지)', '')}시
-일간(日干): {pillars_info.get('day_stem', '')}
-오행 분포: {pillars_info.get('element_count', {})}
-"""
-    
-    user_message = f"""
-다음 토정비결 데이터와 사주 정보를 바탕으로 올해의 운세를 상세하게 분석해주세요:
+    user_message = _build_tojeong_message(tojeong_data, pillars_data, pillars_info)
+    cache_key = _cache_key("tojeong", TOJEONG_SYSTEM_PROMPT, [tojeong_data, pillars_data, pillars_info])
+    return _stream_chat(api_key, TOJEONG_SYSTEM_PROMPT, user_message, cache_key)
 
-## 토정비결 기본 정보
-생년 간지: {tojeong_data.get('birth_year_ganji', '')}
-올해({tojeong_data.get('current_year', '')}년) 간지: {tojeong_data.get('current_year_ganji', '')}
-간지 관계: {tojeong_data.get('relationship', '')} ({tojeong_data.get('relationship_desc', '')})
-기본 운세 평가: {tojeong_data.get('fortune_level', '')}
-기본 메시지: {tojeong_data.get('fortune_message', '')}
-{saju_info}
-위 정보를 바탕으로 토정비결의 전통적 해석과 현대적 의미를 결합하여, 사주팔자 정보를 활용한 매우 상세하고 풍부한 올해 운세를 제공해주세요. 사주팔자의 오행, 십성, 신살 등을 고려하여 더욱 구체적이고 개인화된 분석을 해주세요.
-"""
+
+async def generate_tojeong_analysis_stream_async(api_key, tojeong_data, pillars_data=None, pillars_info=None,
+                                                 admit=None):
+    """
+    Async version of generate_tojeong_analysis_stream (AsyncOpenAI, pooled client).
+    Awaiting it opens or joins the stream; admission errors from `admit` are raised here.
     
-    try:
-        stream = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": TOJEONG_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            stream=True,  # 스트리밍 활성화
-            timeout=60.0  # 스트리밍은 타임아웃이 길어도 문제없음 (청크 단위로 전송)
-        )
-        
-        accumulated_text = ""
-        for chunk in stream:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    accumulated_text += delta.content
-                    # 각 청크를 JSON 형식으로 전송
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': delta.content}, ensure_ascii=False)}\n\n"
-        
-        # 최종 완료 메시지
-        try:
-            result_json = json.loads(accumulated_text)
-            yield f"data: {json.dumps({'type': 'complete', 'data': result_json}, ensure_ascii=False)}\n\n"
-        except json.JSONDecodeError:
-            yield f"data: {json.dumps({'type': 'error', 'error': 'JSON 파싱 실패'}, ensure_ascii=False)}\n\n"
-        
-    except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    Returns:
+        async iterator of str: SSE events, same sequence as the synchronous version
+    """
+    user_message = _build_tojeong_message(tojeong_data, pillars_data, pillars_info)
+    cache_key = _cache_key("tojeong", TOJEONG_SYSTEM_PROMPT, [tojeong_data, pillars_data, pillars_info])
+    return await _coalesced_stream("tojeong", api_key, TOJEONG_SYSTEM_PROMPT, user_message, cache_key, admit)
 
 
 # System Prompt for Gonghap (궁합)
@@ -465,24 +781,10 @@ GONGHAP_SYSTEM_PROMPT = """
 """
 
 
-def generate_gonghap_analysis(api_key, gonghap_data, person1_pillars_data=None, person1_pillars_info=None, 
-                              person2_pillars_data=None, person2_pillars_info=None):
-    """
-    Generate detailed Gonghap (궁합) analysis using OpenAI API.
-    
-    Args:
-        api_key: OpenAI API key
-        gonghap_data: Dictionary containing Gonghap calculation results
-        person1_pillars_data: First person's pillar data (optional)
-        person1_pillars_info: First person's pillar info (optional)
-        person2_pillars_data: Second person's pillar data (optional)
-        person2_pillars_info: Second person's pillar info (optional)
-    
-    Returns:
-        Dictionary containing detailed Gonghap analysis
-    """
-    client = OpenAI(api_key=api_key)
-    
+
+def _build_gonghap_message(gonghap_data, person1_pillars_data=None, person1_pillars_info=None,
+                           person2_pillars_data=None, person2_pillars_info=None):
+    """궁합 분석 요청 메시지"""
     # 사주 정보 구성
     saju_info = ""
     if person1_pillars_data and person1_pillars_info and person2_pillars_data and person2_pillars_info:
@@ -534,10 +836,33 @@ def generate_gonghap_analysis(api_key, gonghap_data, person1_pillars_data=None,
 {saju_info}
 위 정보를 바탕으로 전통 명리학 원리를 활용하여, 두 사람의 사주팔자 정보를 고려한 매우 상세하고 구체적인 궁합 분석을 제공해주세요. 관계의 강점과 도전과제를 균형 있게 분석하고, 실용적인 관계 개선 방안을 제시해주세요.
 """
+    return user_message
+
+
+def generate_gonghap_analysis(api_key, gonghap_data, person1_pillars_data=None, person1_pillars_info=None, 
+                              person2_pillars_data=None, person2_pillars_info=None):
+    """
+    Generate detailed Gonghap (궁합) analysis using OpenAI API.
+    
+    Args:
+        api_key: OpenAI API key
+        gonghap_data: Dictionary containing Gonghap calculation results
+        person1_pillars_data: First person's pillar data (optional)
+        person1_pillars_info: First person's pillar info (optional)
+        person2_pillars_data: Second person's pillar data (optional)
+        person2_pillars_info: Second person's pillar info (optional)
+    
+    Returns:
+        Dictionary containing detailed Gonghap analysis
+    """
+    client = OpenAI(api_key=api_key)
+    
+    user_message = _build_gonghap_message(gonghap_data, person1_pillars_data, person1_pillars_info,
+                                          person2_pillars_data, person2_pillars_info)
     
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": GONGHAP_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
@@ -572,91 +897,40 @@ def generate_gonghap_analysis_stream(api_key, gonghap_data, person1_pillars_data
     Yields:
         str: JSON chunks of the analysis result
     """
-    client = OpenAI(api_key=api_key)
-    
-    # 사주 정보 구성
-    saju_info = ""
-    if person1_pillars_data and person1_pillars_info and person2_pillars_data and person2_pillars_info:
-        p1_saju = f"{person1_pillars_data[0].get('Heavenly Stem (천간)', '')}{person1_pillars_data[0].get('Earthly Branch (지지)', '')}년 " \
-                 f"{person1_pillars_data[1].get('Heavenly Stem (천간)', '')}{person1_pillars_data[1].get('Earthly Branch (지지)', '')}월 " \
-                 f"{person1_pillars_data[2].get('Heavenly Stem (천간)', '')}{person1_pillars_data[2].get('Earthly Branch (지지)', '')}일 " \
-                 f"{person1_pillars_data[3].get('Heavenly Stem (천간)', '')}{person1_pillars_data[3].get('Earthly Branch (지지)', '')}시"
-        
-        p2_saju = f"{person2_pillars_data[0].get('Heavenly Stem (천간)', '')}{person2_pillars_data[0].get('Earthly Branch (지지)', '')}년 " \
-                 f"{person2_pillars_data[1].get('Heavenly Stem (천간)', '')}{person2_pillars_data[1].get('Earthly Branch (지지)', '')}월 " \
-                 f"{person2_pillars_data[2].get('Heavenly Stem (천간)', '')}{person2_pillars_data[2].get('Earthly Branch (지지)', '')}일 " \
-                 f"{person2_pillars_data[3].get('Heavenly Stem (천간)', '')}{person2_pillars_data[3].get('Earthly Branch (지지)', '')}시"
-        
-        saju_info = f"""
-## 첫 번째 사람 사주팔자
-{p1_saju}
-일간(日干): {person1_pillars_info.get('day_stem', '')}
+    user_message = _build_gonghap_message(gonghap_data, person1_pillars_data, person1_pillars_info,
+                                          person2_pillars_data, person2_pillars_info)
+    cache_key = _cache_key("gonghap", GONGHAP_SYSTEM_PROMPT, [gonghap_data, person1_pillars_data, person1_pillars_info,
+                                                              person2_pillars_data, person2_pillars_info])
+    return _stream_chat(api_key, GONGHAP_SYSTEM_PROMPT, user_message, cache_key)
 
-## 두 번째 사람 사주팔자
-{p2_saju}
-일간(日干): {person2_pillars_info.get('day_stem', '')}
-"""
-    
-    user_message = f"""
-다음 궁합 계산 결과와 사주 정보를 바탕으로 두 사람의 궁합을 상세하게 분석해주세요:
-
-## 궁합 기본 정보
-전체 점수: {gonghap_data.get('overall_score', 75)}점
-전체 평가: {gonghap_data.get('overall_level', '보통')}
-전체 설명: {gonghap_data.get('overall_desc', '')}
-
-## 기둥별 궁합
-{chr(10).join([f"- {p.get('pillar', '')}: {p.get('score', 0)}점 ({p.get('level', '')}) - {p.get('analysis', '')}" for p in gonghap_data.get('pillar_compatibilities', [])])}
 
-## 지지 관계
-{chr(10).join([f"- {rel}" for rel in gonghap_data.get('branch_relationships', [])])}
-
-## 십성 분석
-{chr(10).join([f"- {tg}" for tg in gonghap_data.get('ten_god_analysis', [])])}
-
-## 강점
-{chr(10).join([f"- {s}" for s in gonghap_data.get('strengths', [])])}
+async def generate_gonghap_analysis_stream_async(api_key, gonghap_data, person1_pillars_data=None,
+                                                 person1_pillars_info=None, person2_pillars_data=None,
+                                                 person2_pillars_info=None, admit=None):
+    """
+    Async version of generate_gonghap_analysis_stream (AsyncOpenAI, pooled client).
+    Awaiting it opens or joins the stream; admission errors from `admit` are raised here.
+    
+    Returns:
+        async iterator of str: SSE events, same sequence as the synchronous version
+    """
+    user_message = _build_gonghap_message(gonghap_data, person1_pillars_data, person1_pillars_info,
+                                          person2_pillars_data, person2_pillars_info)
+    cache_key = _cache_key("gonghap", GONGHAP_SYSTEM_PROMPT, [gonghap_data, person1_pillars_data, person1_pillars_info,
+                                                              person2_pillars_data, person2_pillars_info])
+    return await _coalesced_stream("gonghap", api_key, GONGHAP_SYSTEM_PROMPT, user_message, cache_key, admit)
 
-## 주의사항
-{chr(10).join([f"- {w}" for w in gonghap_data.get('weaknesses', [])])}
 
-## 조언
-{gonghap_data.get('advice', '')}
-{saju_info}
-위 정보를 바탕으로 전통 명리학 원리를 활용하여, 두 사람의 사주팔자 정보를 고려한 매우 상세하고 구체적인 궁합 분석을 제공해주세요. 관계의 강점과 도전과제를 균형 있게 분석하고, 실용적인 관계 개선 방안을 제시해주세요.
-"""
+def _tarot_image_prompt(card_name, is_reversed=False):
+    """Build the DALL-E prompt for a tarot card."""
+    # 카드 이름에서 한글과 영어 이름 추출
+    card_display_name = card_name.split("(")[0].strip() if "(" in card_name else card_name
+    card_english_name = card_name.split("(")[1].split(")")[0].strip() if "(" in card_name and ")" in card_name else ""
     
-    try:
-        stream = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": GONGHAP_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            stream=True,  # 스트리밍 활성화
-            timeout=60.0  # 스트리밍은 타임아웃이 길어도 문제없음 (청크 단위로 전송)
-        )
-        
-        accumulated_text = ""
-        for chunk in stream:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    accumulated_text += delta.content
-                    # 각 청크를 JSON 형식으로 전송
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': delta.content}, ensure_ascii=False)}\n\n"
-        
-        # 최종 완료 메시지
-        try:
-            result_json = json.loads(accumulated_text)
-            yield f"data: {json.dumps({'type': 'complete', 'data': result_json}, ensure_ascii=False)}\n\n"
-        except json.JSONDecodeError:
-            yield f"data: {json.dumps({'type': 'error', 'error': 'JSON 파싱 실패'}, ensure_ascii=False)}\n\n"
-        
-    except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    # 프롬프트 생성
+    if is_reversed:
+        return f"A mystical and beautiful tarot card illustration of '{card_display_name}' ({card_english_name}) in reversed position. The card should have a dark, mysterious, and introspective atmosphere. Rich colors, intricate details, symbolic imagery, golden borders, mystical aura, high quality art style, traditional tarot card design with ornate frame."
+    return f"A mystical and beautiful tarot card illustration of '{card_display_name}' ({card_english_name}) in upright position. The card should have a bright, positive, and inspiring atmosphere. Rich colors, intricate details, symbolic imagery, golden borders, mystical aura, high quality art style, traditional tarot card design with ornate frame."
 
 
 def generate_tarot_card_image(api_key, card_name, is_reversed=False):
@@ -672,16 +946,7 @@ def generate_tarot_card_image(api_key, card_name, is_reversed=False):
         str: URL of the generated image, or None if generation fails
     """
     client = OpenAI(api_key=api_key)
-    
-    # 카드 이름에서 한글과 영어 이름 추출
-    card_display_name = card_name.split("(")[0].strip() if "(" in card_name else card_name
-    card_english_name = card_name.split("(")[1].split(")")[0].strip() if "(" in card_name and ")" in card_name else ""
-    
-    # 프롬프트 생성
-    if is_reversed:
-        prompt = f"A mystical and beautiful tarot card illustration of '{card_display_name}' ({card_english_name}) in reversed position. The card should have a dark, mysterious, and introspective atmosphere. Rich colors, intricate details, symbolic imagery, golden borders, mystical aura, high quality art style, traditional tarot card design with ornate frame."
-    else:
-        prompt = f"A mystical and beautiful tarot card illustration of '{card_display_name}' ({card_english_name}) in upright position. The card should have a bright, positive, and inspiring atmosphere. Rich colors, intricate details, symbolic imagery, golden borders, mystical aura, high quality art style, traditional tarot card design with ornate frame."
+    prompt = _tarot_image_prompt(card_name, is_reversed)
     
     try:
         response = client.images.generate(
@@ -699,6 +964,36 @@ def generate_tarot_card_image(api_key, card_name, is_reversed=False):
     except Exception as e:
         logger.error(f"타로 카드 이미지 생성 오류: {e}", exc_info=True)
         return None
+
+
+async def generate_tarot_card_image_async(api_key, card_name, is_reversed=False):
+    """
+    Async version of generate_tarot_card_image that returns the image bytes.
+    
+    The image is requested as base64 so it can be stored locally without a
+    second download from the provider's expiring URL.
+    
+    Returns:
+        bytes: PNG image data, or None if generation fails
+    """
+    client = openai_pool.get_async_client(api_key)
+    prompt = _tarot_image_prompt(card_name, is_reversed)
+    
+    try:
+        response = await client.images.generate(
+            model="dall-e-3",
+            prompt=prompt,
+            size="1024x1024",
+            quality="standard",
+            n=1,
+            response_format="b64_json",
+            timeout=30.0
+        )
+        return base64.b64decode(response.data[0].b64_json)
+        
+    except Exception as e:
+        logger.error(f"타로 카드 이미지 생성 오류: {e}", exc_info=True)
+        return None
 # System Prompt for Byeoljari (별자리)
 BYEOLJARI_SYSTEM_PROMPT = """
 ## 역할 정의
@@ -749,19 +1044,9 @@ BYEOLJARI_SYSTEM_PROMPT = """
 """
 
 
-def generate_byeoljari_analysis_stream(api_key, byeoljari_data):
-    """
-    Generate detailed Byeoljari (Horoscope) analysis using OpenAI API with streaming.
-    
-    Args:
-        api_key: OpenAI API key
-        byeoljari_data: Dictionary containing Horoscope calculation results
-    
-    Yields:
-        str: JSON chunks of the analysis result
-    """
-    client = OpenAI(api_key=api_key)
-    
+
+def _build_byeoljari_message(byeoljari_data):
+    """별자리 분석 요청 메시지"""
     user_message = f"""
 다음 별자리 기본 운세 데이터를 바탕으로 상세한 AI 점성술 분석을 제공해주세요:
 
@@ -783,33 +1068,32 @@ def generate_byeoljari_analysis_stream(api_key, byeoljari_data):
 
 위 기본 정보를 바탕으로 서양 점성술의 심도 있는 해석을 더하여, 더욱 풍부하고 개인화된 운세 분석을 제공해주세요.
 """
+    return user_message
+
+
+def generate_byeoljari_analysis_stream(api_key, byeoljari_data):
+    """
+    Generate detailed Byeoljari (Horoscope) analysis using OpenAI API with streaming.
     
-    try:
-        stream = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": BYEOLJARI_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            stream=True,
-            timeout=60.0
-        )
-        
-        accumulated_text = ""
-        for chunk in stream:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    accumulated_text += delta.content
-                    yield f"data: {json.dumps({'type': 'chunk', 'content': delta.content}, ensure_ascii=False)}\n\n"
-        
-        try:
-            result_json = json.loads(accumulated_text)
-            yield f"data: {json.dumps({'type': 'complete', 'data': result_json}, ensure_ascii=False)}\n\n"
-        except json.JSONDecodeError:
-            yield f"data: {json.dumps({'type': 'error', 'error': 'JSON 파싱 실패'}, ensure_ascii=False)}\n\n"
-        
-    except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    Args:
+        api_key: OpenAI API key
+        byeoljari_data: Dictionary containing Horoscope calculation results
+    
+    Yields:
+        str: JSON chunks of the analysis result
+    """
+    return _stream_chat(api_key, BYEOLJARI_SYSTEM_PROMPT, _build_byeoljari_message(byeoljari_data),
+                        _cache_key("byeoljari", BYEOLJARI_SYSTEM_PROMPT, byeoljari_data))
+
+
+async def generate_byeoljari_analysis_stream_async(api_key, byeoljari_data, admit=None):
+    """
+    Async version of generate_byeoljari_analysis_stream (AsyncOpenAI, pooled client).
+    Awaiting it opens or joins the stream; admission errors from `admit` are raised here.
+    
+    Returns:
+        async iterator of str: SSE events, same sequence as the synchronous version
+    """
+    return await _coalesced_stream("byeoljari", api_key, BYEOLJARI_SYSTEM_PROMPT,
+                                   _build_byeoljari_message(byeoljari_data),
+                                   _cache_key("byeoljari", BYEOLJARI_SYSTEM_PROMPT, byeoljari_data), admit)
@@ -10,6 +10,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.status import HTTP_404_NOT_FOUND
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -21,22 +22,47 @@ import saju_logic
 from utils.seo_fastapi import get_page_meta, generate_sitemap, generate_robots_txt, SITE_INFO
 from utils.page_config import PAGE_NAMES
 from utils.banner_fastapi import get_banner_html
+from utils import openai_pool, tarot_images
+from utils.response_cache import response_cache
+from utils.session_store import ServerSessionMiddleware, session_backend, SESSION_TTL
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    # 종료 시 재사용 중인 OpenAI 연결 정리
+    await openai_pool.aclose_all()
+
 
 app = FastAPI(
     title="운세담 | AI 프리미엄 사주",
     description="AI 기반 프리미엄 사주 명리 분석 서비스",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # 세션 미들웨어 (st.session_state 대체)
+# 서버 저장소가 설정되었으면 쿠키에는 세션 ID만 담고, 아니면 서명 쿠키에 담음 (utils/session_store.py)
 # 세션 쿠키 설정: same_site='lax'로 설정하여 메뉴 이동 시에도 쿠키가 전달되도록 함
-SECRET_KEY = os.getenv("SECRET_KEY", "unsedam-secret-key-change-in-production")
-app.add_middleware(
-    SessionMiddleware, 
-    secret_key=SECRET_KEY,
-    max_age=86400,  # 24시간
-    same_site='lax'  # 메뉴 이동 시에도 쿠키 전달
-)
+if session_backend is not None:
+    app.add_middleware(
+        ServerSessionMiddleware,
+        backend=session_backend,
+        max_age=SESSION_TTL,  # 기본 24시간
+        same_site='lax'  # 메뉴 이동 시에도 쿠키 전달
+    )
+else:
+    SECRET_KEY = os.getenv("SECRET_KEY", "unsedam-secret-key-change-in-production")
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key=SECRET_KEY,
+        max_age=SESSION_TTL,  # 기본 24시간
+        same_site='lax'  # 메뉴 이동 시에도 쿠키 전달
+    )
+
+# 타로 AI 이미지 (저장 디렉토리가 static 밖일 수 있으므로 /static보다 먼저 따로 연결)
+if tarot_images.IMAGE_DIR is not None:
+    app.mount(tarot_images.IMAGE_URL_PREFIX, StaticFiles(directory=str(tarot_images.IMAGE_DIR)), name="tarot_ai")
 
 # 정적 파일 서빙 (절대 경로 사용)
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
@@ -78,6 +104,7 @@ async def index(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 배너 생성
@@ -99,6 +126,7 @@ async def index(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "top_banner_html": top_banner_html,
             "sidebar_banner_html": sidebar_banner_html,
@@ -107,25 +135,24 @@ async def index(request: Request):
 
 
 @app.get("/robots.txt", response_class=PlainTextResponse)
-async def robots_txt():
+async def robots_txt(request: Request):
     """robots.txt 제공"""
-    robots_content = generate_robots_txt()
-    return PlainTextResponse(
-        content=robots_content,
-        media_type="text/plain; charset=utf-8",
-        headers={"Cache-Control": "public, max-age=3600"}
-    )
+    entry = response_cache.get("robots", None)
+    if entry is None:
+        entry = response_cache.put("robots", None, generate_robots_txt(), media_type="text/plain; charset=utf-8")
+    return response_cache.respond(request, entry, "robots", headers={"Cache-Control": "public, max-age=3600"})
 
 
 @app.get("/sitemap.xml", response_class=PlainTextResponse)
-async def sitemap_xml():
+async def sitemap_xml(request: Request):
     """sitemap.xml 제공"""
-    sitemap_content = generate_sitemap()
-    return PlainTextResponse(
-        content=sitemap_content,
-        media_type="application/xml; charset=utf-8",
-        headers={"Cache-Control": "public, max-age=3600"}
-    )
+    # lastmod가 오늘 날짜이므로 날짜별로 캐시
+    bucket = datetime.now().date()
+    entry = response_cache.get("sitemap", None, bucket)
+    if entry is None:
+        entry = response_cache.put("sitemap", None, generate_sitemap(), bucket,
+                                   media_type="application/xml; charset=utf-8")
+    return response_cache.respond(request, entry, "sitemap", headers={"Cache-Control": "public, max-age=3600"})
 
 
 @app.get("/naverc30385e5fad1beddd1da6ba899dd964f.html", response_class=PlainTextResponse)
@@ -207,10 +234,11 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             status_code=HTTP_404_NOT_FOUND
         )
     
-    # 기타 HTTP 예외는 기본 처리
+    # 기타 HTTP 예외는 기본 처리 (Retry-After 등 예외에 지정된 헤더는 그대로 전달)
     return HTMLResponse(
         content=f"<h1>{exc.status_code} Error</h1><p>{exc.detail}</p>",
-        status_code=exc.status_code
+        status_code=exc.status_code,
+        headers=exc.headers
     )
 
 
@@ -6,31 +6,130 @@ from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.responses import JSONResponse, StreamingResponse
 from datetime import datetime
 import logging
+import asyncio
 import json
+import os
+from contextlib import aclosing
 import saju_logic
 import ai_analyst
+from utils import metrics, session_store
 from utils.api_key_fastapi import get_api_key, validate_api_key
-from utils.security import validate_name, safe_error_message, is_production
+from utils.cache import TTLCache
+from utils.admission import AdmissionRejected, chat_admission, image_admission, dream_admission
+from utils.executor import run_compute, ComputeBusyError, ComputeTimeoutError
+from utils.openai_pool import key_hash
+from utils.response_cache import response_cache, cache_control, seconds_until_midnight, LONG_MAX_AGE
+from utils.result_store import result_store, make_result_key, is_result_id
+from utils.sse import guard_stream
+from utils.security import validate_name, safe_error_message, is_production, verify_admin_token
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# /calculate 결과 중 출생 정보만으로 정해지는 부분의 캐시
+# 나이, 현재 대운, 올해 간지, AI 입력 데이터는 날짜에 따라 바뀌므로 요청마다 계산
+_calculate_cache = TTLCache(
+    maxsize=int(os.getenv("CALCULATE_CACHE_SIZE", "2048")),
+    ttl=int(os.getenv("CALCULATE_CACHE_TTL", "86400"))
+)
+metrics.register("calculate_cache", _calculate_cache.stats)
 
-@router.post("/calculate")
-async def calculate_pillars(
-    request: Request,
-    name: str = Form(...),
-    birth_date: str = Form(...),
-    birth_time: str = Form(default=""),
-    gender: str = Form(...),
-    is_lunar: bool = Form(False)
-):
-    """사주 계산 API"""
+
+async def _run_compute(fn, *args):
+    """
+    CPU 계산을 이벤트 루프 밖의 계산 실행기에서 실행합니다.
+    대기열 초과는 503, 시간 초과는 504로 응답합니다.
+    """
+    try:
+        return await run_compute(fn, *args)
+    except ComputeBusyError:
+        raise HTTPException(status_code=503, detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                            headers={"Retry-After": "1"})
+    except ComputeTimeoutError:
+        raise HTTPException(status_code=504, detail="계산 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+
+
+async def _admit(limiter, api_key):
+    """
+    AI 요청의 동시 실행 자리를 얻습니다. 대기는 API Key별로 번갈아 처리됩니다.
+    대기열 초과나 대기 시간 초과는 429와 Retry-After로 응답합니다.
+    """
+    try:
+        return await limiter.acquire(key_hash(api_key))
+    except AdmissionRejected as e:
+        logger.warning(f"AI 요청 거절 ({limiter.name}): {e}")
+        raise HTTPException(status_code=429, detail="AI 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                            headers={"Retry-After": str(e.retry_after)})
+
+
+def _manse_cache_policy(year, month, now):
+    """
+    만세력 달력의 (캐시 구간, 브라우저 max-age)
+    - 이번 달: 오늘 표시(is_today)가 바뀌므로 오늘 날짜 구간, 자정까지
+    - 다음 달 이후: 그 달이 되면 오늘 표시가 생기므로 이번 달 구간, 그 달이 시작될 때까지
+    - 지난 달: 바뀌지 않으므로 구간 없이 오래
+    """
+    today = now.date()
+    if (year, month) == (today.year, today.month):
+        return today, seconds_until_midnight(now)
+    if (year, month) > (today.year, today.month):
+        month_start = now.replace(year=year, month=month, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return (today.year, today.month), max(60, min(LONG_MAX_AGE, int((month_start - now).total_seconds())))
+    return None, LONG_MAX_AGE
+
+
+async def _load_result(result_id):
+    """
+    /calculate가 돌려준 결과 ID의 저장된 결과 ({"data": ..., "year_pillar": ...}).
+    형식이 틀리면 400, 없거나 만료되었으면 410 (클라이언트는 calculated_data로 다시 요청)
+    """
+    if not is_result_id(result_id):
+        raise HTTPException(status_code=400, detail="결과 ID 형식이 올바르지 않습니다.")
+    record = await result_store.aget(result_id)
+    if record is None:
+        raise HTTPException(status_code=410, detail="계산 결과가 만료되었습니다. 사주를 다시 계산해주세요.")
+    return record
+
+
+async def _birth_chart(birth_dt, birth_tm, is_lunar, is_leap_month, gender):
+    """
+    출생 정보만으로 정해지는 사주 계산 결과(saju_logic.compute_birth_chart)를 반환합니다.
+    같은 (날짜, 시각, 음력/윤달 여부, 성별) 입력은 캐시에서 바로 반환하고,
+    캐시에 없을 때만 계산 실행기에서 계산합니다.
+    캐시된 값을 공유하므로 반환된 dict와 그 내용은 수정하면 안 됩니다.
+    """
+    key = (birth_dt.isoformat(), birth_tm.strftime("%H:%M"), is_lunar, is_leap_month, gender)
+    chart = _calculate_cache.get(key)
+    if chart is None:
+        chart = await _run_compute(saju_logic.compute_birth_chart, birth_dt, birth_tm, is_lunar, is_leap_month, gender)
+        _calculate_cache.set(key, chart)
+    return chart
+
+
+@router.get("/stats")
+async def get_stats(request: Request):
+    """
+    캐시 등 운영 지표 조회 API
+    저장소 경로와 트래픽이 드러나므로 X-Admin-Token 헤더로 ADMIN_TOKEN을 보내야 함 (미설정 시 ENVIRONMENT=development일 때만 허용)
+    """
+    if not verify_admin_token(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+    return JSONResponse({"success": True, "data": metrics.snapshot()})
+
+
+async def _calculate_data(name, birth_date, birth_time, gender, is_lunar, is_leap_month, issue_result_id=True):
+    """
+    사주 계산 결과 (POST/GET /calculate 공통, 세션은 건드리지 않음)
+    issue_result_id면 결과를 저장하고 새 결과 ID를 result_id로 담습니다.
+    입력 오류는 400, 그 밖의 오류는 500 HTTPException으로 올립니다.
+    """
     try:
         # is_lunar는 체크박스이므로 문자열로 올 수 있음
         if isinstance(is_lunar, str):
             is_lunar = is_lunar.lower() in ('true', '1', 'yes', 'on', 'checked')
         is_lunar = bool(is_lunar)
+        # 윤달은 음력 입력일 때만 의미가 있음
+        is_leap_month = is_lunar and bool(is_leap_month)
         
         # 입력 검증
         name_valid, name_error = validate_name(name)
@@ -65,34 +164,9 @@ async def calculate_pillars(
         if not isinstance(birth_tm, dt_time):
             birth_tm = dt_time(12, 0)
         
-        # 사주 계산 (기존 로직 그대로 사용)
-        result = saju_logic.calculate_pillars(birth_dt, birth_tm, is_lunar)
-        
-        # birth_datetime이 없으면 생성 (birth_dt와 birth_tm으로부터)
-        # calculate_pillars는 datetime.date를 받지만, birth_datetime은 datetime.datetime이어야 함
-        from datetime import datetime as dt
-        birth_datetime = result[1].get('birth_datetime')
-        
-        # birth_datetime이 None이거나 datetime 객체가 아니면 생성
-        if birth_datetime is None or not isinstance(birth_datetime, dt):
-            birth_datetime = dt.combine(birth_dt, birth_tm)
-            result[1]['birth_datetime'] = birth_datetime
-        
-        # 세션에 저장하기 전에 datetime 객체를 문자열로 변환
-        # Starlette SessionMiddleware는 JSON 직렬화를 사용하므로 datetime 객체를 직접 저장할 수 없음
-        pillars_info_for_session = result[1].copy()
-        if 'birth_datetime' in pillars_info_for_session:
-            pillars_info_for_session['birth_datetime'] = pillars_info_for_session['birth_datetime'].isoformat()
-        
-        # 세션에 저장 (st.session_state 대체)
-        # 큰 데이터는 세션에 저장하지 않고 응답에 포함시켜 클라이언트에서 관리
-        # Heroku 쿠키 크기 제한(4KB)을 피하기 위해 최소한의 정보만 세션에 저장
-        request.session['user_name'] = str(name) if name else ""
-        request.session['user_gender'] = str(gender) if gender else ""
-        request.session['birth_date'] = str(birth_date) if birth_date else ""  # YYYY-MM-DD 형식으로 저장
-        request.session['birth_time'] = str(birth_time) if birth_time else ""  # HH:MM 형식으로 저장
-        request.session['is_lunar'] = bool(is_lunar)  # boolean으로 명시적 변환
-        request.session['processed'] = True
+        # 출생 정보로 정해지는 계산 결과 (캐시)
+        chart = await _birth_chart(birth_dt, birth_tm, is_lunar, is_leap_month, gender)
+        daeun = chart["daeun"]
         
         # AI 분석을 위한 데이터 준비
         from datetime import datetime as dt
@@ -100,15 +174,6 @@ async def calculate_pillars(
         korean_age = today.year - birth_dt.year + 1
         current_age = today.year - birth_dt.year - ((today.month, today.day) < (birth_dt.month, birth_dt.day))
         
-        # 대운 계산 (원본 result[1]의 birth_datetime 사용)
-        # birth_datetime이 None이면 생성
-        birth_datetime_for_daeun = result[1].get('birth_datetime')
-        if birth_datetime_for_daeun is None:
-            birth_datetime_for_daeun = dt.combine(birth_dt, birth_tm)
-        daeun = saju_logic.calculate_daeun(result[1], gender, birth_datetime_for_daeun)
-        
-        # daeun 데이터는 세션에 저장하지 않고 응답에 포함 (쿠키 크기 제한 회피)
-        
         # 현재 대운 기간 찾기
         current_daeun_period = None
         for period in daeun['periods']:
@@ -119,27 +184,14 @@ async def calculate_pillars(
         
         # 현재 연도 간지 계산
         current_year = today.year
-        current_year_stem, current_year_branch = saju_logic.get_year_ganji(current_year)
-        current_year_stem_char = current_year_stem.split()[0] if isinstance(current_year_stem, str) and "(" in current_year_stem else current_year_stem
-        current_year_branch_char = current_year_branch.split()[0] if isinstance(current_year_branch, str) and "(" in current_year_branch else current_year_branch
-        current_year_ganji = (current_year_stem_char, current_year_branch_char)
-        
-        # 십이운성, 신살 계산
-        day_stem = result[1].get('day_stem', '')
-        day_stem_full = next((s for s in saju_logic.HEAVENLY_STEMS if s.split()[0] == day_stem.split()[0]), day_stem)
-        hidden_lists = [p.get("Hidden Stems (지장간)", []) for p in result[0]]
-        fortunes = saju_logic.calculate_twelve_fortunes(result[0], day_stem_full)
-        day_branch = result[1].get('day_branch', '')
-        year_branch = result[0][0]["Earthly Branch (지지)"]
-        sinsals = saju_logic.calculate_sinsal(result[0], day_stem_full, year_branch, day_branch)
+        current_year_ganji = saju_logic.year_ganji(current_year)
         
         # AI 입력 데이터 준비
         ai_input_data = saju_logic.prepare_ai_input(
-            result[0],
-            result[1],
+            chart["pillars"],
             daeun,
-            fortunes,
-            sinsals,
+            chart["fortunes"],
+            chart["sinsals"],
             gender,
             korean_age,
             current_year,
@@ -147,26 +199,6 @@ async def calculate_pillars(
             current_year_ganji
         )
         
-        # 큰 데이터는 세션에 저장하지 않고 응답에 포함 (쿠키 크기 제한 회피)
-        # request.session['ai_input_data'] = ai_input_data
-        # request.session['fortunes'] = fortunes
-        # request.session['sinsals'] = sinsals
-        request.session['current_year'] = current_year  # 작은 값만 저장
-        
-        # JSON 직렬화를 위해 datetime 객체를 문자열로 변환
-        pillars_info_serializable = result[1].copy()
-        if 'birth_datetime' in pillars_info_serializable:
-            pillars_info_serializable['birth_datetime'] = pillars_info_serializable['birth_datetime'].isoformat()
-        
-        # daeun도 직렬화 가능한 형태로 변환
-        daeun_serializable = daeun.copy()
-        if 'periods' in daeun_serializable:
-            daeun_serializable['periods'] = [
-                {k: (v.isoformat() if isinstance(v, datetime) else v) 
-                 for k, v in period.items()} 
-                for period in daeun['periods']
-            ]
-        
         # ai_input_data도 직렬화 가능한 형태로 변환 (datetime 객체가 있을 수 있음)
         import json
         def serialize_for_json(obj):
@@ -184,25 +216,33 @@ async def calculate_pillars(
         
         ai_input_data_serializable = serialize_for_json(ai_input_data) if ai_input_data else None
         
-        return JSONResponse({
-            "success": True,
-            "data": {
-                "pillars_data": result[0],
-                "pillars_info": pillars_info_serializable,
-                "daeun": daeun_serializable,
-                "fortunes": fortunes,
-                "sinsals": sinsals,
-                "ai_input_data": ai_input_data_serializable,  # AI 분석을 위한 데이터도 포함
-                # 세션에 저장된 값도 함께 반환하여 다른 페이지에서 사용할 수 있도록 함
-                "session_data": {
-                    "user_name": str(name) if name else "",
-                    "user_gender": str(gender) if gender else "",
-                    "birth_date": str(birth_date) if birth_date else "",
-                    "birth_time": str(birth_time) if birth_time else "",
-                    "is_lunar": bool(is_lunar)
-                }
+        data = {
+            "pillars_data": chart["pillars_data"],
+            "pillars_info": chart["pillars_info"],
+            "daeun": daeun,
+            "fortunes": chart["fortunes"],
+            "sinsals": chart["sinsals"],
+            "ai_input_data": ai_input_data_serializable,  # AI 분석을 위한 데이터도 포함
+            # 세션에 저장된 값도 함께 반환하여 다른 페이지에서 사용할 수 있도록 함
+            "session_data": {
+                "user_name": str(name) if name else "",
+                "user_gender": str(gender) if gender else "",
+                "birth_date": str(birth_date) if birth_date else "",
+                "birth_time": str(birth_time) if birth_time else "",
+                "is_lunar": bool(is_lunar),
+                "is_leap_month": bool(is_leap_month)
             }
-        })
+        }
+        
+        # 이후 요청(AI 분석, 토정비결)은 calculated_data 대신 결과 ID만 보낼 수 있음
+        # 결과 ID는 요청마다 새로 발급하므로 여러 사용자가 함께 쓰는 캐시 응답에는 넣지 않음
+        if issue_result_id:
+            key = make_result_key(name, birth_date, birth_time, gender, is_lunar, is_leap_month, today.date())
+            record = {"data": dict(data), "year_pillar": chart["pillars"].year.code}
+            data["result_id"] = await result_store.aput(key, record)
+        return data
+    except HTTPException:
+        raise
     except ValueError as e:
         error_msg = safe_error_message(e, show_details=not is_production())
         raise HTTPException(status_code=400, detail=error_msg)
@@ -218,6 +258,72 @@ async def calculate_pillars(
         raise HTTPException(status_code=500, detail=f"오류가 발생했습니다: {error_msg}")
 
 
+@router.post("/calculate")
+async def calculate_pillars(
+    request: Request,
+    name: str = Form(...),
+    birth_date: str = Form(...),
+    birth_time: str = Form(default=""),
+    gender: str = Form(...),
+    is_lunar: bool = Form(False),
+    is_leap_month: bool = Form(False)
+):
+    """사주 계산 API"""
+    data = await _calculate_data(name, birth_date, birth_time, gender, is_lunar, is_leap_month)
+    session_data = data["session_data"]
+    
+    # 세션에 저장 (st.session_state 대체)
+    # 세션이 서버에 저장되면(쿠키에는 세션 ID만) 사주 기둥과 결과 ID도 함께 저장해
+    # 페이지가 API를 다시 호출하지 않고 결과를 그릴 수 있게 함
+    # 서명 쿠키 세션이면 쿠키 크기 제한(4KB) 때문에 작은 값만 저장
+    request.session['user_name'] = session_data["user_name"]
+    request.session['user_gender'] = session_data["user_gender"]
+    request.session['birth_date'] = session_data["birth_date"]  # YYYY-MM-DD 형식으로 저장
+    request.session['birth_time'] = session_data["birth_time"]  # HH:MM 형식으로 저장
+    request.session['is_lunar'] = session_data["is_lunar"]
+    request.session['is_leap_month'] = session_data["is_leap_month"]
+    request.session['processed'] = True
+    request.session['current_year'] = datetime.now().year
+    if session_store.SERVER_SIDE:
+        request.session['pillars_data'] = data["pillars_data"]
+        request.session['pillars_info'] = data["pillars_info"]
+        request.session['result_id'] = data["result_id"]
+    
+    return JSONResponse({
+        "success": True,
+        "data": data
+    })
+
+
+@router.get("/calculate")
+async def get_calculate_pillars(
+    request: Request,
+    name: str,
+    birth_date: str,
+    gender: str,
+    birth_time: str = "",
+    is_lunar: bool = False,
+    is_leap_month: bool = False
+):
+    """
+    사주 계산 API (GET, 세션을 바꾸지 않아 브라우저에 캐시 가능)
+    나이와 현재 대운이 날짜에 따라 바뀌므로 자정까지 캐시하며, 이름이 들어 있어 private로 응답합니다.
+    응답을 서버에서도 캐시해 같은 입력의 요청이 함께 쓰므로 결과 ID는 담지 않습니다.
+    """
+    params = (name, birth_date, birth_time, gender, is_lunar, is_leap_month)
+    now = datetime.now()
+    entry = response_cache.get("calculate", params, now.date())
+    if entry is None:
+        data = await _calculate_data(name, birth_date, birth_time, gender, is_lunar, is_leap_month,
+                                     issue_result_id=False)
+        entry = response_cache.put("calculate", params, {
+            "success": True,
+            "data": data
+        }, now.date())
+    return response_cache.respond(request, entry, "calculate",
+                                  headers={"Cache-Control": cache_control(seconds_until_midnight(now), private=True)})
+
+
 @router.post("/save-api-key")
 async def save_api_key(request: Request):
     """API Key를 세션에 저장 (빈 문자열이면 제거)"""
@@ -253,9 +359,10 @@ async def ai_analysis(request: Request):
     try:
         body = await request.json()
         calculated_data = body.get('calculated_data')
+        result_id = body.get('result_id')
         API_KEY = body.get('api_key', '').strip()  # API Key는 요청 본문에서 받음 (저장하지 않고 입력 시에만 사용)
         
-        if not calculated_data:
+        if not calculated_data and not result_id:
             raise HTTPException(status_code=400, detail="사주 데이터가 없습니다. 먼저 사주를 계산해주세요.")
     except HTTPException:
         raise
@@ -263,6 +370,10 @@ async def ai_analysis(request: Request):
         logger.error(f"AI 분석 요청 데이터 읽기 오류: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail="요청 데이터를 읽을 수 없습니다. 먼저 사주를 계산해주세요.")
     
+    # 결과 ID만 보낸 경우 서버에 저장된 계산 결과 사용
+    if not calculated_data:
+        calculated_data = (await _load_result(result_id))["data"]
+    
     # 요청 본문에서 데이터 추출
     pillars_data = calculated_data.get('pillars_data', [])
     pillars_info = calculated_data.get('pillars_info', {})
@@ -298,6 +409,10 @@ async def ai_analysis(request: Request):
         logger.warning("AI 분석 요청 - ai_input_data가 없습니다.")
         raise HTTPException(status_code=400, detail="AI 분석을 위한 데이터가 준비되지 않았습니다.")
     
+    # 같은 분석이 진행 중이면 합류하고, 새로 시작할 때만 동시 실행 자리를 얻음 (초과 시 스트림을 시작하기 전에 429로 응답)
+    analysis_stream = await ai_analyst.generate_saju_analysis_stream_async(
+        API_KEY, ai_input_data, admit=lambda: _admit(chat_admission, API_KEY))
+    
     # 스트리밍 응답 생성
     async def generate_stream():
         try:
@@ -306,8 +421,9 @@ async def ai_analysis(request: Request):
             yield "data: " + json.dumps({"type": "start"}, ensure_ascii=False) + "\n\n"
             
             # 스트리밍 생성기 호출
-            for chunk in ai_analyst.generate_saju_analysis_stream(API_KEY, ai_input_data):
-                yield chunk
+            async with aclosing(analysis_stream) as stream:
+                async for chunk in stream:
+                    yield chunk
             
             logger.info("OpenAI API 스트리밍 완료")
         except Exception as e:
@@ -316,7 +432,7 @@ async def ai_analysis(request: Request):
             yield f"data: {json.dumps({'type': 'error', 'error': error_msg}, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        generate_stream(),
+        guard_stream(request, generate_stream(), "saju"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -333,75 +449,105 @@ async def calculate_tojeong(request: Request):
     try:
         body = await request.json()
         calculated_data = body.get('calculated_data')
-        if not calculated_data:
+        result_id = body.get('result_id')
+        if not calculated_data and not result_id:
             raise HTTPException(status_code=400, detail="사주 데이터가 없습니다. 먼저 사주를 계산해주세요.")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail="요청 데이터를 읽을 수 없습니다. 먼저 사주를 계산해주세요.")
     
-    # 요청 본문에서 데이터 추출
-    pillars_data = calculated_data.get('pillars_data', [])
-    pillars_info = calculated_data.get('pillars_info', {})
-    
-    # 데이터 검증
-    if not pillars_data or not pillars_info:
-        raise HTTPException(status_code=400, detail="사주 데이터가 없습니다. 먼저 사주를 계산해주세요.")
+    if calculated_data:
+        # 요청 본문에서 데이터 추출
+        pillars_data = calculated_data.get('pillars_data', [])
+        pillars_info = calculated_data.get('pillars_info', {})
+        
+        # 데이터 검증
+        if not pillars_data or not pillars_info:
+            raise HTTPException(status_code=400, detail="사주 데이터가 없습니다. 먼저 사주를 계산해주세요.")
+        
+        # 클라이언트가 보낸 기둥 문자열은 여기서 한 번만 정수 코드로 변환
+        try:
+            year_pillar = saju_logic.Pillars.from_pillars_data(pillars_data).year
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        # 결과 ID: 저장된 년주 코드를 그대로 사용 (기둥 문자열 해석 없음)
+        year_pillar = saju_logic.Ganji((await _load_result(result_id))["year_pillar"])
     
     current_year = datetime.now().year
     
+    # 토정비결은 년주와 올해 연도만으로 정해짐
+    params = (year_pillar.code, current_year)
+    entry = response_cache.get("tojeong", params)
+    if entry is not None:
+        return response_cache.respond(request, entry, "tojeong")
+    
     try:
-        # pillars_info의 birth_datetime이 문자열이면 datetime 객체로 변환
-        if pillars_info and 'birth_datetime' in pillars_info:
-            if isinstance(pillars_info['birth_datetime'], str):
-                from datetime import datetime as dt
-                pillars_info['birth_datetime'] = dt.fromisoformat(pillars_info['birth_datetime'])
-        
         # 토정비결 계산
-        tojeong_result = saju_logic.calculate_tojeong_bigyeol(pillars_info, current_year, pillars_data)
+        tojeong_result = saju_logic.calculate_tojeong_bigyeol(year_pillar, current_year)
         
         # 세션에 저장하지 않음 (쿠키 크기 제한 회피)
         # request.session['tojeong_result'] = tojeong_result
         
-        # 사주 계산 데이터도 세션에 저장하지 않음 (쿠키 크기 제한 회피)
-        # JSON 직렬화를 위해 datetime 객체를 문자열로 변환 (응답에만 사용)
-        pillars_info_serializable = pillars_info.copy()
-        if 'birth_datetime' in pillars_info_serializable and pillars_info_serializable['birth_datetime']:
-            if isinstance(pillars_info_serializable['birth_datetime'], datetime):
-                pillars_info_serializable['birth_datetime'] = pillars_info_serializable['birth_datetime'].isoformat()
-            elif not isinstance(pillars_info_serializable['birth_datetime'], str):
-                pillars_info_serializable['birth_datetime'] = str(pillars_info_serializable['birth_datetime'])
-        
-        # request.session['tojeong_pillars_data'] = pillars_data  # 쿠키 크기 제한으로 제거
-        # request.session['tojeong_pillars_info'] = pillars_info_serializable  # 쿠키 크기 제한으로 제거
-        
-        return JSONResponse(
-            content={
-                "success": True,
-                "data": {
-                    "tojeong_result": tojeong_result,
-                    "current_year": current_year
-                }
-            },
-            headers={"Content-Type": "application/json; charset=utf-8"}
-        )
+        entry = response_cache.put("tojeong", params, {
+            "success": True,
+            "data": {
+                "tojeong_result": tojeong_result,
+                "current_year": current_year
+            }
+        }, media_type="application/json; charset=utf-8")
+        return response_cache.respond(request, entry, "tojeong")
     except Exception as e:
         error_msg = safe_error_message(e, show_details=not is_production())
         logger.error(f"Unhandled exception in calculate_tojeong: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"토정비결 계산 중 오류가 발생했습니다: {error_msg}")
 
 
+@router.get("/tojeong/{year_pillar}")
+async def get_tojeong(request: Request, year_pillar: str, year: int = None):
+    """
+    토정비결 API (GET, 캐시 가능)
+    year_pillar: 년주 한자 두 글자 (예: 庚午), year: 운세 연도 (생략하면 올해, 자정까지 캐시)
+    """
+    year_pillar = year_pillar.strip()
+    try:
+        if len(year_pillar) != 2:
+            raise ValueError("년주는 천간과 지지 두 글자여야 합니다.")
+        year_ganji = saju_logic.Ganji.parse(year_pillar[0], year_pillar[1])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    now = datetime.now()
+    if year is None:
+        current_year = now.year
+        max_age = seconds_until_midnight(now)
+    else:
+        current_year = year
+        max_age = LONG_MAX_AGE
+    if not 1 <= current_year <= 9999:
+        raise HTTPException(status_code=400, detail="연도가 올바르지 않습니다.")
+    
+    # POST /tojeong과 같은 캐시 항목을 사용
+    params = (year_ganji.code, current_year)
+    entry = response_cache.get("tojeong", params)
+    if entry is None:
+        tojeong_result = saju_logic.calculate_tojeong_bigyeol(year_ganji, current_year)
+        entry = response_cache.put("tojeong", params, {
+            "success": True,
+            "data": {
+                "tojeong_result": tojeong_result,
+                "current_year": current_year
+            }
+        }, media_type="application/json; charset=utf-8")
+    return response_cache.respond(request, entry, "tojeong", headers={"Cache-Control": cache_control(max_age)})
+
+
 @router.post("/byeoljari")
 async def calculate_byeoljari(request: Request):
     """별자리운세 계산 API"""
-    from datetime import datetime
-    from utils.constellation import (
-        get_constellation, get_constellation_info, get_daily_fortune,
-        get_weekly_fortune, get_monthly_fortune, get_yearly_fortune,
-        get_lucky_elements, get_compatibility, get_constellation_advice,
-        get_life_aspects_fortune, get_career_hobby, get_love_style,
-        get_health_info, get_monthly_detailed_fortune
-    )
+    from utils.constellation import get_constellation
+    from utils.constellation_bundle import daily_bundle, kst_today
     
     # 요청 본문에서 생년월일과 이름 가져오기 (없으면 세션에서)
     try:
@@ -425,64 +571,58 @@ async def calculate_byeoljari(request: Request):
         birth_date = datetime.strptime(birth_date_str, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="생년월일 형식이 올바르지 않습니다.")
-    current_date = datetime.now()
-    current_year = current_date.year
-    
     # 별자리 계산
-    korean_name, emoji, english_name = get_constellation(birth_date)
-    
-    # 별자리 정보 수집
-    constellation_info = get_constellation_info(korean_name)
-    today_fortune = get_daily_fortune(korean_name, current_date)
-    weekly_fortune = get_weekly_fortune(korean_name, current_date)
-    monthly_fortune = get_monthly_fortune(korean_name, current_date)
-    yearly_fortune = get_yearly_fortune(korean_name, current_year)
-    lucky_elements = get_lucky_elements(korean_name)
-    compatibility = get_compatibility(korean_name)
-    advice = get_constellation_advice(korean_name)
-    life_aspects = get_life_aspects_fortune(korean_name, current_date)
-    career_hobby = get_career_hobby(korean_name)
-    love_style = get_love_style(korean_name)
-    health_info = get_health_info(korean_name)
-    monthly_detailed = get_monthly_detailed_fortune(korean_name, current_year)
-    
-    result = {
-        "korean_name": korean_name,
-        "emoji": emoji,
-        "english_name": english_name,
-        "birth_date": birth_date_str,
-        "birth_date_formatted": birth_date.strftime('%Y년 %m월 %d일'),
-        "user_name": user_name,
-        "constellation_info": constellation_info,
-        "today_fortune": today_fortune,
-        "weekly_fortune": weekly_fortune,
-        "monthly_fortune": monthly_fortune,
-        "yearly_fortune": yearly_fortune,
-        "lucky_elements": lucky_elements,
-        "compatibility": compatibility,
-        "advice": advice,
-        "life_aspects": life_aspects,
-        "career_hobby": career_hobby,
-        "love_style": love_style,
-        "health_info": health_info,
-        "monthly_detailed": monthly_detailed,
-        "current_date": current_date.strftime('%Y년 %m월 %d일'),
-        "current_year": current_year
-    }
+    korean_name, _emoji, _english_name = get_constellation(birth_date)
     
+    # 별자리 정보는 KST 날짜별로 미리 인코딩해 둔 번들에서 가져오고 사용자 필드만 채움
     # 세션에 저장하지 않음 (쿠키 크기 제한 회피)
-    # request.session['byeoljari_result'] = result
+    # 같은 사용자가 다시 요청하면 조립한 본문(과 압축본, ETag)을 그대로 사용
+    params = (birth_date_str, user_name)
+    bucket = kst_today()
+    entry = response_cache.get("byeoljari", params, bucket)
+    if entry is None:
+        content = daily_bundle.render(korean_name, birth_date_str, birth_date, user_name, bucket)
+        if content is None:
+            raise HTTPException(status_code=500, detail="별자리를 계산할 수 없습니다.")
+        entry = response_cache.put("byeoljari", params, content, bucket)
+    return response_cache.respond(request, entry, "byeoljari")
+
+
+@router.get("/byeoljari/{sign}")
+async def get_byeoljari(request: Request, sign: str, date: str = None):
+    """
+    별자리운세 API (GET, 캐시 가능)
+    sign: 별자리 영문명(예: aries) 또는 한글명, date: YYYY-MM-DD (생략하면 KST 오늘, 자정까지 캐시)
+    이름/생년월일 필드는 없으며 클라이언트가 채웁니다.
+    """
+    from utils.constellation_bundle import daily_bundle, find_sign, kst_today, KST
     
-    return JSONResponse({
-        "success": True,
-        "data": result
-    })
+    found = find_sign(sign)
+    if found is None:
+        raise HTTPException(status_code=400, detail="알 수 없는 별자리입니다.")
+    korean_name = found[0]
+    
+    if date:
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다.")
+        max_age = LONG_MAX_AGE
+    else:
+        day = kst_today()
+        max_age = seconds_until_midnight(datetime.now(KST))
+    
+    entry = response_cache.get("byeoljari_sign", korean_name, day)
+    if entry is None:
+        entry = response_cache.put("byeoljari_sign", korean_name, daily_bundle.sign_body(korean_name, day), day)
+    return response_cache.respond(request, entry, "byeoljari_sign", headers={"Cache-Control": cache_control(max_age)})
 
 
 @router.post("/dream")
 async def calculate_dream(request: Request):
     """꿈해몽 계산 API"""
-    from utils.dream import get_dream_meaning, DREAM_CATEGORIES
+    from utils.dream import (get_dream_meaning, lookup_dream_meaning, resolve_keyword, find_keyword_category,
+                             similar_keywords)
     from utils.api_key_fastapi import get_api_key
     
     try:
@@ -497,20 +637,29 @@ async def calculate_dream(request: Request):
     # API Key는 요청 본문에서 받음 (저장하지 않고 입력 시에만 사용)
     api_key = body.get('api_key', '').strip()
     
-    # 꿈해몽 정보 가져오기
-    dream_meaning = get_dream_meaning(keyword, api_key)
+    # 꿈해몽 정보 가져오기: 상세 해몽, 저장된 AI 해석, 초성/자모로 찾은 키워드는 바로 반환
+    # 저장소(SQLite) 조회와 AI 호출은 이벤트 루프 밖 스레드로 실행 (AI 호출은 동시 실행 한도 안에서)
+    dream_meaning = await asyncio.to_thread(lookup_dream_meaning, keyword)
+    if dream_meaning is None and api_key:
+        permit = await _admit(dream_admission, api_key)
+        # 요청이 취소되어도 스레드의 모델 호출이 끝날 때까지 자리를 반납하지 않음
+        call = asyncio.ensure_future(asyncio.to_thread(get_dream_meaning, keyword, api_key))
+        permit.release_after(call)
+        dream_meaning = await asyncio.shield(call)
+    elif dream_meaning is None:
+        dream_meaning = await asyncio.to_thread(get_dream_meaning, keyword, api_key)
     
-    # 카테고리 정보 추가
-    category = None
-    for cat_name, cat_data in DREAM_CATEGORIES.items():
-        if keyword in cat_data["키워드"]:
-            category = cat_name
-            break
+    # 카테고리 정보 추가 (초성/자모로 다른 키워드를 찾았으면 그 키워드 기준)
+    # 색인에 없는 입력이면 오타일 수 있는 가까운 키워드를 제안만 함 (해몽은 입력 그대로)
+    matched_keyword = resolve_keyword(keyword)
+    category = find_keyword_category(matched_keyword or keyword)
     
     result = {
         "keyword": keyword,
+        "matched_keyword": matched_keyword if matched_keyword != keyword else None,
         "category": category,
-        "dream_meaning": dream_meaning
+        "dream_meaning": dream_meaning,
+        "suggestions": similar_keywords(keyword) if matched_keyword is None else []
     }
     
     # 세션에 저장하지 않음 (쿠키 크기 제한 회피)
@@ -522,6 +671,33 @@ async def calculate_dream(request: Request):
     })
 
 
+@router.get("/dream/suggest")
+async def suggest_dream(q: str = "", limit: int = 10):
+    """꿈해몽 키워드 자동완성 API (해석 없이 키워드와 카테고리만 반환)"""
+    from utils.dream import suggest_keywords
+    
+    limit = max(1, min(limit, 20))
+    return JSONResponse({
+        "success": True,
+        "data": suggest_keywords(q[:50], limit)
+    })
+
+
+@router.get("/dream/search")
+async def search_dream(q: str = "", k: int = 5):
+    """꿈해몽 문장 검색 API (예: "뱀에 물리는 꿈", 상세 해몽과 상황별 해몽을 BM25로 검색)"""
+    from utils.dream import search_dreams
+    
+    q = q.strip()[:100]
+    if not q:
+        raise HTTPException(status_code=400, detail="검색할 내용을 입력해주세요.")
+    k = max(1, min(k, 20))
+    return JSONResponse({
+        "success": True,
+        "data": search_dreams(q, k)
+    })
+
+
 @router.post("/tarot")
 async def draw_tarot(request: Request):
     """타로 카드 뽑기 API"""
@@ -551,30 +727,19 @@ async def draw_tarot(request: Request):
     comprehensive_analysis = generate_comprehensive_analysis(result)
     result['analysis'] = comprehensive_analysis
     
-    # API Key가 있으면 각 카드에 대한 이미지 생성 시도 (타임아웃 방지를 위해 제한적으로)
-    # 1장일 때만 AI 이미지 생성 (3장, 5장은 타임아웃 위험으로 제외)
-    if API_KEY and spread_type == '1장':
-        logger.info("타로 카드 이미지 생성 시작...")
-        for card in result.get('cards', []):
-            # 기본 이미지가 없거나 API Key로 생성된 이미지를 원하는 경우에만 생성
-            # 기본 이미지가 있으면 우선 사용하고, API Key로 생성한 이미지는 추가 옵션으로 제공
-            try:
-                image_url = ai_analyst.generate_tarot_card_image(
-                    API_KEY,
-                    card.get('카드명', ''),
-                    card.get('역위치', False)
-                )
-                if image_url:
-                    # AI 생성 이미지는 ai_image_url로 저장 (기본 이미지와 구분)
-                    card['ai_image_url'] = image_url
-                    logger.info(f"타로 카드 AI 이미지 생성 성공: {card.get('카드명', '')}")
-            except Exception as e:
-                logger.error(f"타로 카드 이미지 생성 오류 ({card.get('카드명', '')}): {e}", exc_info=True)
-                # 이미지 생성 실패해도 계속 진행
-                continue
-        logger.info("타로 카드 이미지 생성 완료")
-    elif API_KEY and spread_type in ['3장', '5장']:
-        logger.info(f"타로 {spread_type}은 타임아웃 방지를 위해 기본 이미지만 사용합니다.")
+    # API Key가 있으면 각 카드의 AI 이미지를 붙임
+    # 한 번 생성한 카드 이미지는 WebP 파일로 저장해 재사용하고, 없는 카드만 동시에 생성 (전체 마감 시간 적용)
+    if API_KEY:
+        from utils.tarot_images import attach_images, missing_cards
+        cards = result.get('cards', [])
+        if missing_cards(cards):
+            # 새로 생성할 때만 동시 실행 한도 적용 (초과 시 429)
+            # 자리는 마감 시간이 지나도 이 요청이 기다린 생성 작업이 모두 끝날 때 반납됨
+            permit = await _admit(image_admission, API_KEY)
+            attached = await attach_images(API_KEY, cards, permit=permit)
+        else:
+            attached = await attach_images(API_KEY, cards)
+        logger.info(f"타로 카드 AI 이미지: {attached}/{len(cards)}장")
     
     # 세션에 저장하지 않음 (쿠키 크기 제한 회피)
     # request.session['tarot_result'] = result
@@ -649,6 +814,7 @@ async def generate_lotto(request: Request):
 async def get_manse_calendar(request: Request):
     """만세력 달력 데이터 API"""
     from utils.manse import generate_calendar_data
+    from utils.solar_terms import MIN_YEAR, MAX_YEAR
     from datetime import datetime
     
     try:
@@ -665,18 +831,50 @@ async def get_manse_calendar(request: Request):
         show_ganji = True
     
     # 년월 유효성 검증
-    if year < 1900 or year > 2100:
+    if year < MIN_YEAR or year > MAX_YEAR:
         year = datetime.now().year
     if month < 1 or month > 12:
         month = datetime.now().month
     
-    # 달력 데이터 생성
-    calendar_data = generate_calendar_data(year, month, show_lunar, show_ganji)
+    # 오늘 표시(is_today)가 바뀌는 시점에 맞춰 캐시 구간을 나눔
+    params = (year, month, bool(show_lunar), bool(show_ganji))
+    bucket, _ = _manse_cache_policy(year, month, datetime.now())
+    entry = response_cache.get("manse", params, bucket)
+    if entry is None:
+        # 달력 데이터 생성 (계산 실행기에서)
+        calendar_data = await _run_compute(generate_calendar_data, year, month, show_lunar, show_ganji)
+        entry = response_cache.put("manse", params, {
+            "success": True,
+            "data": calendar_data
+        }, bucket)
+    return response_cache.respond(request, entry, "manse")
+
+
+@router.get("/manse/{year}/{month}")
+async def get_manse_month(request: Request, year: int, month: int, show_lunar: bool = True, show_ganji: bool = True):
+    """
+    만세력 달력 데이터 API (GET, 캐시 가능)
+    지난 달은 오래, 이번 달은 자정까지, 다음 달 이후는 그 달이 시작될 때까지 캐시합니다.
+    """
+    from utils.manse import generate_calendar_data
+    from utils.solar_terms import MIN_YEAR, MAX_YEAR
+    
+    if year < MIN_YEAR or year > MAX_YEAR:
+        raise HTTPException(status_code=400, detail=f"{MIN_YEAR}~{MAX_YEAR}년만 조회할 수 있습니다.")
+    if month < 1 or month > 12:
+        raise HTTPException(status_code=400, detail="월은 1~12 사이여야 합니다.")
     
-    return JSONResponse({
-        "success": True,
-        "data": calendar_data
-    })
+    # POST /manse와 같은 캐시 항목을 사용
+    params = (year, month, show_lunar, show_ganji)
+    bucket, max_age = _manse_cache_policy(year, month, datetime.now())
+    entry = response_cache.get("manse", params, bucket)
+    if entry is None:
+        calendar_data = await _run_compute(generate_calendar_data, year, month, show_lunar, show_ganji)
+        entry = response_cache.put("manse", params, {
+            "success": True,
+            "data": calendar_data
+        }, bucket)
+    return response_cache.respond(request, entry, "manse", headers={"Cache-Control": cache_control(max_age)})
 
 
 @router.post("/gonghap")
@@ -726,6 +924,10 @@ async def calculate_gonghap(request: Request):
             }
         })
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"궁합 계산 오류: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"궁합 계산 중 오류가 발생했습니다: {str(e)}")
@@ -763,7 +965,17 @@ async def gonghap_ai_analysis(request: Request):
         })
     
     # AI 분석 - 스트리밍 방식으로 변경 (Heroku H12 타임아웃 방지)
-    # 스트리밍 응답 생성
+    # 같은 분석이 진행 중이면 합류하고, 새로 시작할 때만 동시 실행 자리를 얻음 (초과 시 스트림을 시작하기 전에 429로 응답)
+    analysis_stream = await ai_analyst.generate_gonghap_analysis_stream_async(
+        API_KEY,
+        gonghap_data,
+        person1_pillars_data=person1_pillars_data,
+        person1_pillars_info=person1_pillars_info,
+        person2_pillars_data=person2_pillars_data,
+        person2_pillars_info=person2_pillars_info,
+        admit=lambda: _admit(chat_admission, API_KEY)
+    )
+    
     async def generate_stream():
         try:
             logger.info("궁합 OpenAI API 스트리밍 시작...")
@@ -771,15 +983,9 @@ async def gonghap_ai_analysis(request: Request):
             yield "data: " + json.dumps({"type": "start"}, ensure_ascii=False) + "\n\n"
             
             # 스트리밍 생성기 호출
-            for chunk in ai_analyst.generate_gonghap_analysis_stream(
-                API_KEY, 
-                gonghap_data,
-                person1_pillars_data=person1_pillars_data,
-                person1_pillars_info=person1_pillars_info,
-                person2_pillars_data=person2_pillars_data,
-                person2_pillars_info=person2_pillars_info
-            ):
-                yield chunk
+            async with aclosing(analysis_stream) as stream:
+                async for chunk in stream:
+                    yield chunk
             
             logger.info("궁합 OpenAI API 스트리밍 완료")
         except Exception as e:
@@ -788,7 +994,7 @@ async def gonghap_ai_analysis(request: Request):
             yield f"data: {json.dumps({'type': 'error', 'error': error_msg}, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        generate_stream(),
+        guard_stream(request, generate_stream(), "gonghap"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -807,6 +1013,7 @@ async def tojeong_ai_analysis(request: Request):
         tojeong_result = body.get('tojeong_result')
         pillars_data = body.get('pillars_data', [])
         pillars_info = body.get('pillars_info', {})
+        result_id = body.get('result_id')
         API_KEY = body.get('api_key', '').strip()  # API Key는 요청 본문에서 받음 (저장하지 않고 입력 시에만 사용)
         
         if not tojeong_result:
@@ -817,6 +1024,12 @@ async def tojeong_ai_analysis(request: Request):
         logger.error(f"토정비결 AI 분석 요청 데이터 읽기 오류: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail="요청 데이터를 읽을 수 없습니다.")
     
+    # 결과 ID만 보낸 경우 기둥 정보는 서버에 저장된 계산 결과에서 가져옴
+    if result_id and not pillars_data:
+        stored = (await _load_result(result_id))["data"]
+        pillars_data = stored.get('pillars_data', [])
+        pillars_info = stored.get('pillars_info', {})
+    
     if not API_KEY:
         return JSONResponse({
             "success": True,
@@ -827,7 +1040,15 @@ async def tojeong_ai_analysis(request: Request):
         })
     
     # AI 분석 - 스트리밍 방식으로 변경 (Heroku H12 타임아웃 방지)
-    # 스트리밍 응답 생성
+    # 같은 분석이 진행 중이면 합류하고, 새로 시작할 때만 동시 실행 자리를 얻음 (초과 시 스트림을 시작하기 전에 429로 응답)
+    analysis_stream = await ai_analyst.generate_tojeong_analysis_stream_async(
+        API_KEY,
+        tojeong_result,
+        pillars_data=pillars_data,
+        pillars_info=pillars_info,
+        admit=lambda: _admit(chat_admission, API_KEY)
+    )
+    
     async def generate_stream():
         try:
             logger.info("토정비결 OpenAI API 스트리밍 시작...")
@@ -835,13 +1056,9 @@ async def tojeong_ai_analysis(request: Request):
             yield "data: " + json.dumps({"type": "start"}, ensure_ascii=False) + "\n\n"
             
             # 스트리밍 생성기 호출
-            for chunk in ai_analyst.generate_tojeong_analysis_stream(
-                API_KEY, 
-                tojeong_result,
-                pillars_data=pillars_data,
-                pillars_info=pillars_info
-            ):
-                yield chunk
+            async with aclosing(analysis_stream) as stream:
+                async for chunk in stream:
+                    yield chunk
             
             logger.info("토정비결 OpenAI API 스트리밍 완료")
         except Exception as e:
@@ -850,7 +1067,7 @@ async def tojeong_ai_analysis(request: Request):
             yield f"data: {json.dumps({'type': 'error', 'error': error_msg}, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        generate_stream(),
+        guard_stream(request, generate_stream(), "tojeong"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -888,13 +1105,18 @@ async def byeoljari_ai_analysis(request: Request):
         })
     
     # AI 분석 - 스트리밍 방식
+    # 같은 분석이 진행 중이면 합류하고, 새로 시작할 때만 동시 실행 자리를 얻음 (초과 시 스트림을 시작하기 전에 429로 응답)
+    analysis_stream = await ai_analyst.generate_byeoljari_analysis_stream_async(
+        API_KEY, byeoljari_data, admit=lambda: _admit(chat_admission, API_KEY))
+    
     async def generate_stream():
         try:
             logger.info("별자리 OpenAI API 스트리밍 시작...")
             yield "data: " + json.dumps({"type": "start"}, ensure_ascii=False) + "\n\n"
             
-            for chunk in ai_analyst.generate_byeoljari_analysis_stream(API_KEY, byeoljari_data):
-                yield chunk
+            async with aclosing(analysis_stream) as stream:
+                async for chunk in stream:
+                    yield chunk
             
             logger.info("별자리 OpenAI API 스트리밍 완료")
         except Exception as e:
@@ -903,7 +1125,7 @@ async def byeoljari_ai_analysis(request: Request):
             yield f"data: {json.dumps({'type': 'error', 'error': error_msg}, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        generate_stream(),
+        guard_stream(request, generate_stream(), "byeoljari"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -37,9 +37,25 @@ async def tojeong_page(request: Request):
         is_lunar = is_lunar_session.lower() in ('true', '1', 'yes', 'on')
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     current_year = datetime.now().year
     
+    # 세션의 계산 결과를 페이지에 넣어 자동 로드 시 /api/calculate를 다시 호출하지 않도록 함
+    session_result = None
+    if processed and pillars_data and pillars_info and request.session.get('result_id'):
+        session_result = {
+            "pillars_data": pillars_data,
+            "pillars_info": pillars_info,
+            "result_id": request.session['result_id'],
+            "user_name": user_name,
+            "user_gender": user_gender,
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month
+        }
+    
     # 배너 생성
     sidebar_banner_html = get_banner_html(current_page=page, is_sidebar=True)
     
@@ -58,8 +74,10 @@ async def tojeong_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "current_year": current_year,
+            "session_result": session_result,
             "sidebar_banner_html": sidebar_banner_html,
         }
     )
@@ -88,6 +106,7 @@ async def byeoljari_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 배너 생성
@@ -108,6 +127,7 @@ async def byeoljari_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "sidebar_banner_html": sidebar_banner_html,
         }
@@ -135,6 +155,7 @@ async def gonghap_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 배너 생성
@@ -155,6 +176,7 @@ async def gonghap_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "sidebar_banner_html": sidebar_banner_html,
         }
@@ -184,6 +206,7 @@ async def dream_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 쿼리 파라미터에서 키워드 확인
@@ -207,6 +230,7 @@ async def dream_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "keyword": keyword,
             "sidebar_banner_html": sidebar_banner_html,
@@ -218,6 +242,7 @@ async def dream_page(request: Request):
 async def manse_page(request: Request):
     """만세력 페이지"""
     from datetime import datetime
+    from utils.solar_terms import MIN_YEAR, MAX_YEAR
     
     page = "manse"
     meta = get_page_meta(page)
@@ -237,6 +262,7 @@ async def manse_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 쿼리 파라미터에서 년월 가져오기 (기본값: 현재 년월)
@@ -249,7 +275,7 @@ async def manse_page(request: Request):
         month = now.month
     
     # 년월 유효성 검증
-    if year < 1900 or year > 2100:
+    if year < MIN_YEAR or year > MAX_YEAR:
         year = now.year
     if month < 1 or month > 12:
         month = now.month
@@ -272,6 +298,7 @@ async def manse_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "year": year,
             "month": month,
@@ -303,6 +330,7 @@ async def taro_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 배너 생성
@@ -323,6 +351,7 @@ async def taro_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "sidebar_banner_html": sidebar_banner_html,
         }
@@ -352,6 +381,7 @@ async def lotto_page(request: Request):
         is_lunar = is_lunar_session
     else:
         is_lunar = bool(is_lunar_session)
+    is_leap_month = bool(request.session.get('is_leap_month', False))
     processed = request.session.get('processed', False)
     
     # 배너 생성
@@ -372,6 +402,7 @@ async def lotto_page(request: Request):
             "birth_date": birth_date,
             "birth_time": birth_time,
             "is_lunar": is_lunar,
+            "is_leap_month": is_leap_month,
             "processed": processed,
             "sidebar_banner_html": sidebar_banner_html,
         }
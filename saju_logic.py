@@ -1,46 +1,48 @@
 import ephem
+import math
 from datetime import datetime, timedelta
-from korean_lunar_calendar import KoreanLunarCalendar
+from utils import lunar_calendar, solar_terms
 
 # Gan-Ji Data
+# 천간/지지는 내부적으로 정수 인덱스(천간 0~9, 지지 0~11, 60갑자 0~59)로 다루고,
+# 아래 표시용 문자열은 응답을 만들 때(가장자리)에서만 사용합니다.
 HEAVENLY_STEMS = ["甲 (갑)", "乙 (을)", "丙 (병)", "丁 (정)", "戊 (무)", "己 (기)", "庚 (경)", "辛 (신)", "壬 (임)", "癸 (계)"]
 EARTHLY_BRANCHES = ["子 (자)", "丑 (축)", "寅 (인)", "卯 (묘)", "辰 (진)", "巳 (사)", "午 (오)", "未 (미)", "申 (신)", "酉 (유)", "戌 (술)", "亥 (해)"]
 
+STEM_CHARS = "甲乙丙丁戊己庚辛壬癸"
+BRANCH_CHARS = "子丑寅卯辰巳午未申酉戌亥"
+STEM_KOREAN = "갑을병정무기경신임계"
+BRANCH_KOREAN = "자축인묘진사오미신유술해"
+
 ZODIAC_ANIMALS = ["Rat", "Ox", "Tiger", "Rabbit", "Dragon", "Snake", "Horse", "Sheep", "Monkey", "Rooster", "Dog", "Pig"]
 
-# 지장간 (地支藏干) - 각 지지에 숨어있는 천간
-# Format: [본기(本氣), 중기(中氣), 여기(餘氣)]
-HIDDEN_STEMS = {
-    "子 (자)": ["壬 (임)", "癸 (계)"],
-    "丑 (축)": ["己 (기)", "辛 (신)", "癸 (계)"],
-    "寅 (인)": ["甲 (갑)", "丙 (병)", "戊 (무)"],
-    "卯 (묘)": ["乙 (을)"],
-    "辰 (진)": ["戊 (무)", "乙 (을)", "癸 (계)"],
-    "巳 (사)": ["丙 (병)", "戊 (무)", "庚 (경)"],
-    "午 (오)": ["丙 (병)", "己 (기)", "丁 (정)"],  # 병(본기), 기(중기), 정(여기)
-    "未 (미)": ["己 (기)", "丁 (정)", "乙 (을)"],
-    "申 (신)": ["庚 (경)", "壬 (임)", "戊 (무)"],
-    "酉 (유)": ["辛 (신)"],
-    "戌 (술)": ["戊 (무)", "辛 (신)", "丁 (정)"],
-    "亥 (해)": ["壬 (임)", "甲 (갑)"]
-}
+# 오행 (五行) 인덱스: 0=木, 1=火, 2=土, 3=金, 4=水
+# 상생: i -> (i + 1) % 5, 상극: i -> (i + 2) % 5
+ELEMENT_CHARS = "木火土金水"
+ELEMENT_KEYS = ("wood", "fire", "earth", "metal", "water")
 
-# 오행 (五行)
-FIVE_ELEMENTS = {
-    "甲 (갑)": "木", "乙 (을)": "木",
-    "丙 (병)": "火", "丁 (정)": "火",
-    "戊 (무)": "土", "己 (기)": "土",
-    "庚 (경)": "金", "辛 (신)": "金",
-    "壬 (임)": "水", "癸 (계)": "水"
-}
+# 천간별 오행 (甲乙=木, 丙丁=火, 戊己=土, 庚辛=金, 壬癸=水)
+STEM_ELEMENTS = (0, 0, 1, 1, 2, 2, 3, 3, 4, 4)
 
-BRANCH_ELEMENTS = {
-    "寅 (인)": "木", "卯 (묘)": "木",
-    "巳 (사)": "火", "午 (오)": "火",
-    "辰 (진)": "土", "戌 (술)": "土", "丑 (축)": "土", "未 (미)": "土",
-    "申 (신)": "金", "酉 (유)": "金",
-    "亥 (해)": "水", "子 (자)": "水"
-}
+# 지지별 오행 (子=水, 丑=土, 寅卯=木, 辰=土, 巳午=火, 未=土, 申酉=金, 戌=土, 亥=水)
+BRANCH_ELEMENTS = (4, 2, 0, 0, 2, 1, 1, 2, 3, 3, 2, 4)
+
+# 지장간 (地支藏干) - 각 지지에 숨어있는 천간 인덱스
+# Format: (본기(本氣), 중기(中氣), 여기(餘氣))
+HIDDEN_STEMS = (
+    (8, 9),     # 子: 壬 癸
+    (5, 7, 9),  # 丑: 己 辛 癸
+    (0, 2, 4),  # 寅: 甲 丙 戊
+    (1,),       # 卯: 乙
+    (4, 1, 9),  # 辰: 戊 乙 癸
+    (2, 4, 6),  # 巳: 丙 戊 庚
+    (2, 5, 3),  # 午: 丙(본기) 己(중기) 丁(여기)
+    (5, 3, 1),  # 未: 己 丁 乙
+    (6, 8, 4),  # 申: 庚 壬 戊
+    (7,),       # 酉: 辛
+    (4, 7, 3),  # 戌: 戊 辛 丁
+    (8, 0)      # 亥: 壬 甲
+)
 
 # 십성 (十神) 이름
 TEN_GODS = {
@@ -51,99 +53,220 @@ TEN_GODS = {
     "偏印": "偏印", "正印": "正印"
 }
 
-# 십이운성 (十二運星) - 일간별 지지에 대한 운성
+# 십이운성 (十二運星) - 일간별 장생(長生) 지지
+# 양간(甲丙戊庚壬)은 순행, 음간(乙丁己辛癸)은 역행으로 장생부터 12단계를 셉니다.
 # 순서: 장생(長生), 목욕(沐浴), 관대(冠帶), 건록(建祿), 제왕(帝旺), 쇠(衰), 병(病), 사(死), 묘(墓), 절(絶), 태(胎), 양(養)
-TWELVE_FORTUNES = {
-    "甲 (갑)": ["亥 (해)", "子 (자)", "丑 (축)", "寅 (인)", "卯 (묘)", "辰 (진)", "巳 (사)", "午 (오)", "未 (미)", "申 (신)", "酉 (유)", "戌 (술)"],
-    "乙 (을)": ["午 (오)", "巳 (사)", "辰 (진)", "卯 (묘)", "寅 (인)", "丑 (축)", "子 (자)", "亥 (해)", "戌 (술)", "酉 (유)", "申 (신)", "未 (미)"],
-    "丙 (병)": ["寅 (인)", "卯 (묘)", "辰 (진)", "巳 (사)", "午 (오)", "未 (미)", "申 (신)", "酉 (유)", "戌 (술)", "亥 (해)", "子 (자)", "丑 (축)"],
-    "丁 (정)": ["酉 (유)", "申 (신)", "未 (미)", "午 (오)", "巳 (사)", "辰 (진)", "卯 (묘)", "寅 (인)", "丑 (축)", "子 (자)", "亥 (해)", "戌 (술)"],
-    "戊 (무)": ["寅 (인)", "卯 (묘)", "辰 (진)", "巳 (사)", "午 (오)", "未 (미)", "申 (신)", "酉 (유)", "戌 (술)", "亥 (해)", "子 (자)", "丑 (축)"],
-    "己 (기)": ["酉 (유)", "申 (신)", "未 (미)", "午 (오)", "巳 (사)", "辰 (진)", "卯 (묘)", "寅 (인)", "丑 (축)", "子 (자)", "亥 (해)", "戌 (술)"],
-    "庚 (경)": ["巳 (사)", "午 (오)", "未 (미)", "申 (신)", "酉 (유)", "戌 (술)", "亥 (해)", "子 (자)", "丑 (축)", "寅 (인)", "卯 (묘)", "辰 (진)"],
-    "辛 (신)": ["子 (자)", "亥 (해)", "戌 (술)", "酉 (유)", "申 (신)", "未 (미)", "午 (오)", "巳 (사)", "辰 (진)", "卯 (묘)", "寅 (인)", "丑 (축)"],
-    "壬 (임)": ["申 (신)", "酉 (유)", "戌 (술)", "亥 (해)", "子 (자)", "丑 (축)", "寅 (인)", "卯 (묘)", "辰 (진)", "巳 (사)", "午 (오)", "未 (미)"],
-    "癸 (계)": ["卯 (묘)", "寅 (인)", "丑 (축)", "子 (자)", "亥 (해)", "戌 (술)", "酉 (유)", "申 (신)", "未 (미)", "午 (오)", "巳 (사)", "辰 (진)"]
-}
+TWELVE_FORTUNE_START = (11, 6, 2, 9, 2, 9, 5, 0, 8, 3)  # 甲:亥 乙:午 丙:寅 丁:酉 戊:寅 己:酉 庚:巳 辛:子 壬:申 癸:卯
 
 # 십이운성 한글 이름
 TWELVE_FORTUNE_NAMES = ["장생", "목욕", "관대", "건록", "제왕", "쇠", "병", "사", "묘", "절", "태", "양"]
 
-# 신살 (神煞) 계산용 데이터
+# 신살 (神煞) 계산용 데이터 (모두 지지 인덱스)
 # 천을귀인 (天乙貴人) - 일간별 해당 지지
-TIANYI_GUIREN = {
-    "甲 (갑)": ["丑 (축)", "未 (미)"],
-    "乙 (을)": ["子 (자)", "申 (신)"],
-    "丙 (병)": ["亥 (해)", "酉 (유)"],
-    "丁 (정)": ["亥 (해)", "酉 (유)"],
-    "戊 (무)": ["丑 (축)", "未 (미)"],
-    "己 (기)": ["子 (자)", "申 (신)"],
-    "庚 (경)": ["丑 (축)", "未 (미)"],
-    "辛 (신)": ["午 (오)", "寅 (인)"],
-    "壬 (임)": ["卯 (묘)", "巳 (사)"],
-    "癸 (계)": ["卯 (묘)", "巳 (사)"]
-}
+TIANYI_GUIREN = (
+    (1, 7), (0, 8), (11, 9), (11, 9), (1, 7),  # 甲:丑未 乙:子申 丙:亥酉 丁:亥酉 戊:丑未
+    (0, 8), (1, 7), (6, 2), (3, 5), (3, 5)     # 己:子申 庚:丑未 辛:午寅 壬:卯巳 癸:卯巳
+)
 
-# 도화 (桃花) - 년지/일지 기준
-TAOHUA = {
-    "子 (자)": "酉 (유)", "丑 (축)": "午 (오)", "寅 (인)": "卯 (묘)", "卯 (묘)": "子 (자)",
-    "辰 (진)": "酉 (유)", "巳 (사)": "午 (오)", "午 (오)": "卯 (묘)", "未 (미)": "子 (자)",
-    "申 (신)": "酉 (유)", "酉 (유)": "午 (오)", "戌 (술)": "卯 (묘)", "亥 (해)": "子 (자)"
-}
+# 도화 (桃花) - 년지/일지 기준 (申子辰:酉, 寅午戌:卯, 巳酉丑:午, 亥卯未:子)
+TAOHUA = (9, 6, 3, 0, 9, 6, 3, 0, 9, 6, 3, 0)
 
-# 화개 (華蓋) - 년지/일지 기준
-HUAGAI = {
-    "子 (자)": "辰 (진)", "丑 (축)": "丑 (축)", "寅 (인)": "戌 (술)", "卯 (묘)": "未 (미)",
-    "辰 (진)": "辰 (진)", "巳 (사)": "丑 (축)", "午 (오)": "戌 (술)", "未 (미)": "未 (미)",
-    "申 (신)": "辰 (진)", "酉 (유)": "丑 (축)", "戌 (술)": "戌 (술)", "亥 (해)": "未 (미)"
-}
+# 화개 (華蓋) - 년지/일지 기준 (申子辰:辰, 寅午戌:戌, 巳酉丑:丑, 亥卯未:未)
+HUAGAI = (4, 1, 10, 7, 4, 1, 10, 7, 4, 1, 10, 7)
 
-# 양인 (羊刃) - 일간별 해당 지지
-YANGREN = {
-    "甲 (갑)": "卯 (묘)", "乙 (을)": "寅 (인)", "丙 (병)": "午 (오)", "丁 (정)": "巳 (사)",
-    "戊 (무)": "午 (오)", "己 (기)": "巳 (사)", "庚 (경)": "酉 (유)", "辛 (신)": "申 (신)",
-    "壬 (임)": "子 (자)", "癸 (계)": "亥 (해)"
-}
+# 양인 (羊刃) - 일간별 해당 지지 (甲:卯 乙:寅 丙:午 丁:巳 戊:午 己:巳 庚:酉 辛:申 壬:子 癸:亥)
+YANGREN = (3, 2, 6, 5, 6, 5, 9, 8, 0, 11)
 
-# 역마 (驛馬) - 년지/일지 기준
-YIMA = {
-    "子 (자)": "寅 (인)", "丑 (축)": "亥 (해)", "寅 (인)": "申 (신)", "卯 (묘)": "巳 (사)",
-    "辰 (진)": "寅 (인)", "巳 (사)": "亥 (해)", "午 (오)": "申 (신)", "未 (미)": "巳 (사)",
-    "申 (신)": "寅 (인)", "酉 (유)": "亥 (해)", "戌 (술)": "申 (신)", "亥 (해)": "巳 (사)"
-}
+# 역마 (驛馬) - 년지/일지 기준 (申子辰:寅, 寅午戌:申, 巳酉丑:亥, 亥卯未:巳)
+YIMA = (2, 11, 8, 5, 2, 11, 8, 5, 2, 11, 8, 5)
 
-# 공망 (空亡) - 일간과 일지 기준 (60갑자 순서)
-KONGWANG = {
-    "甲 (갑)": ["戌 (술)", "亥 (해)"],
-    "乙 (을)": ["申 (신)", "酉 (유)"],
-    "丙 (병)": ["午 (오)", "未 (미)"],
-    "丁 (정)": ["辰 (진)", "巳 (사)"],
-    "戊 (무)": ["寅 (인)", "卯 (묘)"],
-    "己 (기)": ["子 (자)", "丑 (축)"],
-    "庚 (경)": ["戌 (술)", "亥 (해)"],
-    "辛 (신)": ["申 (신)", "酉 (유)"],
-    "壬 (임)": ["午 (오)", "未 (미)"],
-    "癸 (계)": ["辰 (진)", "巳 (사)"]
-}
+# 공망 (空亡) - 일간 기준 (60갑자 순서)
+KONGWANG = (
+    (10, 11), (8, 9), (6, 7), (4, 5), (2, 3),  # 甲:戌亥 乙:申酉 丙:午未 丁:辰巳 戊:寅卯
+    (0, 1), (10, 11), (8, 9), (6, 7), (4, 5)   # 己:子丑 庚:戌亥 辛:申酉 壬:午未 癸:辰巳
+)
 
-# 장성 (將星) - 년지/일지 기준
-JIANGXING = {
-    "子 (자)": "子 (자)", "丑 (축)": "酉 (유)", "寅 (인)": "午 (오)", "卯 (묘)": "卯 (묘)",
-    "辰 (진)": "子 (자)", "巳 (사)": "酉 (유)", "午 (오)": "午 (오)", "未 (미)": "卯 (묘)",
-    "申 (신)": "子 (자)", "酉 (유)": "酉 (유)", "戌 (술)": "午 (오)", "亥 (해)": "卯 (묘)"
-}
+# 장성 (將星) - 년지/일지 기준 (申子辰:子, 寅午戌:午, 巳酉丑:酉, 亥卯未:卯)
+JIANGXING = (0, 9, 6, 3, 0, 9, 6, 3, 0, 9, 6, 3)
+
+# 신살 이름 (표시 순서)
+SINSAL_NAMES = ("천을귀인", "도화", "화개", "양인", "역마", "공망", "장성")
+
+# 문자열 -> 인덱스 조회표 ("甲", "甲 (갑)" 모두 허용)
+_STEM_LOOKUP = {**{c: i for i, c in enumerate(STEM_CHARS)}, **{s: i for i, s in enumerate(HEAVENLY_STEMS)}}
+_BRANCH_LOOKUP = {**{c: i for i, c in enumerate(BRANCH_CHARS)}, **{b: i for i, b in enumerate(EARTHLY_BRANCHES)}}
+
+
+def stem_index(stem):
+    """
+    천간 문자열("甲" 또는 "甲 (갑)")을 인덱스(0~9)로 변환합니다.
+
+    Raises:
+        ValueError: 알 수 없는 천간
+    """
+    try:
+        return _STEM_LOOKUP[stem]
+    except (KeyError, TypeError):
+        raise ValueError(f"알 수 없는 천간입니다: {stem}")
+
+
+def branch_index(branch):
+    """
+    지지 문자열("子" 또는 "子 (자)")을 인덱스(0~11)로 변환합니다.
+
+    Raises:
+        ValueError: 알 수 없는 지지
+    """
+    try:
+        return _BRANCH_LOOKUP[branch]
+    except (KeyError, TypeError):
+        raise ValueError(f"알 수 없는 지지입니다: {branch}")
+
+
+class Ganji:
+    """
+    60갑자 하나를 0~59 코드로 표현합니다 (0=甲子, 1=乙丑, ..., 59=癸亥).
+    천간은 code % 10, 지지는 code % 12 입니다.
+    """
+    __slots__ = ("code",)
+
+    def __init__(self, code):
+        self.code = code % 60
+
+    @classmethod
+    def from_parts(cls, stem, branch):
+        """천간/지지 인덱스로 생성합니다. 음양이 다른 조합은 60갑자에 없으므로 ValueError."""
+        if (stem - branch) % 2:
+            raise ValueError(f"존재하지 않는 간지 조합입니다: {STEM_CHARS[stem]}{BRANCH_CHARS[branch]}")
+        return cls(6 * stem - 5 * branch)
+
+    @classmethod
+    def parse(cls, stem, branch):
+        """천간/지지 문자열로 생성합니다."""
+        return cls.from_parts(stem_index(stem), branch_index(branch))
+
+    @property
+    def stem(self):
+        return self.code % 10
+
+    @property
+    def branch(self):
+        return self.code % 12
+
+    @property
+    def stem_char(self):
+        return STEM_CHARS[self.code % 10]
+
+    @property
+    def branch_char(self):
+        return BRANCH_CHARS[self.code % 12]
+
+    @property
+    def korean(self):
+        """한글 발음 (예: "갑자")"""
+        return STEM_KOREAN[self.code % 10] + BRANCH_KOREAN[self.code % 12]
+
+    def shift(self, steps):
+        """steps만큼 60갑자 순서로 이동한 간지"""
+        return Ganji(self.code + steps)
+
+    def __eq__(self, other):
+        return isinstance(other, Ganji) and other.code == self.code
+
+    def __hash__(self):
+        return self.code
+
+    def __str__(self):
+        return STEM_CHARS[self.code % 10] + BRANCH_CHARS[self.code % 12]
+
+    def __repr__(self):
+        return f"Ganji({self.code}, {self})"
+
+
+class Pillars:
+    """
+    사주 네 기둥 (년, 월, 일, 시).
+    각 기둥은 Ganji이며, 표시용 문자열 변환은 to_pillars_data / to_info에서만 합니다.
+    """
+    __slots__ = ("year", "month", "day", "hour", "birth_datetime")
+
+    LABELS = ("Year (년)", "Month (월)", "Day (일)", "Hour (시)")
+
+    def __init__(self, year, month, day, hour, birth_datetime=None):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.hour = hour
+        self.birth_datetime = birth_datetime
+
+    def __iter__(self):
+        return iter((self.year, self.month, self.day, self.hour))
+
+    def __repr__(self):
+        return f"Pillars({self.year} {self.month} {self.day} {self.hour})"
+
+    @property
+    def day_stem(self):
+        return self.day.code % 10
+
+    @classmethod
+    def from_pillars_data(cls, pillars_data, birth_datetime=None):
+        """
+        응답 형식의 pillars_data(클라이언트가 되돌려 보낸 값 포함)를 Pillars로 변환합니다.
+
+        Raises:
+            ValueError: 기둥이 4개가 아니거나 간지를 해석할 수 없는 경우
+        """
+        if not pillars_data or len(pillars_data) != 4:
+            raise ValueError("사주 기둥 데이터가 올바르지 않습니다.")
+        ganjis = [
+            Ganji.parse(p.get("Heavenly Stem (천간)"), p.get("Earthly Branch (지지)"))
+            for p in pillars_data
+        ]
+        return cls(*ganjis, birth_datetime=birth_datetime)
+
+    def to_pillars_data(self):
+        """응답용 기둥 목록 (천간/지지 한자, 지장간과 십성)"""
+        day_stem = self.day_stem
+        return [
+            {
+                "Pillar": label,
+                "Heavenly Stem (천간)": ganji.stem_char,
+                "Earthly Branch (지지)": ganji.branch_char,
+                "Hidden Stems (지장간)": [
+                    {"stem": STEM_CHARS[hidden], "ten_god": get_ten_god(day_stem, hidden)}
+                    for hidden in HIDDEN_STEMS[ganji.branch]
+                ]
+            }
+            for label, ganji in zip(self.LABELS, self)
+        ]
+
+    def to_info(self):
+        """응답/세션용 사주 정보 (표시 문자열과 인덱스)"""
+        return {
+            "year_stem": HEAVENLY_STEMS[self.year.stem],
+            "year_stem_idx": self.year.stem,
+            "month_stem": HEAVENLY_STEMS[self.month.stem],
+            "month_branch": EARTHLY_BRANCHES[self.month.branch],
+            "month_stem_idx": self.month.stem,
+            "month_branch_idx": self.month.branch,
+            "day_stem": HEAVENLY_STEMS[self.day.stem],
+            "day_branch": EARTHLY_BRANCHES[self.day.branch],
+            "day_stem_idx": self.day.stem,
+            "birth_datetime": self.birth_datetime
+        }
 
 # Gan-Ji for reference dates (Simplified)
 # Ref: 1900-01-01 was ... actually we need a robust algorithm.
 # We will use the standard modulo math for Year/Day.
 
 def get_ganji(idx):
-    """Returns (Stem, Branch) based on 0-59 index"""
+    """Returns (Stem, Branch) display strings based on 0-59 index"""
     stem = HEAVENLY_STEMS[idx % 10]
     branch = EARTHLY_BRANCHES[idx % 12]
     return stem, branch
 
-def get_year_ganji(year):
+def year_ganji(year):
     """
     Calculate Year Gan-Ji using standard formula.
     Base year 1924 (Gap-Ja) -> 4
@@ -151,11 +274,15 @@ def get_year_ganji(year):
     But note: Year starts at Ipchun (approx Feb 4).
     This function returns the Gan-Ji assuming the year HAS started.
     Adjust for pre-Ipchun dates in the main logic.
+    Returns: Ganji
     """
-    idx = (year - 4) % 60
-    return get_ganji(idx)
+    return Ganji(year - 4)
 
-def get_month_ganji(year_stem_idx, month_branch_idx):
+def get_year_ganji(year):
+    """Year Gan-Ji as (Stem, Branch) display strings. See year_ganji."""
+    return get_ganji(year_ganji(year).code)
+
+def month_ganji(year_stem_idx, month_branch_idx):
     """
     Calculate Month Gan-Ji.
     Month Branch is fixed to the solar term (Tiger=In, Rabbit=Myo...).
@@ -171,6 +298,7 @@ def get_month_ganji(year_stem_idx, month_branch_idx):
     (Year Stem Index % 5) * 2 + 2 = Start Month Stem Index (for Tiger Month)
     
     month_branch_idx: 0=Tiger(인/2), 1=Rabbit(묘/3), 2=Dragon(진/4), ..., 6=Monkey(신/8), ...
+    Returns: Ganji
     """
     start_stem_idx = (year_stem_idx % 5) * 2 + 2
     
@@ -181,40 +309,33 @@ def get_month_ganji(year_stem_idx, month_branch_idx):
     # Month stem: start from Tiger month (month_branch_idx=0)
     current_stem_idx = (start_stem_idx + month_branch_idx) % 10
     
-    # Return stem and branch directly
-    return HEAVENLY_STEMS[current_stem_idx], EARTHLY_BRANCHES[real_branch_idx]
+    return Ganji.from_parts(current_stem_idx, real_branch_idx)
 
-def get_day_ganji(date):
+def get_month_ganji(year_stem_idx, month_branch_idx):
+    """Month Gan-Ji as (Stem, Branch) display strings. See month_ganji."""
+    return get_ganji(month_ganji(year_stem_idx, month_branch_idx).code)
+
+def day_ganji(date):
     """
     Calculate Day Gan-Ji.
-    Base date: 1900-01-01 was 甲戌 (Gap-Sul, 10).
-    Days passed since 1900-01-01.
+    Day Ganji is a continuous 60-day cycle.
+    Anchor: 2000-01-01 was 戊午 (Mu-O, 54).
+    Returns: Ganji
     """
-    base_date = datetime(1900, 1, 1)
-    diff = (date - base_date).days
-    # 1900-01-01 was Gap-Sul (idx 10).
-    # Wait, need to verify 1900-01-01 Gan-Ji. 
-    # Actually simpler: 1899-12-31 was ...
-    # Let's perform a known check: 2024-01-01 was 甲子 (Gap-Ja).
-    # 2024-01-01 -> Gap-Ja (0)? No.
-    # 2024-01-01 was Gabjin Year... wait Day Ganji.
-    # Let's use a known anchor. 2023-12-31.
-    # Safe bet: Python's ordinal date or similar.
-    # Anchor: 1901-01-01?
-    # Let's use a standard algorithm:
-    # (Total Days - Offset) % 60
-    # Anchor: 1900-01-08 was 甲戌 (10)? No.
-    # Anchor: 2000-01-01 was 戊午 (Mu-O, 54).
     anchor_date = datetime(2000, 1, 1)
     anchor_idx = 54 # Mu-O
     
     days_diff = (date - anchor_date).days
-    current_idx = (anchor_idx + days_diff) % 60
-    return get_ganji(current_idx)
+    return Ganji(anchor_idx + days_diff)
 
-def get_ten_god(day_stem_idx, other_stem_idx):
+def get_day_ganji(date):
+    """Day Gan-Ji as (Stem, Branch) display strings. See day_ganji."""
+    return get_ganji(day_ganji(date).code)
+
+def _ten_god_rule(day_stem_idx, other_stem_idx):
     """
     Calculate Ten God (十神) based on Day Stem and other Stem.
+    Used once at import to build TEN_GOD_MATRIX; use get_ten_god for lookups.
     
     Rules:
     - Same element, same yin-yang: 比肩 (比肩)
@@ -231,22 +352,13 @@ def get_ten_god(day_stem_idx, other_stem_idx):
     Five Elements cycle:
     木(목) -> 火(화) -> 土(토) -> 金(금) -> 水(수) -> 木(목)
     """
-    # Get elements
-    day_element = FIVE_ELEMENTS[HEAVENLY_STEMS[day_stem_idx]]
-    other_element = FIVE_ELEMENTS[HEAVENLY_STEMS[other_stem_idx]]
-    
-    # Get yin-yang
-    day_yang = (day_stem_idx % 2 == 0)
-    other_yang = (other_stem_idx % 2 == 0)
-    same_yin_yang = (day_yang == other_yang)
-    
-    # Element mapping
-    element_order = {"木": 0, "火": 1, "土": 2, "金": 3, "水": 4}
-    day_elem_idx = element_order[day_element]
-    other_elem_idx = element_order[other_element]
+    # Element indices (0=木 ... 4=水) and yin-yang (even index = yang)
+    day_elem_idx = STEM_ELEMENTS[day_stem_idx]
+    other_elem_idx = STEM_ELEMENTS[other_stem_idx]
+    same_yin_yang = (day_stem_idx - other_stem_idx) % 2 == 0
     
     # Calculate relationship
-    if day_element == other_element:
+    if day_elem_idx == other_elem_idx:
         # Same element
         if same_yin_yang:
             return "比肩"
@@ -270,17 +382,21 @@ def get_ten_god(day_stem_idx, other_stem_idx):
             return "偏財"
         else:
             return "正財"
-    elif (other_elem_idx + 2) % 5 == day_elem_idx:
+    else:
         # Other overcomes day
         if same_yin_yang:
             return "偏官"
         else:
             return "正官"
-    else:
-        # Should not happen, but return default
-        return "比肩"
 
-def get_hour_ganji(day_stem_idx, hour):
+# 십성 행렬: TEN_GOD_MATRIX[일간 * 10 + 다른 천간] (import 시 한 번 생성)
+TEN_GOD_MATRIX = tuple(_ten_god_rule(day, other) for day in range(10) for other in range(10))
+
+def get_ten_god(day_stem_idx, other_stem_idx):
+    """Ten God (十神) of other stem relative to Day Stem, e.g. "正財" (see _ten_god_rule)"""
+    return TEN_GOD_MATRIX[day_stem_idx * 10 + other_stem_idx]
+
+def hour_ganji(day_stem_idx, hour):
     """
     Calculate Hour Gan-Ji.
     Based on Day Stem.
@@ -295,13 +411,117 @@ def get_hour_ganji(day_stem_idx, hour):
     Day Stem 戊/癸 -> Start 壬 (8)
     
     (Day Stem Index % 5) * 2 = Start Hour Stem Index (for Ja hour)
+    Returns: Ganji
     """
     branch_idx = ((hour + 1) // 2) % 12
     start_stem_idx = (day_stem_idx % 5) * 2
     current_stem_idx = (start_stem_idx + branch_idx) % 10
     
-    # Return stem and branch directly
-    return HEAVENLY_STEMS[current_stem_idx], EARTHLY_BRANCHES[branch_idx]
+    return Ganji.from_parts(current_stem_idx, branch_idx)
+
+def get_hour_ganji(day_stem_idx, hour):
+    """Hour Gan-Ji as (Stem, Branch) display strings. See hour_ganji."""
+    return get_ganji(hour_ganji(day_stem_idx, hour).code)
+
+def get_sun_longitude(dt):
+    """
+    Apparent geocentric ecliptic longitude of the Sun (equinox of date), in degrees.
+    dt: naive datetime in KST
+    """
+    when = ephem.Date(dt - timedelta(hours=9))
+    sun = ephem.Sun()
+    sun.compute(when, epoch=when)
+    ecl = ephem.Ecliptic(ephem.Equatorial(sun.g_ra, sun.g_dec, epoch=when), epoch=when)
+    return math.degrees(float(ecl.lon)) % 360
+
+def solve_solar_longitude(target_deg, start, end, tolerance_minutes=1.0, max_iterations=50):
+    """
+    Find the moment in [start, end] when the Sun reaches target_deg, using Brent's method
+    (inverse quadratic / secant steps, falling back to bisection) on the signed
+    longitude difference. The bracket must contain exactly one crossing.
+
+    The returned time is within tolerance_minutes of the true crossing.
+    Raises ValueError if the bracket does not contain the crossing or the
+    iteration cap is reached.
+
+    Returns: (datetime, evaluations) - evaluations is the number of ephem computations used
+    """
+    evaluations = 0
+
+    def f(days):
+        nonlocal evaluations
+        evaluations += 1
+        diff = get_sun_longitude(start + timedelta(days=days)) - target_deg
+        return (diff + 180) % 360 - 180
+
+    tol = tolerance_minutes / 1440
+    a, b = 0.0, (end - start).total_seconds() / 86400
+    fa, fb = f(a), f(b)
+    if (fa > 0) == (fb > 0):
+        raise ValueError(f"황경 {target_deg}도가 {start} ~ {end} 구간에 없습니다.")
+
+    c, fc = b, fb
+    d = e = b - a
+    for _ in range(max_iterations):
+        if (fb > 0) == (fc > 0):
+            # Keep the root bracketed between b and c
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol1 = 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0:
+            return start + timedelta(days=b), evaluations
+
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2 * xm * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f(b)
+
+    raise ValueError(f"황경 {target_deg}도 계산이 {max_iterations}회 안에 수렴하지 않았습니다.")
+
+def find_solar_term_time(year, target_deg, tolerance_minutes=1.0):
+    """
+    Find the moment in calendar year `year` (KST) when the Sun reaches target_deg.
+    The bracket is +-8 days around the mean-motion estimate (0 deg ~ Mar 20), which
+    covers the up to ~4 day lag of the true Sun plus calendar drift.
+
+    Returns: (datetime, evaluations)
+    """
+    approx = datetime(year, 3, 20, 12) + timedelta(days=(target_deg % 360) / 0.98565)
+    if approx.year > year:
+        approx -= timedelta(days=365.2422)
+    return solve_solar_longitude(
+        target_deg,
+        approx - timedelta(days=8),
+        approx + timedelta(days=8),
+        tolerance_minutes=tolerance_minutes
+    )
 
 def find_next_solar_term(birth_datetime, direction):
     """
@@ -309,139 +529,11 @@ def find_next_solar_term(birth_datetime, direction):
     direction: 1 for forward (next), -1 for backward (previous)
     Returns: datetime of the solar term
     """
-    # Solar terms are at: 315, 330, 345, 0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225, 240, 255, 270, 285, 300
-    # Each term is 15 degrees apart
-    term_angles = [315, 330, 345, 0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225, 240, 255, 270, 285, 300]
-    
-    # Get current solar longitude
-    obs = ephem.Observer()
-    utc_datetime = birth_datetime - timedelta(hours=9)
-    obs.date = ephem.Date(utc_datetime)
-    s = ephem.Sun()
-    s.compute(obs)
-    ecl = ephem.Ecliptic(s.ra, s.dec)
-    current_long = float(ecl.lon) * 180 / ephem.pi
-    current_long = current_long % 360
-    
-    # Find the target term angle
-    if direction == 1:  # Forward - find next term
-        # Find the next term angle that is greater than current
-        target_angle = None
-        for angle in term_angles:
-            if angle > current_long:
-                target_angle = angle
-                break
-        
-        # If no next angle found, wrap to next cycle (315)
-        if target_angle is None:
-            target_angle = 315
-    else:  # Backward - find previous term
-        # Find the previous term angle that is less than current
-        target_angle = None
-        for angle in reversed(term_angles):
-            if angle < current_long:
-                target_angle = angle
-                break
-        
-        # If no previous angle found, wrap to previous cycle (300)
-        if target_angle is None:
-            target_angle = 300
-    
-    # Search for the exact datetime by checking each day
-    best_date = None
-    min_diff = float('inf')
-    
-    # Search forward or backward up to 60 days
-    for day_offset in range(60):
-        if direction == 1:
-            check_date = birth_datetime + timedelta(days=day_offset)
-        else:
-            check_date = birth_datetime - timedelta(days=day_offset)
-        
-        obs.date = ephem.Date(check_date - timedelta(hours=9))
-        s.compute(obs)
-        ecl = ephem.Ecliptic(s.ra, s.dec)
-        check_long = float(ecl.lon) * 180 / ephem.pi
-        check_long = check_long % 360
-        
-        # Calculate difference from target (considering wrap-around)
-        diff = None
-        if direction == 1:
-            # For forward, find when we reach or pass target
-            if target_angle < current_long:  # Wrap around case (e.g., 300 -> 315)
-                # Target is in next cycle
-                if check_long >= target_angle:
-                    diff = abs(check_long - target_angle)
-                elif check_long < current_long:
-                    diff = abs(check_long + 360 - target_angle)
-            else:
-                # Normal case: target_angle > current_long
-                if check_long >= target_angle:
-                    diff = abs(check_long - target_angle)
-        else:  # Backward
-            if target_angle > current_long:  # Wrap around case (e.g., 15 -> 300)
-                # Target is in previous cycle
-                if check_long <= target_angle:
-                    diff = abs(check_long - target_angle)
-                elif check_long > current_long:
-                    diff = abs(check_long - 360 - target_angle)
-            else:
-                # Normal case: target_angle < current_long
-                if check_long <= target_angle:
-                    diff = abs(check_long - target_angle)
-        
-        # Update best date if we found a valid difference
-        if diff is not None and diff < min_diff:
-            min_diff = diff
-            best_date = check_date
-            # If we're very close, we can stop
-            if diff < 0.5:
-                break
-    
-    # Refine with hourly search around the best date
-    if best_date:
-        for hour_offset in range(-24, 25):  # ±24 hours
-            refined_date = best_date + timedelta(hours=hour_offset)
-            obs.date = ephem.Date(refined_date - timedelta(hours=9))
-            s.compute(obs)
-            ecl = ephem.Ecliptic(s.ra, s.dec)
-            refined_long = float(ecl.lon) * 180 / ephem.pi
-            refined_long = refined_long % 360
-            
-            if direction == 1:
-                if target_angle < current_long:
-                    if refined_long >= target_angle:
-                        diff = abs(refined_long - target_angle)
-                    elif refined_long < current_long:
-                        diff = abs(refined_long + 360 - target_angle)
-                    else:
-                        continue
-                else:
-                    if refined_long >= target_angle:
-                        diff = abs(refined_long - target_angle)
-                    else:
-                        continue
-            else:
-                if target_angle > current_long:
-                    if refined_long <= target_angle:
-                        diff = abs(refined_long - target_angle)
-                    elif refined_long > current_long:
-                        diff = abs(refined_long - 360 - target_angle)
-                    else:
-                        continue
-                else:
-                    if refined_long <= target_angle:
-                        diff = abs(refined_long - target_angle)
-                    else:
-                        continue
-            
-            if diff < min_diff:
-                min_diff = diff
-                best_date = refined_date
-    
-    return best_date if best_date else birth_datetime
+    if direction == 1:
+        return solar_terms.next_term(birth_datetime).when
+    return solar_terms.prev_term(birth_datetime).when
 
-def calculate_daeun(pillars_info, gender, birth_datetime):
+def calculate_daeun(pillars, gender, birth_datetime=None):
     """
     Calculate Daeun (大運, Great Fortune Period).
     
@@ -459,22 +551,21 @@ def calculate_daeun(pillars_info, gender, birth_datetime):
     Starting age calculation:
     - Days from birth to next/previous solar term divided by 3
     - 3 days = 1 year (1 day = 4 months = 1/3 year)
+    
+    pillars: Pillars
+    birth_datetime: None이면 pillars.birth_datetime 사용
     """
-    # birth_datetime이 None이면 pillars_info에서 가져오거나 기본값 사용
+    # birth_datetime이 None이면 pillars에서 가져오거나 기본값 사용
     if birth_datetime is None:
-        if 'birth_datetime' in pillars_info and pillars_info['birth_datetime'] is not None:
-            birth_datetime = pillars_info['birth_datetime']
+        if pillars.birth_datetime is not None:
+            birth_datetime = pillars.birth_datetime
         else:
             # 기본값: 현재 날짜의 정오
             from datetime import datetime, time
             birth_datetime = datetime.combine(datetime.now().date(), time(12, 0))
     
-    year_stem_idx = pillars_info["year_stem_idx"]
-    month_stem_idx = pillars_info["month_stem_idx"]
-    month_branch_idx = pillars_info["month_branch_idx"]
-    
     # Determine if year is Yang (陽) or Yin (陰)
-    is_yang_year = (year_stem_idx % 2 == 0)
+    is_yang_year = (pillars.year.stem % 2 == 0)
     
     # Determine direction based on gender and year type
     is_male = (gender == "남성")
@@ -484,100 +575,9 @@ def calculate_daeun(pillars_info, gender, birth_datetime):
     else:
         direction = -1  # Backward (逆行)
     
-    # Calculate starting age based on solar longitude (more reliable than finding exact term date)
-    # Get current solar longitude
-    obs = ephem.Observer()
-    utc_datetime = birth_datetime - timedelta(hours=9)
-    obs.date = ephem.Date(utc_datetime)
-    s = ephem.Sun()
-    s.compute(obs)
-    ecl = ephem.Ecliptic(s.ra, s.dec)
-    current_long = float(ecl.lon) * 180 / ephem.pi
-    current_long = current_long % 360
-    
-    # Find target angle
-    term_angles = [315, 330, 345, 0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225, 240, 255, 270, 285, 300]
-    if direction == 1:
-        target_angle = None
-        for angle in term_angles:
-            if angle > current_long:
-                target_angle = angle
-                break
-        if target_angle is None:
-            target_angle = 315
-    else:
-        target_angle = None
-        for angle in reversed(term_angles):
-            if angle < current_long:
-                target_angle = angle
-                break
-        if target_angle is None:
-            target_angle = 300
-    
-    # Find the actual date when sun reaches target angle
-    # Simple approach: find first date that reaches or passes target
-    best_date = None
-    
-    # Search forward or backward up to 60 days
-    for day_offset in range(60):
-        if direction == 1:
-            check_date = birth_datetime + timedelta(days=day_offset)
-        else:
-            check_date = birth_datetime - timedelta(days=day_offset)
-        
-        # Create new observer and sun for each date to avoid state issues
-        check_obs = ephem.Observer()
-        check_obs.date = ephem.Date(check_date - timedelta(hours=9))
-        check_s = ephem.Sun()
-        check_s.compute(check_obs)
-        check_ecl = ephem.Ecliptic(check_s.ra, check_s.dec)
-        check_long = float(check_ecl.lon) * 180 / ephem.pi
-        check_long = check_long % 360
-        
-        # Check if we've reached or passed the target
-        if direction == 1:
-            # Forward: check if we've reached or passed target
-            if target_angle < current_long:  # Wrap around case (e.g., 300 -> 315)
-                # We need to check if we've passed into next cycle
-                if check_long >= target_angle or (check_long < current_long and check_long < 50):
-                    best_date = check_date
-                    break
-            else:
-                # Normal case: target_angle > current_long (e.g., 154.92 -> 165)
-                if check_long >= target_angle:
-                    best_date = check_date
-                    break
-        else:  # Backward
-            # Backward: check if we've reached or passed target
-            if target_angle > current_long:  # Wrap around case (e.g., 15 -> 300)
-                # We need to check if we've passed into previous cycle
-                if check_long <= target_angle or (check_long > current_long and check_long > 300):
-                    best_date = check_date
-                    break
-            else:
-                # Normal case: target_angle < current_long
-                if check_long <= target_angle:
-                    best_date = check_date
-                    break
-    
-    # Calculate days from birth to term
-    if best_date and best_date != birth_datetime:
-        days_diff = abs((best_date - birth_datetime).total_seconds() / 86400)
-    else:
-        # Fallback: use angle-based calculation (should not happen in normal cases)
-        # This means we couldn't find the term date, so use approximate calculation
-        if direction == 1:
-            if target_angle < current_long:
-                angle_diff = (target_angle + 360) - current_long
-            else:
-                angle_diff = target_angle - current_long
-        else:
-            if target_angle > current_long:
-                angle_diff = current_long - (target_angle - 360)
-            else:
-                angle_diff = current_long - target_angle
-        # Use slightly adjusted solar speed for better accuracy
-        days_diff = angle_diff / 0.9856
+    # Days from birth to the next (or previous) solar term, looked up in the precomputed term table
+    term_datetime = find_next_solar_term(birth_datetime, direction)
+    days_diff = abs((term_datetime - birth_datetime).total_seconds() / 86400)
     
     # Convert days to years: 3 days = 1 year (1 day = 4 months = 1/3 year)
     start_age_years = days_diff / 3
@@ -592,16 +592,12 @@ def calculate_daeun(pillars_info, gender, birth_datetime):
     # Calculate Daeun periods (typically 8 periods, 10 years each)
     # Daeun starts from the NEXT ganji after month pillar
     daeun_periods = []
-    current_stem_idx = month_stem_idx
-    current_branch_idx = month_branch_idx
     
     for i in range(8):  # 8 periods of 10 years each = 80 years
-        # Calculate next ganji (first daeun is after month pillar)
-        next_stem_idx = (current_stem_idx + direction) % 10
-        next_branch_idx = (current_branch_idx + direction) % 12
-        
-        stem = HEAVENLY_STEMS[next_stem_idx]
-        branch = EARTHLY_BRANCHES[next_branch_idx]
+        # Period i is (i + 1) steps from the month pillar along the 60-ganji cycle
+        ganji = pillars.month.shift(direction * (i + 1))
+        stem = HEAVENLY_STEMS[ganji.stem]
+        branch = EARTHLY_BRANCHES[ganji.branch]
         
         # Calculate age range
         age_start = start_age + i * 10
@@ -615,10 +611,6 @@ def calculate_daeun(pillars_info, gender, birth_datetime):
             "branch": branch,
             "ganji": f"{stem} {branch}"
         })
-        
-        # Move to next ganji for next period
-        current_stem_idx = next_stem_idx
-        current_branch_idx = next_branch_idx
     
     return {
         "direction": "順行" if direction == 1 else "逆行",
@@ -626,139 +618,136 @@ def calculate_daeun(pillars_info, gender, birth_datetime):
         "start_age": start_age
     }
 
-def calculate_twelve_fortunes(pillars_data, day_stem):
+def _twelve_fortune_rule(day_stem_idx, branch_idx):
+    """일간과 지지 인덱스로 십이운성 인덱스(0=장생 ... 11=양)를 구합니다. (행렬 생성용)"""
+    steps = branch_idx - TWELVE_FORTUNE_START[day_stem_idx]
+    # 음간은 역행
+    if day_stem_idx % 2:
+        steps = -steps
+    return steps % 12
+
+# 십이운성 행렬: TWELVE_FORTUNE_MATRIX[일간 * 12 + 지지] = 십이운성 인덱스
+TWELVE_FORTUNE_MATRIX = bytes(_twelve_fortune_rule(stem, branch) for stem in range(10) for branch in range(12))
+
+def twelve_fortune_index(day_stem_idx, branch_idx):
+    """일간과 지지 인덱스로 십이운성 인덱스(0=장생 ... 11=양)를 구합니다."""
+    return TWELVE_FORTUNE_MATRIX[day_stem_idx * 12 + branch_idx]
+
+def calculate_twelve_fortunes(pillars):
     """
     Calculate Twelve Fortunes (十二運星) for each pillar based on day stem.
     
     Args:
-        pillars_data: List of pillar dictionaries
-        day_stem: Day stem string (e.g., "甲 (갑)")
+        pillars: Pillars
     
     Returns:
         List of fortune names for each pillar
     """
-    if day_stem not in TWELVE_FORTUNES:
-        return []
-    
-    fortune_table = TWELVE_FORTUNES[day_stem]
-    fortunes = []
-    
-    for pillar in pillars_data:
-        branch = pillar["Earthly Branch (지지)"]
-        # Branch might be just Chinese char (e.g., "子") or full format (e.g., "子 (자)")
-        # Convert to full format for lookup
-        branch_full = branch
-        if "(" not in branch:
-            # Find the full format
-            for full_branch in EARTHLY_BRANCHES:
-                if full_branch.split()[0] == branch:
-                    branch_full = full_branch
-                    break
-        
-        # Find the index of this branch in the fortune table
-        try:
-            branch_idx = fortune_table.index(branch_full)
-            fortune_name = TWELVE_FORTUNE_NAMES[branch_idx]
-            fortunes.append(fortune_name)
-        except ValueError:
-            fortunes.append("")
+    row = pillars.day_stem * 12
+    return [TWELVE_FORTUNE_NAMES[TWELVE_FORTUNE_MATRIX[row + ganji.branch]] for ganji in pillars]
+
+def _build_sinsal_matrix():
+    """
+    신살 비트마스크 행렬을 만듭니다. 비트 i는 SINSAL_NAMES[i]에 해당합니다.
+    
+    - 천을귀인/양인/공망: 일간(日干) 기준
+    - 도화/화개/역마/장성: 년지나 일지 기준 (삼합 국)
     
-    return fortunes
+    Returns:
+        bytes: [((일간 * 12 + 년지) * 12 + 일지) * 12 + 기둥 지지] = 비트마스크
+    """
+    # 일간 기준 신살: [일간 * 12 + 지지]
+    by_stem = []
+    for stem in range(10):
+        for branch in range(12):
+            mask = 0
+            if branch in TIANYI_GUIREN[stem]:
+                mask |= 1 << 0  # 천을귀인 (天乙貴人)
+            if branch == YANGREN[stem]:
+                mask |= 1 << 3  # 양인 (羊刃)
+            if branch in KONGWANG[stem]:
+                mask |= 1 << 5  # 공망 (空亡)
+            by_stem.append(mask)
+    
+    # 년지/일지 기준 신살: [기준 지지 * 12 + 지지]
+    by_branch = []
+    for base in range(12):
+        for branch in range(12):
+            mask = 0
+            if branch == TAOHUA[base]:
+                mask |= 1 << 1  # 도화 (桃花) - 삼합의 끝에서 3위
+            if branch == HUAGAI[base]:
+                mask |= 1 << 2  # 화개 (華蓋) - 삼합의 중간
+            if branch == YIMA[base]:
+                mask |= 1 << 4  # 역마 (驛馬) - 대충(對沖)의 양쪽
+            if branch == JIANGXING[base]:
+                mask |= 1 << 6  # 장성 (將星) - 삼합의 첫 번째
+            by_branch.append(mask)
+    
+    return bytes(
+        by_stem[stem * 12 + branch] | by_branch[year_branch * 12 + branch] | by_branch[day_branch * 12 + branch]
+        for stem in range(10)
+        for year_branch in range(12)
+        for day_branch in range(12)
+        for branch in range(12)
+    )
+
+SINSAL_MATRIX = _build_sinsal_matrix()
 
-def calculate_sinsal(pillars_data, day_stem, year_branch, day_branch):
+# 비트마스크 -> 신살 표시 문자열 (예: "천을귀인 도화"), 없으면 ""
+SINSAL_TEXTS = tuple(
+    " ".join(name for i, name in enumerate(SINSAL_NAMES) if mask >> i & 1)
+    for mask in range(1 << len(SINSAL_NAMES))
+)
+
+def sinsal_mask(day_stem_idx, year_branch_idx, day_branch_idx, branch_idx):
+    """한 기둥 지지의 신살 비트마스크 (비트 i = SINSAL_NAMES[i])"""
+    return SINSAL_MATRIX[((day_stem_idx * 12 + year_branch_idx) * 12 + day_branch_idx) * 12 + branch_idx]
+
+def calculate_sinsal(pillars):
     """
     Calculate Sinsal (神煞) for each pillar.
     
     Args:
-        pillars_data: List of pillar dictionaries
-        day_stem: Day stem string (e.g., "甲 (갑)" or "甲")
-        year_branch: Year branch string (e.g., "子 (자)" or "子")
-        day_branch: Day branch string (e.g., "子 (자)" or "子")
+        pillars: Pillars
     
     Returns:
-        List of sinsal names for each pillar
+        List of sinsal names for each pillar (space separated, "" if none)
     """
-    sinsal_list = []
-    
-    # Convert branches to full format if needed
-    def get_full_branch(branch):
-        if "(" in branch:
-            return branch
-        for full_branch in EARTHLY_BRANCHES:
-            if full_branch.split()[0] == branch:
-                return full_branch
-        return branch
-    
-    # Convert stem to full format if needed
-    def get_full_stem(stem):
-        if "(" in stem:
-            return stem
-        for full_stem in HEAVENLY_STEMS:
-            if full_stem.split()[0] == stem:
-                return full_stem
-        return stem
-    
-    # Ensure day_stem is in full format for dictionary lookup
-    day_stem_full = get_full_stem(day_stem)
-    year_branch_full = get_full_branch(year_branch)
-    day_branch_full = get_full_branch(day_branch)
-    
-    for pillar in pillars_data:
-        branch = pillar["Earthly Branch (지지)"]
-        branch_full = get_full_branch(branch)
-        sinsals = []
-        
-        # 천을귀인 (天乙貴人) - 일간(日干) 기준으로 해당 지지 확인
-        if day_stem_full in TIANYI_GUIREN and branch_full in TIANYI_GUIREN[day_stem_full]:
-            sinsals.append("천을귀인")
-        
-        # 도화 (桃花) - 년지나 일지 기준으로 삼합의 끝에서 3위
-        # 각 기둥의 지지가 년지나 일지 기준 도화에 해당하는지 확인
-        if branch_full == TAOHUA.get(year_branch_full) or branch_full == TAOHUA.get(day_branch_full):
-            sinsals.append("도화")
-        
-        # 화개 (華蓋) - 년지나 일지 기준으로 삼합의 중간
-        # 각 기둥의 지지가 년지나 일지 기준 화개에 해당하는지 확인
-        if branch_full == HUAGAI.get(year_branch_full) or branch_full == HUAGAI.get(day_branch_full):
-            sinsals.append("화개")
-        
-        # 양인 (羊刃) - 일간(日干) 기준으로 해당 지지 확인
-        if day_stem_full in YANGREN and branch_full == YANGREN[day_stem_full]:
-            sinsals.append("양인")
-        
-        # 역마 (驛馬) - 년지나 일지 기준으로 대충(對沖)의 양쪽
-        # 각 기둥의 지지가 년지나 일지 기준 역마에 해당하는지 확인
-        if branch_full == YIMA.get(year_branch_full) or branch_full == YIMA.get(day_branch_full):
-            sinsals.append("역마")
-        
-        # 공망 (空亡) - 일간과 일지 기준 (60갑자 순서)
-        # 일간의 갑자 순서에 따라 공망이 되는 지지 확인
-        if day_stem_full in KONGWANG and branch_full in KONGWANG[day_stem_full]:
-            sinsals.append("공망")
-        
-        # 장성 (將星) - 년지나 일지 기준으로 삼합의 첫 번째
-        # 각 기둥의 지지가 년지나 일지 기준 장성에 해당하는지 확인
-        if branch_full == JIANGXING.get(year_branch_full) or branch_full == JIANGXING.get(day_branch_full):
-            sinsals.append("장성")
-        
-        if sinsals:
-            sinsal_list.append(" ".join(sinsals))
-        else:
-            sinsal_list.append("")
+    row = ((pillars.day_stem * 12 + pillars.year.branch) * 12 + pillars.day.branch) * 12
+    return [SINSAL_TEXTS[SINSAL_MATRIX[row + ganji.branch]] for ganji in pillars]
+
+def count_elements(pillars, hidden_weight=0):
+    """
+    기둥의 천간/지지 오행 개수를 셉니다.
     
-    return sinsal_list
+    Args:
+        pillars: Pillars
+        hidden_weight: 0이면 지지 자체의 오행을 1로 세고,
+                       0보다 크면 지지 대신 지장간 오행을 이 가중치로 셈
+    
+    Returns:
+        list: 오행 인덱스(0=木 ... 4=水)별 개수
+    """
+    counts = [0, 0, 0, 0, 0]
+    for ganji in pillars:
+        counts[STEM_ELEMENTS[ganji.stem]] += 1
+        if hidden_weight:
+            for hidden in HIDDEN_STEMS[ganji.branch]:
+                counts[STEM_ELEMENTS[hidden]] += hidden_weight
+        else:
+            counts[BRANCH_ELEMENTS[ganji.branch]] += 1
+    return counts
 
-def generate_fortune_analysis(pillars_data, pillars_info, daeun, fortunes, sinsals, hidden_lists):
+def generate_fortune_analysis(pillars, daeun, fortunes, sinsals):
     """
     Generate comprehensive fortune analysis based on all available data.
     
     Args:
-        pillars_data: List of pillar dictionaries
-        pillars_info: Dictionary with pillar information
+        pillars: Pillars
         daeun: Daeun calculation result
         fortunes: List of twelve fortunes for each pillar
         sinsals: List of sinsals for each pillar
-        hidden_lists: List of hidden stems for each pillar
     
     Returns:
         String containing comprehensive analysis
@@ -766,39 +755,11 @@ def generate_fortune_analysis(pillars_data, pillars_info, daeun, fortunes, sinsa
     analysis_parts = []
     
     # Get day stem element
-    day_stem = pillars_info.get('day_stem', '')
-    day_stem_char = day_stem.split()[0] if day_stem else ""
-    day_element = FIVE_ELEMENTS.get(day_stem, "") if day_stem else ""
-    
-    # Count elements in pillars
-    element_count = {"木": 0, "火": 0, "土": 0, "金": 0, "水": 0}
-    for pillar in pillars_data:
-        stem = pillar.get("Heavenly Stem (천간)", "")
-        if stem:
-            stem_full = stem if "(" in stem else None
-            if not stem_full:
-                for s in HEAVENLY_STEMS:
-                    if s.split()[0] == stem:
-                        stem_full = s
-                        break
-            if stem_full:
-                elem = FIVE_ELEMENTS.get(stem_full, "")
-                if elem:
-                    element_count[elem] += 1
-        
-        branch = pillar.get("Earthly Branch (지지)", "")
-        if branch:
-            branch_full = branch if "(" in branch else None
-            if not branch_full:
-                for b in EARTHLY_BRANCHES:
-                    if b.split()[0] == branch:
-                        branch_full = b
-                        break
-            if branch_full and branch_full in HIDDEN_STEMS:
-                for hidden_stem in HIDDEN_STEMS[branch_full]:
-                    elem = FIVE_ELEMENTS.get(hidden_stem, "")
-                    if elem:
-                        element_count[elem] += 0.3  # Hidden stems have less weight
+    day_stem_char = pillars.day.stem_char
+    day_element = ELEMENT_CHARS[STEM_ELEMENTS[pillars.day_stem]]
+    
+    # Count elements in pillars (hidden stems have less weight)
+    element_count = dict(zip(ELEMENT_CHARS, count_elements(pillars, hidden_weight=0.3)))
     
     # Find dominant element
     dominant_element = max(element_count, key=element_count.get)
@@ -901,52 +862,27 @@ def generate_fortune_analysis(pillars_data, pillars_info, daeun, fortunes, sinsa
     
     return "<br>".join(analysis_parts)
 
-def calculate_tojeong_bigyeol(pillars_info, current_year, pillars_data=None):
+def calculate_tojeong_bigyeol(birth_year, current_year):
     """
     Calculate Tojeong Bigyeol (토정비결) fortune for the current year.
     
     토정비결은 생년의 간지와 올해의 간지를 비교하여 올해의 운세를 예측합니다.
     
     Parameters:
-    - pillars_info: 사주 정보 (년, 월, 일, 시 간지 포함)
+    - birth_year: 생년 간지 (Ganji, 년주)
     - current_year: 현재 연도
-    - pillars_data: 사주 기둥 데이터 (선택사항, year_branch를 얻기 위해 사용)
     
     Returns:
     - dict with fortune predictions
     """
-    from datetime import datetime
-    
-    # Get birth year ganji
-    birth_year_stem = pillars_info.get('year_stem', '')
-    # year_branch는 pillars_data에서 가져오거나, pillars_info에 없다면 pillars_data 사용
-    if pillars_data and len(pillars_data) > 0:
-        birth_year_branch = pillars_data[0].get('Earthly Branch (지지)', '')
-    else:
-        # fallback: pillars_info에서 직접 가져오기 시도
-        birth_year_branch = pillars_info.get('year_branch', '')
-    
-    # Extract only Chinese characters (remove Korean pronunciation)
-    def extract_char(ganji_str):
-        if isinstance(ganji_str, str) and "(" in ganji_str:
-            return ganji_str.split()[0]
-        return ganji_str
-    
-    birth_year_stem_char = extract_char(birth_year_stem)
-    birth_year_branch_char = extract_char(birth_year_branch)
-    
-    # Get current year ganji
-    current_year_stem, current_year_branch = get_year_ganji(current_year)
-    current_year_stem_char = extract_char(current_year_stem)
-    current_year_branch_char = extract_char(current_year_branch)
+    current_ganji = year_ganji(current_year)
     
     # 토정비결 기본 운세 메시지 (생년 지지와 올해 지지 비교)
     # 삼합, 육합, 형, 충, 해 관계 등을 고려한 간단한 운세
     
     # 지지 인덱스
-    branch_idx_map = {extract_char(b): i for i, b in enumerate(EARTHLY_BRANCHES)}
-    birth_branch_idx = branch_idx_map.get(birth_year_branch_char, 0)
-    current_branch_idx = branch_idx_map.get(current_year_branch_char, 0)
+    birth_branch_idx = birth_year.branch
+    current_branch_idx = current_ganji.branch
     
     # 삼합 관계 (寅午戌, 申子辰, 亥卯未, 巳酉丑)
     sanhap_groups = [
@@ -1123,7 +1059,7 @@ def calculate_tojeong_bigyeol(pillars_info, current_year, pillars_data=None):
                 "advice": "재테크에서는 장기적인 관점에서 꾸준한 투자를 계속하고, 급격한 변화보다는 안정적인 수익을 추구하세요. 직장에서는 현재의 업무에 충실하면서 점진적으로 발전시켜 나가세요. 건강과 인간관계를 유지하는 것이 중요하며, 새로운 기회를 찾기보다는 기존의 것을 발전시키는 것이 좋습니다."
             }
     
-    yearly_fortune = get_yearly_detailed_fortune(relationship, fortune_level, f"{birth_year_stem_char}{birth_year_branch_char}", f"{current_year_stem_char}{current_year_branch_char}")
+    yearly_fortune = get_yearly_detailed_fortune(relationship, fortune_level, str(birth_year), str(current_ganji))
     
     # 월별 운세 생성 (1~12월)
     def generate_monthly_fortunes(rel, level):
@@ -1289,8 +1225,8 @@ def calculate_tojeong_bigyeol(pillars_info, current_year, pillars_data=None):
     monthly_guidance = "월별로는 봄에는 새로운 시작, 여름에는 발전, 가을에는 수확, 겨울에는 준비의 시기입니다."
     
     return {
-        "birth_year_ganji": f"{birth_year_stem_char}{birth_year_branch_char}",
-        "current_year_ganji": f"{current_year_stem_char}{current_year_branch_char}",
+        "birth_year_ganji": str(birth_year),
+        "current_year_ganji": str(current_ganji),
         "current_year": current_year,
         "relationship": relationship,
         "relationship_desc": relationship_desc,
@@ -1308,128 +1244,21 @@ def calculate_tojeong_bigyeol(pillars_info, current_year, pillars_data=None):
 
 def get_solar_terms(year):
     """
-    Return list of (Date, TermName) for the year using Ephem.
+    Return list of (Date, TermName) for the year using the precomputed term table.
     Terms: Ipchun (315), Usu (330)...
-    Returns: List of (datetime, term_name_korean) tuples for the 24 solar terms.
+    Returns: List of (datetime, term_name_korean) tuples for the 24 solar terms,
+    from Ipchun of the year to Daehan of the next year.
     """
-    # 24 solar terms: angles and Korean names
-    # Starting from Ipchun (315 deg, approx Feb 4)
-    solar_term_data = [
-        (315, "입춘"), (330, "우수"), (345, "경칩"), (0, "춘분"),
-        (15, "청명"), (30, "곡우"), (45, "입하"), (60, "소만"),
-        (75, "망종"), (90, "하지"), (105, "소서"), (120, "대서"),
-        (135, "입추"), (150, "처서"), (165, "백로"), (180, "추분"),
-        (195, "한로"), (210, "상강"), (225, "입동"), (240, "소설"),
-        (255, "대설"), (270, "동지"), (285, "소한"), (300, "대한")
-    ]
-    
-    terms = []
-    s = ephem.Sun()
-    obs = ephem.Observer()
-    
-    # Start from previous year's Ipchun to catch the first term of the target year
-    # (since the year starts at Ipchun, we need to go back to find it)
-    search_start = datetime(year - 1, 2, 3)  # Approximate start
-    
-    for angle_deg, term_name in solar_term_data:
-        target_rad = angle_deg * ephem.pi / 180
-        
-        # Find the occurrence of this term in the target year
-        # For angles >= 315, it's in Feb-Mar of the target year
-        # For angles < 315, it's from Mar (year) to Jan (year+1)
-        if angle_deg >= 315:
-            # Ipchun (315), Usu (330), Gyeongchip (345) occur in Feb-Mar
-            start_search = datetime(year, 1, 25)
-            end_search = datetime(year, 4, 10)
-        else:
-            # Other terms occur from Mar (year) to Jan (year+1)
-            start_search = datetime(year, 2, 25)
-            end_search = datetime(year + 1, 2, 10)
-        
-        # Binary search approach: check each day to find when sun reaches target angle
-        best_date = None
-        min_diff = float('inf')
-        
-        # Search day by day
-        current_date = start_search
-        while current_date < end_search:
-            utc_datetime = current_date - timedelta(hours=9)
-            obs.date = ephem.Date(utc_datetime)
-            s.compute(obs)
-            ecl = ephem.Ecliptic(s.ra, s.dec)
-            current_long = float(ecl.lon) * 180 / ephem.pi
-            current_long = current_long % 360
-            
-            # Calculate difference (handling wrap-around at 0/360)
-            if angle_deg == 0:
-                # Special case: 0 degrees (360 degrees)
-                diff1 = abs(current_long - 0)
-                diff2 = abs(current_long - 360)
-                diff = min(diff1, diff2)
-            else:
-                diff = abs(current_long - angle_deg)
-                # Also check wrap-around case
-                if angle_deg > 350:  # Near 360, check wrap to 0
-                    diff = min(diff, abs(current_long + 360 - angle_deg))
-                elif angle_deg < 10:  # Near 0, check wrap from 360
-                    diff = min(diff, abs(current_long - 360 - angle_deg))
-            
-            if diff < min_diff:
-                min_diff = diff
-                best_date = current_date
-                # If very close, refine with hourly search
-                if diff < 1.0:
-                    # Refine with hourly precision
-                    for hour_offset in range(-12, 13):
-                        refined = current_date + timedelta(hours=hour_offset)
-                        utc_refined = refined - timedelta(hours=9)
-                        obs.date = ephem.Date(utc_refined)
-                        s.compute(obs)
-                        ecl = ephem.Ecliptic(s.ra, s.dec)
-                        refined_long = float(ecl.lon) * 180 / ephem.pi
-                        refined_long = refined_long % 360
-                        
-                        if angle_deg == 0:
-                            rdiff1 = abs(refined_long - 0)
-                            rdiff2 = abs(refined_long - 360)
-                            rdiff = min(rdiff1, rdiff2)
-                        else:
-                            rdiff = abs(refined_long - angle_deg)
-                            if angle_deg > 350:
-                                rdiff = min(rdiff, abs(refined_long + 360 - angle_deg))
-                            elif angle_deg < 10:
-                                rdiff = min(rdiff, abs(refined_long - 360 - angle_deg))
-                        
-                        if rdiff < min_diff:
-                            min_diff = rdiff
-                            best_date = refined
-                    break
-            
-            current_date += timedelta(days=1)
-        
-        if best_date:
-            # For saju logic, the year starts at Ipchun (Feb)
-            # Terms >= 315 occur in Feb-Mar of target year
-            # Terms < 315 occur in Mar-Jan of target/next year
-            # We want all terms from Feb (year) to Jan (year+1)
-            if angle_deg >= 315:
-                # Should be in Feb-Mar of target year
-                if best_date >= datetime(year, 2, 1) and best_date < datetime(year, 4, 1):
-                    terms.append((best_date, term_name))
-            else:
-                # Should be in Mar (year) to Jan (year+1)
-                if (best_date >= datetime(year, 3, 1) and best_date < datetime(year + 1, 2, 1)):
-                    terms.append((best_date, term_name))
-    
-    # Sort by date
-    terms.sort(key=lambda x: x[0])
-    return terms 
+    return [(term.when, term.name) for term in solar_terms.terms_of_year(year)]
 
-def calculate_pillars(dob_date, dob_time, is_lunar=False):
+def compute_pillars(dob_date, dob_time, is_lunar=False, is_leap_month=False):
     """
     Main function to calculate Four Pillars.
     dob_date: datetime.date
     dob_time: datetime.time (None일 경우 정오 12시 사용)
+    is_lunar: dob_date가 음력 날짜인지 여부
+    is_leap_month: 음력 윤달 여부 (is_lunar일 때만 사용)
+    Returns: Pillars
     """
     # dob_time이 None이거나 time 객체가 아니면 기본값으로 정오 12시 사용
     from datetime import time as dt_time
@@ -1438,270 +1267,83 @@ def calculate_pillars(dob_date, dob_time, is_lunar=False):
     
     # 1. Lunar -> Solar conversion if needed
     if is_lunar:
-        calendar = KoreanLunarCalendar()
-        calendar.setLunarDate(dob_date.year, dob_date.month, dob_date.day, False) # False = not leap (needs input)
-        # TODO: Handle leap month UI input if we want perfection.
-        # Get solar date from calendar attributes
-        year = calendar.solarYear
-        month = calendar.solarMonth
-        day = calendar.solarDay
-        dob_solar = datetime(year, month, day, dob_time.hour, dob_time.minute)
+        solar_date = lunar_calendar.lunar_to_solar(dob_date.year, dob_date.month, dob_date.day, is_leap_month)
+        dob_solar = datetime(solar_date.year, solar_date.month, solar_date.day, dob_time.hour, dob_time.minute)
     else:
         dob_solar = datetime(dob_date.year, dob_date.month, dob_date.day, dob_time.hour, dob_time.minute)
     
-    year = dob_solar.year
-    month = dob_solar.month
-    day = dob_solar.day
-    hour = dob_solar.hour
-    
-    # 2. Determine Year Pillar (Check Ipchun)
-    # We need the Ipchun time for the birth year.
-    s = ephem.Sun()
-    
-    def get_solar_long(dt):
-        observer = ephem.Observer()
-        observer.date = dt
-        s.compute(observer)
-        # return longitude in degrees
-        return float(s.hlon) * 180 / ephem.pi
-
-    # Ipchun is at 315 degrees.
-    # We need to see if the current date is before or after Ipchun of that year.
-    # Quick check: Ipchun is usually Feb 4.
-    # If date is Jan, it's definitely prev year.
-    # If date is Feb, we need precision.
-    
-    # Algorithm: Find the exact Ipchun date for the birth year.
-    # Ephem Newton method to find when hlon == 315 deg.
-    
-    def find_term_date(year, target_deg):
-        # target_deg in radians
-        target_rad = target_deg * ephem.pi / 180
-        
-        # Start search around Feb 4 for Ipchun (315)
-        # Or generalize: 
-        # 0 (Mar 20), 15, 30 ...
-        # Ipchun (315) is roughly Feb 4.
-        
-        start_date = datetime(year, 2, 3) # approximate
-        if target_deg == 315:
-             start_date = datetime(year, 2, 3)
-        # This is hard to generalize for all terms quickly without a table.
-        # But we only need to know the Month Index.
-        pass
-    
-    # BETTER APPROACH:
-    # 1. Calculate Solar Longitude of the birth moment.
-    # 2. Convert Longitude to Month Index.
-    # Ipchun (315) -> Month 1 (Tiger)
-    # Usu (330) -> Mid-Month 1
-    # Gyeongchip (345) -> Month 2 (Rabbit)
-    # Chunbun (0) -> Mid-Month 2
-    # Cheongmyeong (15) -> Month 3 (Dragon)
-    
-    # So, Month starts at 315, 345, 15, 45, 75, 105, 135, 165, 195, 225, 255, 285.
-    
-    obs = ephem.Observer()
-    # Ephem uses UTC. Convert KST to UTC by subtracting 9 hours
-    # Use ephem.Date for proper date handling
-    utc_datetime = dob_solar - timedelta(hours=9)
-    obs.date = ephem.Date(utc_datetime)
-    s.compute(obs)
-    # Use ecliptic longitude (not heliocentric longitude)
-    ecl = ephem.Ecliptic(s.ra, s.dec)
-    long_deg = float(ecl.lon) * 180 / ephem.pi
-    
-    # Normalize to 0-360
-    long_deg = long_deg % 360
-    
-    # Determine Saju Month Index (0=Tiger, 1=Rabbit...)
-    # 315 <= L < 345 : Tiger (Month 1 in Saju, usually Solar Feb)
-    # 345 <= L < 15 (375) : Rabbit
-    # ...
-    
-    # Pivot at 315 (Ipchun). 
-    # Let's shift logic: Relative to 315.
-    # (L - 315) % 360
-    # 0-30: Tiger
-    # 30-60: Rabbit
-    # ...
-    
-    rel_long = (long_deg - 315) % 360
-    month_idx = int(rel_long // 30) # 0 to 11
-    
-    # Determine Saju Year
-    # If we are before Ipchun (long < 315 and long > 270 approx... wait)
-    # Actually, simplistic check: 
-    # If date is Jan 1 to Feb 3, long is roughly 280-314.
-    # If long is between 270 (Dongji) and 315 (Ipchun), it is typically "Previous Year" in some schools,
-    # BUT standard Saju changes year at Ipchun.
-    # So if we are currently in the [315, 360) range or [0, 315) range?
-    # Wait, Ipchun is 315.
-    # So if long < 315 (and > 270 i.e. Jan/Feb), it is late winter of previous year?
-    # NO. Longitude increases.
-    # Winter Solstice is 270.
-    # Ipchun is 315.
-    # So if the sun is between 315 and 360, or 0 and 315?
-    # 315 is the Start of Spring.
-    # If current longitude is >= 315 (until 360) OR >= 0 (until next 315? No).
-    # Solar longitude goes 0 -> 360.
-    # 315 is in Feb.
-    # 0 is in Mar.
-    # So Year starts when Longitude hits 315.
-    # If calculated longitude is, say, 300 (Jan), it is BEFORE Ipchun.
-    # So we use (Year - 1).
-    
-    # How to detect "Before Ipchun"?
-    # The `long_deg` we got is for the *current* time.
-    # If `long_deg` < 315 and month is 1 or 2 (early), it's previous year.
-    # But wait, 270 is Dec. 
-    # 300 is Jan.
-    # 315 is Feb 4.
-    # So if long_deg < 315 and long_deg > 270? (Jan/Feb before Ipchun) -> Previous Year.
-    # If long_deg >= 315? -> Current Year.
-    # If long_deg < 100 (Spring/Summer)? -> Current Year.
-    
-    full_year_check = year
-    # Refine year logic:
-    # If date is early year (Jan/Feb) and long < 315:
-    # Then it belongs to previous year pillar.
-    if dob_solar.month <= 2 and long_deg > 270 and long_deg < 315:
-        full_year_check = year - 1
-        
-    saju_year_stem, saju_year_branch = get_year_ganji(full_year_check)
+    # 2. Determine Year / Month Pillar from the solar term in effect at the birth moment.
+    # The saju year starts at Ipchun (315 deg) and each month starts at a major term (節):
+    # 315, 345, 15, 45, 75, 105, 135, 165, 195, 225, 255, 285.
+    term = solar_terms.term_at(dob_solar, major_only=True)
+    month_idx = term.order // 2  # 0=Tiger, 1=Rabbit, ...
     
-    # Month
-    saju_year_stem_idx = HEAVENLY_STEMS.index(saju_year_stem)
-    saju_month_stem, saju_month_branch = get_month_ganji(saju_year_stem_idx, month_idx)
+    year = year_ganji(term.year)
+    month = month_ganji(year.stem, month_idx)
     
-    # Day
     # Day Ganji is independent of year/month, it's just continuous count.
-    saju_day_stem, saju_day_branch = get_day_ganji(dob_solar)
-    
-    # Hour
-    # Depends on Day Stem (which we just found).
-    saju_day_stem_idx = HEAVENLY_STEMS.index(saju_day_stem)
-    saju_hour_stem, saju_hour_branch = get_hour_ganji(saju_day_stem_idx, dob_solar.hour)
-    
-    # Get hidden stems (지장간) for each branch
-    year_hidden = HIDDEN_STEMS.get(saju_year_branch, [])
-    month_hidden = HIDDEN_STEMS.get(saju_month_branch, [])
-    day_hidden = HIDDEN_STEMS.get(saju_day_branch, [])
-    hour_hidden = HIDDEN_STEMS.get(saju_hour_branch, [])
-    
-    # Calculate ten gods for hidden stems (based on day stem)
-    # Format: return list of [stem_char, ten_god] pairs
-    def format_hidden_stems_with_ten_gods(hidden_stems, day_stem_idx):
-        if not hidden_stems:
-            return []
-        result = []
-        for hidden_stem in hidden_stems:
-            hidden_stem_idx = HEAVENLY_STEMS.index(hidden_stem)
-            ten_god = get_ten_god(day_stem_idx, hidden_stem_idx)
-            # Extract only the Chinese character (remove Korean pronunciation)
-            stem_char = hidden_stem.split()[0]  # Get "甲" from "甲 (갑)"
-            result.append({"stem": stem_char, "ten_god": ten_god})
-        return result
-    
-    year_hidden_list = format_hidden_stems_with_ten_gods(year_hidden, saju_day_stem_idx)
-    month_hidden_list = format_hidden_stems_with_ten_gods(month_hidden, saju_day_stem_idx)
-    day_hidden_list = format_hidden_stems_with_ten_gods(day_hidden, saju_day_stem_idx)
-    hour_hidden_list = format_hidden_stems_with_ten_gods(hour_hidden, saju_day_stem_idx)
-    
-    # Extract Chinese characters only (remove Korean pronunciation)
-    def get_stem_char(stem_str):
-        return stem_str.split()[0]  # Get "甲" from "甲 (갑)"
-    
-    def get_branch_char(branch_str):
-        return branch_str.split()[0]  # Get "子" from "子 (자)"
-    
-    return [
-        {"Pillar": "Year (년)", "Heavenly Stem (천간)": get_stem_char(saju_year_stem), "Earthly Branch (지지)": get_branch_char(saju_year_branch), "Hidden Stems (지장간)": year_hidden_list},
-        {"Pillar": "Month (월)", "Heavenly Stem (천간)": get_stem_char(saju_month_stem), "Earthly Branch (지지)": get_branch_char(saju_month_branch), "Hidden Stems (지장간)": month_hidden_list},
-        {"Pillar": "Day (일)", "Heavenly Stem (천간)": get_stem_char(saju_day_stem), "Earthly Branch (지지)": get_branch_char(saju_day_branch), "Hidden Stems (지장간)": day_hidden_list},
-        {"Pillar": "Hour (시)", "Heavenly Stem (천간)": get_stem_char(saju_hour_stem), "Earthly Branch (지지)": get_branch_char(saju_hour_branch), "Hidden Stems (지장간)": hour_hidden_list}
-    ], {
-        "year_stem": saju_year_stem,
-        "year_stem_idx": saju_year_stem_idx,
-        "month_stem": saju_month_stem,
-        "month_branch": saju_month_branch,
-        "month_stem_idx": HEAVENLY_STEMS.index(saju_month_stem),
-        "month_branch_idx": EARTHLY_BRANCHES.index(saju_month_branch),
-        "day_stem": saju_day_stem,
-        "day_branch": saju_day_branch,
-        "birth_datetime": dob_solar
+    day = day_ganji(dob_solar)
+    
+    # Hour depends on Day Stem (which we just found).
+    hour = hour_ganji(day.stem, dob_solar.hour)
+    
+    return Pillars(year, month, day, hour, birth_datetime=dob_solar)
+
+def calculate_pillars(dob_date, dob_time, is_lunar=False, is_leap_month=False):
+    """
+    compute_pillars 결과를 응답 형식으로 변환합니다.
+    Returns: (pillars_data, pillars_info)
+    """
+    pillars = compute_pillars(dob_date, dob_time, is_lunar, is_leap_month)
+    return pillars.to_pillars_data(), pillars.to_info()
+
+def compute_birth_chart(dob_date, dob_time, is_lunar, is_leap_month, gender):
+    """
+    출생 정보만으로 정해지는 계산 결과를 한 번에 구합니다.
+    (나이, 현재 대운, 올해 간지처럼 오늘 날짜에 따라 바뀌는 값은 포함하지 않음)
+    계산 실행기(프로세스 풀)에서도 호출할 수 있도록 pickle 가능한 값만 반환합니다.
+    
+    Returns:
+        dict: pillars(Pillars), pillars_data, pillars_info(birth_datetime은 ISO 문자열), daeun, fortunes, sinsals
+    """
+    pillars = compute_pillars(dob_date, dob_time, is_lunar, is_leap_month)
+    pillars_info = pillars.to_info()
+    pillars_info['birth_datetime'] = pillars.birth_datetime.isoformat()
+    return {
+        "pillars": pillars,
+        "pillars_data": pillars.to_pillars_data(),
+        "pillars_info": pillars_info,
+        # 대운 (양력으로 변환된 출생 시각 기준)
+        "daeun": calculate_daeun(pillars, gender),
+        # 십이운성, 신살
+        "fortunes": calculate_twelve_fortunes(pillars),
+        "sinsals": calculate_sinsal(pillars)
     }
 
-def prepare_ai_input(pillars_data, pillars_info, daeun_data, fortunes, sinsals, gender, current_age, current_year, current_daeun_period=None, current_year_ganji=None):
+def prepare_ai_input(pillars, daeun_data, fortunes, sinsals, gender, current_age, current_year, current_daeun_period=None, current_year_ganji=None):
     """
     Formats the Saju calculation results into the JSON structure required by the AI Analyst.
     
     Args:
+        pillars: Pillars
         current_daeun_period: Dictionary with current daeun period info (ganji, age_start, etc.)
-        current_year_ganji: Tuple of (heavenly_stem, earthly_branch) for current year, e.g., ("丙", "午")
+        current_year_ganji: Ganji for current year, e.g. 丙午
     """
-    # Helper to get char only
-    def get_char(s):
-        return s.split()[0] if s else ""
-
-    # Element Analysis
-    elements = {"wood": 0, "fire": 0, "earth": 0, "metal": 0, "water": 0}
-    yin_yang = {"yang": 0, "yin": 0}
-    
-    # Map for counting (simplified)
-    elem_map = {"木": "wood", "火": "fire", "土": "earth", "金": "metal", "水": "water"}
-    
-    # Analyze pillars for counts
-    all_chars = []
-    # Stems
-    for key in ["year_stem", "month_stem", "day_stem"]:
-         char = pillars_info.get(key)
-         full_char = next((s for s in HEAVENLY_STEMS if s.startswith(char)), None)
-         if full_char:
-             elem = FIVE_ELEMENTS.get(full_char)
-             if elem: elements[elem_map[elem]] += 1
-    
-    # Branches (need to look up element)
-    # This part requires iterating pillars_data because pillars_info doesn't have all branch full strings easily accessible for element lookup if we only stored partials.
-    # Actually pillars_data has the full chars in 'Heavenly Stem' and 'Earthly Branch' if properly returned, but the current return above cuts them.
-    # Let's use pillars_info to reconstruct or lookup.
-    
-    # Re-accessing data logic for elements might be complex if we only have the display strings.
-    # For now, let's trust the AI can infer some if we give it the characters, but the prompt asks for specific counts.
-    # Let's do a quick lookup based on characters in pillars_data which are just chars now.
-    
-    for p in pillars_data:
-        stem = p["Heavenly Stem (천간)"]
-        branch = p["Earthly Branch (지지)"]
-        
-        # Stem Element
-        # Need to find full string to use FIVE_ELEMENTS dict which uses "甲 (갑)" keys
-        stem_full = next((s for s in HEAVENLY_STEMS if s.startswith(stem)), None)
-        if stem_full:
-            e = FIVE_ELEMENTS[stem_full]
-            elements[elem_map[e]] += 1
-            # Yin/Yang (simple alternate logic: 甲=Yang, 乙=Yin...)
-            idx = HEAVENLY_STEMS.index(stem_full)
-            if idx % 2 == 0: yin_yang["yang"] += 1
-            else: yin_yang["yin"] += 1
-            
-        # Branch Element
-        branch_full = next((s for s in EARTHLY_BRANCHES if s.startswith(branch)), None)
-        if branch_full:
-            e = BRANCH_ELEMENTS[branch_full]
-            elements[elem_map[e]] += 1
-            idx = EARTHLY_BRANCHES.index(branch_full)
-            # Branch Yin/Yang is complex, simplified here:
-            # Sub(Rat):Yang, Chuk:Yin... 
-            if idx % 2 == 0: yin_yang["yang"] += 1
-            else: yin_yang["yin"] += 1
+    # Element Analysis: stems and branches of all pillars, plus the year/month/day stems once more
+    counts = count_elements(pillars)
+    for ganji in (pillars.year, pillars.month, pillars.day):
+        counts[STEM_ELEMENTS[ganji.stem]] += 1
+    elements = dict(zip(ELEMENT_KEYS, counts))
+    
+    # Yin/Yang (simple alternate logic: 甲=Yang, 乙=Yin..., 子=Yang, 丑=Yin...)
+    # 60갑자는 천간과 지지의 음양이 같으므로 기둥마다 2씩 셈
+    yang = sum(2 for ganji in pillars if ganji.code % 2 == 0)
+    yin_yang = {"yang": yang, "yin": 8 - yang}
 
     # Format Pillars
     formatted_pillar = {
-        "year": {"heavenlyStem": pillars_data[0]["Heavenly Stem (천간)"], "earthlyBranch": pillars_data[0]["Earthly Branch (지지)"]},
-        "month": {"heavenlyStem": pillars_data[1]["Heavenly Stem (천간)"], "earthlyBranch": pillars_data[1]["Earthly Branch (지지)"]},
-        "day": {"heavenlyStem": pillars_data[2]["Heavenly Stem (천간)"], "earthlyBranch": pillars_data[2]["Earthly Branch (지지)"]},
-        "hour": {"heavenlyStem": pillars_data[3]["Heavenly Stem (천간)"], "earthlyBranch": pillars_data[3]["Earthly Branch (지지)"]}
+        key: {"heavenlyStem": ganji.stem_char, "earthlyBranch": ganji.branch_char}
+        for key, ganji in zip(("year", "month", "day", "hour"), pillars)
     }
 
     # Sibiunseong
@@ -1717,14 +1359,14 @@ def prepare_ai_input(pillars_data, pillars_info, daeun_data, fortunes, sinsals,
     for d in daeun_data["periods"][:3]:
         formatted_daeun.append({
             "age": d.get("age_start", 0),
-            "heavenlyStem": d["ganji"].split()[0], # Just char
-            "earthlyBranch": d["ganji"].split()[1] if len(d["ganji"].split()) > 1 else "",
+            "heavenlyStem": STEM_CHARS[stem_index(d["stem"])],
+            "earthlyBranch": BRANCH_CHARS[branch_index(d["branch"])],
             "period": "10년" # Approx
         })
 
     result = {
         "pillar": formatted_pillar,
-        "dayMaster": pillars_data[2]["Heavenly Stem (천간)"],
+        "dayMaster": pillars.day.stem_char,
         "elements": elements,
         "yinYang": yin_yang,
         "sipseong": { "note": "AI will calculate based on Day Master" }, # Simplified for now
@@ -1741,17 +1383,16 @@ def prepare_ai_input(pillars_data, pillars_info, daeun_data, fortunes, sinsals,
         result["currentDaeun"] = {
             "ganji": current_daeun_period.get("ganji", ""),
             "ageStart": current_daeun_period.get("age_start", 0),
-            "heavenlyStem": current_daeun_period["ganji"].split()[0] if current_daeun_period.get("ganji") else "",
-            "earthlyBranch": current_daeun_period["ganji"].split()[1] if current_daeun_period.get("ganji") and len(current_daeun_period["ganji"].split()) > 1 else ""
+            "heavenlyStem": STEM_CHARS[stem_index(current_daeun_period["stem"])],
+            "earthlyBranch": BRANCH_CHARS[branch_index(current_daeun_period["branch"])]
         }
     
     # Add current year ganji if provided
     if current_year_ganji:
-        year_stem, year_branch = current_year_ganji
         result["currentYearGanji"] = {
-            "heavenlyStem": year_stem,
-            "earthlyBranch": year_branch,
-            "ganji": f"{year_stem}{year_branch}"
+            "heavenlyStem": current_year_ganji.stem_char,
+            "earthlyBranch": current_year_ganji.branch_char,
+            "ganji": str(current_year_ganji)
         }
     
     return result
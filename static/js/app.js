@@ -115,6 +115,7 @@ function fillFormFromLocalStorage(formId, hasSessionData = false) {
     const birthTimeInput = form.querySelector('[name="birth_time"]');
     const genderSelect = form.querySelector('[name="gender"]');
     const isLunarCheckbox = form.querySelector('[name="is_lunar"]');
+    const isLeapMonthCheckbox = form.querySelector('[name="is_leap_month"]');
 
     // localStorage 값이 있으면 항상 사용 (세션 값보다 우선)
     // 폼 값이 비어있거나, localStorage 값이 다르면 localStorage 값으로 업데이트
@@ -143,6 +144,10 @@ function fillFormFromLocalStorage(formId, hasSessionData = false) {
             isLunarCheckbox.checked = sessionData.is_lunar;
         }
     }
+    if (isLeapMonthCheckbox) {
+        // 윤달 값이 없던 이전 저장 데이터는 평달로 간주
+        isLeapMonthCheckbox.checked = !!sessionData.is_leap_month;
+    }
 }
 
 // 사주 입력 폼 설정 (공통 로직)
@@ -187,6 +192,7 @@ function setupInputForm(formId = 'input-form') {
                         birth_date: formData.get('birth_date') || '',
                         birth_time: formData.get('birth_time') || '',
                         is_lunar: formData.get('is_lunar') === 'on' || formData.get('is_lunar') === 'true',
+                        is_leap_month: formData.get('is_leap_month') === 'on' || formData.get('is_leap_month') === 'true',
                         _timestamp: Date.now()
                     };
                     localStorage.setItem('user_session_data', JSON.stringify(sessionData));
@@ -81,6 +81,9 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
+    // 키워드 자동완성
+    setupDreamSuggest();
+
     // 사주 데이터 업데이트 시 알림 (선택 사항)
     document.addEventListener('sajuUpdated', function (e) {
         if (e.detail.success) {
@@ -89,6 +92,45 @@ document.addEventListener('DOMContentLoaded', function () {
     });
 });
 
+// 키워드 자동완성: 입력이 멈추면 서버에서 추천 키워드만 받아 datalist를 채움
+function setupDreamSuggest() {
+    const searchInput = document.getElementById('dream-search-input');
+    const datalist = document.getElementById('dream-suggestions');
+    if (!searchInput || !datalist) return;
+
+    let timer = null;
+    let lastQuery = '';
+
+    searchInput.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(async function () {
+            const query = searchInput.value.trim();
+            if (query === lastQuery) return;
+            lastQuery = query;
+            if (!query) {
+                datalist.innerHTML = '';
+                return;
+            }
+            try {
+                const data = await apiRequest('/api/dream/suggest?q=' + encodeURIComponent(query) + '&limit=8');
+                // 응답이 오는 동안 입력이 바뀌었으면 무시
+                if (!data.success || query !== searchInput.value.trim()) return;
+                datalist.innerHTML = '';
+                data.data.forEach(function (item) {
+                    const option = document.createElement('option');
+                    option.value = item.keyword;
+                    if (item.category) {
+                        option.label = `${item.icon || ''} ${item.category}`.trim();
+                    }
+                    datalist.appendChild(option);
+                });
+            } catch (error) {
+                console.error('꿈 키워드 자동완성 오류:', error);
+            }
+        }, 150);
+    });
+}
+
 // 카테고리 렌더링
 function renderCategories() {
     const container = document.getElementById('dream-categories-container');
@@ -162,6 +204,10 @@ window.searchDream = async function (keyword) {
 
         if (data.success) {
             renderDreamResult(data.data);
+            // 여러 단어로 된 문장 검색이면 관련 상황별 해몽도 함께 표시
+            if (/\s/.test(keyword.trim())) {
+                renderDreamSearchResults(keyword.trim());
+            }
         } else {
             showError('dream-result-container', data.detail || '꿈해몽 검색 중 오류가 발생했습니다.');
         }
@@ -171,6 +217,35 @@ window.searchDream = async function (keyword) {
     }
 };
 
+// 문장 검색 결과 (상세 해몽/상황별 해몽 중 관련 있는 항목) 표시
+async function renderDreamSearchResults(query) {
+    const resultContainer = document.getElementById('dream-result-container');
+    if (!resultContainer) return;
+
+    try {
+        const data = await apiRequest('/api/dream/search?q=' + encodeURIComponent(query) + '&k=5');
+        if (!data.success || !data.data.length) return;
+
+        // snippet은 서버에서 이스케이프 후 <mark>만 넣은 HTML
+        const items = data.data.map(item => `
+        <div style="padding: 0.75rem 1rem; background: rgba(212,175,55,0.05); border-radius: 8px; margin-bottom: 0.5rem;">
+            <a href="#" onclick="searchDream('${item.keyword}'); return false;" style="color: #F9E79F; font-weight: 600; text-decoration: none;">${item.keyword}</a>
+            ${item.situation ? `<span style="color: #A0AEC0; font-size: 0.9em;"> · 상황별 해몽</span>` : ''}
+            <div style="color: #E2E8F0; font-size: 0.95em; line-height: 1.7; margin-top: 0.25rem;">${item.snippet}</div>
+        </div>`).join('');
+
+        const section = document.createElement('div');
+        section.innerHTML = `
+<h3 style="color: var(--gold-primary); margin-top: 1.5rem; margin-bottom: 1rem;"></h3>
+${items}`;
+        // 사용자가 입력한 문장은 텍스트로만 넣음
+        section.querySelector('h3').textContent = `🔎 "${query}" 관련 해몽`;
+        resultContainer.prepend(section);
+    } catch (error) {
+        console.error('꿈해몽 문장 검색 오류:', error);
+    }
+}
+
 // 꿈해몽 길흉도 시각화 함수
 function renderDreamFortuneBar(level) {
     let score = 5; // 보통
@@ -325,7 +400,8 @@ function renderDreamResult(data) {
     const resultContainer = document.getElementById('dream-result-container');
     if (!resultContainer) return;
 
-    const keyword = data.keyword;
+    // 초성/자모로 다른 키워드를 찾았으면 그 키워드로 표시
+    const keyword = data.matched_keyword || data.keyword;
     const category = data.category || '';
     const dreamMeaning = data.dream_meaning;
     const fortuneLevel = dreamMeaning.길흉 || '보통';
@@ -358,6 +434,14 @@ function renderDreamResult(data) {
 <div class="section-header" style="margin-top: 0;">
     <span>🔮</span> "${keyword}" 꿈해몽
 </div>
+${data.matched_keyword ? `
+<p style="color: #A0AEC0; font-size: 0.9em; margin-top: 0.5rem;">"${data.keyword}"와 가장 가까운 키워드 "${data.matched_keyword}"의 해몽입니다.</p>
+` : ''}
+${data.suggestions && data.suggestions.length ? `
+<p style="color: #A0AEC0; font-size: 0.9em; margin-top: 0.5rem;">혹시 이 꿈을 찾으셨나요? ${data.suggestions.map(item =>
+    `<a href="#" onclick="searchDream('${item.keyword}'); return false;" style="color: #F9E79F; text-decoration: none; border-bottom: 1px solid rgba(249,231,159,0.6); margin-right: 0.5rem;">${item.keyword}</a>`
+).join(' ')}</p>
+` : ''}
 
 <!-- 카테고리 및 키워드 -->
 ${category ? `
@@ -64,12 +64,12 @@ async function loadCalendar() {
     const showGanji = document.getElementById('show-ganji')?.checked ?? true;
 
     try {
-        const response = await apiRequest('/api/manse', 'POST', {
-            year: year,
-            month: month,
+        // 캐시 가능한 GET 주소로 조회 (이미 본 달은 브라우저/프록시 캐시에서 바로 응답)
+        const params = new URLSearchParams({
             show_lunar: showLunar,
             show_ganji: showGanji
         });
+        const response = await apiRequest(`/api/manse/${year}/${month}?${params}`);
 
         if (response.success) {
             renderCalendar(response.data);
@@ -0,0 +1,216 @@
+"""
+AI 요청 동시 실행 제한 (admission control)
+모델 호출처럼 오래 걸리는 요청을 종류별로 동시에 몇 개까지만 실행하고,
+나머지는 짧은 대기열에서 기다리게 합니다. 대기열까지 가득 차면 바로 거절합니다.
+
+- 종류별 한도: "chat"(AI 분석 스트림), "image"(타로 이미지 생성), "dream"(AI 꿈해몽)
+- 공정한 대기: 대기 중인 요청을 API Key(해시)별로 나눠 번갈아 입장시킴
+  (한 사용자가 요청을 많이 보내도 다른 사용자의 요청이 뒤로 밀리지 않음)
+- 대기 시간 제한: 제한 시간 안에 자리가 나지 않으면 거절
+- 거절 시 AdmissionRejected (retry_after: 다시 시도할 때까지 권장 대기 초)
+- 실행 수, 대기 수, 대기 시간 통계를 utils.metrics에 "admission"으로 등록
+
+환경 변수 (종류 이름은 대문자, 예: AI_CHAT_CONCURRENCY):
+    AI_<종류>_CONCURRENCY: 동시에 실행할 수 있는 요청 수 (기본 chat 8, image 2, dream 4)
+    AI_<종류>_QUEUE: 실행 중인 요청 외에 기다릴 수 있는 요청 수 (기본 chat 16, image 4, dream 8)
+    AI_ADMISSION_WAIT_SECONDS: 대기열에서 기다리는 최대 시간(초, 기본 10)
+
+이벤트 루프 하나에서만 사용합니다 (스레드 안전하지 않음).
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(RuntimeError):
+    """동시 실행 한도와 대기열이 가득 찼거나 대기 시간이 초과됨"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Permit:
+    """입장 허가. release()는 여러 번 호출해도 한 번만 반영됩니다."""
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._acquired_at = time.monotonic()
+        self.released = False
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+        self._limiter._release(time.monotonic() - self._acquired_at)
+
+    def release_after(self, *futures):
+        """
+        futures(작업, 스레드 실행 등)가 모두 끝나면 반납합니다.
+        요청이 취소되어도 업스트림 호출이 끝날 때까지 자리를 차지해 실제 동시 호출 수를 제한합니다.
+        """
+        pending = set(futures)
+        if not pending:
+            self.release()
+            return
+
+        def done(future):
+            if not future.cancelled():
+                # 기다리던 요청이 취소되어 결과를 가져가지 않아도 경고가 남지 않도록 함
+                future.exception()
+            pending.discard(future)
+            if not pending:
+                self.release()
+
+        for future in pending:
+            future.add_done_callback(done)
+
+
+class AdmissionLimiter:
+    """종류 하나에 대한 동시 실행 한도 + 소유자별 번갈아 입장하는 대기열"""
+
+    def __init__(self, name, limit=8, max_queue=16, max_wait=10.0):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._in_flight = 0
+        self._waiting = OrderedDict()  # 소유자 -> 대기 중인 Future의 deque (앞 소유자부터 입장)
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._waited = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._hold_total = 0.0
+        self._released = 0
+
+    def _retry_after(self):
+        # 평균 실행 시간 기준으로 대기열이 한 번 빠지는 데 걸리는 시간을 추정
+        avg_hold = self._hold_total / self._released if self._released else 1.0
+        return max(1, math.ceil(avg_hold * (self._queued + 1) / self.limit))
+
+    async def acquire(self, owner=None):
+        """
+        자리가 있으면 바로, 없으면 대기열에서 기다렸다가 Permit을 반환합니다.
+
+        Args:
+            owner: 공정한 대기에 쓰는 요청 소유자 (예: API Key 해시, None이면 익명 한 그룹)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나 max_wait 안에 자리가 나지 않음
+        """
+        if self._in_flight < self.limit and not self._queued:
+            self._in_flight += 1
+            self._admitted += 1
+            return Permit(self)
+        if self._queued >= self.max_queue:
+            self._rejected += 1
+            raise AdmissionRejected("요청이 많아 AI 분석 대기열이 가득 찼습니다.", self._retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(owner, deque()).append(future)
+        self._queued += 1
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._rejected += 1
+            self._abandon(owner, future)
+            raise AdmissionRejected("요청이 많아 AI 분석 대기 시간이 초과되었습니다.", self._retry_after())
+        except asyncio.CancelledError:
+            self._abandon(owner, future)
+            raise
+        waited = time.monotonic() - started_at
+        self._waited += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return future.result()
+
+    def _abandon(self, owner, future):
+        """기다리다 포기한 요청 정리 (그 사이 자리를 넘겨받았다면 다음 요청에게 넘김)"""
+        if future.done() and not future.cancelled():
+            future.result().release()
+            return
+        future.cancel()
+        waiters = self._waiting.get(owner)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            self._queued -= 1
+            if not waiters:
+                del self._waiting[owner]
+
+    def _release(self, held):
+        self._released += 1
+        self._hold_total += held
+        # 다음 소유자의 가장 오래 기다린 요청에게 자리를 바로 넘김 (실행 수는 그대로)
+        while self._waiting:
+            owner, waiters = next(iter(self._waiting.items()))
+            future = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                self._waiting.move_to_end(owner)
+            else:
+                del self._waiting[owner]
+            if not future.done():
+                self._admitted += 1
+                future.set_result(Permit(self))
+                return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, owner=None):
+        """async with 블록 동안 자리를 차지합니다."""
+        permit = await self.acquire(owner)
+        try:
+            yield permit
+        finally:
+            permit.release()
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "max_wait": self.max_wait,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "queued_owners": len(self._waiting),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+            "avg_queue_wait_ms": round(self._wait_total / self._waited * 1000, 3) if self._waited else 0.0,
+            "max_queue_wait_ms": round(self._wait_max * 1000, 3),
+            "avg_hold_ms": round(self._hold_total / self._released * 1000, 3) if self._released else 0.0
+        }
+
+
+def _limiter(name, limit, max_queue):
+    suffix = name.upper()
+    return AdmissionLimiter(
+        name,
+        limit=int(os.getenv(f"AI_{suffix}_CONCURRENCY", str(limit))),
+        max_queue=int(os.getenv(f"AI_{suffix}_QUEUE", str(max_queue))),
+        max_wait=float(os.getenv("AI_ADMISSION_WAIT_SECONDS", "10"))
+    )
+
+
+chat_admission = _limiter("chat", 8, 16)
+image_admission = _limiter("image", 2, 4)
+dream_admission = _limiter("dream", 4, 8)
+
+
+def stats():
+    return {limiter.name: limiter.stats() for limiter in (chat_admission, image_admission, dream_admission)}
+
+
+metrics.register("admission", stats)
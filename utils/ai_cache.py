@@ -0,0 +1,207 @@
+"""
+AI 분석 결과 캐시
+같은 입력(시스템 프롬프트 버전 + 정규화된 입력 JSON)에 대한 AI 분석 결과를 저장해
+다시 요청되면 모델을 호출하지 않고 SSE 이벤트로 재생합니다.
+
+- 키: 분석 종류, 모델, 시스템 프롬프트 해시, 입력 JSON(키 정렬)의 SHA-256
+- 메모리(LRU + TTL)를 먼저 조회하고, 설정 시 SQLite 파일을 2차 저장소로 사용
+- API Key는 키에 포함하지 않음 (같은 입력이면 사용자와 관계없이 같은 결과를 재사용)
+
+환경 변수:
+    AI_CACHE_SIZE: 메모리에 보관할 결과 수 (기본 512, 0이면 캐시 사용 안 함)
+    AI_CACHE_TTL: 결과 보관 시간(초, 기본 604800 = 7일)
+    AI_CACHE_DB: SQLite 파일 경로 (미설정 시 메모리만 사용)
+    AI_CACHE_DB_SIZE: SQLite에 보관할 결과 수 (기본 10000)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from utils import metrics
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 요청 메시지 구성 방식이 바뀌면 올려서 기존 결과를 무효화
+CACHE_VERSION = 1
+
+
+def canonical_json(data):
+    """키 순서와 공백에 영향받지 않는 JSON 문자열"""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def make_key(kind, model, system_prompt, input_data):
+    """
+    캐시 키를 만듭니다.
+
+    Args:
+        kind: 분석 종류 (예: "saju", "gonghap")
+        model: 모델 이름
+        system_prompt: 시스템 프롬프트 원문 (내용이 바뀌면 키도 바뀜)
+        input_data: 요청 메시지를 만드는 데 쓰인 입력 (JSON 직렬화 가능)
+    """
+    prompt_version = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+    material = canonical_json({
+        "v": CACHE_VERSION,
+        "kind": kind,
+        "model": model,
+        "prompt": prompt_version,
+        "input": input_data
+    })
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _SQLiteStore:
+    """분석 결과를 JSON 문자열로 저장하는 SQLite 저장소 (오래 저장된 순서로 제거)"""
+
+    def __init__(self, path, maxsize, ttl):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ai_cache_created ON ai_cache (created_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl is not None and created_at + self.ttl <= time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now)
+            )
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM ai_cache WHERE created_at <= ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM ai_cache WHERE key IN "
+                "(SELECT key FROM ai_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            )
+            self._conn.commit()
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+
+
+class AnalysisCache:
+    """메모리 + (선택) SQLite 2단 AI 분석 결과 캐시"""
+
+    def __init__(self, maxsize=512, ttl=604800, db_path=None, db_maxsize=10000):
+        self.enabled = maxsize > 0
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl) if self.enabled else None
+        self._db = None
+        self.db_hits = 0
+        self.db_errors = 0
+        if self.enabled and db_path:
+            try:
+                self._db = _SQLiteStore(db_path, db_maxsize, ttl)
+                logger.info(f"AI 분석 캐시 SQLite 사용: {db_path}")
+            except sqlite3.Error as e:
+                # 파일을 열 수 없으면 메모리 캐시만 사용
+                logger.warning(f"AI 분석 캐시 SQLite 초기화 실패, 메모리만 사용: {e}")
+
+    def get(self, key):
+        """결과를 조회합니다. 없으면 None (SQLite 조회는 호출 스레드를 막음)"""
+        if not self.enabled:
+            return None
+        value = self._memory.get(key)
+        if value is None and self._db is not None:
+            value = self._db_get(key)
+        return value
+
+    async def aget(self, key):
+        """get의 비동기 버전: SQLite 조회는 스레드에서 실행"""
+        if not self.enabled:
+            return None
+        value = self._memory.get(key)
+        if value is None and self._db is not None:
+            value = await asyncio.to_thread(self._db_get, key)
+        return value
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        self._memory.set(key, value)
+        if self._db is not None:
+            self._db_set(key, value)
+
+    async def aset(self, key, value):
+        if not self.enabled:
+            return
+        self._memory.set(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, value)
+
+    def _db_get(self, key):
+        try:
+            value = self._db.get(key)
+        except (sqlite3.Error, ValueError) as e:
+            self.db_errors += 1
+            logger.warning(f"AI 분석 캐시 조회 실패: {e}")
+            return None
+        if value is not None:
+            self.db_hits += 1
+            self._memory.set(key, value)
+        return value
+
+    def _db_set(self, key, value):
+        try:
+            self._db.set(key, value)
+        except sqlite3.Error as e:
+            self.db_errors += 1
+            logger.warning(f"AI 분석 캐시 저장 실패: {e}")
+
+    def clear(self):
+        if self._memory is not None:
+            self._memory.clear()
+
+    def stats(self):
+        if not self.enabled:
+            return {"enabled": False}
+        result = {"enabled": True, **self._memory.stats()}
+        if self._db is not None:
+            try:
+                db_size = self._db.size()
+            except sqlite3.Error:
+                db_size = None
+            result["db"] = {
+                "path": self._db.path,
+                "size": db_size,
+                "maxsize": self._db.maxsize,
+                "hits": self.db_hits,
+                "errors": self.db_errors
+            }
+        return result
+
+
+analysis_cache = AnalysisCache(
+    maxsize=int(os.getenv("AI_CACHE_SIZE", "512")),
+    ttl=int(os.getenv("AI_CACHE_TTL", "604800")),
+    db_path=os.getenv("AI_CACHE_DB") or None,
+    db_maxsize=int(os.getenv("AI_CACHE_DB_SIZE", "10000"))
+)
+metrics.register("ai_cache", analysis_cache.stats)
@@ -1,6 +1,11 @@
 """
 별자리 계산 및 운세 유틸리티
+
+운세 함수는 (별자리, 날짜)만으로 결과가 정해집니다.
+별자리 이름의 해시는 _stable_hash를 사용해 프로세스(워커)나 재시작과 관계없이 항상 같은 운세가 나옵니다.
+(내장 hash()는 문자열 해시가 프로세스마다 달라져 워커마다 운세가 달랐음)
 """
+import hashlib
 from datetime import datetime
 
 
@@ -21,6 +26,11 @@ CONSTELLATION_DATES = [
 ]
 
 
+def _stable_hash(text):
+    """프로세스와 관계없이 항상 같은 값을 주는 문자열 해시 (0 이상 정수)"""
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
 def get_constellation(birth_date):
     """
     생년월일을 기준으로 별자리를 반환합니다.
@@ -52,146 +62,147 @@ def get_constellation(birth_date):
     return ("알 수 없음", "✨", "Unknown")
 
 
+_INFO_MAP = {
+    "양자리": {
+        "period": "3월 21일 ~ 4월 19일",
+        "planet": "화성",
+        "element": "불",
+        "traits": "적극적이고 리더십이 강하며 용맹한 성격",
+        "detailed_traits": {
+            "강점": ["리더십", "용기", "결단력", "독립성", "적극성"],
+            "약점": ["성급함", "경솔함", "고집", "참을성 부족"],
+            "성격": "양자리는 불의 원소를 가진 카디널 사인으로, 새로운 시작을 이끄는 선도자입니다. 자신감이 넘치고 목표 지향적이며, 도전을 두려워하지 않습니다. 솔직하고 직설적인 커뮤니케이션 스타일을 가지고 있습니다."
+        }
+    },
+    "황소자리": {
+        "period": "4월 20일 ~ 5월 20일",
+        "planet": "금성",
+        "element": "흙",
+        "traits": "안정적이고 신중하며 인내심이 강한 성격",
+        "detailed_traits": {
+            "강점": ["인내심", "안정성", "신뢰성", "실용성", "감각적"],
+            "약점": ["고집", "변화 거부", "소유욕", "게으름"],
+            "성격": "황소자리는 흙의 원소를 가진 픽스드 사인으로, 안정과 지속성을 중시합니다. 실용적이고 감각적이며, 아름다운 것과 편안함을 사랑합니다. 신중하고 신뢰할 수 있는 파트너이자 친구입니다."
+        }
+    },
+    "쌍둥이자리": {
+        "period": "5월 21일 ~ 6월 21일",
+        "planet": "수성",
+        "element": "공기",
+        "traits": "호기심 많고 지적이며 사교적인 성격",
+        "detailed_traits": {
+            "강점": ["호기심", "적응력", "소통 능력", "지적 능력", "다재다능"],
+            "약점": ["변덕", "표면적", "불안정", "결단력 부족"],
+            "성격": "쌍둥이자리는 공기의 원소를 가진 뮤터블 사인으로, 변화와 소통을 사랑합니다. 호기심이 많고 배움을 좋아하며, 다양한 주제에 관심을 가집니다. 유머 감각이 뛰어나고 사교적입니다."
+        }
+    },
+    "게자리": {
+        "period": "6월 22일 ~ 7월 22일",
+        "planet": "달",
+        "element": "물",
+        "traits": "감성적이고 보호 본능이 강하며 가정을 중시",
+        "detailed_traits": {
+            "강점": ["보호 본능", "직관력", "공감 능력", "충성심", "상상력"],
+            "약점": ["과보호", "기분 변동", "과거 집착", "방어적"],
+            "성격": "게자리는 물의 원소를 가진 카디널 사인으로, 감정과 가정을 가장 중요하게 생각합니다. 직관력이 뛰어나고 타인을 보호하려는 강한 본능이 있습니다. 감성적이고 기억력이 좋습니다."
+        }
+    },
+    "사자자리": {
+        "period": "7월 23일 ~ 8월 22일",
+        "planet": "태양",
+        "element": "불",
+        "traits": "자신감 있고 열정적이며 표현력이 뛰어남",
+        "detailed_traits": {
+            "강점": ["자신감", "창의성", "관대함", "리더십", "열정"],
+            "약점": ["자만", "과시욕", "고집", "비판에 민감"],
+            "성격": "사자자리는 불의 원소를 가진 픽스드 사인으로, 태양의 축복을 받은 별자리입니다. 자신감이 넘치고 창의적이며, 주목받는 것을 좋아합니다. 관대하고 따뜻한 마음을 가지고 있습니다."
+        }
+    },
+    "처녀자리": {
+        "period": "8월 23일 ~ 9월 22일",
+        "planet": "수성",
+        "element": "흙",
+        "traits": "완벽주의적이고 체계적이며 분석력이 뛰어남",
+        "detailed_traits": {
+            "강점": ["분석력", "실용성", "신뢰성", "세심함", "근면성"],
+            "약점": ["과도한 비판", "걱정", "완벽주의", "유연성 부족"],
+            "성격": "처녀자리는 흙의 원소를 가진 뮤터블 사인으로, 완벽과 질서를 추구합니다. 분석적이고 실용적이며, 세부사항에 주의를 기울입니다. 타인을 도우려는 마음이 강합니다."
+        }
+    },
+    "천칭자리": {
+        "period": "9월 23일 ~ 10월 22일",
+        "planet": "금성",
+        "element": "공기",
+        "traits": "조화롭고 균형감각이 있으며 미적 감각이 뛰어남",
+        "detailed_traits": {
+            "강점": ["균형감각", "공정성", "협조성", "미적 감각", "매력"],
+            "약점": ["우유부단", "갈등 회피", "표면적", "결단력 부족"],
+            "성격": "천칭자리는 공기의 원소를 가진 카디널 사인으로, 균형과 조화를 추구합니다. 공정하고 협조적이며, 아름다운 환경을 좋아합니다. 인간관계에서 중재자 역할을 잘합니다."
+        }
+    },
+    "전갈자리": {
+        "period": "10월 23일 ~ 11월 22일",
+        "planet": "화성, 명왕성",
+        "element": "물",
+        "traits": "강렬하고 신비로우며 집중력이 뛰어남",
+        "detailed_traits": {
+            "강점": ["집중력", "직관력", "결단력", "강인함", "변화 능력"],
+            "약점": ["질투", "복수심", "비밀주의", "과도한 집착"],
+            "성격": "전갈자리는 물의 원소를 가진 픽스드 사인으로, 강렬하고 깊이 있는 에너지를 가지고 있습니다. 신비롭고 강인하며, 진실을 추구합니다. 한번 결정하면 끝까지 밀고 나가는 힘이 있습니다."
+        }
+    },
+    "사수자리": {
+        "period": "11월 23일 ~ 12월 21일",
+        "planet": "목성",
+        "element": "불",
+        "traits": "낙천적이고 모험심이 강하며 철학적 사고",
+        "detailed_traits": {
+            "강점": ["낙천성", "모험심", "철학적", "정직함", "자유로운 영혼"],
+            "약점": ["성급함", "무책임", "직설적", "약속 불이행"],
+            "성격": "사수자리는 불의 원소를 가진 뮤터블 사인으로, 자유와 모험을 사랑합니다. 낙천적이고 철학적이며, 새로운 경험을 추구합니다. 진실을 말하는 것을 두려워하지 않습니다."
+        }
+    },
+    "염소자리": {
+        "period": "12월 22일 ~ 1월 19일",
+        "planet": "토성",
+        "element": "흙",
+        "traits": "책임감 있고 현실적이며 야망이 큼",
+        "detailed_traits": {
+            "강점": ["책임감", "현실성", "인내력", "야망", "신뢰성"],
+            "약점": ["비관적", "냉정함", "완고함", "유머 부족"],
+            "성격": "염소자리는 흙의 원소를 가진 카디널 사인으로, 야망과 성취를 추구합니다. 현실적이고 책임감이 강하며, 장기적인 계획을 세우는 것을 좋아합니다. 끈기와 인내력이 뛰어납니다."
+        }
+    },
+    "물병자리": {
+        "period": "1월 20일 ~ 2월 18일",
+        "planet": "천왕성, 토성",
+        "element": "공기",
+        "traits": "독창적이고 진보적이며 인도주의적",
+        "detailed_traits": {
+            "강점": ["독창성", "진보성", "인도주의", "지적 호기심", "독립성"],
+            "약점": ["감정 표현 어려움", "고집", "예측 불가능", "거리감"],
+            "성격": "물병자리는 공기의 원소를 가진 픽스드 사인으로, 독창성과 자유를 중시합니다. 진보적이고 인도주의적이며, 새로운 아이디어를 좋아합니다. 인간관계에서 독립적이고 독특합니다."
+        }
+    },
+    "물고기자리": {
+        "period": "2월 19일 ~ 3월 20일",
+        "planet": "해왕성, 목성",
+        "element": "물",
+        "traits": "직관력이 뛰어나고 감성적이며 상상력이 풍부",
+        "detailed_traits": {
+            "강점": ["직관력", "공감 능력", "창의성", "상상력", "영성"],
+            "약점": ["현실 감각 부족", "도피성", "결단력 부족", "과도한 감정"],
+            "성격": "물고기자리는 물의 원소를 가진 뮤터블 사인으로, 직관과 감성을 중시합니다. 공감 능력이 뛰어나고 창의적이며, 영적인 면을 가지고 있습니다. 타인의 감정을 잘 이해합니다."
+        }
+    },
+}
+
+
 def get_constellation_info(korean_name):
     """
     별자리 기본 정보를 반환합니다.
     """
-    info_map = {
-        "양자리": {
-            "period": "3월 21일 ~ 4월 19일",
-            "planet": "화성",
-            "element": "불",
-            "traits": "적극적이고 리더십이 강하며 용맹한 성격",
-            "detailed_traits": {
-                "강점": ["리더십", "용기", "결단력", "독립성", "적극성"],
-                "약점": ["성급함", "경솔함", "고집", "참을성 부족"],
-                "성격": "양자리는 불의 원소를 가진 카디널 사인으로, 새로운 시작을 이끄는 선도자입니다. 자신감이 넘치고 목표 지향적이며, 도전을 두려워하지 않습니다. 솔직하고 직설적인 커뮤니케이션 스타일을 가지고 있습니다."
-            }
-        },
-        "황소자리": {
-            "period": "4월 20일 ~ 5월 20일",
-            "planet": "금성",
-            "element": "흙",
-            "traits": "안정적이고 신중하며 인내심이 강한 성격",
-            "detailed_traits": {
-                "강점": ["인내심", "안정성", "신뢰성", "실용성", "감각적"],
-                "약점": ["고집", "변화 거부", "소유욕", "게으름"],
-                "성격": "황소자리는 흙의 원소를 가진 픽스드 사인으로, 안정과 지속성을 중시합니다. 실용적이고 감각적이며, 아름다운 것과 편안함을 사랑합니다. 신중하고 신뢰할 수 있는 파트너이자 친구입니다."
-            }
-        },
-        "쌍둥이자리": {
-            "period": "5월 21일 ~ 6월 21일",
-            "planet": "수성",
-            "element": "공기",
-            "traits": "호기심 많고 지적이며 사교적인 성격",
-            "detailed_traits": {
-                "강점": ["호기심", "적응력", "소통 능력", "지적 능력", "다재다능"],
-                "약점": ["변덕", "표면적", "불안정", "결단력 부족"],
-                "성격": "쌍둥이자리는 공기의 원소를 가진 뮤터블 사인으로, 변화와 소통을 사랑합니다. 호기심이 많고 배움을 좋아하며, 다양한 주제에 관심을 가집니다. 유머 감각이 뛰어나고 사교적입니다."
-            }
-        },
-        "게자리": {
-            "period": "6월 22일 ~ 7월 22일",
-            "planet": "달",
-            "element": "물",
-            "traits": "감성적이고 보호 본능이 강하며 가정을 중시",
-            "detailed_traits": {
-                "강점": ["보호 본능", "직관력", "공감 능력", "충성심", "상상력"],
-                "약점": ["과보호", "기분 변동", "과거 집착", "방어적"],
-                "성격": "게자리는 물의 원소를 가진 카디널 사인으로, 감정과 가정을 가장 중요하게 생각합니다. 직관력이 뛰어나고 타인을 보호하려는 강한 본능이 있습니다. 감성적이고 기억력이 좋습니다."
-            }
-        },
-        "사자자리": {
-            "period": "7월 23일 ~ 8월 22일",
-            "planet": "태양",
-            "element": "불",
-            "traits": "자신감 있고 열정적이며 표현력이 뛰어남",
-            "detailed_traits": {
-                "강점": ["자신감", "창의성", "관대함", "리더십", "열정"],
-                "약점": ["자만", "과시욕", "고집", "비판에 민감"],
-                "성격": "사자자리는 불의 원소를 가진 픽스드 사인으로, 태양의 축복을 받은 별자리입니다. 자신감이 넘치고 창의적이며, 주목받는 것을 좋아합니다. 관대하고 따뜻한 마음을 가지고 있습니다."
-            }
-        },
-        "처녀자리": {
-            "period": "8월 23일 ~ 9월 22일",
-            "planet": "수성",
-            "element": "흙",
-            "traits": "완벽주의적이고 체계적이며 분석력이 뛰어남",
-            "detailed_traits": {
-                "강점": ["분석력", "실용성", "신뢰성", "세심함", "근면성"],
-                "약점": ["과도한 비판", "걱정", "완벽주의", "유연성 부족"],
-                "성격": "처녀자리는 흙의 원소를 가진 뮤터블 사인으로, 완벽과 질서를 추구합니다. 분석적이고 실용적이며, 세부사항에 주의를 기울입니다. 타인을 도우려는 마음이 강합니다."
-            }
-        },
-        "천칭자리": {
-            "period": "9월 23일 ~ 10월 22일",
-            "planet": "금성",
-            "element": "공기",
-            "traits": "조화롭고 균형감각이 있으며 미적 감각이 뛰어남",
-            "detailed_traits": {
-                "강점": ["균형감각", "공정성", "협조성", "미적 감각", "매력"],
-                "약점": ["우유부단", "갈등 회피", "표면적", "결단력 부족"],
-                "성격": "천칭자리는 공기의 원소를 가진 카디널 사인으로, 균형과 조화를 추구합니다. 공정하고 협조적이며, 아름다운 환경을 좋아합니다. 인간관계에서 중재자 역할을 잘합니다."
-            }
-        },
-        "전갈자리": {
-            "period": "10월 23일 ~ 11월 22일",
-            "planet": "화성, 명왕성",
-            "element": "물",
-            "traits": "강렬하고 신비로우며 집중력이 뛰어남",
-            "detailed_traits": {
-                "강점": ["집중력", "직관력", "결단력", "강인함", "변화 능력"],
-                "약점": ["질투", "복수심", "비밀주의", "과도한 집착"],
-                "성격": "전갈자리는 물의 원소를 가진 픽스드 사인으로, 강렬하고 깊이 있는 에너지를 가지고 있습니다. 신비롭고 강인하며, 진실을 추구합니다. 한번 결정하면 끝까지 밀고 나가는 힘이 있습니다."
-            }
-        },
-        "사수자리": {
-            "period": "11월 23일 ~ 12월 21일",
-            "planet": "목성",
-            "element": "불",
-            "traits": "낙천적이고 모험심이 강하며 철학적 사고",
-            "detailed_traits": {
-                "강점": ["낙천성", "모험심", "철학적", "정직함", "자유로운 영혼"],
-                "약점": ["성급함", "무책임", "직설적", "약속 불이행"],
-                "성격": "사수자리는 불의 원소를 가진 뮤터블 사인으로, 자유와 모험을 사랑합니다. 낙천적이고 철학적이며, 새로운 경험을 추구합니다. 진실을 말하는 것을 두려워하지 않습니다."
-            }
-        },
-        "염소자리": {
-            "period": "12월 22일 ~ 1월 19일",
-            "planet": "토성",
-            "element": "흙",
-            "traits": "책임감 있고 현실적이며 야망이 큼",
-            "detailed_traits": {
-                "강점": ["책임감", "현실성", "인내력", "야망", "신뢰성"],
-                "약점": ["비관적", "냉정함", "완고함", "유머 부족"],
-                "성격": "염소자리는 흙의 원소를 가진 카디널 사인으로, 야망과 성취를 추구합니다. 현실적이고 책임감이 강하며, 장기적인 계획을 세우는 것을 좋아합니다. 끈기와 인내력이 뛰어납니다."
-            }
-        },
-        "물병자리": {
-            "period": "1월 20일 ~ 2월 18일",
-            "planet": "천왕성, 토성",
-            "element": "공기",
-            "traits": "독창적이고 진보적이며 인도주의적",
-            "detailed_traits": {
-                "강점": ["독창성", "진보성", "인도주의", "지적 호기심", "독립성"],
-                "약점": ["감정 표현 어려움", "고집", "예측 불가능", "거리감"],
-                "성격": "물병자리는 공기의 원소를 가진 픽스드 사인으로, 독창성과 자유를 중시합니다. 진보적이고 인도주의적이며, 새로운 아이디어를 좋아합니다. 인간관계에서 독립적이고 독특합니다."
-            }
-        },
-        "물고기자리": {
-            "period": "2월 19일 ~ 3월 20일",
-            "planet": "해왕성, 목성",
-            "element": "물",
-            "traits": "직관력이 뛰어나고 감성적이며 상상력이 풍부",
-            "detailed_traits": {
-                "강점": ["직관력", "공감 능력", "창의성", "상상력", "영성"],
-                "약점": ["현실 감각 부족", "도피성", "결단력 부족", "과도한 감정"],
-                "성격": "물고기자리는 물의 원소를 가진 뮤터블 사인으로, 직관과 감성을 중시합니다. 공감 능력이 뛰어나고 창의적이며, 영적인 면을 가지고 있습니다. 타인의 감정을 잘 이해합니다."
-            }
-        },
-    }
-    
-    return info_map.get(korean_name, {
+    return _INFO_MAP.get(korean_name, {
         "period": "-",
         "planet": "-",
         "element": "-",
@@ -204,50 +215,52 @@ def get_constellation_info(korean_name):
     })
 
 
+_DAILY_FORTUNES = [
+    {"level": "최고", "color": "#2ecc71", "emoji": "🌟", "message": "오늘은 운이 매우 좋은 날입니다. 중요한 결정을 내리거나 새로운 시작을 하기에 완벽한 시기입니다.", "love": "연인이나 배우자와의 관계가 깊어지는 날입니다.", "work": "업무에서 좋은 성과를 거둘 수 있는 기회가 찾아옵니다.", "health": "건강 상태가 양호하며 활력이 넘칩니다."},
+    {"level": "좋음", "color": "#3498db", "emoji": "✨", "message": "오늘은 긍정적인 에너지가 흐르는 날입니다. 계획했던 일들을 진행하기에 좋은 시기입니다.", "love": "사랑하는 사람들과의 소통이 원활합니다.", "work": "협업을 통해 좋은 결과를 얻을 수 있습니다.", "health": "신체적, 정신적 건강이 안정적입니다."},
+    {"level": "보통", "color": "#f39c12", "emoji": "⭐", "message": "오늘은 평범한 하루입니다. 무리하지 말고 꾸준히 노력하시면 좋은 결과를 얻을 수 있습니다.", "love": "관계에서 작은 노력이 큰 효과를 가져올 수 있습니다.", "work": "일상적인 업무에 집중하세요.", "health": "규칙적인 생활 패턴을 유지하세요."},
+    {"level": "주의", "color": "#e74c3c", "emoji": "⚠️", "message": "오늘은 신중함이 필요한 날입니다. 성급한 결정을 피하고 신중하게 행동하세요.", "love": "관계에서 오해가 생기지 않도록 소통에 주의하세요.", "work": "업무에서 실수를 하지 않도록 꼼꼼히 확인하세요.", "health": "무리한 활동을 피하고 휴식을 취하세요."},
+]
+
+
 def get_daily_fortune(korean_name, date):
     """오늘의 운세를 반환합니다."""
     day_of_year = date.timetuple().tm_yday
-    base_index = (hash(korean_name) + day_of_year) % 100
-    
-    fortunes = [
-        {"level": "최고", "color": "#2ecc71", "emoji": "🌟", "message": "오늘은 운이 매우 좋은 날입니다. 중요한 결정을 내리거나 새로운 시작을 하기에 완벽한 시기입니다.", "love": "연인이나 배우자와의 관계가 깊어지는 날입니다.", "work": "업무에서 좋은 성과를 거둘 수 있는 기회가 찾아옵니다.", "health": "건강 상태가 양호하며 활력이 넘칩니다."},
-        {"level": "좋음", "color": "#3498db", "emoji": "✨", "message": "오늘은 긍정적인 에너지가 흐르는 날입니다. 계획했던 일들을 진행하기에 좋은 시기입니다.", "love": "사랑하는 사람들과의 소통이 원활합니다.", "work": "협업을 통해 좋은 결과를 얻을 수 있습니다.", "health": "신체적, 정신적 건강이 안정적입니다."},
-        {"level": "보통", "color": "#f39c12", "emoji": "⭐", "message": "오늘은 평범한 하루입니다. 무리하지 말고 꾸준히 노력하시면 좋은 결과를 얻을 수 있습니다.", "love": "관계에서 작은 노력이 큰 효과를 가져올 수 있습니다.", "work": "일상적인 업무에 집중하세요.", "health": "규칙적인 생활 패턴을 유지하세요."},
-        {"level": "주의", "color": "#e74c3c", "emoji": "⚠️", "message": "오늘은 신중함이 필요한 날입니다. 성급한 결정을 피하고 신중하게 행동하세요.", "love": "관계에서 오해가 생기지 않도록 소통에 주의하세요.", "work": "업무에서 실수를 하지 않도록 꼼꼼히 확인하세요.", "health": "무리한 활동을 피하고 휴식을 취하세요."},
-    ]
+    base_index = (_stable_hash(korean_name) + day_of_year) % 100
     
     if base_index >= 80:
-        fortune = fortunes[0]
+        fortune = _DAILY_FORTUNES[0]
     elif base_index >= 60:
-        fortune = fortunes[1]
+        fortune = _DAILY_FORTUNES[1]
     elif base_index >= 30:
-        fortune = fortunes[2]
+        fortune = _DAILY_FORTUNES[2]
     else:
-        fortune = fortunes[3]
+        fortune = _DAILY_FORTUNES[3]
     
     return fortune
 
 
+_WEEKLY_MESSAGES = [
+    "이번 주는 큰 변화와 새로운 기회가 찾아오는 주입니다. 적극적으로 도전하세요.",
+    "이번 주는 안정적인 흐름 속에서 꾸준한 발전을 이룰 수 있는 주입니다.",
+    "이번 주는 인내와 노력이 필요한 주입니다. 조급해하지 마시고 차근차근 나아가세요.",
+    "이번 주는 휴식과 재정비가 필요한 주입니다. 무리하지 말고 자신을 돌봐주세요."
+]
+
+
 def get_weekly_fortune(korean_name, date):
     """이번 주 운세를 반환합니다."""
     week_number = date.isocalendar()[1]
-    base_index = (hash(korean_name) + week_number) % 100
-    
-    messages = [
-        "이번 주는 큰 변화와 새로운 기회가 찾아오는 주입니다. 적극적으로 도전하세요.",
-        "이번 주는 안정적인 흐름 속에서 꾸준한 발전을 이룰 수 있는 주입니다.",
-        "이번 주는 인내와 노력이 필요한 주입니다. 조급해하지 마시고 차근차근 나아가세요.",
-        "이번 주는 휴식과 재정비가 필요한 주입니다. 무리하지 말고 자신을 돌봐주세요."
-    ]
+    base_index = (_stable_hash(korean_name) + week_number) % 100
     
     if base_index >= 70:
-        message = messages[0]
+        message = _WEEKLY_MESSAGES[0]
     elif base_index >= 40:
-        message = messages[1]
+        message = _WEEKLY_MESSAGES[1]
     elif base_index >= 20:
-        message = messages[2]
+        message = _WEEKLY_MESSAGES[2]
     else:
-        message = messages[3]
+        message = _WEEKLY_MESSAGES[3]
     
     return {"message": message}
 
@@ -271,7 +284,7 @@ def get_monthly_fortune(korean_name, date):
 
 def get_yearly_fortune(korean_name, year):
     """올해의 운세를 반환합니다."""
-    base_index = (hash(korean_name) + year) % 100
+    base_index = (_stable_hash(korean_name) + year) % 100
     
     themes = [
         {"theme": "변화와 성장", "message": f"{year}년은 큰 변화와 성장의 해가 될 것입니다. 새로운 도전을 두려워하지 마시고 적극적으로 나아가시면 큰 성과를 거둘 수 있습니다."},
@@ -287,171 +300,172 @@ def get_yearly_fortune(korean_name, year):
         return themes[2]
 
 
+_LUCKY_MAP = {
+    "양자리": {"color": "빨간색, 주황색", "number": "1, 8, 17", "day": "화요일", "direction": "동쪽", "stone": "다이아몬드, 홍옥"},
+    "황소자리": {"color": "초록색, 분홍색", "number": "2, 6, 24", "day": "금요일", "direction": "북동쪽", "stone": "에메랄드, 장미석"},
+    "쌍둥이자리": {"color": "노란색, 회색", "number": "3, 12, 21", "day": "수요일", "direction": "북쪽", "stone": "진주, 아게이트"},
+    "게자리": {"color": "은색, 흰색", "number": "4, 7, 28", "day": "월요일", "direction": "북서쪽", "stone": "진주, 문스톤"},
+    "사자자리": {"color": "금색, 주황색", "number": "5, 19, 23", "day": "일요일", "direction": "남쪽", "stone": "호박, 시트린"},
+    "처녀자리": {"color": "베이지, 갈색", "number": "6, 15, 24", "day": "수요일", "direction": "남서쪽", "stone": "사파이어, 자수정"},
+    "천칭자리": {"color": "파란색, 분홍색", "number": "3, 6, 27", "day": "금요일", "direction": "동쪽", "stone": "오팔, 다이아몬드"},
+    "전갈자리": {"color": "빨간색, 검은색", "number": "4, 13, 22", "day": "화요일", "direction": "북쪽", "stone": "토파즈, 오닉스"},
+    "사수자리": {"color": "보라색, 남색", "number": "5, 14, 23", "day": "목요일", "direction": "남동쪽", "stone": "터키석, 아메지스트"},
+    "염소자리": {"color": "검은색, 갈색", "number": "8, 10, 26", "day": "토요일", "direction": "서쪽", "stone": "흑요석, 루비"},
+    "물병자리": {"color": "은색, 청록색", "number": "4, 7, 11", "day": "토요일", "direction": "남쪽", "stone": "아쿠아마린, 자수정"},
+    "물고기자리": {"color": "바다색, 보라색", "number": "3, 7, 12", "day": "목요일", "direction": "북동쪽", "stone": "아쿠아마린, 문스톤"},
+}
+
+
 def get_lucky_elements(korean_name):
     """행운의 요소를 반환합니다."""
-    lucky_map = {
-        "양자리": {"color": "빨간색, 주황색", "number": "1, 8, 17", "day": "화요일", "direction": "동쪽", "stone": "다이아몬드, 홍옥"},
-        "황소자리": {"color": "초록색, 분홍색", "number": "2, 6, 24", "day": "금요일", "direction": "북동쪽", "stone": "에메랄드, 장미석"},
-        "쌍둥이자리": {"color": "노란색, 회색", "number": "3, 12, 21", "day": "수요일", "direction": "북쪽", "stone": "진주, 아게이트"},
-        "게자리": {"color": "은색, 흰색", "number": "4, 7, 28", "day": "월요일", "direction": "북서쪽", "stone": "진주, 문스톤"},
-        "사자자리": {"color": "금색, 주황색", "number": "5, 19, 23", "day": "일요일", "direction": "남쪽", "stone": "호박, 시트린"},
-        "처녀자리": {"color": "베이지, 갈색", "number": "6, 15, 24", "day": "수요일", "direction": "남서쪽", "stone": "사파이어, 자수정"},
-        "천칭자리": {"color": "파란색, 분홍색", "number": "3, 6, 27", "day": "금요일", "direction": "동쪽", "stone": "오팔, 다이아몬드"},
-        "전갈자리": {"color": "빨간색, 검은색", "number": "4, 13, 22", "day": "화요일", "direction": "북쪽", "stone": "토파즈, 오닉스"},
-        "사수자리": {"color": "보라색, 남색", "number": "5, 14, 23", "day": "목요일", "direction": "남동쪽", "stone": "터키석, 아메지스트"},
-        "염소자리": {"color": "검은색, 갈색", "number": "8, 10, 26", "day": "토요일", "direction": "서쪽", "stone": "흑요석, 루비"},
-        "물병자리": {"color": "은색, 청록색", "number": "4, 7, 11", "day": "토요일", "direction": "남쪽", "stone": "아쿠아마린, 자수정"},
-        "물고기자리": {"color": "바다색, 보라색", "number": "3, 7, 12", "day": "목요일", "direction": "북동쪽", "stone": "아쿠아마린, 문스톤"},
-    }
-    
-    return lucky_map.get(korean_name, {"color": "-", "number": "-", "day": "-", "direction": "-", "stone": "-"})
+    return _LUCKY_MAP.get(korean_name, {"color": "-", "number": "-", "day": "-", "direction": "-", "stone": "-"})
+
+
+_COMPATIBILITY_MAP = {
+    "양자리": {"best": ["사자자리", "사수자리"], "good": ["쌍둥이자리", "물병자리"], "challenge": ["게자리", "염소자리", "천칭자리"]},
+    "황소자리": {"best": ["처녀자리", "염소자리"], "good": ["게자리", "물고기자리"], "challenge": ["사자자리", "전갈자리", "물병자리"]},
+    "쌍둥이자리": {"best": ["천칭자리", "물병자리"], "good": ["양자리", "사자자리"], "challenge": ["처녀자리", "사수자리", "물고기자리"]},
+    "게자리": {"best": ["전갈자리", "물고기자리"], "good": ["황소자리", "처녀자리"], "challenge": ["양자리", "천칭자리", "사수자리"]},
+    "사자자리": {"best": ["양자리", "사수자리"], "good": ["쌍둥이자리", "천칭자리"], "challenge": ["황소자리", "전갈자리", "염소자리"]},
+    "처녀자리": {"best": ["황소자리", "염소자리"], "good": ["게자리", "전갈자리"], "challenge": ["쌍둥이자리", "사수자리", "물병자리"]},
+    "천칭자리": {"best": ["쌍둥이자리", "물병자리"], "good": ["사자자리", "사수자리"], "challenge": ["게자리", "염소자리", "물고기자리"]},
+    "전갈자리": {"best": ["게자리", "물고기자리"], "good": ["처녀자리", "염소자리"], "challenge": ["양자리", "사자자리", "물병자리"]},
+    "사수자리": {"best": ["양자리", "사자자리"], "good": ["천칭자리", "물병자리"], "challenge": ["쌍둥이자리", "처녀자리", "물고기자리"]},
+    "염소자리": {"best": ["황소자리", "처녀자리"], "good": ["전갈자리", "물고기자리"], "challenge": ["양자리", "사자자리", "천칭자리"]},
+    "물병자리": {"best": ["쌍둥이자리", "천칭자리"], "good": ["양자리", "사수자리"], "challenge": ["황소자리", "전갈자리", "물고기자리"]},
+    "물고기자리": {"best": ["게자리", "전갈자리"], "good": ["황소자리", "염소자리"], "challenge": ["쌍둥이자리", "사수자리", "물병자리"]},
+}
 
 
 def get_compatibility(korean_name):
     """별자리 궁합을 반환합니다."""
-    compatibility_map = {
-        "양자리": {"best": ["사자자리", "사수자리"], "good": ["쌍둥이자리", "물병자리"], "challenge": ["게자리", "염소자리", "천칭자리"]},
-        "황소자리": {"best": ["처녀자리", "염소자리"], "good": ["게자리", "물고기자리"], "challenge": ["사자자리", "전갈자리", "물병자리"]},
-        "쌍둥이자리": {"best": ["천칭자리", "물병자리"], "good": ["양자리", "사자자리"], "challenge": ["처녀자리", "사수자리", "물고기자리"]},
-        "게자리": {"best": ["전갈자리", "물고기자리"], "good": ["황소자리", "처녀자리"], "challenge": ["양자리", "천칭자리", "사수자리"]},
-        "사자자리": {"best": ["양자리", "사수자리"], "good": ["쌍둥이자리", "천칭자리"], "challenge": ["황소자리", "전갈자리", "염소자리"]},
-        "처녀자리": {"best": ["황소자리", "염소자리"], "good": ["게자리", "전갈자리"], "challenge": ["쌍둥이자리", "사수자리", "물병자리"]},
-        "천칭자리": {"best": ["쌍둥이자리", "물병자리"], "good": ["사자자리", "사수자리"], "challenge": ["게자리", "염소자리", "물고기자리"]},
-        "전갈자리": {"best": ["게자리", "물고기자리"], "good": ["처녀자리", "염소자리"], "challenge": ["양자리", "사자자리", "물병자리"]},
-        "사수자리": {"best": ["양자리", "사자자리"], "good": ["천칭자리", "물병자리"], "challenge": ["쌍둥이자리", "처녀자리", "물고기자리"]},
-        "염소자리": {"best": ["황소자리", "처녀자리"], "good": ["전갈자리", "물고기자리"], "challenge": ["양자리", "사자자리", "천칭자리"]},
-        "물병자리": {"best": ["쌍둥이자리", "천칭자리"], "good": ["양자리", "사수자리"], "challenge": ["황소자리", "전갈자리", "물고기자리"]},
-        "물고기자리": {"best": ["게자리", "전갈자리"], "good": ["황소자리", "염소자리"], "challenge": ["쌍둥이자리", "사수자리", "물병자리"]},
-    }
-    
-    return compatibility_map.get(korean_name, {"best": [], "good": [], "challenge": []})
+    return _COMPATIBILITY_MAP.get(korean_name, {"best": [], "good": [], "challenge": []})
+
+
+_ADVICE_MAP = {
+    "양자리": "성급함을 조절하고 신중함을 기르세요. 때로는 한 걸음 물러서 전체를 보는 시각이 필요합니다.",
+    "황소자리": "변화를 두려워하지 마세요. 안정은 좋지만 새로운 경험도 가치가 있습니다.",
+    "쌍둥이자리": "깊이 있는 관계를 만들어보세요. 다양한 경험도 좋지만 깊이 있는 연결도 중요합니다.",
+    "게자리": "과거에 집착하지 말고 현재와 미래에 집중하세요. 감정을 표현하는 것을 두려워하지 마세요.",
+    "사자자리": "타인의 의견도 경청하세요. 자신감은 좋지만 겸손함도 가치가 있습니다.",
+    "처녀자리": "완벽을 추구하되 과도하지 않게 하세요. 때로는 '충분히 좋음'도 받아들일 수 있습니다.",
+    "천칭자리": "결단력 있게 행동하세요. 균형은 중요하지만 결정을 미루는 것은 좋지 않습니다.",
+    "전갈자리": "신뢰를 구축하고 감정을 공유하세요. 강인함도 좋지만 취약함을 보여주는 것도 용기입니다.",
+    "사수자리": "책임감을 키우고 약속을 지키세요. 자유로운 영혼도 신뢰를 받아야 합니다.",
+    "염소자리": "즐거움과 휴식을 허용하세요. 성취도 중요하지만 삶의 즐거움도 잊지 마세요.",
+    "물병자리": "감정을 표현하는 법을 배우세요. 독립성도 좋지만 연결과 소통도 중요합니다.",
+    "물고기자리": "현실 감각을 기르고 행동으로 옮기세요. 상상력도 좋지만 실행력도 필요합니다.",
+}
 
 
 def get_constellation_advice(korean_name):
     """별자리별 조언을 반환합니다."""
-    advice_map = {
-        "양자리": "성급함을 조절하고 신중함을 기르세요. 때로는 한 걸음 물러서 전체를 보는 시각이 필요합니다.",
-        "황소자리": "변화를 두려워하지 마세요. 안정은 좋지만 새로운 경험도 가치가 있습니다.",
-        "쌍둥이자리": "깊이 있는 관계를 만들어보세요. 다양한 경험도 좋지만 깊이 있는 연결도 중요합니다.",
-        "게자리": "과거에 집착하지 말고 현재와 미래에 집중하세요. 감정을 표현하는 것을 두려워하지 마세요.",
-        "사자자리": "타인의 의견도 경청하세요. 자신감은 좋지만 겸손함도 가치가 있습니다.",
-        "처녀자리": "완벽을 추구하되 과도하지 않게 하세요. 때로는 '충분히 좋음'도 받아들일 수 있습니다.",
-        "천칭자리": "결단력 있게 행동하세요. 균형은 중요하지만 결정을 미루는 것은 좋지 않습니다.",
-        "전갈자리": "신뢰를 구축하고 감정을 공유하세요. 강인함도 좋지만 취약함을 보여주는 것도 용기입니다.",
-        "사수자리": "책임감을 키우고 약속을 지키세요. 자유로운 영혼도 신뢰를 받아야 합니다.",
-        "염소자리": "즐거움과 휴식을 허용하세요. 성취도 중요하지만 삶의 즐거움도 잊지 마세요.",
-        "물병자리": "감정을 표현하는 법을 배우세요. 독립성도 좋지만 연결과 소통도 중요합니다.",
-        "물고기자리": "현실 감각을 기르고 행동으로 옮기세요. 상상력도 좋지만 실행력도 필요합니다.",
+    return _ADVICE_MAP.get(korean_name, "자신을 믿고 꾸준히 노력하세요.")
+
+
+_LIFE_ASPECTS_MAP = {
+    "양자리": {
+        "career": "리더십과 도전 정신이 돋보이는 시기입니다. 새로운 프로젝트를 시작하거나 승진을 노릴 수 있는 기회가 있습니다.",
+        "wealth": "투자와 수입 증가의 기회가 있습니다. 하지만 성급한 결정은 피하세요.",
+        "love": "적극적인 어필이 효과적입니다. 솔직한 감정 표현이 관계를 발전시킵니다.",
+        "health": "활동적인 운동이 좋습니다. 스트레스 관리에 주의하세요.",
+        "study": "집중력이 높은 시기입니다. 새로운 기술이나 언어를 배우기 좋습니다.",
+        "family": "가족과의 소통이 활발해집니다. 여행이나 활동을 함께하면 좋습니다."
+    },
+    "황소자리": {
+        "career": "안정적인 발전이 기대됩니다. 꾸준한 노력이 결과로 나타납니다.",
+        "wealth": "저축과 투자가 좋은 시기입니다. 신중한 판단이 재물을 모읍니다.",
+        "love": "진실한 감정이 관계를 깊게 만듭니다. 서두르지 말고 천천히 알아가세요.",
+        "health": "규칙적인 생활과 식습관 관리가 중요합니다. 과식에 주의하세요.",
+        "study": "기초를 탄탄히 하는 시기입니다. 체계적인 학습이 도움이 됩니다.",
+        "family": "가정의 평화와 안정이 중요합니다. 가족과의 시간을 소중히 하세요."
+    },
+    "쌍둥이자리": {
+        "career": "소통과 협업이 중요한 시기입니다. 네트워킹이 기회를 가져옵니다.",
+        "wealth": "다양한 수입원을 모색하세요. 정보 수집이 재물 운을 높입니다.",
+        "love": "대화와 소통이 관계의 핵심입니다. 흥미로운 이야기로 마음을 사로잡으세요.",
+        "health": "정신적 휴식이 필요합니다. 스트레스를 줄이고 여유를 가지세요.",
+        "study": "다양한 주제에 관심을 가져보세요. 독서와 학습이 활력을 줍니다.",
+        "family": "가족과의 대화가 중요합니다. 함께하는 활동을 즐기세요."
+    },
+    "게자리": {
+        "career": "감성과 직관이 업무에 도움이 됩니다. 팀워크가 성과를 높입니다.",
+        "wealth": "안전한 투자가 좋습니다. 감정적 소비를 조절하세요.",
+        "love": "진심 어린 배려가 관계를 깊게 합니다. 감정을 솔직하게 표현하세요.",
+        "health": "스트레스 관리가 중요합니다. 충분한 휴식과 수면을 취하세요.",
+        "study": "감성적 접근이 학습에 도움이 됩니다. 예술이나 창의적 활동을 즐기세요.",
+        "family": "가족과의 유대가 강해집니다. 가정의 따뜻함을 느낄 수 있습니다."
+    },
+    "사자자리": {
+        "career": "자신감과 열정이 성과로 이어집니다. 리더십을 발휘할 기회가 있습니다.",
+        "wealth": "과시적 소비를 조절하세요. 장기적인 투자가 유리합니다.",
+        "love": "당당하고 진솔한 모습이 매력적입니다. 로맨틱한 제스처를 보여주세요.",
+        "health": "활동적인 운동이 좋습니다. 심장과 혈액 순환에 주의하세요.",
+        "study": "창의적인 학습 방법을 시도해보세요. 프레젠테이션과 발표가 잘 됩니다.",
+        "family": "가족에게 따뜻함과 관심을 표현하세요. 함께하는 즐거운 시간이 중요합니다."
+    },
+    "처녀자리": {
+        "career": "세심함과 정확성이 인정받습니다. 계획적인 접근이 성과를 높입니다.",
+        "wealth": "신중한 관리가 재물을 보호합니다. 불필요한 지출을 줄이세요.",
+        "love": "완벽을 추구하되 유연함도 필요합니다. 작은 결점도 받아들이세요.",
+        "health": "규칙적인 건강 검진이 중요합니다. 소화 기관 관리에 주의하세요.",
+        "study": "체계적인 학습이 효과적입니다. 세부사항에 집중하세요.",
+        "family": "가족을 도우려는 마음이 깊습니다. 실용적인 도움을 제공하세요."
+    },
+    "천칭자리": {
+        "career": "협상과 조정 능력이 발휘됩니다. 균형감각이 업무에 도움이 됩니다.",
+        "wealth": "아름다운 것에 투자하는 경향이 있습니다. 계획적인 소비가 필요합니다.",
+        "love": "로맨틱하고 이상적인 관계를 추구합니다. 조화로운 만남이 좋습니다.",
+        "health": "균형 잡힌 식습관이 중요합니다. 신장 관리에 주의하세요.",
+        "study": "예술과 미학에 관심이 많습니다. 협력 학습이 효과적입니다.",
+        "family": "가족 간의 조화를 중시합니다. 공정한 태도로 문제를 해결하세요."
+    },
+    "전갈자리": {
+        "career": "강렬한 집중력이 목표 달성에 도움이 됩니다. 변화와 재생의 기회가 있습니다.",
+        "wealth": "투자에 대한 통찰력이 있습니다. 신중한 판단이 필요합니다.",
+        "love": "깊고 강렬한 감정을 느낍니다. 신뢰가 관계의 핵심입니다.",
+        "health": "스트레스 관리가 중요합니다. 생식 기관 건강에 주의하세요.",
+        "study": "깊이 있는 학습이 좋습니다. 비밀과 신비로운 주제에 관심이 많습니다.",
+        "family": "가족에 대한 강한 애착을 가집니다. 깊은 유대감을 형성하세요."
+    },
+    "사수자리": {
+        "career": "모험과 탐구가 기회를 가져옵니다. 새로운 분야에 도전하세요.",
+        "wealth": "관대한 성격으로 소비가 많을 수 있습니다. 계획적인 관리가 필요합니다.",
+        "love": "자유롭고 낙천적인 매력이 있습니다. 진실한 감정을 표현하세요.",
+        "health": "활동적인 운동이 좋습니다. 간과 대퇴부 건강에 주의하세요.",
+        "study": "철학과 여행에 관심이 많습니다. 다양한 문화를 경험하세요.",
+        "family": "가족과의 모험을 즐깁니다. 함께 여행하거나 새로운 경험을 하세요."
+    },
+    "염소자리": {
+        "career": "야망과 인내심이 성과를 만듭니다. 장기적인 계획이 중요합니다.",
+        "wealth": "신중하고 계획적인 관리가 재물을 키웁니다. 저축과 투자가 좋습니다.",
+        "love": "진지하고 책임감 있는 모습이 매력적입니다. 감정을 점진적으로 표현하세요.",
+        "health": "골격과 관절 건강에 주의하세요. 규칙적인 운동이 도움이 됩니다.",
+        "study": "체계적이고 목표 지향적인 학습이 효과적입니다. 인내심을 가지고 공부하세요.",
+        "family": "가족에 대한 책임감이 강합니다. 전통과 안정을 중시합니다."
+    },
+    "물병자리": {
+        "career": "독창성과 혁신이 인정받습니다. 새로운 아이디어가 기회를 만듭니다.",
+        "wealth": "독특한 투자 방식이 성과를 낼 수 있습니다. 기술 관련 투자가 좋습니다.",
+        "love": "독립적이고 자유로운 사랑을 추구합니다. 깊이 있는 소통이 중요합니다.",
+        "health": "순환계 건강에 주의하세요. 독특한 건강법을 시도해보세요.",
+        "study": "과학과 기술에 관심이 많습니다. 혁신적인 학습 방법을 찾으세요.",
+        "family": "가족과의 독특한 관계를 형성합니다. 독립성을 존중받으세요."
+    },
+    "물고기자리": {
+        "career": "창의성과 직관이 업무에 도움이 됩니다. 예술과 치유 분야가 좋습니다.",
+        "wealth": "감정적 소비를 조절하세요. 투자보다는 저축에 집중하세요.",
+        "love": "로맨틱하고 이상적인 사랑을 꿈꿉니다. 감성적인 표현이 효과적입니다.",
+        "health": "정신적 건강이 중요합니다. 수면과 휴식을 충분히 취하세요.",
+        "study": "예술과 영성에 관심이 많습니다. 상상력과 창의력을 키우세요.",
+        "family": "가족에 대한 깊은 애정을 가집니다. 감성적인 유대감을 형성하세요."
     }
-    
-    return advice_map.get(korean_name, "자신을 믿고 꾸준히 노력하세요.")
+}
 
 
 def get_life_aspects_fortune(korean_name, date):
     """생활 영역별 운세를 반환합니다."""
-    day_of_year = date.timetuple().tm_yday
-    base_index = (hash(korean_name) + day_of_year) % 100
-    
-    life_aspects_map = {
-        "양자리": {
-            "career": "리더십과 도전 정신이 돋보이는 시기입니다. 새로운 프로젝트를 시작하거나 승진을 노릴 수 있는 기회가 있습니다.",
-            "wealth": "투자와 수입 증가의 기회가 있습니다. 하지만 성급한 결정은 피하세요.",
-            "love": "적극적인 어필이 효과적입니다. 솔직한 감정 표현이 관계를 발전시킵니다.",
-            "health": "활동적인 운동이 좋습니다. 스트레스 관리에 주의하세요.",
-            "study": "집중력이 높은 시기입니다. 새로운 기술이나 언어를 배우기 좋습니다.",
-            "family": "가족과의 소통이 활발해집니다. 여행이나 활동을 함께하면 좋습니다."
-        },
-        "황소자리": {
-            "career": "안정적인 발전이 기대됩니다. 꾸준한 노력이 결과로 나타납니다.",
-            "wealth": "저축과 투자가 좋은 시기입니다. 신중한 판단이 재물을 모읍니다.",
-            "love": "진실한 감정이 관계를 깊게 만듭니다. 서두르지 말고 천천히 알아가세요.",
-            "health": "규칙적인 생활과 식습관 관리가 중요합니다. 과식에 주의하세요.",
-            "study": "기초를 탄탄히 하는 시기입니다. 체계적인 학습이 도움이 됩니다.",
-            "family": "가정의 평화와 안정이 중요합니다. 가족과의 시간을 소중히 하세요."
-        },
-        "쌍둥이자리": {
-            "career": "소통과 협업이 중요한 시기입니다. 네트워킹이 기회를 가져옵니다.",
-            "wealth": "다양한 수입원을 모색하세요. 정보 수집이 재물 운을 높입니다.",
-            "love": "대화와 소통이 관계의 핵심입니다. 흥미로운 이야기로 마음을 사로잡으세요.",
-            "health": "정신적 휴식이 필요합니다. 스트레스를 줄이고 여유를 가지세요.",
-            "study": "다양한 주제에 관심을 가져보세요. 독서와 학습이 활력을 줍니다.",
-            "family": "가족과의 대화가 중요합니다. 함께하는 활동을 즐기세요."
-        },
-        "게자리": {
-            "career": "감성과 직관이 업무에 도움이 됩니다. 팀워크가 성과를 높입니다.",
-            "wealth": "안전한 투자가 좋습니다. 감정적 소비를 조절하세요.",
-            "love": "진심 어린 배려가 관계를 깊게 합니다. 감정을 솔직하게 표현하세요.",
-            "health": "스트레스 관리가 중요합니다. 충분한 휴식과 수면을 취하세요.",
-            "study": "감성적 접근이 학습에 도움이 됩니다. 예술이나 창의적 활동을 즐기세요.",
-            "family": "가족과의 유대가 강해집니다. 가정의 따뜻함을 느낄 수 있습니다."
-        },
-        "사자자리": {
-            "career": "자신감과 열정이 성과로 이어집니다. 리더십을 발휘할 기회가 있습니다.",
-            "wealth": "과시적 소비를 조절하세요. 장기적인 투자가 유리합니다.",
-            "love": "당당하고 진솔한 모습이 매력적입니다. 로맨틱한 제스처를 보여주세요.",
-            "health": "활동적인 운동이 좋습니다. 심장과 혈액 순환에 주의하세요.",
-            "study": "창의적인 학습 방법을 시도해보세요. 프레젠테이션과 발표가 잘 됩니다.",
-            "family": "가족에게 따뜻함과 관심을 표현하세요. 함께하는 즐거운 시간이 중요합니다."
-        },
-        "처녀자리": {
-            "career": "세심함과 정확성이 인정받습니다. 계획적인 접근이 성과를 높입니다.",
-            "wealth": "신중한 관리가 재물을 보호합니다. 불필요한 지출을 줄이세요.",
-            "love": "완벽을 추구하되 유연함도 필요합니다. 작은 결점도 받아들이세요.",
-            "health": "규칙적인 건강 검진이 중요합니다. 소화 기관 관리에 주의하세요.",
-            "study": "체계적인 학습이 효과적입니다. 세부사항에 집중하세요.",
-            "family": "가족을 도우려는 마음이 깊습니다. 실용적인 도움을 제공하세요."
-        },
-        "천칭자리": {
-            "career": "협상과 조정 능력이 발휘됩니다. 균형감각이 업무에 도움이 됩니다.",
-            "wealth": "아름다운 것에 투자하는 경향이 있습니다. 계획적인 소비가 필요합니다.",
-            "love": "로맨틱하고 이상적인 관계를 추구합니다. 조화로운 만남이 좋습니다.",
-            "health": "균형 잡힌 식습관이 중요합니다. 신장 관리에 주의하세요.",
-            "study": "예술과 미학에 관심이 많습니다. 협력 학습이 효과적입니다.",
-            "family": "가족 간의 조화를 중시합니다. 공정한 태도로 문제를 해결하세요."
-        },
-        "전갈자리": {
-            "career": "강렬한 집중력이 목표 달성에 도움이 됩니다. 변화와 재생의 기회가 있습니다.",
-            "wealth": "투자에 대한 통찰력이 있습니다. 신중한 판단이 필요합니다.",
-            "love": "깊고 강렬한 감정을 느낍니다. 신뢰가 관계의 핵심입니다.",
-            "health": "스트레스 관리가 중요합니다. 생식 기관 건강에 주의하세요.",
-            "study": "깊이 있는 학습이 좋습니다. 비밀과 신비로운 주제에 관심이 많습니다.",
-            "family": "가족에 대한 강한 애착을 가집니다. 깊은 유대감을 형성하세요."
-        },
-        "사수자리": {
-            "career": "모험과 탐구가 기회를 가져옵니다. 새로운 분야에 도전하세요.",
-            "wealth": "관대한 성격으로 소비가 많을 수 있습니다. 계획적인 관리가 필요합니다.",
-            "love": "자유롭고 낙천적인 매력이 있습니다. 진실한 감정을 표현하세요.",
-            "health": "활동적인 운동이 좋습니다. 간과 대퇴부 건강에 주의하세요.",
-            "study": "철학과 여행에 관심이 많습니다. 다양한 문화를 경험하세요.",
-            "family": "가족과의 모험을 즐깁니다. 함께 여행하거나 새로운 경험을 하세요."
-        },
-        "염소자리": {
-            "career": "야망과 인내심이 성과를 만듭니다. 장기적인 계획이 중요합니다.",
-            "wealth": "신중하고 계획적인 관리가 재물을 키웁니다. 저축과 투자가 좋습니다.",
-            "love": "진지하고 책임감 있는 모습이 매력적입니다. 감정을 점진적으로 표현하세요.",
-            "health": "골격과 관절 건강에 주의하세요. 규칙적인 운동이 도움이 됩니다.",
-            "study": "체계적이고 목표 지향적인 학습이 효과적입니다. 인내심을 가지고 공부하세요.",
-            "family": "가족에 대한 책임감이 강합니다. 전통과 안정을 중시합니다."
-        },
-        "물병자리": {
-            "career": "독창성과 혁신이 인정받습니다. 새로운 아이디어가 기회를 만듭니다.",
-            "wealth": "독특한 투자 방식이 성과를 낼 수 있습니다. 기술 관련 투자가 좋습니다.",
-            "love": "독립적이고 자유로운 사랑을 추구합니다. 깊이 있는 소통이 중요합니다.",
-            "health": "순환계 건강에 주의하세요. 독특한 건강법을 시도해보세요.",
-            "study": "과학과 기술에 관심이 많습니다. 혁신적인 학습 방법을 찾으세요.",
-            "family": "가족과의 독특한 관계를 형성합니다. 독립성을 존중받으세요."
-        },
-        "물고기자리": {
-            "career": "창의성과 직관이 업무에 도움이 됩니다. 예술과 치유 분야가 좋습니다.",
-            "wealth": "감정적 소비를 조절하세요. 투자보다는 저축에 집중하세요.",
-            "love": "로맨틱하고 이상적인 사랑을 꿈꿉니다. 감성적인 표현이 효과적입니다.",
-            "health": "정신적 건강이 중요합니다. 수면과 휴식을 충분히 취하세요.",
-            "study": "예술과 영성에 관심이 많습니다. 상상력과 창의력을 키우세요.",
-            "family": "가족에 대한 깊은 애정을 가집니다. 감성적인 유대감을 형성하세요."
-        }
-    }
-    
-    return life_aspects_map.get(korean_name, {
+    return _LIFE_ASPECTS_MAP.get(korean_name, {
         "career": "꾸준한 노력이 성과로 이어집니다.",
         "wealth": "신중한 관리가 필요합니다.",
         "love": "진실한 감정이 관계를 발전시킵니다.",
@@ -461,143 +475,145 @@ def get_life_aspects_fortune(korean_name, date):
     })
 
 
+_CAREER_HOBBY_MAP = {
+    "양자리": {
+        "careers": ["경영자", "군인", "경찰", "운동선수", "엔터테이너", "엔지니어", "외과의사"],
+        "hobbies": ["운동", "등산", "승마", "격투기", "자동차 경주", "탐험", "리더십 활동"]
+    },
+    "황소자리": {
+        "careers": ["요리사", "은행원", "건축가", "농업", "디자이너", "음악가", "회계사"],
+        "hobbies": ["요리", "원예", "음악 감상", "수집", "미술", "사진", "명상"]
+    },
+    "쌍둥이자리": {
+        "careers": ["기자", "작가", "번역가", "상담사", "마케터", "교사", "방송인"],
+        "hobbies": ["독서", "글쓰기", "언어 학습", "퍼즐", "게임", "여행", "네트워킹"]
+    },
+    "게자리": {
+        "careers": ["간호사", "요리사", "인테리어 디자이너", "상담사", "유치원 교사", "작가", "심리학자"],
+        "hobbies": ["요리", "독서", "일기 쓰기", "사진", "가족 시간", "수집", "예술 감상"]
+    },
+    "사자자리": {
+        "careers": ["배우", "가수", "디자이너", "경영자", "교사", "연예인", "이벤트 기획자"],
+        "hobbies": ["연기", "댄스", "패션", "사진", "파티 기획", "예술", "자선 활동"]
+    },
+    "처녀자리": {
+        "careers": ["의사", "약사", "회계사", "편집자", "연구원", "품질 관리", "작가"],
+        "hobbies": ["독서", "요리", "정리", "수집", "건강 관리", "학습", "원예"]
+    },
+    "천칭자리": {
+        "careers": ["변호사", "디자이너", "중재자", "예술가", "컨설턴트", "카운셀러", "패션 스타일리스트"],
+        "hobbies": ["미술", "음악", "사교", "패션", "인테리어", "요리", "예술 감상"]
+    },
+    "전갈자리": {
+        "careers": ["심리학자", "의사", "연구원", "탐정", "경찰", "치료사", "투자자"],
+        "hobbies": ["독서", "명상", "운동", "탐구", "수집", "요리", "영화 감상"]
+    },
+    "사수자리": {
+        "careers": ["교수", "여행 작가", "철학자", "법률가", "외교관", "기자", "운동 코치"],
+        "hobbies": ["여행", "독서", "운동", "사진", "외국어", "야외 활동", "철학"]
+    },
+    "염소자리": {
+        "careers": ["경영자", "공무원", "회계사", "건축가", "엔지니어", "교사", "금융가"],
+        "hobbies": ["독서", "계획하기", "산악 등반", "수집", "학습", "사진", "전통 예술"]
+    },
+    "물병자리": {
+        "careers": ["과학자", "프로그래머", "발명가", "작가", "심리학자", "사회 활동가", "기자"],
+        "hobbies": ["과학", "기술", "독서", "작문", "사교", "운동", "혁신적 활동"]
+    },
+    "물고기자리": {
+        "careers": ["예술가", "음악가", "작가", "상담사", "간호사", "사진작가", "심리학자"],
+        "hobbies": ["예술", "음악", "독서", "영화", "명상", "요가", "창작 활동"]
+    }
+}
+
+
 def get_career_hobby(korean_name):
     """별자리별 추천 직업 및 취미를 반환합니다."""
-    career_hobby_map = {
-        "양자리": {
-            "careers": ["경영자", "군인", "경찰", "운동선수", "엔터테이너", "엔지니어", "외과의사"],
-            "hobbies": ["운동", "등산", "승마", "격투기", "자동차 경주", "탐험", "리더십 활동"]
-        },
-        "황소자리": {
-            "careers": ["요리사", "은행원", "건축가", "농업", "디자이너", "음악가", "회계사"],
-            "hobbies": ["요리", "원예", "음악 감상", "수집", "미술", "사진", "명상"]
-        },
-        "쌍둥이자리": {
-            "careers": ["기자", "작가", "번역가", "상담사", "마케터", "교사", "방송인"],
-            "hobbies": ["독서", "글쓰기", "언어 학습", "퍼즐", "게임", "여행", "네트워킹"]
-        },
-        "게자리": {
-            "careers": ["간호사", "요리사", "인테리어 디자이너", "상담사", "유치원 교사", "작가", "심리학자"],
-            "hobbies": ["요리", "독서", "일기 쓰기", "사진", "가족 시간", "수집", "예술 감상"]
-        },
-        "사자자리": {
-            "careers": ["배우", "가수", "디자이너", "경영자", "교사", "연예인", "이벤트 기획자"],
-            "hobbies": ["연기", "댄스", "패션", "사진", "파티 기획", "예술", "자선 활동"]
-        },
-        "처녀자리": {
-            "careers": ["의사", "약사", "회계사", "편집자", "연구원", "품질 관리", "작가"],
-            "hobbies": ["독서", "요리", "정리", "수집", "건강 관리", "학습", "원예"]
-        },
-        "천칭자리": {
-            "careers": ["변호사", "디자이너", "중재자", "예술가", "컨설턴트", "카운셀러", "패션 스타일리스트"],
-            "hobbies": ["미술", "음악", "사교", "패션", "인테리어", "요리", "예술 감상"]
-        },
-        "전갈자리": {
-            "careers": ["심리학자", "의사", "연구원", "탐정", "경찰", "치료사", "투자자"],
-            "hobbies": ["독서", "명상", "운동", "탐구", "수집", "요리", "영화 감상"]
-        },
-        "사수자리": {
-            "careers": ["교수", "여행 작가", "철학자", "법률가", "외교관", "기자", "운동 코치"],
-            "hobbies": ["여행", "독서", "운동", "사진", "외국어", "야외 활동", "철학"]
-        },
-        "염소자리": {
-            "careers": ["경영자", "공무원", "회계사", "건축가", "엔지니어", "교사", "금융가"],
-            "hobbies": ["독서", "계획하기", "산악 등반", "수집", "학습", "사진", "전통 예술"]
-        },
-        "물병자리": {
-            "careers": ["과학자", "프로그래머", "발명가", "작가", "심리학자", "사회 활동가", "기자"],
-            "hobbies": ["과학", "기술", "독서", "작문", "사교", "운동", "혁신적 활동"]
-        },
-        "물고기자리": {
-            "careers": ["예술가", "음악가", "작가", "상담사", "간호사", "사진작가", "심리학자"],
-            "hobbies": ["예술", "음악", "독서", "영화", "명상", "요가", "창작 활동"]
-        }
-    }
-    
-    return career_hobby_map.get(korean_name, {
+    return _CAREER_HOBBY_MAP.get(korean_name, {
         "careers": ["다양한 직업에 적합합니다."],
         "hobbies": ["다양한 취미를 즐길 수 있습니다."]
     })
 
 
+_LOVE_STYLE_MAP = {
+    "양자리": {
+        "style": "적극적이고 솔직한 스타일",
+        "approach": "직설적이고 솔직한 어필을 좋아합니다. 로맨틱한 제스처보다는 행동으로 보여주는 것을 선호합니다.",
+        "ideal_type": "자신감 있고 독립적인 상대",
+        "tips": "성급하게 다가가기보다는 상대방의 반응을 보면서 천천히 접근하세요. 리더십을 보여주되 상대방의 의견도 존중하세요."
+    },
+    "황소자리": {
+        "style": "안정적이고 신중한 스타일",
+        "approach": "천천히 알아가며 깊이 있는 관계를 형성합니다. 물질적인 안정과 감각적인 만족을 중시합니다.",
+        "ideal_type": "안정적이고 신뢰할 수 있는 상대",
+        "tips": "서두르지 말고 인내심을 가지세요. 로맨틱한 식사나 편안한 시간을 함께 보내는 것이 좋습니다."
+    },
+    "쌍둥이자리": {
+        "style": "소통 중심의 가볍고 즐거운 스타일",
+        "approach": "대화와 지적 호기심이 관계의 핵심입니다. 다양한 주제로 흥미롭게 대화하는 것을 좋아합니다.",
+        "ideal_type": "똑똑하고 재치 있는 상대",
+        "tips": "흥미로운 이야기와 유머로 마음을 사로잡으세요. 가볍고 즐거운 만남에서 시작하는 것이 좋습니다."
+    },
+    "게자리": {
+        "style": "감성적이고 보호적인 스타일",
+        "approach": "진심 어린 배려와 감성적 유대감을 중시합니다. 가정과 안정을 중요하게 생각합니다.",
+        "ideal_type": "안정감을 주고 감성을 이해하는 상대",
+        "tips": "배려와 관심을 표현하세요. 가정적인 모습과 보호 본능을 보여주면 효과적입니다."
+    },
+    "사자자리": {
+        "style": "당당하고 로맨틱한 스타일",
+        "approach": "대담하고 로맨틱한 어필을 좋아합니다. 주목받는 것을 좋아하며 관대하고 따뜻합니다.",
+        "ideal_type": "자신을 인정해주고 존경해주는 상대",
+        "tips": "당당하고 자신감 있는 모습을 보여주세요. 로맨틱한 제스처와 관심을 표현하는 것이 좋습니다."
+    },
+    "처녀자리": {
+        "style": "완벽주의적이지만 진실한 스타일",
+        "approach": "신중하고 완벽을 추구하지만, 진심이 통하면 깊이 빠집니다. 세심한 배려를 좋아합니다.",
+        "ideal_type": "성실하고 신뢰할 수 있는 상대",
+        "tips": "완벽을 기대하지 말고 유연하게 접근하세요. 성실함과 신뢰를 보여주는 것이 중요합니다."
+    },
+    "천칭자리": {
+        "style": "조화롭고 이상적인 스타일",
+        "approach": "균형과 조화를 추구하며 로맨틱하고 이상적인 관계를 꿈꿉니다. 아름다운 것을 좋아합니다.",
+        "ideal_type": "아름답고 세련된 상대",
+        "tips": "예의 바르고 세련된 모습을 보여주세요. 로맨틱한 분위기와 아름다운 환경을 만들어주세요."
+    },
+    "전갈자리": {
+        "style": "강렬하고 깊이 있는 스타일",
+        "approach": "강렬하고 깊이 있는 감정을 느낍니다. 신뢰와 충성심을 매우 중요하게 생각합니다.",
+        "ideal_type": "진실하고 강렬한 상대",
+        "tips": "진심을 보여주고 신뢰를 구축하세요. 강렬한 감정을 두려워하지 말고 솔직하게 표현하세요."
+    },
+    "사수자리": {
+        "style": "자유롭고 낙천적인 스타일",
+        "approach": "자유롭고 진실한 사랑을 추구합니다. 모험과 새로운 경험을 함께 나누는 것을 좋아합니다.",
+        "ideal_type": "자유롭고 모험적인 상대",
+        "tips": "자유로운 영혼을 존중하세요. 함께 모험하고 새로운 경험을 나누는 것이 좋습니다."
+    },
+    "염소자리": {
+        "style": "진지하고 책임감 있는 스타일",
+        "approach": "신중하고 장기적인 관계를 생각합니다. 책임감과 안정을 중시하며 점진적으로 발전시킵니다.",
+        "ideal_type": "목표 지향적이고 안정적인 상대",
+        "tips": "진지하고 책임감 있는 모습을 보여주세요. 미래 계획을 함께 세우는 것이 좋습니다."
+    },
+    "물병자리": {
+        "style": "독립적이고 독특한 스타일",
+        "approach": "독립적이고 자유로운 사랑을 추구합니다. 깊이 있는 정신적 교감을 중요하게 생각합니다.",
+        "ideal_type": "독창적이고 지적인 상대",
+        "tips": "독립성을 존중하고 정신적 교감을 나누세요. 독특하고 혁신적인 접근이 효과적입니다."
+    },
+    "물고기자리": {
+        "style": "로맨틱하고 이상적인 스타일",
+        "approach": "로맨틱하고 이상적인 사랑을 꿈꿉니다. 감성적이고 공감 능력이 뛰어납니다.",
+        "ideal_type": "감성적이고 이해심 많은 상대",
+        "tips": "로맨틱한 제스처와 감성적 표현을 하세요. 상대방의 감정을 이해하고 공감하는 것이 중요합니다."
+    }
+}
+
+
 def get_love_style(korean_name):
     """별자리별 연애 스타일을 반환합니다."""
-    love_style_map = {
-        "양자리": {
-            "style": "적극적이고 솔직한 스타일",
-            "approach": "직설적이고 솔직한 어필을 좋아합니다. 로맨틱한 제스처보다는 행동으로 보여주는 것을 선호합니다.",
-            "ideal_type": "자신감 있고 독립적인 상대",
-            "tips": "성급하게 다가가기보다는 상대방의 반응을 보면서 천천히 접근하세요. 리더십을 보여주되 상대방의 의견도 존중하세요."
-        },
-        "황소자리": {
-            "style": "안정적이고 신중한 스타일",
-            "approach": "천천히 알아가며 깊이 있는 관계를 형성합니다. 물질적인 안정과 감각적인 만족을 중시합니다.",
-            "ideal_type": "안정적이고 신뢰할 수 있는 상대",
-            "tips": "서두르지 말고 인내심을 가지세요. 로맨틱한 식사나 편안한 시간을 함께 보내는 것이 좋습니다."
-        },
-        "쌍둥이자리": {
-            "style": "소통 중심의 가볍고 즐거운 스타일",
-            "approach": "대화와 지적 호기심이 관계의 핵심입니다. 다양한 주제로 흥미롭게 대화하는 것을 좋아합니다.",
-            "ideal_type": "똑똑하고 재치 있는 상대",
-            "tips": "흥미로운 이야기와 유머로 마음을 사로잡으세요. 가볍고 즐거운 만남에서 시작하는 것이 좋습니다."
-        },
-        "게자리": {
-            "style": "감성적이고 보호적인 스타일",
-            "approach": "진심 어린 배려와 감성적 유대감을 중시합니다. 가정과 안정을 중요하게 생각합니다.",
-            "ideal_type": "안정감을 주고 감성을 이해하는 상대",
-            "tips": "배려와 관심을 표현하세요. 가정적인 모습과 보호 본능을 보여주면 효과적입니다."
-        },
-        "사자자리": {
-            "style": "당당하고 로맨틱한 스타일",
-            "approach": "대담하고 로맨틱한 어필을 좋아합니다. 주목받는 것을 좋아하며 관대하고 따뜻합니다.",
-            "ideal_type": "자신을 인정해주고 존경해주는 상대",
-            "tips": "당당하고 자신감 있는 모습을 보여주세요. 로맨틱한 제스처와 관심을 표현하는 것이 좋습니다."
-        },
-        "처녀자리": {
-            "style": "완벽주의적이지만 진실한 스타일",
-            "approach": "신중하고 완벽을 추구하지만, 진심이 통하면 깊이 빠집니다. 세심한 배려를 좋아합니다.",
-            "ideal_type": "성실하고 신뢰할 수 있는 상대",
-            "tips": "완벽을 기대하지 말고 유연하게 접근하세요. 성실함과 신뢰를 보여주는 것이 중요합니다."
-        },
-        "천칭자리": {
-            "style": "조화롭고 이상적인 스타일",
-            "approach": "균형과 조화를 추구하며 로맨틱하고 이상적인 관계를 꿈꿉니다. 아름다운 것을 좋아합니다.",
-            "ideal_type": "아름답고 세련된 상대",
-            "tips": "예의 바르고 세련된 모습을 보여주세요. 로맨틱한 분위기와 아름다운 환경을 만들어주세요."
-        },
-        "전갈자리": {
-            "style": "강렬하고 깊이 있는 스타일",
-            "approach": "강렬하고 깊이 있는 감정을 느낍니다. 신뢰와 충성심을 매우 중요하게 생각합니다.",
-            "ideal_type": "진실하고 강렬한 상대",
-            "tips": "진심을 보여주고 신뢰를 구축하세요. 강렬한 감정을 두려워하지 말고 솔직하게 표현하세요."
-        },
-        "사수자리": {
-            "style": "자유롭고 낙천적인 스타일",
-            "approach": "자유롭고 진실한 사랑을 추구합니다. 모험과 새로운 경험을 함께 나누는 것을 좋아합니다.",
-            "ideal_type": "자유롭고 모험적인 상대",
-            "tips": "자유로운 영혼을 존중하세요. 함께 모험하고 새로운 경험을 나누는 것이 좋습니다."
-        },
-        "염소자리": {
-            "style": "진지하고 책임감 있는 스타일",
-            "approach": "신중하고 장기적인 관계를 생각합니다. 책임감과 안정을 중시하며 점진적으로 발전시킵니다.",
-            "ideal_type": "목표 지향적이고 안정적인 상대",
-            "tips": "진지하고 책임감 있는 모습을 보여주세요. 미래 계획을 함께 세우는 것이 좋습니다."
-        },
-        "물병자리": {
-            "style": "독립적이고 독특한 스타일",
-            "approach": "독립적이고 자유로운 사랑을 추구합니다. 깊이 있는 정신적 교감을 중요하게 생각합니다.",
-            "ideal_type": "독창적이고 지적인 상대",
-            "tips": "독립성을 존중하고 정신적 교감을 나누세요. 독특하고 혁신적인 접근이 효과적입니다."
-        },
-        "물고기자리": {
-            "style": "로맨틱하고 이상적인 스타일",
-            "approach": "로맨틱하고 이상적인 사랑을 꿈꿉니다. 감성적이고 공감 능력이 뛰어납니다.",
-            "ideal_type": "감성적이고 이해심 많은 상대",
-            "tips": "로맨틱한 제스처와 감성적 표현을 하세요. 상대방의 감정을 이해하고 공감하는 것이 중요합니다."
-        }
-    }
-    
-    return love_style_map.get(korean_name, {
+    return _LOVE_STYLE_MAP.get(korean_name, {
         "style": "진실한 스타일",
         "approach": "진심으로 다가가세요.",
         "ideal_type": "서로를 이해하는 상대",
@@ -605,112 +621,114 @@ def get_love_style(korean_name):
     })
 
 
+_HEALTH_INFO_MAP = {
+    "양자리": {
+        "strengths": "활력이 넘치고 활동적입니다.",
+        "weaknesses": "머리, 얼굴, 눈 건강에 주의하세요. 성급함으로 인한 사고에 조심하세요.",
+        "tips": "규칙적인 운동으로 에너지를 발산하세요. 스트레스 관리와 충분한 휴식이 중요합니다."
+    },
+    "황소자리": {
+        "strengths": "체력이 좋고 인내력이 있습니다.",
+        "weaknesses": "목, 인후, 갑상선 건강에 주의하세요. 과식과 비활동에 조심하세요.",
+        "tips": "규칙적인 식습관과 운동을 유지하세요. 천천히 씹어 먹고 소화를 돕는 식습관이 좋습니다."
+    },
+    "쌍둥이자리": {
+        "strengths": "활발하고 민첩합니다.",
+        "weaknesses": "호흡기, 신경계, 어깨 건강에 주의하세요. 과도한 스트레스에 조심하세요.",
+        "tips": "정신적 휴식이 중요합니다. 충분한 수면과 명상이 도움이 됩니다."
+    },
+    "게자리": {
+        "strengths": "회복력이 좋고 적응력이 있습니다.",
+        "weaknesses": "위, 가슴, 유방 건강에 주의하세요. 감정적 스트레스에 조심하세요.",
+        "tips": "감정 관리가 중요합니다. 충분한 휴식과 수면을 취하세요. 식습관 조절에 신경 쓰세요."
+    },
+    "사자자리": {
+        "strengths": "심장 기능이 좋고 활력이 있습니다.",
+        "weaknesses": "심장, 척추, 등 건강에 주의하세요. 과로와 스트레스에 조심하세요.",
+        "tips": "규칙적인 운동으로 건강을 유지하세요. 심장 건강에 특히 주의하고 충분한 휴식을 취하세요."
+    },
+    "처녀자리": {
+        "strengths": "면역력이 좋고 체계적입니다.",
+        "weaknesses": "소화기관, 장 건강에 주의하세요. 과도한 걱정에 조심하세요.",
+        "tips": "규칙적인 식사와 소화에 좋은 음식을 섭취하세요. 건강 검진을 정기적으로 받으세요."
+    },
+    "천칭자리": {
+        "strengths": "균형감각이 좋고 조화로웁니다.",
+        "weaknesses": "신장, 허리 건강에 주의하세요. 우유부단함으로 인한 스트레스에 조심하세요.",
+        "tips": "균형 잡힌 식습관과 규칙적인 생활이 중요합니다. 신장 건강에 특히 주의하세요."
+    },
+    "전갈자리": {
+        "strengths": "회복력이 강하고 강인합니다.",
+        "weaknesses": "생식기관, 직장 건강에 주의하세요. 감정적 스트레스에 조심하세요.",
+        "tips": "스트레스 관리가 매우 중요합니다. 정기적인 건강 검진과 충분한 휴식을 취하세요."
+    },
+    "사수자리": {
+        "strengths": "활동적이고 낙천적입니다.",
+        "weaknesses": "간, 대퇴부, 허벅지 건강에 주의하세요. 무리한 활동에 조심하세요.",
+        "tips": "규칙적인 운동이 좋지만 과도하지 않게 하세요. 간 건강에 주의하고 적절한 휴식을 취하세요."
+    },
+    "염소자리": {
+        "strengths": "인내력이 강하고 끈기가 있습니다.",
+        "weaknesses": "뼈, 관절, 무릎, 피부 건강에 주의하세요. 과로에 조심하세요.",
+        "tips": "골격 건강에 특히 주의하세요. 규칙적인 운동과 충분한 휴식이 중요합니다."
+    },
+    "물병자리": {
+        "strengths": "순환계가 좋고 활동적입니다.",
+        "weaknesses": "순환계, 정맥, 발목 건강에 주의하세요. 불규칙한 생활에 조심하세요.",
+        "tips": "규칙적인 생활 패턴을 유지하세요. 순환계 건강에 주의하고 적절한 운동을 하세요."
+    },
+    "물고기자리": {
+        "strengths": "직관력이 좋고 감성이 풍부합니다.",
+        "weaknesses": "발, 림프계 건강에 주의하세요. 정신적 피로에 조심하세요.",
+        "tips": "정신적 휴식과 명상이 중요합니다. 충분한 수면과 스트레스 관리에 신경 쓰세요."
+    }
+}
+
+
 def get_health_info(korean_name):
     """별자리별 건강 정보를 반환합니다."""
-    health_info_map = {
-        "양자리": {
-            "strengths": "활력이 넘치고 활동적입니다.",
-            "weaknesses": "머리, 얼굴, 눈 건강에 주의하세요. 성급함으로 인한 사고에 조심하세요.",
-            "tips": "규칙적인 운동으로 에너지를 발산하세요. 스트레스 관리와 충분한 휴식이 중요합니다."
-        },
-        "황소자리": {
-            "strengths": "체력이 좋고 인내력이 있습니다.",
-            "weaknesses": "목, 인후, 갑상선 건강에 주의하세요. 과식과 비활동에 조심하세요.",
-            "tips": "규칙적인 식습관과 운동을 유지하세요. 천천히 씹어 먹고 소화를 돕는 식습관이 좋습니다."
-        },
-        "쌍둥이자리": {
-            "strengths": "활발하고 민첩합니다.",
-            "weaknesses": "호흡기, 신경계, 어깨 건강에 주의하세요. 과도한 스트레스에 조심하세요.",
-            "tips": "정신적 휴식이 중요합니다. 충분한 수면과 명상이 도움이 됩니다."
-        },
-        "게자리": {
-            "strengths": "회복력이 좋고 적응력이 있습니다.",
-            "weaknesses": "위, 가슴, 유방 건강에 주의하세요. 감정적 스트레스에 조심하세요.",
-            "tips": "감정 관리가 중요합니다. 충분한 휴식과 수면을 취하세요. 식습관 조절에 신경 쓰세요."
-        },
-        "사자자리": {
-            "strengths": "심장 기능이 좋고 활력이 있습니다.",
-            "weaknesses": "심장, 척추, 등 건강에 주의하세요. 과로와 스트레스에 조심하세요.",
-            "tips": "규칙적인 운동으로 건강을 유지하세요. 심장 건강에 특히 주의하고 충분한 휴식을 취하세요."
-        },
-        "처녀자리": {
-            "strengths": "면역력이 좋고 체계적입니다.",
-            "weaknesses": "소화기관, 장 건강에 주의하세요. 과도한 걱정에 조심하세요.",
-            "tips": "규칙적인 식사와 소화에 좋은 음식을 섭취하세요. 건강 검진을 정기적으로 받으세요."
-        },
-        "천칭자리": {
-            "strengths": "균형감각이 좋고 조화로웁니다.",
-            "weaknesses": "신장, 허리 건강에 주의하세요. 우유부단함으로 인한 스트레스에 조심하세요.",
-            "tips": "균형 잡힌 식습관과 규칙적인 생활이 중요합니다. 신장 건강에 특히 주의하세요."
-        },
-        "전갈자리": {
-            "strengths": "회복력이 강하고 강인합니다.",
-            "weaknesses": "생식기관, 직장 건강에 주의하세요. 감정적 스트레스에 조심하세요.",
-            "tips": "스트레스 관리가 매우 중요합니다. 정기적인 건강 검진과 충분한 휴식을 취하세요."
-        },
-        "사수자리": {
-            "strengths": "활동적이고 낙천적입니다.",
-            "weaknesses": "간, 대퇴부, 허벅지 건강에 주의하세요. 무리한 활동에 조심하세요.",
-            "tips": "규칙적인 운동이 좋지만 과도하지 않게 하세요. 간 건강에 주의하고 적절한 휴식을 취하세요."
-        },
-        "염소자리": {
-            "strengths": "인내력이 강하고 끈기가 있습니다.",
-            "weaknesses": "뼈, 관절, 무릎, 피부 건강에 주의하세요. 과로에 조심하세요.",
-            "tips": "골격 건강에 특히 주의하세요. 규칙적인 운동과 충분한 휴식이 중요합니다."
-        },
-        "물병자리": {
-            "strengths": "순환계가 좋고 활동적입니다.",
-            "weaknesses": "순환계, 정맥, 발목 건강에 주의하세요. 불규칙한 생활에 조심하세요.",
-            "tips": "규칙적인 생활 패턴을 유지하세요. 순환계 건강에 주의하고 적절한 운동을 하세요."
-        },
-        "물고기자리": {
-            "strengths": "직관력이 좋고 감성이 풍부합니다.",
-            "weaknesses": "발, 림프계 건강에 주의하세요. 정신적 피로에 조심하세요.",
-            "tips": "정신적 휴식과 명상이 중요합니다. 충분한 수면과 스트레스 관리에 신경 쓰세요."
-        }
-    }
-    
-    return health_info_map.get(korean_name, {
+    return _HEALTH_INFO_MAP.get(korean_name, {
         "strengths": "건강 관리를 잘 하세요.",
         "weaknesses": "정기적인 건강 검진이 중요합니다.",
         "tips": "규칙적인 생활과 운동을 유지하세요."
     })
 
 
+# 월별 운세 메시지 템플릿 (레벨별) - 각 월별 3개의 메시지 중 선택
+_MONTHLY_MESSAGES = {
+    1: {
+        "매우 좋음": [
+            "신년을 맞이하여 큰 변화와 기회가 찾아오는 달입니다. 새로운 프로젝트나 목표를 적극적으로 시작하세요. 특히 직업이나 학업 분야에서 큰 성과를 얻을 수 있습니다.",
+            "1월은 당신에게 매우 유리한 시기입니다. 신중하게 계획을 세우고 실행에 옮기면 큰 성공을 거둘 수 있습니다. 인간관계에서도 긍정적인 변화가 있을 것입니다.",
+            "새로운 시작에 완벽한 타이밍입니다. 오랫동안 기다려온 기회가 찾아올 수 있으니 적극적으로 행동하세요. 재정적으로도 좋은 소식이 있을 수 있습니다."
+        ],
+        "좋음": [
+            "신년의 에너지가 당신을 도와줍니다. 새로운 계획을 세우고 실행하기 좋은 시기입니다. 작은 변화부터 시작하여 점진적으로 발전시키세요.",
+            "1월은 안정적인 발전의 시작점입니다. 목표를 명확히 설정하고 차근차근 진행한다면 좋은 결과를 얻을 수 있습니다.",
+            "신년 계획을 세우고 실천하기 좋은 달입니다. 인간관계나 새로운 활동에 참여하면 긍정적인 경험을 할 수 있습니다."
+        ],
+        "보통": [
+            "신년을 맞이했지만 무리한 변화는 자제하세요. 기존 계획을 점검하고 필요한 부분만 조정하는 것이 좋습니다. 조금씩 준비하며 기다리는 것도 지혜입니다.",
+            "1월은 점진적인 변화의 시기입니다. 급하게 결정하지 말고 신중하게 판단하세요. 작은 개선부터 시작하는 것이 안전합니다.",
+            "새로운 시작보다는 기존 일의 정리와 점검에 집중하세요. 너무 큰 기대보다는 현실적인 목표를 세우는 것이 좋습니다."
+        ],
+        "주의": [
+            "1월은 신중한 판단이 필요한 시기입니다. 중요한 결정은 미루는 것이 좋습니다. 건강 관리에 특히 주의하고, 무리한 계획은 피하세요.",
+            "신년이지만 급하게 움직이기보다는 관망하는 자세가 필요합니다. 재정적 결정이나 큰 변화는 신중하게 접근하세요.",
+            "이번 달은 주의가 필요한 시기입니다. 충동적인 결정을 피하고, 기존 상황을 유지하는 것이 안전합니다. 건강과 안전에 특히 주의하세요."
+        ]
+    },
+    # ... (나머지 월들도 동일한 구조로 추가 필요)
+}
+
+
 def get_monthly_detailed_fortune(korean_name, year):
     """월별 상세 운세를 반환합니다."""
-    # 월별 운세 메시지 템플릿 (레벨별) - 각 월별 3개의 메시지 중 선택
-    monthly_messages = {
-        1: {
-            "매우 좋음": [
-                "신년을 맞이하여 큰 변화와 기회가 찾아오는 달입니다. 새로운 프로젝트나 목표를 적극적으로 시작하세요. 특히 직업이나 학업 분야에서 큰 성과를 얻을 수 있습니다.",
-                "1월은 당신에게 매우 유리한 시기입니다. 신중하게 계획을 세우고 실행에 옮기면 큰 성공을 거둘 수 있습니다. 인간관계에서도 긍정적인 변화가 있을 것입니다.",
-                "새로운 시작에 완벽한 타이밍입니다. 오랫동안 기다려온 기회가 찾아올 수 있으니 적극적으로 행동하세요. 재정적으로도 좋은 소식이 있을 수 있습니다."
-            ],
-            "좋음": [
-                "신년의 에너지가 당신을 도와줍니다. 새로운 계획을 세우고 실행하기 좋은 시기입니다. 작은 변화부터 시작하여 점진적으로 발전시키세요.",
-                "1월은 안정적인 발전의 시작점입니다. 목표를 명확히 설정하고 차근차근 진행한다면 좋은 결과를 얻을 수 있습니다.",
-                "신년 계획을 세우고 실천하기 좋은 달입니다. 인간관계나 새로운 활동에 참여하면 긍정적인 경험을 할 수 있습니다."
-            ],
-            "보통": [
-                "신년을 맞이했지만 무리한 변화는 자제하세요. 기존 계획을 점검하고 필요한 부분만 조정하는 것이 좋습니다. 조금씩 준비하며 기다리는 것도 지혜입니다.",
-                "1월은 점진적인 변화의 시기입니다. 급하게 결정하지 말고 신중하게 판단하세요. 작은 개선부터 시작하는 것이 안전합니다.",
-                "새로운 시작보다는 기존 일의 정리와 점검에 집중하세요. 너무 큰 기대보다는 현실적인 목표를 세우는 것이 좋습니다."
-            ],
-            "주의": [
-                "1월은 신중한 판단이 필요한 시기입니다. 중요한 결정은 미루는 것이 좋습니다. 건강 관리에 특히 주의하고, 무리한 계획은 피하세요.",
-                "신년이지만 급하게 움직이기보다는 관망하는 자세가 필요합니다. 재정적 결정이나 큰 변화는 신중하게 접근하세요.",
-                "이번 달은 주의가 필요한 시기입니다. 충동적인 결정을 피하고, 기존 상황을 유지하는 것이 안전합니다. 건강과 안전에 특히 주의하세요."
-            ]
-        },
-        # ... (나머지 월들도 동일한 구조로 추가 필요)
-    }
-    
     # 간단한 버전으로 구현 (전체 월별 메시지는 너무 길어서 핵심만)
     monthly_fortunes = []
     for month_num in range(1, 13):
         month_name = f"{month_num}월"
-        month_hash = hash(f"{korean_name}_{year}_{month_num}") % 100
+        month_hash = _stable_hash(f"{korean_name}_{year}_{month_num}") % 100
         index = abs(month_hash)
         
         if index >= 75:
@@ -0,0 +1,167 @@
+"""
+별자리운세 일일 번들
+별자리운세 응답은 (별자리, 날짜)만으로 정해지므로 KST 기준 하루에 한 번 12개 별자리의 응답을 모두 계산해
+JSON 바이트로 미리 인코딩해 둡니다. 요청마다 하는 일은 별자리 조회와 사용자 필드(생년월일, 이름) 인코딩뿐입니다.
+
+- 응답 본문은 기존 JSONResponse({"success": True, "data": result})와 바이트 단위로 같음
+  (미리 인코딩한 앞부분 + 사용자 필드 + 미리 인코딩한 뒷부분)
+- GET /api/byeoljari/{sign}은 사용자 필드 없이 앞부분 + 뒷부분만 보냄 (sign_body)
+- 날짜가 바뀐 뒤 첫 요청에서 새 번들을 만들고, 만드는 동안 다른 요청은 잠금에서 기다림 (12개 계산은 수 ms)
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils import metrics
+from utils.constellation import (
+    CONSTELLATION_DATES, get_constellation_info, get_daily_fortune,
+    get_weekly_fortune, get_monthly_fortune, get_yearly_fortune,
+    get_lucky_elements, get_compatibility, get_constellation_advice,
+    get_life_aspects_fortune, get_career_hobby, get_love_style,
+    get_health_info, get_monthly_detailed_fortune
+)
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+
+def kst_today():
+    """한국 시간 기준 오늘 날짜"""
+    return datetime.now(KST).date()
+
+
+def _encode(value):
+    # starlette JSONResponse.render와 같은 형식
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def build_sign_data(korean_name, today):
+    """별자리 하나의 응답 중 사용자 정보를 뺀 나머지 (기존 /api/byeoljari 계산과 같음)"""
+    current_year = today.year
+    return {
+        "constellation_info": get_constellation_info(korean_name),
+        "today_fortune": get_daily_fortune(korean_name, today),
+        "weekly_fortune": get_weekly_fortune(korean_name, today),
+        "monthly_fortune": get_monthly_fortune(korean_name, today),
+        "yearly_fortune": get_yearly_fortune(korean_name, current_year),
+        "lucky_elements": get_lucky_elements(korean_name),
+        "compatibility": get_compatibility(korean_name),
+        "advice": get_constellation_advice(korean_name),
+        "life_aspects": get_life_aspects_fortune(korean_name, today),
+        "career_hobby": get_career_hobby(korean_name),
+        "love_style": get_love_style(korean_name),
+        "health_info": get_health_info(korean_name),
+        "monthly_detailed": get_monthly_detailed_fortune(korean_name, current_year),
+        "current_date": today.strftime('%Y년 %m월 %d일'),
+        "current_year": current_year
+    }
+
+
+def _sign_parts(korean_name, emoji, english_name, today):
+    head = _encode({"korean_name": korean_name, "emoji": emoji, "english_name": english_name})
+    tail = _encode(build_sign_data(korean_name, today))
+    return (
+        b'{"success":true,"data":' + head[:-1] + b",",
+        b"," + tail[1:] + b"}"
+    )
+
+
+def build_daily_bundle(today):
+    """
+    12개 별자리의 응답 조각을 인코딩합니다.
+
+    Returns:
+        dict: 한글 별자리명 -> (앞부분 바이트, 뒷부분 바이트)
+            앞부분: {"success":true,"data":{"korean_name":...,"emoji":...,"english_name":...,
+            뒷부분: ,"constellation_info":...,"current_year":...}}
+    """
+    return {
+        korean_name: _sign_parts(korean_name, emoji, english_name, today)
+        for _start, _end, korean_name, emoji, english_name in CONSTELLATION_DATES
+    }
+
+
+def find_sign(name):
+    """한글명 또는 영문명(대소문자 무관)으로 (한글명, 이모지, 영문명)을 찾습니다. 없으면 None"""
+    name = name.strip()
+    for _start, _end, korean_name, emoji, english_name in CONSTELLATION_DATES:
+        if name == korean_name or name.lower() == english_name.lower():
+            return korean_name, emoji, english_name
+    return None
+
+
+class DailyBundle:
+    """KST 날짜별로 한 번 만드는 별자리운세 응답 번들"""
+
+    def __init__(self):
+        self._date = None
+        self._bundle = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.build_ms = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, today=None):
+        """today(기본 KST 오늘)의 번들"""
+        today = today or kst_today()
+        current = self._bundle
+        if self._date == today and current is not None:
+            return current
+        with self._lock:
+            if self._date != today or self._bundle is None:
+                started = time.perf_counter()
+                self._bundle = build_daily_bundle(today)
+                self._date = today
+                self.builds += 1
+                self.build_ms = round((time.perf_counter() - started) * 1000, 3)
+                logger.info(f"별자리운세 번들 생성: {today} ({self.build_ms}ms)")
+            return self._bundle
+
+    def render(self, korean_name, birth_date_str, birth_date, user_name, today=None):
+        """
+        별자리 응답 본문 바이트를 반환합니다. 번들에 없는 별자리면 None
+
+        Args:
+            korean_name: get_constellation 결과의 한글 별자리명
+            birth_date_str: 요청의 생년월일 문자열 (YYYY-MM-DD)
+            birth_date: 생년월일 date
+            user_name: 사용자 이름
+        """
+        parts = self.get(today).get(korean_name)
+        if parts is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        user = _encode({
+            "birth_date": birth_date_str,
+            "birth_date_formatted": birth_date.strftime('%Y년 %m월 %d일'),
+            "user_name": user_name
+        })
+        return parts[0] + user[1:-1] + parts[1]
+
+    def sign_body(self, korean_name, today=None):
+        """
+        사용자 필드 없이 별자리 정보만 담은 응답 본문 바이트 (GET /api/byeoljari/{sign}).
+        today가 번들 날짜가 아니면 그 날짜로 따로 계산합니다. 없는 별자리면 None
+        """
+        today = today or kst_today()
+        if today == self._date or today == kst_today():
+            parts = self.get(today).get(korean_name)
+        else:
+            sign = find_sign(korean_name)
+            parts = _sign_parts(*sign, today) if sign else None
+        if parts is None:
+            return None
+        return parts[0] + parts[1][1:]
+
+    def stats(self):
+        return {"date": str(self._date) if self._date else None, "builds": self.builds,
+                "build_ms": self.build_ms, "hits": self.hits, "misses": self.misses}
+
+
+daily_bundle = DailyBundle()
+metrics.register("constellation_bundle", daily_bundle.stats)
@@ -1,7 +1,20 @@
 """
 꿈해몽 계산 및 분석 유틸리티
+
+AI 해석은 키워드별로 저장소(utils.dream_store)에 저장해 재사용합니다.
+
+환경 변수:
+    DREAM_STORE_DB: 저장소 SQLite 파일 경로 (기본 data/dream_store.db, 빈 값이면 메모리만 사용)
+    DREAM_STORE_MEMORY: 메모리에 둘 키워드 수 (기본 4096)
 """
 import json
+import os
+from pathlib import Path
+
+from utils import metrics
+from utils.dream_index import KeywordIndex
+from utils.dream_search import DreamSearchIndex
+from utils.dream_store import DreamStore, normalize_keyword, prompt_version
 
 
 # 꿈해몽 대분류 및 키워드 데이터
@@ -59,10 +72,28 @@ DREAM_CATEGORIES = {
 
 def find_keyword_category(keyword):
     """키워드가 속한 카테고리를 찾습니다."""
-    for category_name, category_data in DREAM_CATEGORIES.items():
-        if keyword in category_data["키워드"]:
-            return category_name
-    return None
+    return keyword_index.category_of(keyword)
+
+
+def resolve_keyword(keyword):
+    """
+    입력을 색인된 키워드로 바꿉니다. 정확히 일치하면 그 키워드, 아니면 초성("ㅂㅁ" -> 뱀)이나
+    자모가 같은 입력을 상세 해몽이 있는 키워드로 바꾸고, 없거나 애매하면 None을 반환합니다.
+    """
+    entry = keyword_index.resolve(normalize_keyword(keyword))
+    return entry.keyword if entry is not None else None
+
+
+def similar_keywords(keyword, limit=5):
+    """오타일 수 있는 입력과 가까운 키워드 제안 (dict 목록, 해몽을 바꾸지 않고 보여 주기만 함)"""
+    keyword = normalize_keyword(keyword)
+    return [entry.to_dict() for _distance, entry in keyword_index.fuzzy(keyword, limit + 1)
+            if entry.keyword != keyword][:limit]
+
+
+def suggest_keywords(prefix, limit=10):
+    """prefix로 시작하는 꿈 키워드 자동완성 목록 (dict 목록, 상세 해몽이 있는 키워드 우선)"""
+    return [entry.to_dict() for entry in keyword_index.complete(prefix, limit)]
 
 
 def generate_default_dream_meaning(keyword, category):
@@ -161,27 +192,10 @@ def generate_generic_dream_meaning(keyword):
     }
 
 
-def generate_detailed_dream_with_ai(keyword, api_key):
-    """
-    AI API를 사용하여 상세한 꿈해몽을 생성합니다.
-    
-    Args:
-        keyword: 검색 키워드
-        api_key: OpenAI API 키
-        
-    Returns:
-        dict or None: 꿈해몽 정보 또는 None (실패 시)
-    """
-    try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=api_key)
-        
-        # 카테고리 정보 가져오기
-        category = find_keyword_category(keyword)
-        category_info = f"{category} 카테고리" if category else "일반"
-        
-        prompt = f"""다음 키워드에 대한 상세한 꿈해몽을 한국어로 제공해주세요.
+# AI 꿈해몽 프롬프트 (바꾸면 저장소 버전이 바뀌어 새로 생성됨)
+DREAM_MODEL = "gpt-4o-mini"
+DREAM_SYSTEM_PROMPT = "당신은 한국의 전통 꿈해몽 전문가입니다. 정확하고 상세한 꿈해몽 해석을 제공합니다. 항상 유효한 JSON 형식으로만 응답합니다."
+DREAM_PROMPT_TEMPLATE = """다음 키워드에 대한 상세한 꿈해몽을 한국어로 제공해주세요.
 
 키워드: {keyword}
 카테고리: {category_info}
@@ -203,11 +217,41 @@ def generate_detailed_dream_with_ai(keyword, api_key):
 }}
 
 JSON 형식만 응답하고, 다른 설명은 포함하지 마세요."""
+
+dream_store = DreamStore(
+    path=os.getenv("DREAM_STORE_DB", str(Path(__file__).resolve().parent.parent / "data" / "dream_store.db")),
+    version=prompt_version(DREAM_MODEL, DREAM_SYSTEM_PROMPT, DREAM_PROMPT_TEMPLATE),
+    memory_size=int(os.getenv("DREAM_STORE_MEMORY", "4096"))
+)
+metrics.register("dream_store", dream_store.stats)
+
+
+def generate_detailed_dream_with_ai(keyword, api_key):
+    """
+    AI API를 사용하여 상세한 꿈해몽을 생성합니다.
+    
+    Args:
+        keyword: 검색 키워드
+        api_key: OpenAI API 키
+        
+    Returns:
+        dict or None: 꿈해몽 정보 또는 None (실패 시)
+    """
+    try:
+        from openai import OpenAI
+        
+        client = OpenAI(api_key=api_key)
+        
+        # 카테고리 정보 가져오기
+        category = find_keyword_category(keyword)
+        category_info = f"{category} 카테고리" if category else "일반"
+        
+        prompt = DREAM_PROMPT_TEMPLATE.format(keyword=keyword, category_info=category_info)
         
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=DREAM_MODEL,
             messages=[
-                {"role": "system", "content": "당신은 한국의 전통 꿈해몽 전문가입니다. 정확하고 상세한 꿈해몽 해석을 제공합니다. 항상 유효한 JSON 형식으로만 응답합니다."},
+                {"role": "system", "content": DREAM_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
@@ -224,6 +268,8 @@ JSON 형식만 응답하고, 다른 설명은 포함하지 마세요."""
             result_text = result_text.split("```")[1].split("```")[0].strip()
         
         result = json.loads(result_text)
+        if not isinstance(result, dict) or not result.get("기본의미"):
+            return None
         return result
         
     except Exception:
@@ -231,10 +277,58 @@ JSON 형식만 응답하고, 다른 설명은 포함하지 마세요."""
         return None
 
 
+def search_dreams(query, k=5):
+    """
+    문장 질의(예: "뱀에 물리는 꿈")로 상세 해몽과 상황별 해몽을 BM25 검색합니다. (AI 호출 없음)
+    
+    Returns:
+        list[dict]: keyword, situation, title, category, score, snippet(강조 HTML)
+    """
+    results = search_index.search(query, k)
+    for result in results:
+        result["category"] = find_keyword_category(result["keyword"])
+    return results
+
+
+def _offline_dream_meaning(keyword):
+    """AI 호출 없이 만들 수 있는 해몽 (상세 해몽 -> 저장된 AI 해석 -> 카테고리 기본 해몽)"""
+    if keyword in _DREAM_MEANINGS_DB:
+        return _DREAM_MEANINGS_DB[keyword]
+    stored = dream_store.get(keyword)
+    if stored is not None:
+        return stored
+    category = find_keyword_category(keyword)
+    if category:
+        return generate_default_dream_meaning(keyword, category)
+    return generate_generic_dream_meaning(keyword)
+
+
+def lookup_dream_meaning(keyword):
+    """
+    AI 호출 없이 바로 줄 수 있는 해몽을 반환합니다. 없으면 None
+    
+    상세 해몽이 있으면 그 해몽을, 없고 저장된 AI 해석이 있으면 그 해석을 사용합니다.
+    (저장된 AI 해석이 손으로 쓴 상세 해몽을 덮어쓰지 않음)
+    입력이 초성이나 자모로 상세 해몽 키워드에 대응하면 그 키워드의 해몽을 사용합니다.
+    (오타 후보는 뜻이 다른 단어일 수 있으므로 사용하지 않음 — similar_keywords로 제안)
+    저장소 조회(SQLite)는 호출 스레드를 막으므로 이벤트 루프에서는 스레드로 호출합니다.
+    """
+    if normalize_keyword(keyword) in _DREAM_MEANINGS_DB:
+        return _DREAM_MEANINGS_DB[normalize_keyword(keyword)]
+    stored = dream_store.get(keyword)
+    if stored is not None:
+        return stored
+    matched = resolve_keyword(keyword)
+    if matched is not None and matched != normalize_keyword(keyword) and matched in _DREAM_MEANINGS_DB:
+        return _DREAM_MEANINGS_DB[matched]
+    return None
+
+
 def get_dream_meaning(keyword, api_key=None):
     """
     키워드에 대한 꿈해몽 정보를 반환합니다.
-    AI API를 시도하고, 실패 시 기본 해몽을 사용합니다 (fallback).
+    상세 해몽이나 저장된 AI 해석이 있거나 초성/자모로 상세 해몽 키워드에 대응하면 바로 반환하고 (lookup_dream_meaning),
+    없으면 AI API를 시도해 성공한 결과를 저장합니다. AI API 실패 시 기본 해몽을 사용합니다 (fallback).
     
     Args:
         keyword: 검색 키워드
@@ -243,11 +337,17 @@ def get_dream_meaning(keyword, api_key=None):
     Returns:
         dict: 꿈해몽 정보
     """
+    # 상세 해몽, 저장된 AI 해석, 초성/자모로 찾은 키워드 확인 (API Key가 없어도 사용)
+    found = lookup_dream_meaning(keyword)
+    if found is not None:
+        return found
+    
     # AI API를 사용하여 상세 해몽 생성 시도
     if api_key:
         try:
-            ai_result = generate_detailed_dream_with_ai(keyword, api_key)
+            ai_result = generate_detailed_dream_with_ai(normalize_keyword(keyword), api_key)
             if ai_result:
+                dream_store.set(keyword, ai_result)
                 return ai_result
         except Exception:
             # AI API 실패 시 조용히 fallback으로 진행
@@ -565,3 +665,9 @@ _DREAM_MEANINGS_DB = {
     }
 }
 
+
+# 키워드 색인 (정확히 일치 + 접두어 완성), import 시 한 번 생성
+keyword_index = KeywordIndex(DREAM_CATEGORIES, _DREAM_MEANINGS_DB.keys())
+
+# 해몽 전문 검색 색인 (BM25), import 시 한 번 생성
+search_index = DreamSearchIndex(_DREAM_MEANINGS_DB)
@@ -0,0 +1,188 @@
+"""
+꿈해몽 키워드 색인
+DREAM_CATEGORIES와 상세 해몽 데이터베이스의 키워드를 import 시점에 한 번 색인합니다.
+
+- 정확히 일치: 키워드 -> 항목 dict 조회
+- 접두어 완성: 자모로 분해한 키워드의 정렬 배열에서 이분 탐색 (입력 중인 "호라"도 "호랑이"와 일치)
+- 초성 검색: "ㅎㄹㅇ" -> 호랑이, 자음 골격 "ㅂㅁ" -> 뱀
+- 오타 후보: 자모 bigram 역색인으로 후보를 최대 FUZZY_CANDIDATES개로 좁힌 뒤 자모 편집 거리로 비교
+  한 자모 차이의 후보는 뜻이 다른 실제 단어인 경우가 많으므로(사람/바람, 사랑/사장) 제안으로만 사용
+- 자동 대체(resolve): 초성 일치, 자모가 정확히 같은 입력만, 상세 해몽이 있는 키워드로만 바꿈
+- 한 키워드가 여러 카테고리에 있으면 DREAM_CATEGORIES 순서상 첫 카테고리를 사용 (기존 동작과 같음)
+"""
+from bisect import bisect_left
+from collections import Counter
+
+from utils.hangul import choseong, consonants, decompose, edit_distance, is_consonant_query
+
+# 편집 거리를 계산할 최대 후보 수
+FUZZY_CANDIDATES = 24
+
+_END = "\U0010ffff"
+
+
+def _max_distance(jamo_length):
+    """자모 길이에 따른 오타 후보의 허용 편집 거리 (짧은 키워드일수록 엄격, 자모 4개 이하는 후보 없음)"""
+    if jamo_length <= 4:
+        return 0
+    if jamo_length <= 9:
+        return 1
+    return 2
+
+
+def _bigrams(jamo):
+    padded = f"^{jamo}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class KeywordEntry:
+    """색인된 키워드 하나"""
+
+    __slots__ = ("keyword", "category", "icon", "curated", "rank", "jamo", "initials", "skeleton")
+
+    def __init__(self, keyword, category, icon, curated, order):
+        self.keyword = keyword
+        self.category = category
+        self.icon = icon
+        self.curated = curated  # 상세 해몽 데이터베이스에 있는지
+        # 정렬 기준: 상세 해몽 우선, 짧은 키워드 우선, 카테고리 목록 순서
+        self.rank = (not curated, len(keyword), order)
+        self.jamo = decompose(keyword)
+        self.initials = choseong(keyword)
+        self.skeleton = consonants(keyword)
+
+    def to_dict(self):
+        return {"keyword": self.keyword, "category": self.category, "icon": self.icon, "curated": self.curated}
+
+
+class KeywordIndex:
+    """정확히 일치 + 접두어 완성 + 초성/오타 검색 색인"""
+
+    def __init__(self, categories, curated_keywords=()):
+        """
+        Args:
+            categories: DREAM_CATEGORIES 형식의 dict (카테고리명 -> {"키워드": [...], "아이콘": ...})
+            curated_keywords: 상세 해몽이 있는 키워드 목록
+        """
+        curated = set(curated_keywords)
+        self._entries = {}
+        order = 0
+        for category_name, category_data in categories.items():
+            for keyword in category_data["키워드"]:
+                if keyword not in self._entries:
+                    self._entries[keyword] = KeywordEntry(
+                        keyword, category_name, category_data.get("아이콘"), keyword in curated, order
+                    )
+                    order += 1
+        for keyword in sorted(curated):
+            if keyword not in self._entries:
+                self._entries[keyword] = KeywordEntry(keyword, None, None, True, order)
+                order += 1
+
+        entries = self._entries.values()
+        self._by_jamo = sorted((entry.jamo, entry.keyword) for entry in entries)
+        self._by_initials = sorted((entry.initials, entry.keyword) for entry in entries)
+        self._by_skeleton = {}
+        self._grams = {}
+        for entry in entries:
+            self._by_skeleton.setdefault(entry.skeleton, []).append(entry)
+            for gram in _bigrams(entry.jamo):
+                self._grams.setdefault(gram, []).append(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, keyword):
+        return keyword in self._entries
+
+    def get(self, keyword):
+        """키워드 항목 (없으면 None)"""
+        return self._entries.get(keyword)
+
+    def category_of(self, keyword):
+        """키워드가 속한 카테고리 이름 (없으면 None)"""
+        entry = self._entries.get(keyword)
+        return entry.category if entry is not None else None
+
+    def _range(self, array, prefix):
+        start = bisect_left(array, (prefix,))
+        end = bisect_left(array, (prefix + _END,), start)
+        return [self._entries[keyword] for _key, keyword in array[start:end]]
+
+    def complete(self, prefix, limit=10):
+        """
+        prefix로 시작하는 키워드를 순위대로 반환합니다. (KeywordEntry 목록)
+
+        자모 단위로 비교하므로 입력 중인 마지막 글자도 일치합니다.
+        자음만 입력하면 초성으로 시작하는 키워드를 찾습니다.
+        prefix와 정확히 같은 키워드가 있으면 맨 앞에 둡니다.
+        """
+        prefix = prefix.strip()
+        if not prefix or limit <= 0:
+            return []
+        if is_consonant_query(prefix):
+            query = "".join(prefix.split())
+            matches = {entry.keyword: entry for entry in self._range(self._by_initials, query)}
+            for entry in self._by_skeleton.get(query, ()):
+                matches.setdefault(entry.keyword, entry)
+            matches = list(matches.values())
+        else:
+            matches = self._range(self._by_jamo, decompose(prefix))
+        matches.sort(key=lambda entry: (entry.keyword != prefix, entry.rank))
+        return matches[:limit]
+
+    def match_initials(self, query):
+        """초성 또는 자음 골격이 query와 같은 키워드 (순위순)"""
+        query = "".join(query.split())
+        matches = {entry.keyword: entry for entry in self._by_skeleton.get(query, ())}
+        for entry in self._range(self._by_initials, query):
+            if entry.initials == query:
+                matches.setdefault(entry.keyword, entry)
+        return sorted(matches.values(), key=lambda entry: entry.rank)
+
+    def fuzzy(self, query, limit=5):
+        """
+        오타가 섞인 query와 가까운 키워드를 (편집 거리, KeywordEntry) 목록으로 반환합니다.
+
+        자모 bigram을 많이 공유하는 후보 최대 FUZZY_CANDIDATES개만 편집 거리를 계산합니다.
+        """
+        jamo = decompose("".join(query.split()))
+        if not jamo:
+            return []
+        counts = Counter()
+        for gram in _bigrams(jamo):
+            for entry in self._grams.get(gram, ()):
+                counts[entry.keyword] += 1
+        max_distance = _max_distance(len(jamo))
+        results = []
+        for keyword, _shared in counts.most_common(FUZZY_CANDIDATES):
+            entry = self._entries[keyword]
+            distance = edit_distance(jamo, entry.jamo, max_distance)
+            if distance <= max_distance:
+                results.append((distance, entry))
+        results.sort(key=lambda item: (item[0], item[1].rank))
+        return results[:limit]
+
+    def resolve(self, query):
+        """
+        query에 해당하는 색인 키워드를 하나 고릅니다. 없거나 애매하면 None
+
+        정확히 일치하면 그 키워드를, 아니면 상세 해몽이 있는 키워드 중에서
+        초성/자음 골격이 일치("ㅂㅁ" -> 뱀)하거나 자모가 정확히 같은("ㅂㅐㅁ" -> 뱀) 키워드가 하나뿐일 때 고릅니다.
+        오타 후보는 고르지 않습니다. (fuzzy로 제안만)
+        """
+        query = query.strip()
+        if not query:
+            return None
+        if query in self._entries:
+            return self._entries[query]
+        if is_consonant_query(query):
+            return _single_curated(self.match_initials(query))
+        jamo = decompose("".join(query.split()))
+        return _single_curated([entry for entry in self._range(self._by_jamo, jamo) if entry.jamo == jamo])
+
+
+def _single_curated(entries):
+    """상세 해몽이 있는 항목이 하나뿐이면 그 항목, 아니면 None"""
+    curated = [entry for entry in entries if entry.curated]
+    return curated[0] if len(curated) == 1 else None
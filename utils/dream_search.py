@@ -0,0 +1,162 @@
+"""
+꿈해몽 전문 검색 (BM25)
+상세 해몽 데이터베이스의 의미, 상황별 해몽, 상징 설명을 문서로 색인해 "뱀에 물리는 꿈" 같은 문장 검색을 지원합니다.
+
+- 문서: 키워드마다 본문 문서 1개 + 상황별해몽 항목마다 문서 1개
+- 토큰: 형태소 분석기 없이 어절마다 글자 unigram + bigram ("물리는" -> 물, 리, 는, 물리, 리는)
+  조사가 붙거나 활용된 형태도 겹치는 글자 조각으로 일치하고, 흔한 글자는 IDF로 가중치가 낮아짐
+- 제목(키워드, 상황명) 토큰은 TITLE_BOOST배로 반영
+- 색인은 생성 시 한 번 만들고, 검색은 질의 토큰의 posting 목록만 합산
+"""
+import heapq
+import html
+import math
+import re
+from collections import Counter
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+SNIPPET_CHARS = 80
+
+# 본문 문서에 넣는 필드 (상황별해몽은 별도 문서)
+BODY_FIELDS = ("기본의미", "상세해몽", "상징의미", "심리해석", "길흉설명", "조언")
+
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def tokenize(text):
+    """어절별 글자 unigram + bigram"""
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        tokens.extend(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class _Document:
+    __slots__ = ("keyword", "situation", "title", "fields", "length")
+
+    def __init__(self, keyword, situation, title, fields):
+        self.keyword = keyword
+        self.situation = situation
+        self.title = title
+        self.fields = fields  # [(필드명, 텍스트)]
+        self.length = 0
+
+
+class DreamSearchIndex:
+    """BM25 역색인"""
+
+    def __init__(self, meanings):
+        """
+        Args:
+            meanings: 키워드 -> 해몽 dict (_DREAM_MEANINGS_DB 형식)
+        """
+        self._docs = []
+        for keyword, meaning in meanings.items():
+            fields = [(name, meaning[name]) for name in BODY_FIELDS if meaning.get(name)]
+            self._docs.append(_Document(keyword, None, keyword, fields))
+            for situation, text in (meaning.get("상황별해몽") or {}).items():
+                self._docs.append(_Document(keyword, situation, situation, [("상황별해몽", text)]))
+
+        self._postings = {}  # 토큰 -> [(문서 번호, tf)]
+        for doc_id, doc in enumerate(self._docs):
+            counts = Counter()
+            for token in tokenize(doc.title):
+                counts[token] += TITLE_BOOST
+            for _name, text in doc.fields:
+                counts.update(tokenize(text))
+            doc.length = sum(counts.values())
+            for token, tf in counts.items():
+                self._postings.setdefault(token, []).append((doc_id, tf))
+
+        total = len(self._docs)
+        self._avg_length = sum(doc.length for doc in self._docs) / total if total else 0.0
+        self._idf = {
+            token: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+
+    def __len__(self):
+        return len(self._docs)
+
+    def search(self, query, k=5):
+        """
+        query와 가장 관련 있는 문서 k개를 반환합니다.
+
+        Returns:
+            list[dict]: keyword, situation(본문 문서면 None), title, score, snippet(<mark>로 강조한 HTML)
+        """
+        tokens = Counter(tokenize(query))
+        if not tokens or k <= 0:
+            return []
+        scores = {}
+        for token, query_tf in tokens.items():
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = self._idf[token]
+            for doc_id, tf in postings:
+                norm = K1 * (1 - B + B * self._docs[doc_id].length / self._avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (K1 + 1) / (tf + norm)
+
+        terms = _highlight_terms(query)
+        results = []
+        for doc_id, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]):
+            doc = self._docs[doc_id]
+            results.append({
+                "keyword": doc.keyword,
+                "situation": doc.situation,
+                "title": doc.title,
+                "score": round(score, 4),
+                "snippet": _snippet(doc, terms)
+            })
+        return results
+
+
+def _highlight_terms(query):
+    """강조할 조각: 질의 어절 전체와 그 bigram (긴 것부터 일치시키기 위해 길이 역순)"""
+    terms = set()
+    for word in _WORD.findall(query.lower()):
+        terms.add(word)
+        terms.update(word[i:i + 2] for i in range(len(word) - 1))
+    return sorted(terms, key=len, reverse=True)
+
+
+def _snippet(doc, terms):
+    """강조 조각이 가장 많이 들어 있는 필드에서 첫 일치 주변 SNIPPET_CHARS자를 잘라 강조합니다."""
+    if not doc.fields:
+        return ""
+    # 상황별 해몽은 상황명이 주로 일치하므로 "상황명: 해몽" 형태로 보여줌
+    texts = [f"{doc.situation}: {text}" if doc.situation else text for _name, text in doc.fields]
+    pattern = re.compile("|".join(re.escape(term) for term in terms)) if terms else None
+    text = texts[0]
+    first = None
+    if pattern is not None:
+        best = 0
+        for field_text in texts:
+            found = pattern.findall(field_text.lower())
+            if len(found) > best:
+                best = len(found)
+                text = field_text
+        match = pattern.search(text.lower())
+        first = match.start() if match else None
+
+    start = 0 if first is None else max(0, first - SNIPPET_CHARS // 4)
+    end = min(len(text), start + SNIPPET_CHARS)
+    window = text[start:end]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    if pattern is None:
+        return prefix + html.escape(window) + suffix
+
+    # 원문 위치 기준으로 강조 (소문자 변환은 한글/숫자 길이를 바꾸지 않음)
+    parts = []
+    last = 0
+    for match in pattern.finditer(window.lower()):
+        parts.append(html.escape(window[last:match.start()]))
+        parts.append(f"<mark>{html.escape(window[match.start():match.end()])}</mark>")
+        last = match.end()
+    parts.append(html.escape(window[last:]))
+    return prefix + "".join(parts) + suffix
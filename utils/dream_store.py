@@ -0,0 +1,180 @@
+"""
+꿈해몽 해석 저장소
+AI가 생성한 키워드별 꿈해몽을 SQLite 파일에 저장해 같은 키워드는 다시 모델을 호출하지 않습니다.
+
+- 키: (정규화된 키워드, 프롬프트 버전) — 프롬프트나 모델이 바뀌면 버전이 바뀌어 기존 해석은 쓰지 않음
+- 시작 시 현재 버전의 해석을 메모리로 읽어 두어, 자주 찾는 키워드는 파일 조회 없이 바로 반환
+- 파일을 열 수 없으면 메모리만 사용 (재시작하면 비워짐)
+
+인스턴스는 프롬프트를 가진 utils.dream에서 만듭니다 (dream_store).
+
+미리 채우기 (DREAM_CATEGORIES의 모든 키워드):
+    python -m utils.dream_store --api-key sk-...
+    (--api-key 대신 OPENAI_API_KEY 환경 변수 사용 가능, --force: 이미 있는 키워드도 다시 생성)
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_keyword(keyword):
+    """앞뒤 공백 제거, 연속 공백은 하나로"""
+    return " ".join(keyword.split())
+
+
+def prompt_version(*parts):
+    """프롬프트 구성 요소(모델, 시스템 프롬프트, 템플릿 등)의 해시"""
+    material = "\x00".join(parts)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class DreamStore:
+    """키워드별 꿈해몽 저장소 (메모리 LRU + SQLite)"""
+
+    def __init__(self, path, version, memory_size=4096):
+        self.path = path
+        self.version = version
+        self._memory = TTLCache(maxsize=max(1, memory_size), ttl=None)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.db_hits = 0
+        self.writes = 0
+        self.errors = 0
+        if path:
+            try:
+                self._open(path)
+                self._preload()
+            except sqlite3.Error as e:
+                logger.warning(f"꿈해몽 저장소 SQLite 초기화 실패, 메모리만 사용: {e}")
+                self._conn = None
+
+    def _open(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dream_meanings ("
+            "keyword TEXT NOT NULL, version TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (keyword, version))"
+        )
+        self._conn.commit()
+
+    def _preload(self):
+        # 최근 저장된 순서로 메모리 크기만큼 읽음 (오래된 것부터 넣어 최근 것이 LRU 뒤쪽에 오도록)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT keyword, value FROM dream_meanings WHERE version = ? ORDER BY created_at DESC LIMIT ?",
+                (self.version, self._memory.maxsize)
+            ).fetchall()
+        for keyword, value in reversed(rows):
+            self._memory.set(keyword, json.loads(value))
+        if rows:
+            logger.info(f"꿈해몽 저장소 로드: {len(rows)}개 키워드")
+
+    def get(self, keyword):
+        """저장된 해석을 반환합니다. 없으면 None"""
+        keyword = normalize_keyword(keyword)
+        value = self._memory.get(keyword)
+        if value is not None or self._conn is None:
+            return value
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM dream_meanings WHERE keyword = ? AND version = ?",
+                    (keyword, self.version)
+                ).fetchone()
+            if row is None:
+                return None
+            value = json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self.errors += 1
+            logger.warning(f"꿈해몽 저장소 조회 실패: {e}")
+            return None
+        self.db_hits += 1
+        self._memory.set(keyword, value)
+        return value
+
+    def set(self, keyword, value):
+        keyword = normalize_keyword(keyword)
+        self._memory.set(keyword, value)
+        self.writes += 1
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dream_meanings (keyword, version, value, created_at) VALUES (?, ?, ?, ?)",
+                    (keyword, self.version, json.dumps(value, ensure_ascii=False), time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"꿈해몽 저장소 저장 실패: {e}")
+
+    def __contains__(self, keyword):
+        return self.get(keyword) is not None
+
+    def stats(self):
+        result = {"version": self.version, "memory": self._memory.stats(), "db_hits": self.db_hits,
+                  "writes": self.writes, "errors": self.errors}
+        if self._conn is not None:
+            try:
+                with self._lock:
+                    result["db_size"] = self._conn.execute(
+                        "SELECT COUNT(*) FROM dream_meanings WHERE version = ?", (self.version,)
+                    ).fetchone()[0]
+            except sqlite3.Error:
+                result["db_size"] = None
+            result["path"] = self.path
+        return result
+
+
+def warm(api_key, force=False, workers=4):
+    """DREAM_CATEGORIES의 모든 키워드에 대해 AI 해석을 생성해 저장합니다. (생성 수, 실패 수) 반환"""
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.dream import DREAM_CATEGORIES, dream_store, generate_detailed_dream_with_ai
+
+    keywords = []
+    for category_data in DREAM_CATEGORIES.values():
+        for keyword in category_data["키워드"]:
+            if keyword not in keywords:
+                keywords.append(keyword)
+    if not force:
+        keywords = [keyword for keyword in keywords if keyword not in dream_store]
+
+    print(f"꿈해몽 저장소 채우기: {len(keywords)}개 키워드 (버전 {dream_store.version})")
+    generated = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(lambda keyword: (keyword, generate_detailed_dream_with_ai(keyword, api_key)), keywords)
+        for keyword, result in results:
+            if result:
+                dream_store.set(keyword, result)
+                generated += 1
+                print(f"저장 완료: {keyword}")
+            else:
+                failed += 1
+                print(f"생성 실패: {keyword}")
+    print(f"\n완료: {generated}개 저장, {failed}개 실패")
+    return generated, failed
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import sys
+
+    parser = argparse.ArgumentParser(description="꿈해몽 저장소를 DREAM_CATEGORIES의 모든 키워드로 미리 채웁니다.")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY", ""), help="OpenAI API 키 (기본: OPENAI_API_KEY)")
+    parser.add_argument("--force", action="store_true", help="이미 저장된 키워드도 다시 생성")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 생성할 키워드 수 (기본 4)")
+    args = parser.parse_args()
+    if not args.api_key:
+        parser.error("--api-key 또는 OPENAI_API_KEY가 필요합니다.")
+    _generated, failed = warm(args.api_key, force=args.force, workers=args.workers)
+    sys.exit(1 if failed else 0)
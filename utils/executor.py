@@ -0,0 +1,167 @@
+"""
+계산 작업 실행기
+사주/만세력 같은 CPU 계산을 이벤트 루프 밖(스레드 풀 또는 프로세스 풀)에서 실행합니다.
+
+- 대기열 깊이 제한: 실행 중 + 대기 중 작업이 한도를 넘으면 즉시 ComputeBusyError
+- 호출별 시간 제한: 초과 시 ComputeTimeoutError (이미 실행 중인 작업은 끝까지 실행됨)
+- 대기 시간/실행 시간 통계를 utils.metrics에 "compute_executor"로 등록
+
+환경 변수:
+    COMPUTE_EXECUTOR: "thread"(기본) 또는 "process"
+    COMPUTE_WORKERS: 작업자 수 (기본 2)
+    COMPUTE_MAX_QUEUE: 작업자 외에 대기할 수 있는 작업 수 (기본 32)
+    COMPUTE_TIMEOUT: 호출별 시간 제한(초, 기본 10)
+
+프로세스 풀에 넘기는 함수와 인자/반환값은 pickle 가능해야 합니다 (모듈 최상위 함수).
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeBusyError(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class ComputeTimeoutError(RuntimeError):
+    """작업이 시간 제한 안에 끝나지 않음"""
+
+
+def _timed_call(submitted_at, fn, args):
+    """작업자에서 실행: (결과, 대기 시간, 실행 시간) 반환. 프로세스 간 비교를 위해 time.time() 사용"""
+    started_at = time.time()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+class ComputeExecutor:
+    """대기열 제한과 시간 제한이 있는 스레드/프로세스 풀 래퍼"""
+
+    def __init__(self, kind="thread", workers=2, max_queue=32, timeout=10.0):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"알 수 없는 실행기 종류입니다: {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def _get_pool(self):
+        # 첫 사용 시 생성 (import 시점에 프로세스를 띄우지 않음)
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.kind == "process":
+                        # 스레드가 있는 서버 프로세스에서 fork하면 잠금 상태가 복사될 수 있어 spawn 사용
+                        self._pool = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+                    else:
+                        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compute")
+                    logger.info(f"계산 실행기 시작: {self.kind} x {self.workers}")
+        return self._pool
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+                return
+            _result, waited, ran = future.result()
+            self._completed += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._run_total += ran
+
+    async def run(self, fn, *args, timeout=None):
+        """
+        fn(*args)를 풀에서 실행하고 결과를 반환합니다.
+
+        Raises:
+            ComputeBusyError: 대기열이 가득 참
+            ComputeTimeoutError: 시간 제한 초과
+        """
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise ComputeBusyError("요청이 많아 계산 대기열이 가득 찼습니다.")
+            self._in_flight += 1
+            self._submitted += 1
+
+        try:
+            future = self._get_pool().submit(_timed_call, time.time(), fn, args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+                self._failed += 1
+            raise
+        future.add_done_callback(self._done)
+
+        limit = self.timeout if timeout is None else timeout
+        try:
+            result, _waited, _ran = await asyncio.wait_for(asyncio.wrap_future(future), limit)
+        except asyncio.TimeoutError:
+            # 아직 대기 중이면 취소, 실행 중이면 끝까지 실행됨 (_done에서 집계)
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise ComputeTimeoutError(f"계산이 {limit}초 안에 끝나지 않았습니다.")
+        return result
+
+    def stats(self):
+        with self._lock:
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout": self.timeout,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.workers),
+                "submitted": self._submitted,
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_queue_wait_ms": round(self._wait_total / completed * 1000, 3) if completed else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 3),
+                "avg_run_ms": round(self._run_total / completed * 1000, 3) if completed else 0.0
+            }
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+compute_executor = ComputeExecutor(
+    kind=os.getenv("COMPUTE_EXECUTOR", "thread"),
+    workers=int(os.getenv("COMPUTE_WORKERS", "2")),
+    max_queue=int(os.getenv("COMPUTE_MAX_QUEUE", "32")),
+    timeout=float(os.getenv("COMPUTE_TIMEOUT", "10"))
+)
+metrics.register("compute_executor", compute_executor.stats)
+
+
+async def run_compute(fn, *args, timeout=None):
+    """기본 계산 실행기에서 fn(*args)를 실행합니다. (ComputeExecutor.run 참고)"""
+    return await compute_executor.run(fn, *args, timeout=timeout)
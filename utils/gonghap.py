@@ -5,34 +5,18 @@
 import saju_logic
 
 
-def extract_char(ganji_str):
-    """간지 문자열에서 한자만 추출"""
-    if isinstance(ganji_str, str) and "(" in ganji_str:
-        return ganji_str.split()[0]
-    return ganji_str
-
-
-def get_element_from_stem(stem):
-    """천간에서 오행을 추출합니다."""
-    stem_char = extract_char(stem)
-    element_map = {
-        "甲": "木", "乙": "木",
-        "丙": "火", "丁": "火",
-        "戊": "土", "己": "土",
-        "庚": "金", "辛": "金",
-        "壬": "水", "癸": "水"
-    }
-    return element_map.get(stem_char, "土")
-
-
 def check_element_compatibility(element1, element2):
-    """두 오행의 상생/상극 관계를 확인합니다."""
-    sangsaeng = [("木", "火"), ("火", "土"), ("土", "金"), ("金", "水"), ("水", "木")]
-    sanggeuk = [("木", "土"), ("土", "水"), ("水", "火"), ("火", "金"), ("金", "木")]
+    """
+    두 오행의 상생/상극 관계를 확인합니다.
     
-    if (element1, element2) in sangsaeng or (element2, element1) in sangsaeng:
+    Args:
+        element1, element2: 오행 인덱스 (0=木, 1=火, 2=土, 3=金, 4=水)
+    """
+    # 상생은 한 칸(木->火), 상극은 두 칸(木->土) 차이 (어느 방향이든)
+    distance = (element2 - element1) % 5
+    if distance in (1, 4):
         return "상생"
-    elif (element1, element2) in sanggeuk or (element2, element1) in sanggeuk:
+    elif distance in (2, 3):
         return "상극"
     else:
         return "보통"
@@ -164,7 +148,14 @@ def calculate_gonghap(person1_pillars_data, person1_pillars_info, person1_gender
         
     Returns:
         dict: 궁합 분석 결과
+    
+    Raises:
+        ValueError: 기둥 데이터의 간지를 해석할 수 없는 경우
     """
+    # 클라이언트가 보낸 기둥 문자열은 여기서 한 번만 정수 코드로 변환
+    person1 = saju_logic.Pillars.from_pillars_data(person1_pillars_data)
+    person2 = saju_logic.Pillars.from_pillars_data(person2_pillars_data)
+    
     result = {
         "overall_score": 75,
         "overall_level": "보통",
@@ -179,9 +170,6 @@ def calculate_gonghap(person1_pillars_data, person1_pillars_info, person1_gender
         "detailed_guidance": {}
     }
     
-    # 지지 인덱스 매핑
-    branch_idx_map = {saju_logic.EARTHLY_BRANCHES[i].split()[0]: i for i in range(len(saju_logic.EARTHLY_BRANCHES))}
-    
     # 지지 관계 정의
     sanhap_groups = [[2, 6, 10], [8, 0, 4], [11, 3, 7], [5, 9, 1]]  # 삼합
     yukhap_pairs = [(0, 1), (2, 11), (3, 10), (4, 9), (5, 8), (6, 7)]  # 육합
@@ -196,83 +184,67 @@ def calculate_gonghap(person1_pillars_data, person1_pillars_info, person1_gender
     total_weight = 0
     
     # 각 기둥별 궁합 분석
-    for i, pillar_name in enumerate(pillar_names):
-        p1_stem = person1_pillars_data[i].get('Heavenly Stem (천간)', '')
-        p1_branch = person1_pillars_data[i].get('Earthly Branch (지지)', '')
-        p2_stem = person2_pillars_data[i].get('Heavenly Stem (천간)', '')
-        p2_branch = person2_pillars_data[i].get('Earthly Branch (지지)', '')
-        
-        # 천간 추출 (한글 제거)
-        p1_stem_char = extract_char(p1_stem)
-        p1_branch_char = extract_char(p1_branch)
-        p2_stem_char = extract_char(p2_stem)
-        p2_branch_char = extract_char(p2_branch)
-        
-        # 오행 분석
-        p1_stem_element = get_element_from_stem(p1_stem)
-        p2_stem_element = get_element_from_stem(p2_stem)
-        p1_branch_element = saju_logic.BRANCH_ELEMENTS.get(p1_branch, "土")
-        p2_branch_element = saju_logic.BRANCH_ELEMENTS.get(p2_branch, "土")
-        
+    for i, (pillar_name, p1_ganji, p2_ganji) in enumerate(zip(pillar_names, person1, person2)):
         # 천간 오행 상생/상극
-        stem_compat = check_element_compatibility(p1_stem_element, p2_stem_element)
-        branch_compat = check_element_compatibility(p1_branch_element, p2_branch_element)
+        stem_compat = check_element_compatibility(
+            saju_logic.STEM_ELEMENTS[p1_ganji.stem], saju_logic.STEM_ELEMENTS[p2_ganji.stem])
+        branch_compat = check_element_compatibility(
+            saju_logic.BRANCH_ELEMENTS[p1_ganji.branch], saju_logic.BRANCH_ELEMENTS[p2_ganji.branch])
         
         # 지지 관계 분석
-        p1_branch_idx = branch_idx_map.get(p1_branch_char, -1)
-        p2_branch_idx = branch_idx_map.get(p2_branch_char, -1)
+        p1_branch_idx = p1_ganji.branch
+        p2_branch_idx = p2_ganji.branch
         
         branch_relation = "평상"
         branch_desc = ""
         relation_score = 50  # 기본 점수
         
-        if p1_branch_idx >= 0 and p2_branch_idx >= 0:
-            # 육합 확인
-            for pair in yukhap_pairs:
+        # 육합 확인
+        for pair in yukhap_pairs:
+            if (p1_branch_idx == pair[0] and p2_branch_idx == pair[1]) or \
+               (p1_branch_idx == pair[1] and p2_branch_idx == pair[0]):
+                branch_relation = "육합"
+                branch_desc = "조화로운 관계로 서로를 보완합니다."
+                relation_score = 90
+                result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
+                break
+        
+        # 삼합 확인
+        if branch_relation == "평상":
+            for group in sanhap_groups:
+                if p1_branch_idx in group and p2_branch_idx in group:
+                    branch_relation = "삼합"
+                    branch_desc = "협력과 조화가 좋은 관계입니다."
+                    relation_score = 85
+                    result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
+                    break
+        
+        # 충 확인
+        if branch_relation == "평상":
+            for pair in chung_pairs:
                 if (p1_branch_idx == pair[0] and p2_branch_idx == pair[1]) or \
                    (p1_branch_idx == pair[1] and p2_branch_idx == pair[0]):
-                    branch_relation = "육합"
-                    branch_desc = "조화로운 관계로 서로를 보완합니다."
-                    relation_score = 90
+                    branch_relation = "충"
+                    branch_desc = "대립과 변화가 있는 관계입니다. 서로 다른 성향을 이해하는 노력이 필요합니다."
+                    relation_score = 40
+                    result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
+                    break
+        
+        # 형 확인
+        if branch_relation == "평상":
+            for group in hyeong_groups:
+                if p1_branch_idx in group and p2_branch_idx in group and p1_branch_idx != p2_branch_idx:
+                    branch_relation = "형"
+                    branch_desc = "약간의 마찰이나 경쟁이 있을 수 있는 관계입니다."
+                    relation_score = 55
                     result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
                     break
-            
-            # 삼합 확인
-            if branch_relation == "평상":
-                for group in sanhap_groups:
-                    if p1_branch_idx in group and p2_branch_idx in group:
-                        branch_relation = "삼합"
-                        branch_desc = "협력과 조화가 좋은 관계입니다."
-                        relation_score = 85
-                        result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
-                        break
-            
-            # 충 확인
-            if branch_relation == "평상":
-                for pair in chung_pairs:
-                    if (p1_branch_idx == pair[0] and p2_branch_idx == pair[1]) or \
-                       (p1_branch_idx == pair[1] and p2_branch_idx == pair[0]):
-                        branch_relation = "충"
-                        branch_desc = "대립과 변화가 있는 관계입니다. 서로 다른 성향을 이해하는 노력이 필요합니다."
-                        relation_score = 40
-                        result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
-                        break
-            
-            # 형 확인
-            if branch_relation == "평상":
-                for group in hyeong_groups:
-                    if p1_branch_idx in group and p2_branch_idx in group and p1_branch_idx != p2_branch_idx:
-                        branch_relation = "형"
-                        branch_desc = "약간의 마찰이나 경쟁이 있을 수 있는 관계입니다."
-                        relation_score = 55
-                        result["branch_relationships"].append(f"{pillar_name}: {branch_relation} ({branch_desc})")
-                        break
         
         # 십성 분석 (일주만)
         ten_god_relation = ""
         if i == 2:  # 일주
-            p1_day_stem_idx = person1_pillars_info.get('day_stem_idx', 0)
-            p2_day_stem_idx = person2_pillars_info.get('day_stem_idx', 0)
+            p1_day_stem_idx = person1.day_stem
+            p2_day_stem_idx = person2.day_stem
             
             # person1의 입장에서 person2의 일간이 어떤 십성인지
             p1_to_p2_ten_god = saju_logic.get_ten_god(p1_day_stem_idx, p2_day_stem_idx)
@@ -0,0 +1,89 @@
+"""
+한글 자모 유틸리티
+완성형 음절을 호환 자모로 분해해 초성 검색, 자모 단위 접두어/오타 비교에 사용합니다.
+
+- decompose("닭") -> "ㄷㅏㄹㄱ" (겹받침, 겹모음도 낱자로 나눔: 입력 중인 글자와 비교하기 위함)
+- choseong("호랑이") -> "ㅎㄹㅇ"
+- consonants("뱀") -> "ㅂㅁ" (모음을 뺀 자음 골격)
+"""
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹자모 -> 낱자 (두벌식 자판에서 입력하는 순서)
+_COMPOUND = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"
+}
+
+_CONSONANTS = set("ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ")
+
+
+def _split(jamo):
+    return _COMPOUND.get(jamo, jamo)
+
+
+def decompose(text):
+    """완성형 음절을 낱자 단위 호환 자모로 분해합니다. 한글이 아닌 문자는 그대로 둡니다."""
+    parts = []
+    for char in text:
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            index = code - _SYLLABLE_BASE
+            parts.append(CHOSEONG[index // 588])
+            parts.append(_split(JUNGSEONG[(index % 588) // 28]))
+            parts.append(_split(JONGSEONG[index % 28]))
+        else:
+            parts.append(_split(char))
+    return "".join(parts)
+
+
+def choseong(text):
+    """각 음절의 초성을 이어 붙인 문자열 (공백은 제외, 한글 음절이 아닌 문자는 그대로)"""
+    parts = []
+    for char in text:
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            parts.append(CHOSEONG[(code - _SYLLABLE_BASE) // 588])
+        elif not char.isspace():
+            parts.append(char)
+    return "".join(parts)
+
+
+def consonants(text):
+    """분해한 자모에서 자음만 남긴 문자열"""
+    return "".join(jamo for jamo in decompose(text) if jamo in _CONSONANTS)
+
+
+def is_consonant_query(text):
+    """공백을 뺀 모든 문자가 자음 자모인지 (예: "ㅂㅁ", "ㅎㄹㅇ")"""
+    stripped = "".join(text.split())
+    return bool(stripped) and all(char in _CONSONANTS for char in stripped)
+
+
+def edit_distance(a, b, max_distance):
+    """
+    레벤슈타인 거리. max_distance를 넘는 것이 확실해지면 max_distance + 1을 반환합니다.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
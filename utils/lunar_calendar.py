@@ -0,0 +1,280 @@
+"""
+음력 월 테이블
+1900~2100년 음력 달의 시작일(양력 서수), 달 길이, 윤달 여부를 배열로 미리 계산해 둔
+데이터 파일을 읽어 양력 <-> 음력 변환을 제공합니다.
+
+- 2050년까지: korean_lunar_calendar (한국천문연구원 자료 기반)
+- 2051년 이후: ephem 합삭 시각(한국시간) + 절기 테이블의 중기로 윤달 결정 (무중치윤)
+
+데이터 파일 재생성:
+    python -m utils.lunar_calendar
+"""
+import bisect
+import logging
+import sys
+from array import array
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from utils import solar_terms
+
+logger = logging.getLogger(__name__)
+
+MIN_YEAR = solar_terms.MIN_YEAR
+MAX_YEAR = solar_terms.MAX_YEAR
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "lunar_months.bin"
+
+# korean_lunar_calendar가 지원하는 마지막 양력 날짜
+_KLC_SOLAR_MAX = date(2050, 12, 31)
+
+# 월 정보 패킹: (year - _YEAR_BASE) << 5 | month << 1 | leap
+_YEAR_BASE = 1800
+
+LunarDate = namedtuple("LunarDate", ["year", "month", "day", "leap"])
+
+# 로드된 테이블: 시작일 서수(N+1개, 마지막은 끝 경계), 달 길이, 년, 월, 윤달 여부
+_starts = None
+_lengths = None
+_years = None
+_months = None
+_leaps = None
+_index = None
+
+
+def _pack(year, month, leap):
+    return ((year - _YEAR_BASE) << 5) | (month << 1) | int(leap)
+
+
+def _months_from_klc(first, last):
+    """korean_lunar_calendar로 first ~ last(양력) 사이에 시작하는 음력 달 목록을 만듭니다."""
+    from korean_lunar_calendar import KoreanLunarCalendar
+
+    months = []
+    calendar = KoreanLunarCalendar()
+    day = first
+    while day <= last:
+        calendar.setSolarDate(day.year, day.month, day.day)
+        if calendar.lunarDay == 1 or not months:
+            months.append((day.toordinal() - calendar.lunarDay + 1, calendar.lunarYear,
+                           calendar.lunarMonth, bool(calendar.isIntercalation)))
+            # 다음 달 시작 후보(29일 뒤)로 건너뜀
+            day = date.fromordinal(months[-1][0] + 29)
+        else:
+            day += timedelta(days=1)
+    return months
+
+
+def _new_moon_ordinals(first, last):
+    """first ~ last 사이 합삭일(한국시간)의 양력 서수 목록"""
+    import ephem
+
+    ordinals = []
+    when = ephem.Date(datetime(first.year, first.month, first.day) - timedelta(hours=9))
+    while True:
+        when = ephem.next_new_moon(when)
+        kst = ephem.Date(when).datetime() + timedelta(hours=9)
+        if kst.date() > last:
+            return ordinals
+        ordinals.append(kst.date().toordinal())
+
+
+def _months_from_ephem(first_year, last_year):
+    """
+    합삭과 중기(中氣)로 음력 달 목록을 계산합니다.
+    동지가 든 달을 11월로 하고, 11월~다음 11월 사이 달이 13개이면
+    처음 나오는 중기 없는 달을 윤달로 둡니다.
+
+    Returns:
+        list: (시작일 서수, 음력 년, 월, 윤달 여부) - first_year 동지월부터 last_year 동지월 전까지
+    """
+    new_moons = _new_moon_ordinals(date(first_year, 11, 1), date(last_year + 1, 2, 1))
+    principal_days = [
+        term.when.date().toordinal()
+        for term in solar_terms.terms_between(datetime(first_year, 11, 1), datetime(last_year + 1, 1, 1))
+        if term.order % 2
+    ]
+
+    def month_of(ordinal):
+        return bisect.bisect_right(new_moons, ordinal) - 1
+
+    def has_principal(k):
+        i = bisect.bisect_left(principal_days, new_moons[k])
+        return i < len(principal_days) and principal_days[i] < new_moons[k + 1]
+
+    months = []
+    for year in range(first_year, last_year):
+        start = month_of(solar_terms.find_term(year, 270).when.date().toordinal())
+        end = month_of(solar_terms.find_term(year + 1, 270).when.date().toordinal())
+        leap_pending = end - start == 13
+        lunar_year, month = year, 11
+        for k in range(start, end):
+            leap = False
+            if k > start:
+                if leap_pending and not has_principal(k):
+                    leap = True
+                    leap_pending = False
+                else:
+                    month += 1
+                    if month > 12:
+                        month = 1
+                        lunar_year += 1
+            months.append((new_moons[k], lunar_year, month, leap))
+    return months
+
+
+def build_table():
+    """
+    음력 달 테이블을 계산합니다.
+
+    Returns:
+        tuple: (시작일 서수 array('I'), 패킹된 월 정보 array('H'))
+    """
+    klc_months = _months_from_klc(date(MIN_YEAR, 1, 1), _KLC_SOLAR_MAX)
+    # 마지막 달은 끝이 잘릴 수 있으므로 그 시작일부터는 천문 계산 결과로 이어 붙임
+    join = klc_months.pop()
+    ephem_months = [m for m in _months_from_ephem(join[1] - 1, MAX_YEAR + 1) if m[0] >= join[0]]
+    if ephem_months[0] != join:
+        raise ValueError(f"음력 테이블 접합 불일치: {join} != {ephem_months[0]}")
+    months = klc_months + ephem_months
+
+    starts = array("I", [m[0] for m in months])
+    info = array("H", [_pack(m[1], m[2], m[3]) for m in months[:-1]])
+    return starts, info
+
+
+def write_table(path=DATA_FILE):
+    """테이블을 계산해 [개수 uint32][시작일 uint32 * (N+1)][월 정보 uint16 * N] 형식으로 저장합니다."""
+    starts, info = build_table()
+    header = array("I", [len(info)])
+    if sys.byteorder != "little":
+        for arr in (header, starts, info):
+            arr.byteswap()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        header.tofile(f)
+        starts.tofile(f)
+        info.tofile(f)
+    return path
+
+
+def _load_table():
+    global _starts, _lengths, _years, _months, _leaps, _index
+    if _starts is not None:
+        return
+
+    try:
+        with open(DATA_FILE, "rb") as f:
+            raw = f.read()
+        header = array("I")
+        header.frombytes(raw[:4])
+        if sys.byteorder != "little":
+            header.byteswap()
+        count = header[0]
+        starts = array("I")
+        starts.frombytes(raw[4:4 + 4 * (count + 1)])
+        info = array("H")
+        info.frombytes(raw[4 + 4 * (count + 1):])
+        if sys.byteorder != "little":
+            starts.byteswap()
+            info.byteswap()
+        if len(starts) != count + 1 or len(info) != count:
+            raise ValueError("음력 테이블 크기 불일치")
+    except (OSError, ValueError) as e:
+        # 데이터 파일이 없거나 손상된 경우에만 직접 계산 (수 초 소요)
+        logger.warning(f"음력 데이터 파일을 사용할 수 없어 직접 계산합니다: {e}")
+        starts, info = build_table()
+
+    _lengths = array("B", [starts[i + 1] - starts[i] for i in range(len(info))])
+    _years = array("H", [(v >> 5) + _YEAR_BASE for v in info])
+    _months = array("B", [(v >> 1) & 0xF for v in info])
+    _leaps = bytes(v & 1 for v in info)
+    _index = {(_years[i], _months[i], bool(_leaps[i])): i for i in range(len(info))}
+    _starts = starts
+
+
+def _month_index(ordinal):
+    _load_table()
+    idx = bisect.bisect_right(_starts, ordinal) - 1
+    if idx < 0 or idx >= len(_lengths):
+        raise ValueError(f"지원 범위({MIN_YEAR}~{MAX_YEAR}년)를 벗어난 날짜입니다.")
+    return idx
+
+
+def solar_to_lunar(solar_date):
+    """
+    양력 날짜를 음력으로 변환합니다.
+
+    Args:
+        solar_date: date 또는 datetime
+
+    Returns:
+        LunarDate
+    """
+    ordinal = solar_date.toordinal()
+    idx = _month_index(ordinal)
+    return LunarDate(_years[idx], _months[idx], ordinal - _starts[idx] + 1, bool(_leaps[idx]))
+
+
+def solar_to_lunar_range(start, end):
+    """
+    양력 start 이상 end 미만의 모든 날짜를 음력으로 변환합니다.
+    시작 달만 이진 탐색하고 이후는 달 경계를 따라 순차로 채웁니다.
+
+    Args:
+        start: date (포함)
+        end: date (미포함)
+
+    Returns:
+        list[LunarDate]
+    """
+    first = start.toordinal()
+    last = end.toordinal()
+    if last <= first:
+        return []
+    idx = _month_index(first)
+    _month_index(last - 1)  # 범위 확인
+
+    result = []
+    ordinal = first
+    while ordinal < last:
+        month_end = min(_starts[idx + 1], last)
+        year, month, leap = _years[idx], _months[idx], bool(_leaps[idx])
+        base = _starts[idx] - 1
+        result.extend(LunarDate(year, month, o - base, leap) for o in range(ordinal, month_end))
+        ordinal = month_end
+        idx += 1
+    return result
+
+
+def lunar_to_solar(year, month, day, leap=False):
+    """
+    음력 날짜를 양력으로 변환합니다.
+
+    Args:
+        year, month, day: 음력 년/월/일
+        leap: 윤달 여부
+
+    Returns:
+        date
+
+    Raises:
+        ValueError: 존재하지 않는 음력 날짜 (윤달이 없는 달, 30일이 없는 작은 달 등)
+    """
+    _load_table()
+    idx = _index.get((year, month, bool(leap)))
+    if idx is None:
+        if leap:
+            raise ValueError(f"음력 {year}년에는 윤{month}월이 없습니다.")
+        raise ValueError(f"지원 범위({MIN_YEAR}~{MAX_YEAR}년)를 벗어난 음력 날짜입니다.")
+    if day < 1 or day > _lengths[idx]:
+        raise ValueError(f"음력 {year}년 {'윤' if leap else ''}{month}월은 {_lengths[idx]}일까지입니다.")
+    return date.fromordinal(_starts[idx] + day - 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    written = write_table()
+    print(f"음력 테이블 생성 완료: {written}")
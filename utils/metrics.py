@@ -0,0 +1,32 @@
+"""
+운영 지표 모음
+캐시/스트림 등 각 모듈이 자신의 통계 함수를 등록하면 /api/stats에서 한 번에 조회합니다.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+_providers = {}
+
+
+def register(name, provider):
+    """
+    통계 제공 함수를 등록합니다.
+
+    Args:
+        name: 지표 이름 (예: "calculate_cache")
+        provider: 인자 없이 호출하면 JSON 직렬화 가능한 dict를 반환하는 함수
+    """
+    _providers[name] = provider
+
+
+def snapshot():
+    """등록된 모든 지표를 조회합니다. 개별 지표 오류는 나머지 조회를 막지 않습니다."""
+    result = {}
+    for name, provider in _providers.items():
+        try:
+            result[name] = provider()
+        except Exception as e:
+            logger.warning(f"지표 조회 실패 ({name}): {e}")
+            result[name] = {"error": str(e)}
+    return result
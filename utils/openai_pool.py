@@ -0,0 +1,94 @@
+"""
+OpenAI 비동기 클라이언트 풀
+API Key별 AsyncOpenAI 클라이언트를 재사용해 TLS 연결(keep-alive)을 요청 간에 공유합니다.
+
+- 키 원문 대신 SHA-256 해시로 구분 (지표/로그에 키가 노출되지 않음)
+- 크기 제한(LRU): 사용자마다 다른 키를 입력하므로 오래 쓰지 않은 클라이언트부터 제거
+- 클라이언트는 생성된 이벤트 루프에 묶이므로 다른 루프에서 요청하면 새로 생성
+
+환경 변수:
+    OPENAI_CLIENT_POOL_SIZE: 보관할 클라이언트 수 (기본 32)
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from openai import AsyncOpenAI
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+_maxsize = max(1, int(os.getenv("OPENAI_CLIENT_POOL_SIZE", "32")))
+_clients = OrderedDict()  # 키 해시 -> (이벤트 루프, AsyncOpenAI)
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_evictions = 0
+
+
+def key_hash(api_key):
+    """API Key의 SHA-256 해시 (16진수)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def get_async_client(api_key):
+    """
+    API Key에 해당하는 AsyncOpenAI 클라이언트를 반환합니다. 없으면 생성해 풀에 넣습니다.
+
+    AsyncOpenAI는 내부 HTTP 연결 풀을 유지하므로 같은 클라이언트를 쓰는 요청끼리
+    이미 열린 연결을 재사용합니다. 반드시 이벤트 루프 안에서 호출해야 합니다.
+    """
+    global _hits, _misses, _evictions
+    loop = asyncio.get_running_loop()
+    digest = key_hash(api_key)
+    with _lock:
+        entry = _clients.get(digest)
+        if entry is not None and entry[0] is loop:
+            _clients.move_to_end(digest)
+            _hits += 1
+            return entry[1]
+        _misses += 1
+        client = AsyncOpenAI(api_key=api_key)
+        _clients[digest] = (loop, client)
+        _clients.move_to_end(digest)
+        # 제거된 클라이언트는 닫지 않음: 진행 중인 스트림이 참조를 들고 있을 수 있으며
+        # 참조가 모두 사라지면 연결도 함께 정리됨
+        while len(_clients) > _maxsize:
+            _clients.popitem(last=False)
+            _evictions += 1
+    return client
+
+
+async def aclose_all():
+    """현재 루프에서 만든 클라이언트를 모두 닫고 풀을 비웁니다. (종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entries = list(_clients.values())
+        _clients.clear()
+    for client_loop, client in entries:
+        if client_loop is loop:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"OpenAI 클라이언트 종료 실패: {e}")
+
+
+def stats():
+    """풀 통계 (크기, 재사용/생성 횟수, 제거 횟수)"""
+    with _lock:
+        lookups = _hits + _misses
+        return {
+            "size": len(_clients),
+            "maxsize": _maxsize,
+            "hits": _hits,
+            "misses": _misses,
+            "hit_rate": round(_hits / lookups, 4) if lookups else 0.0,
+            "evictions": _evictions
+        }
+
+
+metrics.register("openai_clients", stats)
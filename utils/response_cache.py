@@ -0,0 +1,169 @@
+"""
+인코딩된 응답 캐시
+결과가 입력만으로 정해지는 응답(만세력, 별자리운세, 토정비결, sitemap, robots)을 인코딩한 바이트로 저장해
+적중하면 직렬화 없이 그대로 보냅니다.
+
+- 키: (엔드포인트, 정규화한 파라미터, 날짜 구간) — 날짜에 따라 바뀌는 응답은 그 계산이 쓰는 날짜를 구간으로 넘김
+- 값: 본문 바이트 + gzip 압축본(GZIP_MIN_SIZE 이상일 때) + 강한 ETag(본문 SHA-256)
+  강한 ETag는 표현마다 달라야 하므로 gzip 압축본은 "-gz"를 붙인 ETag를 씀
+- If-None-Match가 보내는 표현의 ETag와 같으면 본문 없이 304
+- Accept-Encoding에 gzip이 있으면 압축본을 보냄
+- 적중할 때마다 저장 시 걸린 인코딩 시간(JSON 직렬화 + 압축 + 해시)을 절약 시간으로 엔드포인트별 집계
+
+GET 엔드포인트는 cache_control로 Cache-Control을 붙여 브라우저/프록시가 같은 요청을 Python까지 보내지 않게 합니다.
+날짜가 정해진 응답은 LONG_MAX_AGE, 오늘 날짜에 따라 바뀌는 응답은 자정까지(seconds_until_midnight) 캐시합니다.
+
+환경 변수:
+    RESPONSE_CACHE_SIZE: 최대 항목 수 (기본 4096)
+    RESPONSE_CACHE_TTL: 항목 유지 시간(초, 기본 86400)
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import timedelta
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from utils import metrics
+from utils.cache import TTLCache
+
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+# 입력이 모두 정해져 결과가 바뀌지 않는 응답의 캐시 시간 (7일)
+LONG_MAX_AGE = 604800
+
+
+def seconds_until_midnight(now):
+    """now가 속한 날의 자정까지 남은 초 (now의 시간대 기준, 최소 60초)"""
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(60, int((midnight - now).total_seconds()))
+
+
+def cache_control(max_age, private=False):
+    """Cache-Control 헤더 값 (이름 등 개인 정보가 들어 있으면 private)"""
+    return f"{'private' if private else 'public'}, max-age={int(max_age)}"
+
+
+def encode_json(content):
+    """starlette JSONResponse.render와 같은 형식으로 인코딩"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class CachedBody:
+    """인코딩이 끝난 응답 하나"""
+
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag", "media_type", "encode_ms")
+
+    def __init__(self, body, media_type, encode_ms=0.0):
+        started = time.perf_counter()
+        self.body = body
+        self.media_type = media_type
+        self.gzipped = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"' if self.gzipped is not None else None
+        self.encode_ms = encode_ms + (time.perf_counter() - started) * 1000
+
+
+def _accepts_gzip(request):
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _sep, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            return not (q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"))
+    return False
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교 (W/ 접두어 무시)
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class ResponseCache:
+    """엔드포인트별 통계를 가진 인코딩된 응답 캐시"""
+
+    def __init__(self, maxsize=4096, ttl=86400):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._endpoints = {}
+
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {
+                "hits": 0, "misses": 0, "not_modified": 0, "gzip": 0,
+                "encode_ms": 0.0, "encode_ms_saved": 0.0
+            }
+        return stats
+
+    def get(self, endpoint, params, bucket=None):
+        """저장된 응답(CachedBody), 없으면 None"""
+        entry = self._cache.get((endpoint, params, bucket))
+        stats = self._stats(endpoint)
+        if entry is None:
+            stats["misses"] += 1
+        else:
+            stats["hits"] += 1
+            stats["encode_ms_saved"] += entry.encode_ms
+        return entry
+
+    def put(self, endpoint, params, content, bucket=None, media_type="application/json"):
+        """
+        content를 인코딩해 저장하고 CachedBody를 반환합니다.
+
+        Args:
+            content: bytes/str은 그대로(UTF-8), 그 밖의 값은 JSON으로 인코딩
+        """
+        started = time.perf_counter()
+        if isinstance(content, bytes):
+            body = content
+        elif isinstance(content, str):
+            body = content.encode("utf-8")
+        else:
+            body = encode_json(content)
+        entry = CachedBody(body, media_type, (time.perf_counter() - started) * 1000)
+        self._cache.set((endpoint, params, bucket), entry)
+        self._stats(endpoint)["encode_ms"] += entry.encode_ms
+        return entry
+
+    def respond(self, request: Request, entry, endpoint, headers=None):
+        """CachedBody를 응답으로 만듭니다. (ETag 일치 시 304, gzip 허용 시 압축본)"""
+        stats = self._stats(endpoint)
+        use_gzip = entry.gzipped is not None and _accepts_gzip(request)
+        etag = entry.gzip_etag if use_gzip else entry.etag
+        response_headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if headers:
+            response_headers.update(headers)
+        if _etag_matches(request, etag):
+            stats["not_modified"] += 1
+            return Response(status_code=304, headers=response_headers)
+        if use_gzip:
+            stats["gzip"] += 1
+            response_headers["Content-Encoding"] = "gzip"
+            return Response(content=entry.gzipped, media_type=entry.media_type, headers=response_headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=response_headers)
+
+    def stats(self):
+        return {
+            "cache": self._cache.stats(),
+            "endpoints": {
+                endpoint: {**stats, "encode_ms": round(stats["encode_ms"], 3),
+                           "encode_ms_saved": round(stats["encode_ms_saved"], 3)}
+                for endpoint, stats in self._endpoints.items()
+            }
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "4096")),
+    ttl=int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+)
+metrics.register("response_cache", response_cache.stats)
@@ -0,0 +1,189 @@
+"""
+사주 계산 결과 저장소
+/api/calculate 결과를 짧은 결과 ID로 서버에 보관해, 이후 요청(AI 분석, 토정비결)이
+수십 KB의 calculated_data를 다시 보내지 않고 결과 ID만 보내도록 합니다.
+
+- 결과 ID: secrets.token_urlsafe(16) (URL 안전 문자 22자, 저장할 때마다 새로 발급)
+  결과 ID가 있으면 결과를 읽을 수 있으므로 출생 정보로 계산해 낼 수 없고, 같은 사람의 요청끼리 연결되지 않게 함
+- 중복 제거 키: 계산 입력과 계산한 날짜의 SHA-256 (서버 내부에서만 사용, 응답에 담지 않음)
+  같은 날 같은 입력이면 메모리에는 결과를 한 번만 보관하고 결과 ID들이 그 결과를 가리킴
+- 값: 응답 data와 년주 코드 (토정비결은 기둥 문자열을 다시 해석하지 않음)
+- 메모리(LRU + TTL)를 먼저 조회하고, 설정 시 SQLite 파일을 2차 저장소로 사용 (재시작/워커 간 공유)
+- 만료되었거나 없는 ID면 클라이언트가 calculated_data로 다시 요청 (엔드포인트는 410 응답)
+
+환경 변수:
+    RESULT_STORE_SIZE: 메모리에 보관할 결과 수 (기본 512)
+    RESULT_STORE_TTL: 결과 보관 시간(초, 기본 86400)
+    RESULT_STORE_DB: SQLite 파일 경로 (미설정 시 메모리만 사용)
+    RESULT_STORE_DB_SIZE: SQLite에 보관할 결과 수 (기본 20000)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+
+from utils import metrics
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_RESULT_ID = re.compile(r"^[A-Za-z0-9_-]{22}$")
+
+
+def make_result_key(*parts):
+    """계산 입력으로 중복 제거 키를 만듭니다. (내부용, 결과 ID로 쓰지 않음)"""
+    material = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def new_result_id():
+    return secrets.token_urlsafe(16)
+
+
+def is_result_id(value):
+    """결과 ID 형식인지"""
+    return isinstance(value, str) and bool(_RESULT_ID.match(value))
+
+
+class _SQLiteResults:
+    """결과를 JSON 문자열로 저장하는 SQLite 저장소 (오래 저장된 순서로 제거)"""
+
+    def __init__(self, path, maxsize, ttl):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS calc_results ("
+            "id TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS calc_results_created ON calc_results (created_at)")
+        self._conn.commit()
+
+    def get(self, result_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM calc_results WHERE id = ?", (result_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if created_at + self.ttl <= time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, result_id, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calc_results (id, value, created_at) VALUES (?, ?, ?)",
+                (result_id, json.dumps(value, ensure_ascii=False), now)
+            )
+            self._conn.execute("DELETE FROM calc_results WHERE created_at <= ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM calc_results WHERE id IN "
+                "(SELECT id FROM calc_results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            )
+            self._conn.commit()
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM calc_results").fetchone()[0]
+
+
+class ResultStore:
+    """결과 ID -> 계산 결과 (메모리 + 선택적 SQLite)"""
+
+    def __init__(self, maxsize=512, ttl=86400, db_path=None, db_maxsize=20000):
+        # 메모리: 결과 ID -> 중복 제거 키 -> 결과 (같은 입력의 결과를 한 번만 보관)
+        self._ids = TTLCache(maxsize=max(1, maxsize) * 4, ttl=ttl)
+        self._memory = TTLCache(maxsize=max(1, maxsize), ttl=ttl)
+        self._db = None
+        self.stored = 0
+        self.db_hits = 0
+        self.db_errors = 0
+        if db_path:
+            try:
+                self._db = _SQLiteResults(db_path, db_maxsize, ttl)
+                logger.info(f"계산 결과 저장소 SQLite 사용: {db_path}")
+            except sqlite3.Error as e:
+                logger.warning(f"계산 결과 저장소 SQLite 초기화 실패, 메모리만 사용: {e}")
+
+    async def aput(self, key, record):
+        """
+        결과를 저장하고 새 결과 ID를 반환합니다. (SQLite 저장은 스레드에서 실행)
+
+        Args:
+            key: 중복 제거 키 (make_result_key)
+            record: {"data": /calculate 응답 data, "year_pillar": 년주 Ganji 코드}
+        """
+        result_id = new_result_id()
+        if key in self._memory:
+            record = self._memory.get(key)
+        else:
+            self._memory.set(key, record)
+            self.stored += 1
+        self._ids.set(result_id, key)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, result_id, record)
+        return result_id
+
+    async def aget(self, result_id):
+        """저장된 결과, 없거나 만료되었으면 None"""
+        key = self._ids.get(result_id)
+        record = self._memory.get(key) if key is not None else None
+        if record is None and self._db is not None:
+            record = await asyncio.to_thread(self._db_get, result_id)
+        return record
+
+    def _db_get(self, result_id):
+        try:
+            record = self._db.get(result_id)
+        except (sqlite3.Error, ValueError) as e:
+            self.db_errors += 1
+            logger.warning(f"계산 결과 조회 실패: {e}")
+            return None
+        if record is not None:
+            self.db_hits += 1
+        return record
+
+    def _db_set(self, result_id, record):
+        try:
+            self._db.set(result_id, record)
+        except sqlite3.Error as e:
+            self.db_errors += 1
+            logger.warning(f"계산 결과 저장 실패: {e}")
+
+    def stats(self):
+        result = {**self._memory.stats(), "ids": len(self._ids), "stored": self.stored}
+        if self._db is not None:
+            try:
+                db_size = self._db.size()
+            except sqlite3.Error:
+                db_size = None
+            result["db"] = {
+                "path": self._db.path,
+                "size": db_size,
+                "maxsize": self._db.maxsize,
+                "hits": self.db_hits,
+                "errors": self.db_errors
+            }
+        return result
+
+
+result_store = ResultStore(
+    maxsize=int(os.getenv("RESULT_STORE_SIZE", "512")),
+    ttl=int(os.getenv("RESULT_STORE_TTL", "86400")),
+    db_path=os.getenv("RESULT_STORE_DB") or None,
+    db_maxsize=int(os.getenv("RESULT_STORE_DB_SIZE", "20000"))
+)
+metrics.register("result_store", result_store.stats)
@@ -148,3 +148,24 @@ def is_production() -> bool:
     # Heroku 환경 변수 확인
     return 'DYNO' in os.environ or os.environ.get('ENVIRONMENT') == 'production'
 
+
+
+def verify_admin_token(token) -> bool:
+    """
+    운영용 엔드포인트(/api/stats 등)의 관리자 토큰을 확인합니다.
+    ADMIN_TOKEN이 설정되어 있으면 같은 토큰만 허용하고,
+    설정되지 않았으면 ENVIRONMENT=development로 명시한 로컬 개발 환경에서만 허용합니다.
+    (Vercel처럼 is_production()이 알아보지 못하는 배포에서도 열리지 않도록 기본은 거부)
+    
+    Args:
+        token: 요청에 담긴 토큰 (없으면 None)
+        
+    Returns:
+        bool: 허용 여부
+    """
+    import os
+    import secrets
+    expected = os.environ.get('ADMIN_TOKEN')
+    if not expected:
+        return os.environ.get('ENVIRONMENT') == 'development' and not is_production()
+    return isinstance(token, str) and secrets.compare_digest(token.encode('utf-8'), expected.encode('utf-8'))
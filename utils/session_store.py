@@ -0,0 +1,312 @@
+"""
+서버 측 세션 저장소
+쿠키에는 무작위 세션 ID만 담고 세션 내용은 서버(메모리 또는 SQLite)에 저장합니다.
+서명 쿠키(starlette SessionMiddleware)처럼 4KB 쿠키 크기 제한을 신경 쓰지 않고
+사주 계산 결과(pillars_data, pillars_info 등)를 세션에 둘 수 있습니다.
+
+- 세션 ID: secrets.token_urlsafe(32) (256비트, 추측 불가능하므로 서명하지 않음)
+- 지연 로드: request.session에 처음 접근할 때만 메모리 저장소를 조회
+  SQLite 저장소는 이벤트 루프를 막지 않도록 세션 ID 쿠키가 있는 요청에서 스레드로 미리 조회
+- 변경 시에만 저장: 최상위 키를 설정/삭제한 요청만 저장소에 쓰고 Set-Cookie를 보냄
+  (세션 안의 dict/list를 직접 고치면 변경으로 감지되지 않으므로 값을 다시 대입해야 함)
+- 저장소에 없는 세션 ID 쿠키는 무시하고 새 ID를 발급 (클라이언트가 고른 ID를 쓰지 않음)
+- 세션을 비우면 저장소에서 지우고 쿠키를 만료시킴
+- 보관 기간은 마지막 저장 시점부터 SESSION_TTL이며, 쿠키 Max-Age도 저장할 때마다 같은 값으로 갱신
+
+서버 저장소는 모든 인스턴스가 같은 저장소를 볼 때만 쓸 수 있습니다.
+메모리 저장소는 재시작하면 비고 인스턴스마다 따로이므로(Vercel처럼 인스턴스가 여럿 뜨는 배포) 명시적으로
+고른 경우(단일 프로세스 배포)에만 쓰고, 서버 저장소를 설정하지 않으면 기존처럼 서명 쿠키
+(starlette SessionMiddleware, SECRET_KEY)에 세션을 담습니다. 이때는 쿠키 크기 때문에 사주 기둥 등
+큰 값을 세션에 두지 않아야 합니다. (SERVER_SIDE로 확인)
+
+환경 변수:
+    SESSION_DB: SQLite 파일 경로 (설정 시 SQLite 저장소, 같은 디스크를 쓰는 워커끼리 공유)
+    SESSION_STORE: "memory"면 SESSION_DB가 없을 때 메모리 LRU 저장소 사용 (미설정 시 서명 쿠키)
+    SESSION_STORE_SIZE: 보관할 세션 수 (기본 10000)
+    SESSION_TTL: 세션 보관 시간(초, 기본 86400, 서명 쿠키의 max_age도 같은 값)
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from utils import metrics
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{43}$")
+
+_counters = {"loads": 0, "load_errors": 0, "saves": 0, "save_errors": 0, "deletes": 0, "unchanged": 0}
+
+
+def new_session_id():
+    return secrets.token_urlsafe(32)
+
+
+def is_session_id(value):
+    """세션 ID 형식인지"""
+    return isinstance(value, str) and bool(_SESSION_ID.match(value))
+
+
+class MemorySessionBackend:
+    """프로세스 메모리 LRU 세션 저장소 (재시작하면 사라짐)"""
+
+    blocking = False
+
+    def __init__(self, maxsize=10000, ttl=86400):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def load(self, session_id):
+        data = self._cache.get(session_id)
+        return dict(data) if data is not None else None
+
+    def save(self, session_id, data):
+        self._cache.set(session_id, dict(data))
+
+    def delete(self, session_id):
+        self._cache.pop(session_id)
+
+    def stats(self):
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteSessionBackend:
+    """세션을 JSON 문자열로 저장하는 SQLite 저장소 (재시작/워커 간 공유, 오래 저장된 순서로 제거)"""
+
+    blocking = True
+
+    def __init__(self, path, maxsize=10000, ttl=86400):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at)")
+        self._conn.commit()
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, updated_at = row
+        if updated_at + self.ttl <= time.time():
+            return None
+        return json.loads(value)
+
+    def save(self, session_id, data):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, value, updated_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(data, ensure_ascii=False), now)
+            )
+            self._conn.execute("DELETE FROM sessions WHERE updated_at <= ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM sessions WHERE id IN "
+                "(SELECT id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,)
+            )
+            self._conn.commit()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": "sqlite", "path": self.path, "size": size, "maxsize": self.maxsize, "ttl": self.ttl}
+
+
+class Session(MutableMapping):
+    """
+    request.session 값. 처음 접근할 때 저장소에서 읽고, 최상위 키가 바뀌었는지 기록합니다.
+    (조회가 스레드를 막는 저장소는 미들웨어가 aload()로 미리 읽어 둠)
+    """
+
+    def __init__(self, backend, session_id=None):
+        self.backend = backend
+        self.session_id = session_id
+        self.modified = False
+        self._data = None
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def _load(self):
+        if self._data is None:
+            data = None
+            if self.session_id is not None:
+                try:
+                    data = self.backend.load(self.session_id)
+                    _counters["loads"] += 1
+                except (sqlite3.Error, ValueError) as e:
+                    _counters["load_errors"] += 1
+                    logger.warning(f"세션 조회 실패: {e}")
+            self._set_loaded(data)
+        return self._data
+
+    async def aload(self):
+        """저장소 조회를 스레드에서 실행해 미리 읽어 둡니다."""
+        if self._data is None:
+            data = None
+            if self.session_id is not None:
+                try:
+                    data = await asyncio.to_thread(self.backend.load, self.session_id)
+                    _counters["loads"] += 1
+                except (sqlite3.Error, ValueError) as e:
+                    _counters["load_errors"] += 1
+                    logger.warning(f"세션 조회 실패: {e}")
+            self._set_loaded(data)
+
+    def _set_loaded(self, data):
+        if data is None:
+            # 만료되었거나 없는 ID는 버리고 저장할 때 새 ID 발급
+            self.session_id = None
+        self._data = data if data is not None else {}
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __setitem__(self, key, value):
+        self._load()[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self._load()[key]
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __repr__(self):
+        return f"Session({self._data!r})"
+
+
+class ServerSessionMiddleware:
+    """쿠키에 세션 ID만 담는 세션 미들웨어 (request.session 사용법은 SessionMiddleware와 같음)"""
+
+    def __init__(self, app, backend, session_cookie="session", max_age=86400, path="/",
+                 same_site="lax", https_only=False):
+        self.app = app
+        self.backend = backend
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        cookie = HTTPConnection(scope).cookies.get(self.session_cookie)
+        session = Session(self.backend, cookie if is_session_id(cookie) else None)
+        if session.session_id is not None and self.backend.blocking:
+            await session.aload()
+        scope["session"] = session
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = await self._commit(session)
+                if header:
+                    MutableHeaders(scope=message).append("Set-Cookie", header)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _commit(self, session):
+        """바뀐 세션을 저장하고 보낼 Set-Cookie 값을 반환합니다. (바뀌지 않았으면 None)"""
+        if not session.modified:
+            if session.loaded:
+                _counters["unchanged"] += 1
+            return None
+
+        if not session:
+            if session.session_id is None:
+                return None
+            try:
+                await asyncio.to_thread(self.backend.delete, session.session_id)
+                _counters["deletes"] += 1
+            except sqlite3.Error as e:
+                logger.warning(f"세션 삭제 실패: {e}")
+            return self._cookie("null", expires=True)
+
+        if session.session_id is None:
+            session.session_id = new_session_id()
+        try:
+            await asyncio.to_thread(self.backend.save, session.session_id, dict(session))
+            _counters["saves"] += 1
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            # 저장하지 못한 세션의 ID는 보내지 않음
+            _counters["save_errors"] += 1
+            logger.warning(f"세션 저장 실패: {e}")
+            return None
+        return self._cookie(session.session_id)
+
+    def _cookie(self, value, expires=False):
+        if expires:
+            return f"{self.session_cookie}={value}; path={self.path}; expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}"
+        return f"{self.session_cookie}={value}; path={self.path}; Max-Age={self.max_age}; {self.security_flags}"
+
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", "86400"))
+
+
+def _create_backend():
+    """서버 세션 저장소, 설정되지 않았으면 None (서명 쿠키 사용)"""
+    maxsize = int(os.getenv("SESSION_STORE_SIZE", "10000"))
+    db_path = os.getenv("SESSION_DB")
+    if db_path:
+        try:
+            backend = SQLiteSessionBackend(db_path, maxsize, SESSION_TTL)
+            logger.info(f"세션 저장소 SQLite 사용: {db_path}")
+            return backend
+        except sqlite3.Error as e:
+            logger.warning(f"세션 저장소 SQLite 초기화 실패: {e}")
+    if os.getenv("SESSION_STORE", "").lower() == "memory":
+        logger.info("세션 저장소 메모리 사용 (단일 프로세스 배포용)")
+        return MemorySessionBackend(maxsize, SESSION_TTL)
+    logger.info("서버 세션 저장소 미설정, 서명 쿠키 사용")
+    return None
+
+
+session_backend = _create_backend()
+
+# 세션이 서버에 저장되는지 (False면 쿠키 크기 제한 때문에 큰 값을 세션에 두지 않음)
+SERVER_SIDE = session_backend is not None
+
+
+def stats():
+    if session_backend is None:
+        return {"backend": "cookie", "ttl": SESSION_TTL}
+    return {**session_backend.stats(), **_counters}
+
+
+metrics.register("sessions", stats)
@@ -0,0 +1,198 @@
+"""
+진행 중인 스트림 합치기 (single-flight)
+같은 키의 스트림이 이미 진행 중이면 새 업스트림을 열지 않고 그 스트림의 이벤트를 함께 받습니다.
+
+- 첫 요청이 생산자: 업스트림 생성기를 별도 작업(task)으로 실행해 구독자 모두에게 나눠줌
+- 늦게 합류한 구독자는 지금까지 버퍼에 쌓인 이벤트를 먼저 재생받음
+- 재생 버퍼가 한도를 넘으면 더 이상 합류를 받지 않음 (이후 요청은 새 스트림 시작)
+- 구독자별 대기열도 한도가 있어, 너무 느린 구독자는 오류 이벤트를 받고 분리됨
+- 구독자가 모두 떠나면 생산자 작업을 취소해 업스트림도 닫힘
+  (응답 본문을 보내기 전에 버려져 한 번도 시작되지 않은 구독도 GC 시 떠난 것으로 처리)
+- 동시 실행 자리(admission)는 새 스트림을 시작하는 요청만 얻고, 생산자 작업이 끝날 때 반납
+  (합류한 구독자는 자리를 쓰지 않음)
+
+환경 변수:
+    STREAM_FLIGHT_BUFFER: 합류용 재생 버퍼 이벤트 수 (기본 2048)
+    STREAM_FLIGHT_QUEUE: 구독자별 대기열 이벤트 수 (기본 1024)
+
+이벤트 루프 하나에서만 사용합니다 (스레드 안전하지 않음).
+"""
+import asyncio
+import json
+import logging
+import os
+import weakref
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_LAGGED = object()
+
+LAGGED_EVENT = "data: " + json.dumps(
+    {"type": "error", "error": "응답 전송이 지연되어 스트림을 종료했습니다. 다시 시도해주세요."},
+    ensure_ascii=False
+) + "\n\n"
+
+
+class _Flight:
+    """키 하나에 대해 진행 중인 업스트림 스트림"""
+
+    def __init__(self, key):
+        self.key = key
+        self.task = None
+        self.prefix = []  # 합류용 재생 버퍼
+        self.joinable = True
+        self.done = False
+        self.cancelled = False
+        self.queues = set()
+        self.peak_subscribers = 0
+
+
+class StreamFlights:
+    """키별 스트림 합치기"""
+
+    def __init__(self, buffer_events=2048, queue_events=1024):
+        self.buffer_events = max(1, buffer_events)
+        self.queue_events = max(1, queue_events)
+        self._flights = {}
+        self._started = 0
+        self._coalesced = 0
+        self._lagged = 0
+        self._buffer_overflows = 0
+        self._cancelled = 0
+        self._max_subscribers = 0
+
+    async def _produce(self, flight, source):
+        try:
+            async for event in source:
+                if flight.joinable:
+                    flight.prefix.append(event)
+                    if len(flight.prefix) > self.buffer_events:
+                        self._close_joining(flight)
+                        self._buffer_overflows += 1
+                for queue in list(flight.queues):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        self._drop_lagged(flight, queue)
+        except Exception as e:
+            # 생성기 자체 오류 (업스트림 오류는 생성기가 error 이벤트로 보냄)
+            logger.error(f"스트림 생산자 오류: {e}", exc_info=True)
+        finally:
+            flight.done = True
+            self._close_joining(flight)
+            for queue in list(flight.queues):
+                try:
+                    queue.put_nowait(_DONE)
+                except asyncio.QueueFull:
+                    self._drop_lagged(flight, queue)
+
+    def _close_joining(self, flight):
+        flight.joinable = False
+        flight.prefix = []
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def _drop_lagged(self, flight, queue):
+        # 대기열을 비우고 종료 신호만 남김
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(_LAGGED)
+        flight.queues.discard(queue)
+        self._lagged += 1
+
+    def _joinable(self, key):
+        flight = self._flights.get(key)
+        return flight if flight is not None and flight.joinable else None
+
+    def _start(self, key, factory, permit):
+        flight = _Flight(key)
+        self._flights[key] = flight
+        flight.task = asyncio.create_task(self._produce(flight, factory()))
+        if permit is not None:
+            # 작업이 시작되기 전에 취소되어도 반납되도록 완료 콜백에서 반납
+            flight.task.add_done_callback(lambda _task: permit.release())
+        self._started += 1
+        return flight
+
+    async def open(self, key, factory, admit=None):
+        """
+        key로 진행 중인 스트림에 합류하거나, 없으면 factory()로 새 스트림을 시작하고 구독 생성기를 반환합니다.
+
+        Args:
+            key: 같은 결과를 내는 요청끼리 같은 값 (해시 가능)
+            factory: 인자 없이 호출하면 업스트림 비동기 생성기를 반환하는 함수
+            admit: 새 스트림을 시작할 때만 호출하는 비동기 함수 (Permit 반환, 거절 예외는 그대로 전파)
+        """
+        flight = self._joinable(key)
+        if flight is None and admit is not None:
+            permit = await admit()
+            # 자리를 기다리는 동안 같은 키의 스트림이 시작되었으면 합류하고 자리는 바로 반납
+            flight = self._joinable(key)
+            if flight is None:
+                flight = self._start(key, factory, permit)
+            else:
+                permit.release()
+                self._coalesced += 1
+        elif flight is None:
+            flight = self._start(key, factory, None)
+        else:
+            self._coalesced += 1
+
+        # await 없이 재생 버퍼 복사와 대기열 등록을 함께 처리해 이벤트 누락/중복이 없음
+        replay = list(flight.prefix)
+        queue = asyncio.Queue(maxsize=self.queue_events)
+        flight.queues.add(queue)
+        flight.peak_subscribers = max(flight.peak_subscribers, len(flight.queues))
+        self._max_subscribers = max(self._max_subscribers, flight.peak_subscribers)
+
+        subscription = self._subscribe(flight, replay, queue)
+        # 한 번도 시작되지 않은 생성기는 finally가 실행되지 않으므로 버려질 때도 구독 해제
+        weakref.finalize(subscription, self._unsubscribe, flight, queue)
+        return subscription
+
+    async def _subscribe(self, flight, replay, queue):
+        try:
+            for event in replay:
+                yield event
+            while True:
+                event = await queue.get()
+                if event is _DONE:
+                    break
+                if event is _LAGGED:
+                    yield LAGGED_EVENT
+                    break
+                yield event
+        finally:
+            self._unsubscribe(flight, queue)
+
+    def _unsubscribe(self, flight, queue):
+        flight.queues.discard(queue)
+        if not flight.queues and not flight.done and not flight.cancelled:
+            # 남은 구독자가 없으면 업스트림을 닫음
+            flight.cancelled = True
+            self._close_joining(flight)
+            flight.task.cancel()
+            self._cancelled += 1
+
+    def stats(self):
+        return {
+            "joinable": len(self._flights),
+            "started": self._started,
+            "coalesced_subscribers": self._coalesced,
+            "max_subscribers": self._max_subscribers,
+            "lagged_subscribers": self._lagged,
+            "buffer_overflows": self._buffer_overflows,
+            "cancelled": self._cancelled,
+            "buffer_events": self.buffer_events,
+            "queue_events": self.queue_events
+        }
+
+
+stream_flights = StreamFlights(
+    buffer_events=int(os.getenv("STREAM_FLIGHT_BUFFER", "2048")),
+    queue_events=int(os.getenv("STREAM_FLIGHT_QUEUE", "1024"))
+)
+metrics.register("ai_singleflight", stream_flights.stats)
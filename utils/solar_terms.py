@@ -0,0 +1,218 @@
+"""
+24절기 테이블
+1899~2101년의 절기 시각(한국시간, 분 단위)을 미리 계산해 둔 데이터 파일을 읽고,
+bisect 기반 이진 탐색으로 절기를 조회합니다.
+
+데이터 파일 재생성:
+    python -m utils.solar_terms
+"""
+import bisect
+import logging
+import sys
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 서비스 지원 범위 (/api/manse, /manse, 사주 계산)
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+# 테이블 범위: 지원 범위 앞뒤로 1년씩 여유를 둠 (1월 생일의 이전 절기, 12월 생일의 다음 절기)
+TABLE_START_YEAR = MIN_YEAR - 1
+TABLE_END_YEAR = MAX_YEAR + 1
+
+# 24절기 (입춘부터 시작, 사주 연도 순서)
+# 짝수 인덱스는 월이 바뀌는 절(節), 홀수 인덱스는 중기(中氣)
+SOLAR_TERMS = [
+    (315, "입춘"), (330, "우수"), (345, "경칩"), (0, "춘분"),
+    (15, "청명"), (30, "곡우"), (45, "입하"), (60, "소만"),
+    (75, "망종"), (90, "하지"), (105, "소서"), (120, "대서"),
+    (135, "입추"), (150, "처서"), (165, "백로"), (180, "추분"),
+    (195, "한로"), (210, "상강"), (225, "입동"), (240, "소설"),
+    (255, "대설"), (270, "동지"), (285, "소한"), (300, "대한")
+]
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "solar_terms.bin"
+
+# 타임스탬프 기준 시각 (한국시간 1899-01-01 00:00, 분 단위)
+_EPOCH = datetime(TABLE_START_YEAR, 1, 1)
+
+SolarTerm = namedtuple("SolarTerm", ["when", "name", "longitude", "year", "order"])
+SolarTerm.__doc__ = """
+절기 정보
+
+when: 절기 시각 (한국시간 naive datetime, 분 단위)
+name: 절기 이름 (예: "입춘")
+longitude: 태양 황경 (도)
+year: 사주 연도 (입춘 기준)
+order: 사주 연도 내 순서 (0=입춘 ... 23=대한), 월 인덱스는 order // 2
+"""
+
+_table = None
+
+
+def build_table():
+    """
+    saju_logic의 황경 솔버로 테이블 전체(TABLE_START_YEAR 입춘 ~ TABLE_END_YEAR 대한)를 계산합니다.
+
+    Returns:
+        array: 기준 시각부터의 경과 분(uint32) 배열
+    """
+    from saju_logic import find_solar_term_time
+
+    minutes = array("I")
+    evaluations = 0
+    for year in range(TABLE_START_YEAR, TABLE_END_YEAR + 1):
+        for order, (longitude, _name) in enumerate(SOLAR_TERMS):
+            # 소한/대한은 다음 양력 년도 1월에 옴
+            calendar_year = year + 1 if order >= 22 else year
+            when, used = find_solar_term_time(calendar_year, longitude, tolerance_minutes=0.1)
+            evaluations += used
+            minutes.append(int(round((when - _EPOCH).total_seconds() / 60)))
+    logger.info(f"절기 테이블 계산: {len(minutes)}개 절기, ephem 계산 {evaluations}회")
+    return minutes
+
+
+def write_table(path=DATA_FILE):
+    """테이블을 계산해 리틀 엔디언 uint32 배열로 저장합니다."""
+    minutes = build_table()
+    if sys.byteorder != "little":
+        minutes.byteswap()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        minutes.tofile(f)
+    return path
+
+
+def _load_table():
+    global _table
+    if _table is not None:
+        return _table
+
+    expected = (TABLE_END_YEAR - TABLE_START_YEAR + 1) * len(SOLAR_TERMS)
+    minutes = array("I")
+    try:
+        with open(DATA_FILE, "rb") as f:
+            minutes.frombytes(f.read())
+        if sys.byteorder != "little":
+            minutes.byteswap()
+        if len(minutes) != expected:
+            raise ValueError(f"절기 테이블 크기 불일치: {len(minutes)} != {expected}")
+    except (OSError, ValueError) as e:
+        # 데이터 파일이 없거나 손상된 경우에만 직접 계산 (수 초 소요)
+        logger.warning(f"절기 데이터 파일을 사용할 수 없어 직접 계산합니다: {e}")
+        minutes = build_table()
+
+    _table = minutes
+    return _table
+
+
+def _to_minutes(dt):
+    if not isinstance(dt, datetime):
+        dt = datetime(dt.year, dt.month, dt.day)
+    return int((dt - _EPOCH).total_seconds() // 60)
+
+
+def _term(idx):
+    table = _load_table()
+    if idx < 0 or idx >= len(table):
+        raise ValueError(f"지원 범위({MIN_YEAR}~{MAX_YEAR}년)를 벗어난 날짜입니다.")
+    order = idx % len(SOLAR_TERMS)
+    longitude, name = SOLAR_TERMS[order]
+    return SolarTerm(
+        when=_EPOCH + timedelta(minutes=table[idx]),
+        name=name,
+        longitude=longitude,
+        year=TABLE_START_YEAR + idx // len(SOLAR_TERMS),
+        order=order
+    )
+
+
+def term_at(dt, major_only=False):
+    """
+    dt 시점에 적용 중인 절기(dt 이전의 가장 최근 절기)를 반환합니다.
+
+    Args:
+        dt: 한국시간 datetime (date이면 자정 기준)
+        major_only: True이면 월이 바뀌는 절(節)만 대상으로 함
+
+    Returns:
+        SolarTerm
+    """
+    idx = bisect.bisect_right(_load_table(), _to_minutes(dt)) - 1
+    if major_only and idx % 2:
+        idx -= 1
+    return _term(idx)
+
+
+def next_term(dt, major_only=False):
+    """dt 이후 처음 오는 절기를 반환합니다."""
+    idx = bisect.bisect_right(_load_table(), _to_minutes(dt))
+    if major_only and idx % 2:
+        idx += 1
+    return _term(idx)
+
+
+def prev_term(dt, major_only=False):
+    """dt 이전의 가장 최근 절기를 반환합니다 (dt와 같은 분의 절기는 제외)."""
+    idx = bisect.bisect_left(_load_table(), _to_minutes(dt)) - 1
+    if major_only and idx % 2:
+        idx -= 1
+    return _term(idx)
+
+
+def terms_between(start, end, major_only=False):
+    """
+    start <= 절기 시각 < end 인 절기 목록을 반환합니다.
+
+    Returns:
+        list[SolarTerm]
+    """
+    table = _load_table()
+    lo = bisect.bisect_left(table, _to_minutes(start))
+    hi = bisect.bisect_left(table, _to_minutes(end))
+    if lo == 0 or hi >= len(table):
+        # 범위 밖 요청은 _term과 같은 오류로 처리
+        _term(-1 if lo == 0 else len(table))
+    return [_term(idx) for idx in range(lo, hi) if not (major_only and idx % 2)]
+
+
+def terms_of_year(year):
+    """사주 연도 year의 24절기(입춘 ~ 다음 해 대한)를 반환합니다."""
+    start = (year - TABLE_START_YEAR) * len(SOLAR_TERMS)
+    return [_term(idx) for idx in range(start, start + len(SOLAR_TERMS))]
+
+
+def find_term(year, longitude):
+    """
+    양력 year년 중 태양 황경이 longitude가 되는 절기를 반환합니다.
+
+    Args:
+        year: 양력 년도
+        longitude: 황경 (15의 배수, 예: 315=입춘, 345=경칩)
+
+    Returns:
+        SolarTerm
+    """
+    order = int((longitude - 315) % 360 // 15)
+    idx = (year - TABLE_START_YEAR) * len(SOLAR_TERMS) + order
+    term = _term(idx)
+    if term.when.year > year:
+        # 소한/대한은 다음 양력 년도 1월에 오므로 전 사주 연도의 항목을 사용
+        term = _term(idx - len(SOLAR_TERMS))
+    return term
+
+
+def ipchun(year):
+    """양력 year년 입춘 시각을 반환합니다."""
+    return find_term(year, 315).when
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    written = write_table()
+    print(f"절기 테이블 생성 완료: {written}")
@@ -0,0 +1,308 @@
+"""
+SSE 스트림 유틸리티
+
+1. 청크 합치기 (coalesce_text)
+   모델이 몇 글자씩 보내는 delta를 모아 바이트 한도나 시간 한도에 도달하면 한 번에 내보냅니다.
+   이벤트 수가 줄어 json.dumps 호출과 네트워크 쓰기 횟수가 함께 줄어듭니다.
+   중간에 취소되면 받은 delta 수를 기록해 아낀 토큰 수를 추정합니다.
+
+2. 연결 감시 (guard_stream)
+   클라이언트 연결이 끊기면 스트림을 닫아 업스트림 모델 호출까지 취소하고,
+   이벤트가 없는 동안 heartbeat 주석을 보내 끊긴 연결을 빨리 발견합니다.
+
+환경 변수 (스트림 이름별 설정이 기본값보다 우선, 이름은 대문자로 예: SSE_FLUSH_BYTES_SAJU):
+    SSE_FLUSH_BYTES[_이름]: 모인 텍스트가 이 바이트 수(UTF-8) 이상이면 내보냄 (기본 2048, 0이면 사용 안 함)
+    SSE_FLUSH_MS[_이름]: 첫 delta 이후 이 시간(ms)이 지나면 내보냄 (기본 50, 0이면 사용 안 함)
+    둘 다 0이면 delta를 그대로 내보냅니다.
+    SSE_HEARTBEAT_SECONDS: 이벤트 없이 이 시간이 지나면 heartbeat 전송 (기본 15, 0이면 사용 안 함)
+    SSE_DISCONNECT_CHECK_SECONDS: 연결 끊김 확인 간격 (기본 1)
+
+통계는 utils.metrics에 "sse_coalescing"(청크 합치기, 업스트림 취소)과
+"sse_streams"(연결 끊김, heartbeat)로 등록됩니다.
+"""
+import asyncio
+import logging
+import os
+import threading
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_BYTES = 2048
+DEFAULT_FLUSH_MS = 50
+
+HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+DISCONNECT_CHECK_INTERVAL = max(0.05, float(os.getenv("SSE_DISCONNECT_CHECK_SECONDS", "1")))
+
+# SSE 주석 줄: 클라이언트는 "data: "로 시작하지 않는 줄을 무시함
+HEARTBEAT_EVENT = ": ping\n\n"
+
+
+def flush_policy(name):
+    """스트림 이름에 해당하는 (바이트 한도, 시간 한도(초))"""
+    suffix = name.upper()
+    max_bytes = int(os.getenv(f"SSE_FLUSH_BYTES_{suffix}", os.getenv("SSE_FLUSH_BYTES", str(DEFAULT_FLUSH_BYTES))))
+    max_ms = float(os.getenv(f"SSE_FLUSH_MS_{suffix}", os.getenv("SSE_FLUSH_MS", str(DEFAULT_FLUSH_MS))))
+    return max(0, max_bytes), max(0.0, max_ms) / 1000
+
+
+class _StreamStats:
+    """스트림 이름별 누적 통계"""
+
+    def __init__(self):
+        self.streams = 0
+        self.deltas = 0
+        self.events = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.byte_flushes = 0
+        self.time_flushes = 0
+        self.completed = 0
+        self.completed_deltas = 0
+        self.aborted = 0
+        self.aborted_deltas = 0
+        self.tokens_saved = 0
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name, deltas, events, size, seconds, byte_flushes, time_flushes, aborted=False):
+    with _stats_lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = _StreamStats()
+        entry.streams += 1
+        entry.deltas += deltas
+        entry.events += events
+        entry.bytes += size
+        entry.seconds += seconds
+        entry.byte_flushes += byte_flushes
+        entry.time_flushes += time_flushes
+        if aborted:
+            # 아낀 토큰 = 끝까지 받은 스트림의 평균 delta 수 - 취소 전까지 받은 delta 수 (delta ≒ 토큰)
+            entry.aborted += 1
+            entry.aborted_deltas += deltas
+            if entry.completed:
+                entry.tokens_saved += max(0, round(entry.completed_deltas / entry.completed) - deltas)
+        else:
+            entry.completed += 1
+            entry.completed_deltas += deltas
+
+
+def _discard_result(task):
+    # 취소한 작업의 결과/예외를 가져가 "never retrieved" 경고를 막음
+    if not task.cancelled():
+        task.exception()
+
+
+async def _cancel_pending(task):
+    """다음 항목을 기다리던 작업을 취소하고, 가능하면 정리가 끝날 때까지 기다립니다."""
+    if task is None:
+        return
+    task.add_done_callback(_discard_result)
+    if task.done():
+        return
+    task.cancel()
+    try:
+        await asyncio.wait((task,))
+    except asyncio.CancelledError:
+        # 호출한 작업도 취소되는 중: 작업은 스스로 정리됨
+        pass
+
+
+async def coalesce_text(source, name):
+    """
+    텍스트 delta 비동기 반복자를 받아 합쳐진 텍스트 조각을 내보냅니다.
+
+    Args:
+        source: 텍스트(str)를 내보내는 비동기 반복자 (예: 모델 delta)
+        name: 설정/통계에 쓰는 스트림 이름 (예: "saju")
+
+    바이트 한도 도달, 시간 한도 경과, 원본 종료 시점에 모인 텍스트를 내보냅니다.
+    시간 한도는 다음 delta를 기다리는 동안에도 적용됩니다.
+    """
+    max_bytes, max_delay = flush_policy(name)
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    deltas = events = size = byte_flushes = time_flushes = 0
+    iterator = source.__aiter__()
+
+    if not max_bytes and not max_delay:
+        aborted = False
+        try:
+            async for text in iterator:
+                deltas += 1
+                events += 1
+                size += len(text.encode("utf-8"))
+                yield text
+        except (asyncio.CancelledError, GeneratorExit):
+            aborted = True
+            raise
+        finally:
+            _record(name, deltas, events, size, loop.time() - started_at, 0, 0, aborted)
+        return
+
+    parts = []
+    pending_bytes = 0
+    deadline = None
+    pending = None  # 다음 delta를 기다리는 작업 (시간 한도로 깨어나도 취소하지 않고 이어서 기다림)
+    aborted = False
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if parts and deadline is not None:
+                done, _ = await asyncio.wait((pending,), timeout=max(0.0, deadline - loop.time()))
+                if not done:
+                    text = "".join(parts)
+                    parts, pending_bytes, deadline = [], 0, None
+                    events += 1
+                    time_flushes += 1
+                    yield text
+                    continue
+            else:
+                await asyncio.wait((pending,))
+            try:
+                text = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+            deltas += 1
+            encoded = len(text.encode("utf-8"))
+            size += encoded
+            parts.append(text)
+            pending_bytes += encoded
+            if deadline is None and max_delay:
+                deadline = loop.time() + max_delay
+            if max_bytes and pending_bytes >= max_bytes:
+                text = "".join(parts)
+                parts, pending_bytes, deadline = [], 0, None
+                events += 1
+                byte_flushes += 1
+                yield text
+        if parts:
+            events += 1
+            yield "".join(parts)
+    except (asyncio.CancelledError, GeneratorExit):
+        aborted = True
+        raise
+    finally:
+        await _cancel_pending(pending)
+        _record(name, deltas, events, size, loop.time() - started_at, byte_flushes, time_flushes, aborted)
+
+
+_stream_counts = {}  # 이름 -> {"streams", "client_disconnects", "heartbeats"}
+
+
+def _count(name, key, amount=1):
+    with _stats_lock:
+        entry = _stream_counts.setdefault(name, {"streams": 0, "client_disconnects": 0, "heartbeats": 0})
+        entry[key] += amount
+
+
+async def guard_stream(request, source, name):
+    """
+    클라이언트 연결을 감시하며 source의 SSE 문자열을 그대로 내보냅니다.
+
+    - 연결이 끊긴 것이 확인되면 source를 닫음 (source가 업스트림을 닫도록 연결되어 있어야 함)
+    - 응답 전송이 취소되어도(서버가 끊김을 먼저 감지한 경우) 같은 방식으로 source를 닫음
+    - 이벤트 없이 HEARTBEAT_INTERVAL이 지나면 HEARTBEAT_EVENT를 보냄
+
+    Args:
+        request: 연결 상태를 확인할 Request
+        source: SSE 문자열을 내보내는 비동기 생성기
+        name: 통계에 쓰는 스트림 이름
+    """
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+    pending = None
+    last_sent = last_check = loop.time()
+    heartbeats = 0
+    disconnected = False
+    _count(name, "streams")
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait((pending,), timeout=DISCONNECT_CHECK_INTERVAL)
+            now = loop.time()
+            if not done:
+                last_check = now
+                if await request.is_disconnected():
+                    disconnected = True
+                    break
+                if HEARTBEAT_INTERVAL > 0 and now - last_sent >= HEARTBEAT_INTERVAL:
+                    heartbeats += 1
+                    last_sent = now
+                    yield HEARTBEAT_EVENT
+                continue
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+            yield event
+            last_sent = now
+            if now - last_check >= DISCONNECT_CHECK_INTERVAL:
+                last_check = now
+                if await request.is_disconnected():
+                    disconnected = True
+                    break
+    except (asyncio.CancelledError, GeneratorExit):
+        disconnected = True
+        raise
+    finally:
+        if pending is not None:
+            # source가 다음 이벤트를 기다리는 중: 그 작업을 취소하면 source도 함께 종료됨
+            await _cancel_pending(pending)
+        else:
+            try:
+                await source.aclose()
+            except Exception as e:
+                logger.warning(f"스트림 종료 중 오류 ({name}): {e}")
+        if heartbeats:
+            _count(name, "heartbeats", heartbeats)
+        if disconnected:
+            _count(name, "client_disconnects")
+            logger.info(f"클라이언트 연결 끊김으로 스트림 중단: {name}")
+
+
+def stats():
+    """스트림 이름별 통계: 이벤트/초, 이벤트당 바이트, delta/이벤트 비율과 현재 설정"""
+    with _stats_lock:
+        result = {}
+        for name, entry in _stats.items():
+            max_bytes, max_delay = flush_policy(name)
+            result[name] = {
+                "flush_bytes": max_bytes,
+                "flush_ms": round(max_delay * 1000, 3),
+                "streams": entry.streams,
+                "deltas": entry.deltas,
+                "events": entry.events,
+                "bytes": entry.bytes,
+                "byte_flushes": entry.byte_flushes,
+                "time_flushes": entry.time_flushes,
+                "events_per_second": round(entry.events / entry.seconds, 3) if entry.seconds else 0.0,
+                "bytes_per_event": round(entry.bytes / entry.events, 1) if entry.events else 0.0,
+                "deltas_per_event": round(entry.deltas / entry.events, 2) if entry.events else 0.0,
+                "completed": entry.completed,
+                "aborted": entry.aborted,
+                "tokens_before_abort": entry.aborted_deltas,
+                "est_tokens_saved": entry.tokens_saved
+            }
+        return result
+
+
+def stream_stats():
+    """스트림 이름별 응답 수, 클라이언트 연결 끊김 수, heartbeat 수"""
+    with _stats_lock:
+        return {name: dict(entry) for name, entry in _stream_counts.items()}
+
+
+metrics.register("sse_coalescing", stats)
+metrics.register("sse_streams", stream_stats)
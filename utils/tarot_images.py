@@ -0,0 +1,210 @@
+"""
+타로 카드 AI 이미지 저장소
+(카드명, 역위치 여부)별로 AI 이미지를 한 번만 생성해 WebP 파일로 저장하고, 이후에는 파일을 그대로 제공합니다.
+
+- 저장 위치: TAROT_AI_IMAGE_DIR (기본 static/images/tarot_ai/), 쓸 수 없으면(읽기 전용 배포 등) 임시 디렉토리
+  어느 디렉토리든 main.py가 IMAGE_URL_PREFIX 경로로 제공
+- 파일로 저장하지 못하면 WebP data URL을 응답에 넣고 메모리에 보관 (저장 디렉토리가 없을 때도 같음)
+- 파일명: 기본 이미지 파일명 기준 (예: tarot_00_fool.webp, 역위치는 tarot_00_fool_reversed.webp)
+- 변환: optimize_images.py와 같은 방식 (너비 600px 이하, RGB, WebP 품질 80)
+- 같은 카드를 동시에 요청하면 생성은 한 번만 하고 결과를 함께 기다림
+- 전체 마감 시간이 지나도 생성 중인 작업은 계속 진행되어 다음 요청부터 파일로 제공됨
+
+환경 변수:
+    TAROT_AI_IMAGE_DIR: 저장 디렉토리 (기본 static/images/tarot_ai)
+    TAROT_AI_MEMORY_SIZE: 파일로 저장하지 못한 이미지를 메모리에 보관할 수 (기본 64)
+    TAROT_IMAGE_DEADLINE: 한 요청에서 이미지 생성을 기다리는 최대 시간(초, 기본 25)
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+import ai_analyst
+from utils import metrics
+from utils.cache import TTLCache
+from utils.tarot import TAROT_IMAGE_MAP
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+IMAGE_URL_PREFIX = "/static/images/tarot_ai"
+DEADLINE = float(os.getenv("TAROT_IMAGE_DEADLINE", "25"))
+
+MAX_WIDTH = 600
+WEBP_QUALITY = 80
+
+
+def _writable_dir(path):
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return False
+    return os.access(path, os.W_OK)
+
+
+def _resolve_image_dir():
+    """쓸 수 있는 저장 디렉토리 (설정 디렉토리 -> 임시 디렉토리 순), 없으면 None"""
+    configured = Path(os.getenv("TAROT_AI_IMAGE_DIR", str(BASE_DIR / "static" / "images" / "tarot_ai")))
+    for candidate in (configured, Path(tempfile.gettempdir()) / "unsedam_tarot_ai"):
+        if _writable_dir(candidate):
+            if candidate != configured:
+                logger.warning(f"타로 이미지 디렉토리에 쓸 수 없어 임시 디렉토리 사용: {configured} -> {candidate}")
+            return candidate
+    logger.warning("타로 이미지를 저장할 디렉토리가 없어 data URL로 제공합니다.")
+    return None
+
+
+IMAGE_DIR = _resolve_image_dir()
+
+_pending = {}  # 파일명 -> 생성 중인 작업
+_memory = TTLCache(maxsize=max(1, int(os.getenv("TAROT_AI_MEMORY_SIZE", "64"))), ttl=None)  # 파일명 -> data URL
+_stats = {"hits": 0, "generated": 0, "failed": 0, "save_failed": 0, "coalesced": 0, "deadline_misses": 0}
+
+
+def image_filename(card_name, is_reversed=False):
+    """카드에 해당하는 AI 이미지 파일명"""
+    base = TAROT_IMAGE_MAP.get(card_name)
+    if base:
+        stem = os.path.splitext(base)[0]
+    else:
+        # 매핑에 없는 카드명은 해시로 구분 (경로 문자가 섞이지 않도록)
+        stem = "tarot_" + hashlib.sha256(card_name.encode("utf-8")).hexdigest()[:16]
+    return f"{stem}_reversed.webp" if is_reversed else f"{stem}.webp"
+
+
+def cached_image_url(card_name, is_reversed=False):
+    """이미 저장된 이미지의 URL(파일이 없으면 메모리의 data URL), 없으면 None"""
+    filename = image_filename(card_name, is_reversed)
+    if IMAGE_DIR is not None and (IMAGE_DIR / filename).is_file():
+        return f"{IMAGE_URL_PREFIX}/{filename}"
+    return _memory.get(filename)
+
+
+def _to_webp(data):
+    """PNG 바이트를 WebP 바이트로 변환"""
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width > MAX_WIDTH:
+            ratio = MAX_WIDTH / float(img.width)
+            img = img.resize((MAX_WIDTH, int(float(img.height) * ratio)), Image.Resampling.LANCZOS)
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, "WEBP", quality=WEBP_QUALITY)
+    return buffer.getvalue()
+
+
+def _write_file(data, filename):
+    """임시 파일에 쓴 뒤 교체해 반쯤 쓴 파일이 제공되지 않도록 저장"""
+    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    path = IMAGE_DIR / filename
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _data_url(data, media_type):
+    return f"data:{media_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+async def _generate(api_key, card_name, is_reversed, filename):
+    try:
+        data = await ai_analyst.generate_tarot_card_image_async(api_key, card_name, is_reversed)
+        if not data:
+            _stats["failed"] += 1
+            return None
+        _stats["generated"] += 1
+        try:
+            webp = await asyncio.to_thread(_to_webp, data)
+        except Exception as e:
+            logger.error(f"타로 카드 AI 이미지 변환 오류 ({card_name}): {e}", exc_info=True)
+            _stats["save_failed"] += 1
+            return _data_url(data, "image/png")
+        if IMAGE_DIR is not None:
+            try:
+                await asyncio.to_thread(_write_file, webp, filename)
+                logger.info(f"타로 카드 AI 이미지 저장: {filename}")
+                return f"{IMAGE_URL_PREFIX}/{filename}"
+            except OSError as e:
+                logger.warning(f"타로 카드 AI 이미지 파일 저장 실패, data URL로 제공 ({filename}): {e}")
+        # 파일로 저장하지 못하면 data URL을 메모리에 보관해 같은 카드는 다시 생성하지 않음
+        _stats["save_failed"] += 1
+        url = _data_url(webp, "image/webp")
+        _memory.set(filename, url)
+        return url
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.error(f"타로 카드 AI 이미지 생성 오류 ({card_name}): {e}", exc_info=True)
+        return None
+    finally:
+        _pending.pop(filename, None)
+
+
+def _image_task(api_key, card_name, is_reversed):
+    """카드 이미지를 생성하는 작업 (같은 카드가 생성 중이면 그 작업을 반환)"""
+    filename = image_filename(card_name, is_reversed)
+    task = _pending.get(filename)
+    if task is None:
+        task = asyncio.create_task(_generate(api_key, card_name, is_reversed, filename))
+        _pending[filename] = task
+    else:
+        _stats["coalesced"] += 1
+    return task
+
+
+def missing_cards(cards):
+    """저장된 이미지가 없는 카드 목록 (cards: draw_tarot_cards 결과의 카드 dict 목록)"""
+    return [card for card in cards if cached_image_url(card.get('카드명', ''), card.get('is_reversed', False)) is None]
+
+
+async def attach_images(api_key, cards, deadline=None, permit=None):
+    """
+    카드마다 AI 이미지 URL을 ai_image_url에 넣습니다.
+
+    저장된 이미지는 바로 사용하고, 없는 카드는 동시에 생성합니다.
+    deadline(초, 기본 TAROT_IMAGE_DEADLINE) 안에 끝나지 않은 카드는 건너뛰며,
+    그 카드의 생성은 계속 진행되어 다음 요청부터 제공됩니다.
+    permit(동시 실행 허가)을 넘기면 생성 작업이 모두 끝날 때 반납합니다.
+
+    Returns:
+        int: 이미지가 붙은 카드 수
+    """
+    tasks = {}
+    try:
+        for index, card in enumerate(cards):
+            card_name = card.get('카드명', '')
+            is_reversed = card.get('is_reversed', False)
+            url = cached_image_url(card_name, is_reversed)
+            if url:
+                _stats["hits"] += 1
+                card['ai_image_url'] = url
+            else:
+                tasks[index] = _image_task(api_key, card_name, is_reversed)
+    finally:
+        if permit is not None:
+            permit.release_after(*tasks.values())
+
+    if tasks:
+        limit = DEADLINE if deadline is None else deadline
+        # shield: 마감 시간이 지나거나 요청이 취소되어도 생성 작업은 취소하지 않음
+        _done, not_done = await asyncio.wait([asyncio.shield(task) for task in tasks.values()], timeout=limit)
+        _stats["deadline_misses"] += len(not_done)
+        for index, task in tasks.items():
+            if task.done() and not task.cancelled() and task.result():
+                cards[index]['ai_image_url'] = task.result()
+
+    return sum(1 for card in cards if card.get('ai_image_url'))
+
+
+def stats():
+    return {"dir": str(IMAGE_DIR) if IMAGE_DIR is not None else None, "deadline": DEADLINE,
+            "generating": len(_pending), "in_memory": len(_memory), **_stats}
+
+
+metrics.register("tarot_images", stats)